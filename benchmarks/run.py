@@ -0,0 +1,291 @@
+"""Benchmark runner — latency percentiles and peak memory vs graph size.
+
+Generates a synthetic session per size (synthetic.py), runs each benchmark
+against it with the LLM linker and embedding model stubbed out, and
+writes the results as JSON. Runs with the same spec and seed use the same
+data, so two result files can be diffed (--baseline) to spot regressions.
+
+Usage:
+    python benchmarks/run.py [--sizes N ...] [--only NAME ...] [--repeat N]
+                             [--budget SECONDS] [--out FILE] [--baseline FILE]
+
+    --sizes:     Node counts (default: 1000 10000 100000).
+    --only:      Benchmarks to run (default: all; see --list).
+    --repeat:    Timed calls per benchmark (default: 20) ...
+    --budget:    ... or fewer, once this many seconds are spent (default: 10).
+    --out:       Write JSON results here (default: stdout).
+    --baseline:  Earlier results file; prints p50 ratios and flags regressions.
+    --threshold: Ratio above which a p50 counts as a regression (default: 1.25).
+    --no-memory: Skip the tracemalloc peak-memory pass.
+
+Spec knobs (--edge-density, --groups, --dim, --topics, --seed) map onto
+synthetic.GraphSpec.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from synthetic import GraphSpec, stub_backends, write_session
+
+from oi import orchestrator
+from oi.cluster import find_clusters
+from oi.confidence import compute_all_confidences
+from oi.fragments import FragmentCache, JsonlTail
+from oi.knowledge import _load_embeddings_safe, add_knowledge, query_knowledge
+from oi.linker import find_candidates
+from oi.search import graph_walk
+from oi.state import _load_knowledge
+from oi.warm import GraphPool, WarmGraph
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+class Fixture:
+    """One generated session plus inputs shared by the benchmarks."""
+
+    def __init__(self, session_dir: Path, spec: GraphSpec):
+        self.session_dir = session_dir
+        self.spec = spec
+        self.knowledge = _load_knowledge(session_dir)
+        self.embeddings = _load_embeddings_safe(session_dir)
+        active = [n for n in self.knowledge["nodes"] if n["type"] != "effort"]
+        step = max(len(active) // 64, 1)
+        self.samples = active[::step][:64]  # Spread over the graph, same every run
+        self.queries = [" ".join(n["summary"].lower().split()[:3]) for n in self.samples]
+        self.warm = WarmGraph(session_dir)
+
+    def sample(self, i: int) -> dict:
+        return self.samples[i % len(self.samples)]
+
+    def new_node(self, i: int) -> dict:
+        src = self.sample(i)
+        return {
+            "id": f"fact-bench-{i}",
+            "type": "fact",
+            "summary": src["summary"] + " revisited",
+            "status": "active",
+            "provenance_uri": "doc://benchmark/new.md#sec-0",
+        }
+
+
+def _cold_build_messages(fx: Fixture, i: int):
+    """_build_messages with its memo caches reset (first turn of a process)."""
+    orchestrator._graphs = GraphPool(max_graphs=8)
+    orchestrator._fragments = FragmentCache()
+    orchestrator._logs = JsonlTail()
+    return orchestrator._build_messages(fx.session_dir, current_turn=1)
+
+
+# name → fn(fixture, call_index). Read-only benchmarks first; add_knowledge grows the graph.
+BENCHMARKS: dict[str, Callable[[Fixture, int], object]] = {
+    "query_knowledge": lambda fx, i: query_knowledge(fx.session_dir, fx.queries[i % len(fx.queries)]),
+    "query_knowledge[warm]": lambda fx, i: query_knowledge(
+        fx.session_dir, fx.queries[i % len(fx.queries)], graph=fx.warm),
+    "find_candidates": lambda fx, i: find_candidates(fx.new_node(i), fx.knowledge),
+    "graph_walk": lambda fx, i: graph_walk(
+        [{"node_id": fx.sample(i + k)["id"], "score": 1.0} for k in range(3)], fx.knowledge),
+    "compute_all_confidences": lambda fx, i: compute_all_confidences(fx.knowledge, embeddings=fx.embeddings),
+    "find_clusters": lambda fx, i: find_clusters(fx.session_dir, fx.knowledge),
+    "build_messages[cold]": _cold_build_messages,
+    "build_messages": lambda fx, i: orchestrator._build_messages(fx.session_dir, current_turn=1),
+    "add_knowledge": lambda fx, i: add_knowledge(
+        fx.session_dir, "fact", fx.new_node(i)["summary"], model="benchmark-stub",
+        provenance_uri="doc://benchmark/new.md#sec-0"),
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(durations: list[float]) -> dict:
+    """Latency stats (ms) for a list of durations in seconds."""
+    ms = sorted(d * 1000 for d in durations)
+    return {
+        "calls": len(ms),
+        "min_ms": round(ms[0], 3),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p90_ms": round(percentile(ms, 90), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(ms[-1], 3),
+        "mean_ms": round(sum(ms) / len(ms), 3),
+    }
+
+
+def run_benchmark(fn: Callable[[int], object], repeat: int, budget: float, memory: bool) -> dict:
+    """Time fn: up to repeat calls, stopping early once budget seconds are spent.
+
+    The untimed warmup call doubles as the peak-memory pass (tracemalloc
+    slows the code it traces, so traced calls are never timed).
+    """
+    if memory:
+        tracemalloc.start()
+        try:
+            fn(0)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    else:
+        fn(0)
+
+    durations = []
+    spent = 0.0
+    for i in range(1, repeat + 1):
+        start = time.perf_counter()
+        fn(i)
+        elapsed = time.perf_counter() - start
+        durations.append(elapsed)
+        spent += elapsed
+        if spent >= budget:
+            break
+    stats = summarize(durations)
+    if memory:
+        stats["peak_kib"] = round(peak / 1024, 1)
+    return stats
+
+
+def run_size(spec: GraphSpec, names: list[str], repeat: int, budget: float, memory: bool,
+             log=print) -> tuple[dict, dict]:
+    """Generate a session for spec and run the named benchmarks. Returns (results, setup)."""
+    with tempfile.TemporaryDirectory(prefix="oi-bench-") as tmp, stub_backends(spec.embedding_dim):
+        session_dir = Path(tmp) / "session"
+        start = time.perf_counter()
+        write_session(session_dir, spec)
+        setup = {
+            "generate_s": round(time.perf_counter() - start, 3),
+            "knowledge_bytes": (session_dir / "knowledge.yaml").stat().st_size,
+        }
+        fx = Fixture(session_dir, spec)
+        results = {}
+        for name in names:
+            log(f"  {spec.nodes:>7} nodes  {name} ...")
+            results[name] = run_benchmark(lambda i: BENCHMARKS[name](fx, i), repeat, budget, memory)
+        return results, setup
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _numpy_version() -> str | None:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy.__version__
+
+
+def compare(baseline: dict, current: dict, threshold: float = 1.25) -> list[dict]:
+    """p50 ratios (current / baseline) for every (size, benchmark) in both runs."""
+    rows = []
+    for size, benches in current.get("results", {}).items():
+        old_benches = baseline.get("results", {}).get(size, {})
+        for name, stats in benches.items():
+            old = old_benches.get(name)
+            if not old or not old.get("p50_ms"):
+                continue
+            ratio = stats["p50_ms"] / old["p50_ms"]
+            rows.append({
+                "size": int(size),
+                "benchmark": name,
+                "baseline_p50_ms": old["p50_ms"],
+                "p50_ms": stats["p50_ms"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > threshold,
+            })
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="oi benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), metavar="NAME")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=10.0)
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--edge-density", type=float, default=GraphSpec.edge_density)
+    parser.add_argument("--groups", type=int, default=GraphSpec.provenance_groups)
+    parser.add_argument("--dim", type=int, default=GraphSpec.embedding_dim)
+    parser.add_argument("--topics", type=int, default=GraphSpec.topics)
+    parser.add_argument("--seed", type=int, default=GraphSpec.seed)
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    names = args.only or list(BENCHMARKS)
+    log = lambda msg: print(msg, file=sys.stderr)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": _numpy_version(),
+            "repeat": args.repeat,
+            "budget_s": args.budget,
+        },
+        "specs": {},
+        "setup": {},
+        "results": {},
+    }
+    for size in args.sizes:
+        spec = GraphSpec(
+            nodes=size, edge_density=args.edge_density, provenance_groups=args.groups,
+            embedding_dim=args.dim, topics=args.topics, seed=args.seed,
+        )
+        results, setup = run_size(spec, names, args.repeat, args.budget, not args.no_memory, log=log)
+        report["specs"][str(size)] = spec.to_dict()
+        report["setup"][str(size)] = setup
+        report["results"][str(size)] = results
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+        log(f"Results written to {args.out}")
+    else:
+        print(text)
+
+    if args.baseline:
+        rows = compare(json.loads(args.baseline.read_text(encoding="utf-8")), report, args.threshold)
+        log(f"\n{'size':>7}  {'benchmark':<26} {'base p50':>10} {'p50':>10} {'ratio':>7}")
+        for row in rows:
+            flag = "  REGRESSION" if row["regression"] else ""
+            log(f"{row['size']:>7}  {row['benchmark']:<26} {row['baseline_p50_ms']:>10.2f} "
+                f"{row['p50_ms']:>10.2f} {row['ratio']:>7.2f}{flag}")
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Deterministic synthetic knowledge graphs for the benchmark suite.
+
+generate(spec) builds a graph in the shape oi writes to knowledge.yaml —
+typed nodes with summaries, provenance URIs and supports/contradicts/
+related_to edges — plus an embeddings.json payload. The same GraphSpec
+(including seed) always yields byte-identical output, so timings from
+different commits are measured on the same data.
+
+Summaries are drawn from per-topic vocabularies so keyword search, the
+linker's Jaccard candidates and graph walks see realistic overlap; each
+node's embedding is its topic centroid plus noise, so clustering finds
+near-duplicates within a topic.
+
+stub_backends() replaces the LLM linker and the embedding model with
+deterministic local stand-ins, so benchmarks measure oi's own code.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import sys
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oi.embed import DEFAULT_EMBED_MODEL, save_embeddings
+from oi.state import _save_knowledge
+
+DEFAULT_TYPE_MIX = {"fact": 0.6, "preference": 0.1, "decision": 0.2, "principle": 0.1}
+
+_SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "ze", "pa", "qu", "di", "fo", "gu", "he", "ji"]
+
+
+@dataclass
+class GraphSpec:
+    """Shape of a synthetic graph.
+
+    edge_density is edges per node; edge_mix splits them by type.
+    provenance_groups is the number of distinct source documents/
+    conversations (nodes in one group share a provenance URI prefix).
+    topics controls keyword/embedding locality.
+    """
+
+    nodes: int = 1000
+    edge_density: float = 2.0
+    type_mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_TYPE_MIX))
+    edge_mix: dict[str, float] = field(default_factory=lambda: {
+        "related_to": 0.5, "supports": 0.35, "contradicts": 0.05, "because_of": 0.1,
+    })
+    provenance_groups: int = 100
+    embedding_dim: int = 64
+    topics: int = 50
+    words_per_summary: int = 8
+    concluded_efforts: int = 20
+    seed: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _unit(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [round(x / norm, 5) for x in vec]
+
+
+def _pick(rng: random.Random, weights: dict[str, float]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def generate(spec: GraphSpec) -> tuple[dict, dict]:
+    """(knowledge, embeddings) for spec. Deterministic in spec."""
+    rng = random.Random(spec.seed)
+    vocab = _vocabulary(rng, max(200, spec.topics * 20))
+    topic_words = [rng.sample(vocab, 20) for _ in range(spec.topics)]
+    centroids = [[rng.gauss(0, 1) for _ in range(spec.embedding_dim)] for _ in range(spec.topics)]
+
+    nodes, vectors, node_topic = [], {}, []
+    counters: dict[str, int] = {}
+    for i in range(spec.nodes):
+        node_type = _pick(rng, spec.type_mix)
+        counters[node_type] = counters.get(node_type, 0) + 1
+        node_id = f"{node_type}-{counters[node_type]:03d}"
+        topic = rng.randrange(spec.topics)
+        words = rng.sample(topic_words[topic], min(spec.words_per_summary, 20))
+        group = rng.randrange(max(spec.provenance_groups, 1))
+        created = f"2026-01-01T00:00:{i // 1000:02d}.{i % 1000:06d}"
+        nodes.append({
+            "id": node_id,
+            "type": node_type,
+            "summary": " ".join(words).capitalize(),
+            "raw_file": None,
+            "status": "active",
+            "source": "benchmark",
+            "created": created,
+            "updated": created,
+            "provenance_uri": f"doc://benchmark/source-{group:05d}.md#sec-{i}",
+        })
+        node_topic.append(topic)
+        vectors[node_id] = _unit([c + rng.gauss(0, 0.35) for c in centroids[topic]])
+
+    # Edges prefer endpoints in the same topic, like the linker produces
+    by_topic: dict[int, list[int]] = {}
+    for i, topic in enumerate(node_topic):
+        by_topic.setdefault(topic, []).append(i)
+    edges, seen = [], set()
+    target = int(spec.nodes * spec.edge_density)
+    attempts = 0
+    while len(edges) < target and attempts < target * 4 and spec.nodes > 1:
+        attempts += 1
+        a = rng.randrange(spec.nodes)
+        pool = by_topic[node_topic[a]] if rng.random() < 0.8 else range(spec.nodes)
+        b = rng.choice(pool)
+        edge_type = _pick(rng, spec.edge_mix)
+        key = (a, b, edge_type)
+        if a == b or key in seen:
+            continue
+        seen.add(key)
+        edges.append({
+            "source": nodes[a]["id"],
+            "target": nodes[b]["id"],
+            "type": edge_type,
+            "reasoning": "synthetic",
+            "created": nodes[max(a, b)]["created"],
+        })
+        if edge_type == "contradicts":
+            nodes[a]["has_contradiction"] = True
+            nodes[b]["has_contradiction"] = True
+
+    for e in range(spec.concluded_efforts):
+        nodes.append({
+            "id": f"effort-{e:03d}",
+            "type": "effort",
+            "summary": f"Concluded effort {e}: " + " ".join(rng.sample(vocab, 12)),
+            "raw_file": f"efforts/effort-{e:03d}.jsonl",
+            "status": "concluded",
+            "created": f"2025-12-01T00:00:{e:02d}",
+            "updated": f"2025-12-01T00:00:{e:02d}",
+        })
+
+    return {"nodes": nodes, "edges": edges}, {"model": DEFAULT_EMBED_MODEL, "vectors": vectors}
+
+
+def write_session(session_dir: Path, spec: GraphSpec, ambient_messages: int = 20) -> dict:
+    """Generate spec into session_dir (knowledge.yaml, embeddings.json, logs). Returns the graph."""
+    session_dir = Path(session_dir)
+    session_dir.mkdir(parents=True, exist_ok=True)
+    knowledge, embeddings = generate(spec)
+    _save_knowledge(session_dir, knowledge)
+    save_embeddings(session_dir, embeddings)
+
+    (session_dir / "efforts").mkdir(exist_ok=True)
+    for node in knowledge["nodes"]:
+        if node["type"] == "effort":
+            (session_dir / node["raw_file"]).write_text(
+                json.dumps({"role": "user", "content": node["summary"], "ts": node["created"]}) + "\n",
+                encoding="utf-8",
+            )
+    with open(session_dir / "raw.jsonl", "w", encoding="utf-8") as f:
+        for i in range(ambient_messages):
+            role = "user" if i % 2 == 0 else "assistant"
+            f.write(json.dumps({"role": role, "content": f"Ambient message {i}", "ts": "t"}) + "\n")
+    return knowledge
+
+
+def stub_embedding(text: str, model: str = None, dim: int = 64) -> list[float]:
+    """Deterministic pseudo-embedding: a unit vector seeded by the text's hash."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    return _unit([rng.gauss(0, 1) for _ in range(dim)])
+
+
+def stub_link_response(*args, **kwargs) -> str:
+    """Linker LLM stand-in: classifies every pair as unrelated."""
+    return '{"edge_type": "none", "reasoning": "benchmark stub"}'
+
+
+@contextmanager
+def stub_backends(dim: int = 64):
+    """Route LLM linking and embedding calls to deterministic local stubs."""
+    with patch("oi.linker.chat", side_effect=stub_link_response), \
+         patch("oi.embed.get_embedding", side_effect=lambda text, model=None: stub_embedding(text, model, dim)):
+        yield
@@ -0,0 +1,95 @@
+"""PDF parse benchmark — serial vs process-pool page extraction.
+
+Parses each PDF with parser._parse_pdf serially and with N workers,
+checks that both produce identical chunks, and reports pages/sec.
+
+Usage:
+    python scripts/bench_pdf_parse.py [PDF ...] [--workers N] [--pages N] [--repeat N]
+
+    PDF:        PDFs to benchmark. If omitted, a synthetic text PDF is generated.
+    --workers:  Process count for the parallel run (default: CPU count).
+    --pages:    Page count of the synthetic PDF (default: 200).
+    --repeat:   Runs per mode; the best time is reported (default: 3).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oi.parser import _parse_pdf
+from pdf_fixtures import write_text_pdf
+
+
+def write_synthetic_pdf(path: Path, pages: int, lines_per_page: int = 40) -> Path:
+    """Write a text-heavy multi-page PDF (one text line per PDF line)."""
+    return write_text_pdf(path, [
+        "\n".join(
+            f"Page {i + 1} line {line + 1}: the quick brown fox jumps over the lazy dog"
+            for line in range(lines_per_page)
+        )
+        for i in range(pages)
+    ])
+
+
+def _best_time(fn, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def bench(pdf: Path, workers: int, repeat: int) -> dict:
+    """Benchmark one PDF. Returns a dict of timings and throughput."""
+    from pypdf import PdfReader
+
+    pages = len(PdfReader(pdf).pages)
+    rel = pdf.name
+
+    t_serial, serial = _best_time(lambda: _parse_pdf(pdf, rel, 2000), repeat)
+    t_par, par = _best_time(lambda: _parse_pdf(pdf, rel, 2000, workers=workers), repeat)
+
+    identical = [c.model_dump() for c in serial.chunks] == [c.model_dump() for c in par.chunks]
+    return {
+        "pdf": str(pdf),
+        "pages": pages,
+        "workers": workers,
+        "serial_s": t_serial,
+        "parallel_s": t_par,
+        "serial_pages_per_s": pages / t_serial if t_serial else 0.0,
+        "parallel_pages_per_s": pages / t_par if t_par else 0.0,
+        "speedup": t_serial / t_par if t_par else 0.0,
+        "identical": identical,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("pdfs", nargs="*", type=Path)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--pages", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = args.pdfs or [write_synthetic_pdf(Path(tmp) / "synthetic.pdf", args.pages)]
+        print(f"{'pdf':<30} {'pages':>6} {'serial p/s':>11} {'parallel p/s':>13} {'speedup':>8}  same")
+        for pdf in pdfs:
+            r = bench(pdf, args.workers, args.repeat)
+            print(
+                f"{Path(r['pdf']).name[:30]:<30} {r['pages']:>6} "
+                f"{r['serial_pages_per_s']:>11.1f} {r['parallel_pages_per_s']:>13.1f} "
+                f"{r['speedup']:>7.2f}x  {'yes' if r['identical'] else 'NO'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
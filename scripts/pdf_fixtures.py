@@ -0,0 +1,49 @@
+"""Synthetic PDF writer shared by scripts/bench_pdf_parse.py and the parser tests.
+
+Writes real (if minimal) PDFs without a PDF library, so benchmarks and
+tests can generate inputs of any page count on the fly.
+"""
+
+from pathlib import Path
+
+
+def write_text_pdf(path: Path, page_texts: list[str]) -> Path:
+    """Write a minimal multi-page text PDF (Helvetica) with a correct xref table.
+
+    Each page shows its text, one line per newline.
+    """
+    n = len(page_texts)
+    font_obj = 3 + 2 * n
+    objs = [
+        b"<</Type/Catalog/Pages 2 0 R>>",
+        b"<</Type/Pages/Kids["
+        + b" ".join(f"{3 + 2 * i} 0 R".encode() for i in range(n))
+        + f"]/Count {n}>>".encode(),
+    ]
+    for i, text in enumerate(page_texts):
+        first, *rest = text.split("\n")
+        ops = ["BT /F1 12 Tf 14 TL 72 720 Td", f"({first}) Tj"]
+        ops += [f"({line}) '" for line in rest]
+        ops.append("ET")
+        stream = "\n".join(ops).encode()
+        objs.append(
+            f"<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]/Contents {4 + 2 * i} 0 R"
+            f"/Resources<</Font<</F1 {font_obj} 0 R>>>>>>".encode()
+        )
+        objs.append(
+            f"<</Length {len(stream)}>>stream\n".encode() + stream + b"\nendstream"
+        )
+    objs.append(b"<</Type/Font/Subtype/Type1/BaseFont/Helvetica>>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj".encode() + body + b"endobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer<</Size {len(objs) + 1}/Root 1 0 R>>\nstartxref\n{xref}\n%%EOF".encode()
+    path.write_bytes(bytes(out))
+    return path
@@ -0,0 +1,176 @@
+"""Background job runner for long-running MCP tools (ingestion).
+
+The MCP server talks stdio from a single loop, so a multi-minute ingest
+run inside a tool call blocks every other call and times clients out.
+BackgroundJobs runs such work on worker threads instead: submit() returns
+a job record straight away, status() reports the stage progress fed in
+through the work's progress_fn(stage, detail) callback, and cancel()
+stops a job at its next progress callback.
+
+Jobs for the same session dir run one at a time on that session's worker
+thread, so two ingests never interleave their knowledge-graph writes.
+Jobs for different session dirs run in parallel.
+
+A cancelled ingest leaves its ingest_jobs.json record incomplete, so it
+can be finished later with resume_ingest_job().
+
+Job records live in memory for the lifetime of the process.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Callable
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (DONE, FAILED, CANCELLED)
+
+HISTORY_LIMIT = 50
+
+
+class JobCancelled(BaseException):
+    """Raised inside a job's progress callback once cancel() was requested.
+
+    A BaseException (like KeyboardInterrupt), so the pipelines' best-effort
+    `except Exception` blocks don't swallow it.
+    """
+
+
+class BackgroundJobs:
+    """Per-session serial job queues on daemon worker threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._jobs: dict[str, dict] = {}
+        self._work: dict[str, Callable] = {}
+        self._cancel: dict[str, threading.Event] = {}
+        self._queues: dict[str, queue.Queue] = {}
+
+    # --- Submission ---
+
+    def submit(
+        self,
+        kind: str,
+        label: str,
+        work: Callable[[Callable[[str, str], None]], str],
+        session_key: str = "",
+    ) -> dict:
+        """Queue work(progress_fn) -> result text. Returns a copy of the job record."""
+        with self.lock:
+            job_id = f"job-{len(self._jobs) + 1:03d}"
+            job = {
+                "id": job_id,
+                "kind": kind,
+                "label": label,
+                "session": session_key,
+                "status": QUEUED,
+                "stage": "",
+                "detail": "",
+                "history": [],
+                "created": datetime.now().isoformat(),
+                "started": None,
+                "finished": None,
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job_id] = job
+            self._work[job_id] = work
+            self._cancel[job_id] = threading.Event()
+            q = self._queues.get(session_key)
+            if q is None:
+                q = self._queues[session_key] = queue.Queue()
+                threading.Thread(
+                    target=self._worker, args=(q,), name=f"oi-jobs-{len(self._queues)}", daemon=True,
+                ).start()
+            q.put(job_id)
+            return dict(job)
+
+    def _worker(self, q: queue.Queue) -> None:
+        while True:
+            self._run(q.get())
+
+    def _run(self, job_id: str) -> None:
+        with self.lock:
+            job = self._jobs[job_id]
+            work = self._work.pop(job_id)
+            if self._cancel[job_id].is_set():
+                return  # cancelled while queued
+            job["status"] = RUNNING
+            job["started"] = datetime.now().isoformat()
+        t0 = time.perf_counter()
+
+        def progress(stage: str, detail: str = "") -> None:
+            with self.lock:
+                job["stage"], job["detail"] = stage, detail
+                job["history"].append([round(time.perf_counter() - t0, 3), stage, detail])
+                del job["history"][:-HISTORY_LIMIT]
+            if self._cancel[job_id].is_set():
+                raise JobCancelled(job_id)
+
+        try:
+            result = work(progress)
+            status, error = DONE, None
+        except JobCancelled:
+            result, status, error = None, CANCELLED, None
+        except Exception as exc:
+            result, status = None, FAILED
+            error = f"{type(exc).__name__}: {exc}"
+            traceback.print_exc()  # stderr — stdout is the MCP transport
+        with self.lock:
+            job["status"] = status
+            job["result"] = result
+            job["error"] = error
+            job["finished"] = datetime.now().isoformat()
+            job["elapsed_s"] = round(time.perf_counter() - t0, 3)
+
+    # --- Queries ---
+
+    def status(self, job_id: str) -> dict | None:
+        """Copy of a job record, or None."""
+        with self.lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot["history"] = [list(h) for h in job["history"]]
+            return snapshot
+
+    def jobs(self) -> list[dict]:
+        """Copies of every job record, oldest first."""
+        with self.lock:
+            ids = list(self._jobs)
+        return [self.status(job_id) for job_id in ids]
+
+    def cancel(self, job_id: str) -> dict | None:
+        """Request cancellation. Queued jobs never start; running jobs stop
+        at their next progress callback. Returns the job record, or None."""
+        with self.lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] not in FINISHED:
+                self._cancel[job_id].set()
+                if job["status"] == QUEUED:
+                    job["status"] = CANCELLED
+                    job["finished"] = datetime.now().isoformat()
+        return self.status(job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None, poll: float = 0.01) -> dict | None:
+        """Block until a job finishes (or timeout). Returns its record."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if job is None or job["status"] in FINISHED:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(poll)
@@ -114,12 +114,21 @@ def parse_chatgpt_conversation(conv: dict, source_id: str) -> ParsedDocument:
         except (ValueError, TypeError, OSError):
             pass
 
+    # Bumped by ChatGPT on every edit/continuation — used for change detection
+    update_time = None
+    if conv.get("update_time") is not None:
+        try:
+            update_time = float(conv["update_time"])
+        except (ValueError, TypeError):
+            pass
+
     metadata = DocumentMetadata(
         title=title,
         format="chatgpt",
         source_path=conv_id,
         provenance_uri=provenance_uri,
         date=conv_date,
+        update_time=update_time,
     )
 
     messages = _linearize_conversation(mapping, current_node)
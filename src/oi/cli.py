@@ -14,7 +14,8 @@ load_dotenv()
 
 import click
 
-from .orchestrator import process_turn
+from . import maintenance, tracing
+from .orchestrator import process_turn_stream
 from .state import _load_efforts, increment_session_count
 from .session_log import create_session_log
 
@@ -50,11 +51,46 @@ def _show_startup(session_dir: Path):
     click.echo()
 
 
-@click.command()
+def _render_turn(events) -> str:
+    """Print process_turn_stream events as they arrive. Returns the final response."""
+    mid_line = False  # streamed text not yet ended with a newline
+    printed = False
+    gap = False  # blank line owed between a banner and following text
+    for kind, text in events:
+        if kind == "done":
+            if mid_line:
+                click.echo()
+            return text
+        if mid_line and kind in ("reset", "banner"):
+            click.echo()
+            mid_line = False
+        if kind == "banner":
+            if printed:
+                click.echo()
+            click.echo(text)
+            printed = gap = True
+        elif kind == "text" and text:
+            if gap:
+                click.echo()
+                gap = False
+            click.echo(text, nl=False)
+            mid_line = not text.endswith("\n")
+            printed = True
+    return ""
+
+
+@click.group(invoke_without_command=True)
 @click.option("--data-dir", default=None, help="Data directory (default: ~/.oi/)")
-def main(data_dir: str | None) -> None:
+@click.option("--trace", is_flag=True, help="Record timing spans to <data-dir>/trace.json (see `oi trace`)")
+@click.pass_context
+def main(ctx: click.Context, data_dir: str | None, trace: bool) -> None:
     """Open Intelligence - Effort-based context management."""
     session_path = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+    ctx.obj = {"session_path": session_path}
+    if trace:
+        tracing.enable()
+    if ctx.invoked_subcommand is not None:
+        return
 
     session_path.mkdir(parents=True, exist_ok=True)
 
@@ -91,13 +127,114 @@ def main(data_dir: str | None) -> None:
             break
 
         try:
-            response = process_turn(session_path, user_input, confirmation_callback=_confirm_action, session_id=session_id)
             click.echo()
-            click.echo(response)
+            _render_turn(process_turn_stream(session_path, user_input, confirmation_callback=_confirm_action,
+                                             session_id=session_id, defer_maintenance=True))
             click.echo()
         except Exception as e:
             click.echo(f"Error: {e}")
 
+    # Let the last turn's deferred maintenance finish before exiting
+    notices = maintenance.wait(session_path)
+    if notices:
+        click.echo("\n".join(notices))
+
+
+
+@main.command()
+@click.argument("job_id", required=False)
+@click.pass_context
+def resume(ctx: click.Context, job_id: str | None) -> None:
+    """Finish an interrupted ingest job (default: oldest incomplete)."""
+    from .ingest import format_pipeline_result, resume_ingest_job
+    from .ingest_jobs import incomplete_jobs
+
+    session_path = ctx.obj["session_path"]
+    if not job_id:
+        pending = incomplete_jobs(session_path)
+        if not pending:
+            click.echo("No incomplete ingest jobs.")
+            return
+        for job in pending:
+            click.echo(f"  {job['id']} ({job['kind']}) — {len(job['node_ids'])} nodes written")
+
+    result = resume_ingest_job(
+        session_path,
+        job_id=job_id,
+        progress_fn=lambda stage, detail: click.echo(f"[{stage}] {detail}"),
+    )
+    click.echo(format_pipeline_result(result))
+
+
+@main.command()
+@click.option("--limit", default=25, show_default=True, type=int, help="Rows to show")
+@click.option("--clear", is_flag=True, help="Delete the trace file")
+@click.pass_context
+def trace(ctx: click.Context, limit: int, clear: bool) -> None:
+    """Summarize the session's trace: where turn time goes, by span."""
+    path = ctx.obj["session_path"] / tracing.TRACE_FILE
+    if clear:
+        path.unlink(missing_ok=True)
+        click.echo(f"Removed {path}")
+        return
+    rows = tracing.summarize(tracing.read_trace(path))
+    if not rows:
+        click.echo(f"No spans in {path}. Record some with `oi --trace` or OI_TRACE=1.")
+        return
+    turns = next((r["count"] for r in rows if r["name"] == "turn"), 0)
+    click.echo(f"{path} — {turns} turns\n")
+    click.echo(f"{'span':<32} {'count':>6} {'total ms':>10} {'self ms':>10} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for r in rows[:limit]:
+        click.echo(f"{r['name'][:32]:<32} {r['count']:>6} {r['total_ms']:>10.1f} {r['self_ms']:>10.1f} "
+                   f"{r['mean_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['max_ms']:>9.2f}")
+    if len(rows) > limit:
+        click.echo(f"... {len(rows) - limit} more (--limit)")
+
+
+@main.command("llm-log")
+@click.option("--phase", default=None, help="Only entries from this phase (extract, link_batch, ...)")
+@click.option("--last", "last", default=None, type=int, help="Only the last N entries")
+@click.option("--no-rotated", is_flag=True, help="Skip rotated (archived) logs")
+@click.pass_context
+def llm_log(ctx: click.Context, phase: str | None, last: int | None, no_rotated: bool) -> None:
+    """Print the LLM audit log as JSONL, with full prompts."""
+    from collections import deque
+    from .llm_log import read_llm_log
+
+    entries = (e for e in read_llm_log(ctx.obj["session_path"], include_rotated=not no_rotated)
+               if phase is None or e.get("phase") == phase)
+    if last is not None:
+        entries = deque(entries, maxlen=last)
+    for entry in entries:
+        click.echo(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+@main.command()
+@click.option("--root", default=None, help="Directory holding one session dir per tenant (default: <data-dir>/tenants)")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8765, show_default=True, type=int)
+@click.option("--socket", "socket_path", default=None, help="Serve on this Unix socket instead of TCP")
+@click.option("--max-tenants", default=16, show_default=True, type=int,
+              help="Tenants whose graphs stay warm in memory (LRU)")
+@click.pass_context
+def serve(ctx: click.Context, root: str | None, host: str, port: int,
+          socket_path: str | None, max_tenants: int) -> None:
+    """Serve the knowledge tools for many session dirs from one process."""
+    try:
+        from .server import serve as run_server
+    except ImportError as e:
+        if (e.name or "").split(".")[0] != "mcp":
+            raise
+        raise click.ClickException("oi serve needs the MCP extra: pip install 'oi[mcp]'") from e
+
+    root_path = Path(root) if root else ctx.obj["session_path"] / "tenants"
+    root_path.mkdir(parents=True, exist_ok=True)
+    where = f"unix:{socket_path}" if socket_path else f"http://{host}:{port}"
+    click.echo(f"Serving tenants under {root_path} on {where} (max {max_tenants} warm)")
+    run_server(root_path, host=host, port=port,
+               socket_path=Path(socket_path) if socket_path else None,
+               max_tenants=max_tenants)
+
 
 if __name__ == "__main__":
     main()
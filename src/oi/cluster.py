@@ -7,67 +7,200 @@ then synthesizes canonical concept (principle) nodes from clusters.
 from __future__ import annotations
 
 import json
+import math
+import operator
 import sys
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # optional: pip install 'oi[fast]'
+    np = None
+
 from .embed import load_embeddings, cosine_similarity
+from .locking import atomic_write_text, session_lock
 from .llm import chat, DEFAULT_MODEL
 
 
+# Similarities within this margin of the threshold are re-checked with
+# embed.cosine_similarity so the vectorized path makes exactly the same
+# keep/drop decisions as the pairwise reference.
+_EXACT_MARGIN = 1e-9
+
+
+def _normalize(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vec))
+    return [x / norm for x in vec] if norm else [0.0] * len(vec)
+
+
+def _neighbours_python(
+    vecs: list[list[float]],
+    threshold: float,
+    exact,
+) -> list[list[int]]:
+    """Upper-triangle threshold neighbours, pure Python on normalized rows."""
+    unit = [_normalize(v) for v in vecs]
+    n = len(unit)
+    neighbours: list[list[int]] = [[] for _ in range(n)]
+    hi = threshold + _EXACT_MARGIN
+    lo = threshold - _EXACT_MARGIN
+    for i in range(n):
+        ui = unit[i]
+        row = neighbours[i]
+        for j in range(i + 1, n):
+            sim = sum(map(operator.mul, ui, unit[j]))
+            if sim >= hi or (sim > lo and exact(i, j)):
+                row.append(j)
+    return neighbours
+
+
+def _neighbours_numpy(
+    vecs: list[list[float]],
+    threshold: float,
+    exact,
+    block_size: int,
+) -> list[list[int]]:
+    """Upper-triangle threshold neighbours via blocked matrix products.
+
+    The matrix is normalized once; each block of rows is multiplied against
+    the rows at or after it, so peak memory is block_size × n similarities.
+    """
+    mat = np.asarray(vecs, dtype=np.float64)
+    norms = np.linalg.norm(mat, axis=1)
+    norms[norms == 0] = 1.0  # zero vectors stay zero → similarity 0
+    mat /= norms[:, None]
+
+    n = len(vecs)
+    neighbours: list[list[int]] = [[] for _ in range(n)]
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        sims = mat[start:stop] @ mat[start:].T
+        # Keep strictly-upper entries only (column index > row index)
+        sims[np.tril_indices(stop - start, 0, sims.shape[1])] = -np.inf
+        sure = sims >= threshold + _EXACT_MARGIN
+        maybe = (sims > threshold - _EXACT_MARGIN) & ~sure
+        for r, c in zip(*np.nonzero(maybe)):
+            if exact(start + r, start + c):
+                sure[r, c] = True
+        for r in range(stop - start):
+            row = np.flatnonzero(sure[r])
+            if row.size:
+                neighbours[start + r] = (row + start).tolist()
+    return neighbours
+
+
+def _greedy_clusters(n: int, neighbours: list[list[int]]) -> list[list[int]]:
+    """Seed-order greedy: each unassigned node claims its unassigned neighbours."""
+    assigned = [False] * n
+    clusters = []
+    for i in range(n):
+        if assigned[i]:
+            continue
+        assigned[i] = True
+        cluster = [i]
+        for j in neighbours[i]:
+            if not assigned[j]:
+                assigned[j] = True
+                cluster.append(j)
+        clusters.append(cluster)
+    return clusters
+
+
+def _union_find_clusters(n: int, neighbours: list[list[int]]) -> list[list[int]]:
+    """Connected components of the threshold graph (transitive clustering)."""
+    parent = list(range(n))
+
+    def _find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, row in enumerate(neighbours):
+        for j in row:
+            ri, rj = _find(i), _find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(n):
+        groups.setdefault(_find(i), []).append(i)
+    return list(groups.values())
+
+
+def _candidate_vectors(session_dir: Path, knowledge: dict) -> dict[str, list[float]]:
+    """Embeddings of active fact nodes, in embeddings-file order."""
+    emb_data = load_embeddings(session_dir)
+    vectors = emb_data.get("vectors", {})
+
+    # Filter to active fact nodes that have embeddings
+    active_facts = {
+        n["id"] for n in knowledge.get("nodes", [])
+        if n.get("status") == "active" and n.get("type") == "fact"
+    }
+    return {nid: vec for nid, vec in vectors.items() if nid in active_facts}
+
+
 def find_clusters(
     session_dir: Path,
     knowledge: dict,
     threshold: float = 0.90,
+    method: str = "greedy",
+    block_size: int = 1024,
 ) -> list[list[str]]:
     """Find clusters of semantically similar fact nodes via embedding similarity.
 
+    Similarities are computed on a normalized embedding matrix in row blocks
+    (numpy when installed, pure Python otherwise), then grouped.
+
     Args:
         session_dir: Path to session directory (for loading embeddings).
         knowledge: Knowledge graph dict with 'nodes' and 'edges'.
         threshold: Cosine similarity threshold for clustering (default 0.90).
+        method: "greedy" — each node, in order, claims every still-unassigned
+                node within threshold of it (the original semantics);
+                "union_find" — connected components of the threshold graph.
+        block_size: Rows per similarity block (bounds memory to block_size × n).
 
     Returns:
         List of clusters (each cluster = list of node IDs), sorted by size descending.
         Only clusters with >= 2 members are returned.
         Only 'fact' nodes are clustered.
     """
-    emb_data = load_embeddings(session_dir)
-    vectors = emb_data.get("vectors", {})
+    if method not in ("greedy", "union_find"):
+        raise ValueError(f"Unknown clustering method: {method}")
 
-    # Filter to active fact nodes that have embeddings
-    active_facts = {
-        n["id"] for n in knowledge.get("nodes", [])
-        if n.get("status") == "active" and n.get("type") == "fact"
-    }
-    candidates = {nid: vec for nid, vec in vectors.items() if nid in active_facts}
+    candidates = _candidate_vectors(session_dir, knowledge)
 
     if len(candidates) < 2:
         return []
 
-    # Greedy clustering: assign each unassigned node to the first cluster it fits
     node_ids = list(candidates.keys())
-    assigned: set[str] = set()
-    clusters: list[list[str]] = []
-
-    for i, nid in enumerate(node_ids):
-        if nid in assigned:
-            continue
-
-        cluster = [nid]
-        assigned.add(nid)
+    vecs = [candidates[nid] for nid in node_ids]
+
+    def _exact(i: int, j: int) -> bool:
+        return cosine_similarity(vecs[i], vecs[j]) >= threshold
+
+    dims = {len(v) for v in vecs}
+    if threshold <= 0 or len(dims) != 1 or 0 in dims:
+        # Mixed dimensions (cosine_similarity → 0) or a threshold that admits
+        # zero similarity: no matrix form, compare pairwise.
+        neighbours = [
+            [j for j in range(i + 1, len(vecs)) if _exact(i, j)]
+            for i in range(len(vecs))
+        ]
+    elif np is not None:
+        neighbours = _neighbours_numpy(vecs, threshold, _exact, block_size)
+    else:
+        neighbours = _neighbours_python(vecs, threshold, _exact)
 
-        for j in range(i + 1, len(node_ids)):
-            other = node_ids[j]
-            if other in assigned:
-                continue
-            sim = cosine_similarity(candidates[nid], candidates[other])
-            if sim >= threshold:
-                cluster.append(other)
-                assigned.add(other)
+    if method == "greedy":
+        groups = _greedy_clusters(len(node_ids), neighbours)
+    else:
+        groups = _union_find_clusters(len(node_ids), neighbours)
 
-        if len(cluster) >= 2:
-            clusters.append(cluster)
+    clusters = [[node_ids[i] for i in g] for g in groups if len(g) >= 2]
 
     # Sort by size descending
     clusters.sort(key=len, reverse=True)
@@ -79,17 +212,61 @@ def _sanitize_llm_output(text: str) -> str:
     return text.replace("\x00", "").strip()
 
 
+# Circuit breaker needs this many finished calls before judging the error rate
+# (same as the old 5-consecutive-errors abort for a run that fails outright).
+BREAKER_MIN_CALLS = 5
+
+
+def _synthesis_messages(cluster: list[str], nodes_by_id: dict) -> list[dict] | None:
+    """Build the synthesis prompt, or None if fewer than 2 members are known."""
+    summaries = []
+    for nid in cluster:
+        node = nodes_by_id.get(nid)
+        if node:
+            summaries.append(f"- [{nid}]: {node.get('summary', '')}")
+
+    if len(summaries) < 2:
+        return None
+
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You synthesize a single canonical concept statement from "
+                "related claims. Respond with ONLY the concept statement "
+                "(one sentence, no explanation)."
+            ),
+        },
+        {
+            "role": "user",
+            "content": (
+                f"These {len(summaries)} claims express the same or very similar idea. "
+                f"Synthesize a single canonical concept statement:\n\n"
+                + "\n".join(summaries)
+            ),
+        },
+    ]
+
+
 def synthesize_concepts(
     clusters: list[list[str]],
     session_dir: Path,
     knowledge: dict,
     model: str = None,
     progress_fn=None,
+    previous_concepts: list[str | None] | None = None,
+    workers: int = 4,
+    max_error_rate: float = 0.5,
 ) -> list[dict]:
     """Synthesize principle nodes from clusters of similar fact nodes.
 
-    For each cluster, calls the LLM to produce a canonical concept statement,
-    then batch-writes all nodes and exemplifies edges in a single YAML save.
+    For each cluster, calls the LLM to produce a canonical concept statement
+    (up to `workers` calls concurrently), then batch-writes all nodes and
+    exemplifies edges in a single YAML save, in cluster order.
+
+    Circuit breaker: once at least BREAKER_MIN_CALLS calls have finished and
+    the share that failed (exception or empty reply) reaches max_error_rate,
+    no further calls are started; clusters already synthesized are written.
 
     Args:
         clusters: List of clusters from find_clusters().
@@ -97,124 +274,327 @@ def synthesize_concepts(
         knowledge: Knowledge graph dict.
         model: LLM model for synthesis. Uses default if None.
         progress_fn: Optional callback(current, total, concept_summary).
+        previous_concepts: Optional principle ID per cluster (None = new
+            cluster). A re-synthesized cluster's new principle supersedes it.
+        workers: Maximum concurrent LLM calls (1 = serial).
+        max_error_rate: Failure share that trips the circuit breaker.
 
     Returns:
-        List of {concept_node_id, member_ids, summary} dicts.
+        List of {concept_node_id, member_ids, summary, cluster_index} dicts.
     """
-    from .state import _load_knowledge, _save_knowledge
+    import contextvars
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    from .state import update_knowledge
 
     nodes_by_id = {n["id"]: n for n in knowledge.get("nodes", [])}
-    results = []
     total = len(clusters)
-    consecutive_errors = 0
-
-    # Phase 1: LLM calls (fast, streaming progress)
-    for idx, cluster in enumerate(clusters):
-        summaries = []
-        for nid in cluster:
-            node = nodes_by_id.get(nid)
-            if node:
-                summaries.append(f"- [{nid}]: {node.get('summary', '')}")
-
-        if len(summaries) < 2:
-            continue
-
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "You synthesize a single canonical concept statement from "
-                    "related claims. Respond with ONLY the concept statement "
-                    "(one sentence, no explanation)."
-                ),
-            },
-            {
-                "role": "user",
-                "content": (
-                    f"These {len(summaries)} claims express the same or very similar idea. "
-                    f"Synthesize a single canonical concept statement:\n\n"
-                    + "\n".join(summaries)
-                ),
-            },
-        ]
-
-        try:
-            raw = chat(
-                messages,
-                model=model or DEFAULT_MODEL,
-                phase="synthesize",
-                log_meta={"cluster_size": len(cluster)},
-            )
-            concept_summary = _sanitize_llm_output(raw)
-        except Exception as e:
-            consecutive_errors += 1
-            if progress_fn:
-                progress_fn(idx + 1, total, f"ERROR: {e}")
-            else:
-                print(f"  [{idx+1}/{total}] ERROR: {e}", file=sys.stderr, flush=True)
-            if consecutive_errors >= 5:
-                if progress_fn:
-                    progress_fn(idx + 1, total, "ABORT: 5 consecutive errors")
-                else:
-                    print(f"  ABORT: {consecutive_errors} consecutive errors", file=sys.stderr, flush=True)
-                break
-            continue
-
-        if not concept_summary:
-            consecutive_errors += 1
-            continue
-
-        consecutive_errors = 0
-
-        results.append({
-            "member_ids": cluster,
-            "summary": concept_summary,
-        })
 
+    def _report(done: int, text: str, error: bool = False) -> None:
         if progress_fn:
-            progress_fn(idx + 1, total, concept_summary[:60])
+            progress_fn(done, total, text)
         else:
-            print(f"  [{idx+1}/{total}] ({len(cluster)} members): {concept_summary[:60]}", flush=True)
+            print(f"  [{done}/{total}] {text}", file=sys.stderr if error else sys.stdout, flush=True)
+
+    # Phase 1: LLM calls on a bounded pool. At most `workers` calls are in
+    # flight; the breaker stops submitting once the error rate is too high.
+    jobs = [
+        (idx, cluster, messages)
+        for idx, cluster in enumerate(clusters)
+        if (messages := _synthesis_messages(cluster, nodes_by_id)) is not None
+    ]
+    summaries_by_idx: dict[int, str] = {}
+    calls = errors = done = 0
+    tripped = False
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        queue = iter(jobs)
+        in_flight: dict = {}
+
+        def _submit_next() -> None:
+            job = next(queue, None)
+            if job is not None:
+                idx, cluster, messages = job
+                # Run in a copy of this context so the call counts towards
+                # the caller's metrics.collect() (e.g. PipelineResult.llm)
+                fut = pool.submit(
+                    contextvars.copy_context().run, chat, messages,
+                    model=model or DEFAULT_MODEL,
+                    phase="synthesize",
+                    log_meta={"cluster_size": len(cluster)},
+                )
+                in_flight[fut] = (idx, cluster)
+
+        for _ in range(max(1, workers)):
+            _submit_next()
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                idx, cluster = in_flight.pop(fut)
+                calls += 1
+                done += 1
+                try:
+                    concept_summary = _sanitize_llm_output(fut.result())
+                except Exception as e:
+                    errors += 1
+                    _report(done, f"ERROR: {e}", error=True)
+                    concept_summary = None
+
+                if concept_summary == "":
+                    errors += 1
+                elif concept_summary:
+                    summaries_by_idx[idx] = concept_summary
+                    _report(done, concept_summary[:60] if progress_fn
+                            else f"({len(cluster)} members): {concept_summary[:60]}")
+
+                if not tripped and calls >= BREAKER_MIN_CALLS and errors / calls >= max_error_rate:
+                    tripped = True
+                    _report(done, f"ABORT: {errors}/{calls} synthesis calls failed", error=True)
+                if not tripped:
+                    _submit_next()
+
+    # Deterministic order: batch write follows cluster order, not completion
+    # order, so principle IDs are stable across runs.
+    results = [
+        {"member_ids": clusters[idx], "summary": summaries_by_idx[idx], "cluster_index": idx}
+        for idx in sorted(summaries_by_idx)
+    ]
 
     # Phase 2: Single batch write (one YAML load/save)
     if results:
         if not progress_fn:
             print(f"  Writing {len(results)} principle nodes...", flush=True)
 
-        kg = _load_knowledge(session_dir)
-        now = datetime.now().isoformat()
-
-        # Count existing principle nodes for ID generation
-        existing_count = sum(1 for n in kg["nodes"] if n["id"].startswith("principle-"))
-
-        for i, item in enumerate(results):
-            concept_id = f"principle-{existing_count + i + 1:03d}"
-            item["concept_node_id"] = concept_id
-
-            kg["nodes"].append({
-                "id": concept_id,
-                "type": "principle",
-                "summary": item["summary"],
-                "raw_file": None,
-                "status": "active",
-                "source": "cluster-synthesis",
-                "instance_count": len(item["member_ids"]),
-                "created": now,
-                "updated": now,
-            })
-
-            for member_id in item["member_ids"]:
-                kg["edges"].append({
-                    "source": member_id,
-                    "target": concept_id,
-                    "type": "exemplifies",
-                    "reasoning": "Cluster member (similarity >= threshold)",
+        # Applied to the current graph (re-run if another writer got in first)
+        def apply(kg: dict):
+            now = datetime.now().isoformat()
+
+            # Count existing principle nodes for ID generation
+            existing_count = sum(1 for n in kg["nodes"] if n["id"].startswith("principle-"))
+
+            for i, item in enumerate(results):
+                concept_id = f"principle-{existing_count + i + 1:03d}"
+                item["concept_node_id"] = concept_id
+
+                kg["nodes"].append({
+                    "id": concept_id,
+                    "type": "principle",
+                    "summary": item["summary"],
+                    "raw_file": None,
+                    "status": "active",
+                    "source": "cluster-synthesis",
+                    "instance_count": len(item["member_ids"]),
                     "created": now,
+                    "updated": now,
                 })
 
-        _save_knowledge(session_dir, kg)
+                for member_id in item["member_ids"]:
+                    kg["edges"].append({
+                        "source": member_id,
+                        "target": concept_id,
+                        "type": "exemplifies",
+                        "reasoning": "Cluster member (similarity >= threshold)",
+                        "created": now,
+                    })
+
+                old_id = previous_concepts[item["cluster_index"]] if previous_concepts else None
+                if old_id:
+                    for n in kg["nodes"]:
+                        if n["id"] == old_id and n.get("status") != "superseded":
+                            n["status"] = "superseded"
+                            n["superseded_by"] = concept_id
+                            n["updated"] = now
+                            kg["edges"].append({
+                                "source": concept_id,
+                                "target": old_id,
+                                "type": "supersedes",
+                                "reasoning": "Cluster membership changed",
+                                "created": now,
+                            })
+                            break
+
+            return None, True
+
+        update_knowledge(session_dir, apply)
 
         if not progress_fn:
             print(f"  Done.", flush=True)
 
     return results
+
+
+# === Incremental cluster maintenance ===
+
+CLUSTERS_FILE = "clusters.json"
+
+
+def load_cluster_state(session_dir: Path) -> dict | None:
+    """Load persisted cluster membership, or None if never built."""
+    path = session_dir / CLUSTERS_FILE
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
+
+
+def save_cluster_state(session_dir: Path, state: dict) -> None:
+    """Write persisted cluster membership (atomically; callers hold session_lock)."""
+    atomic_write_text(session_dir / CLUSTERS_FILE, json.dumps(state, indent=1))
+
+
+def _existing_principles(knowledge: dict) -> dict[str, set[str]]:
+    """Active cluster-synthesis principles → the fact IDs exemplifying them."""
+    principles = {
+        n["id"] for n in knowledge.get("nodes", [])
+        if n.get("type") == "principle" and n.get("source") == "cluster-synthesis"
+        and n.get("status") == "active"
+    }
+    members: dict[str, set[str]] = {pid: set() for pid in principles}
+    for e in knowledge.get("edges", []):
+        if e.get("type") == "exemplifies" and e.get("target") in members:
+            members[e["target"]].add(e["source"])
+    return members
+
+
+def _bootstrap_cluster_state(
+    session_dir: Path, knowledge: dict, candidates: dict, threshold: float,
+) -> dict:
+    """Full find_clusters pass, adopting principles that already cover a cluster."""
+    principles = _existing_principles(knowledge)
+    clusters = {}
+    for i, members in enumerate(find_clusters(session_dir, knowledge, threshold=threshold)):
+        concept_id, synthesized = None, []
+        best = max(principles.items(), key=lambda kv: len(kv[1] & set(members)), default=None)
+        if best and best[1] & set(members):
+            concept_id = best[0]
+            synthesized = [m for m in members if m in best[1]]
+            if len(synthesized) == len(members):
+                synthesized = list(members)
+            principles.pop(best[0])
+        clusters[f"cluster-{i + 1:03d}"] = {
+            "members": list(members),
+            "concept_id": concept_id,
+            "synthesized": synthesized,
+        }
+    return {"threshold": threshold, "seen": list(candidates), "clusters": clusters}
+
+
+def _nearest(units: list[list[float]], mat, p: int) -> int:
+    """Index (< p) of the normalized row most similar to row p."""
+    if mat is not None:
+        return int(np.argmax(mat[:p] @ mat[p]))
+    vec = units[p]
+    best_i, best = 0, -2.0
+    for i in range(p):
+        sim = sum(map(operator.mul, vec, units[i]))
+        if sim > best:
+            best_i, best = i, sim
+    return best_i
+
+
+def update_clusters(
+    session_dir: Path,
+    knowledge: dict,
+    threshold: float = 0.90,
+) -> tuple[dict, list[str]]:
+    """Incrementally maintain persisted cluster membership.
+
+    Only fact nodes not seen on a previous run are placed: each joins the
+    cluster of its nearest neighbour (or forms a new cluster with it) when
+    that neighbour is within threshold. Inactive members are dropped. The
+    first run, or a threshold change, rebuilds from a full find_clusters.
+
+    Returns (state, changed cluster IDs) — clusters with >= 2 members whose
+    membership differs from what was last synthesized. The caller saves the
+    state under session_lock (see maintain_clusters).
+    """
+    candidates = _candidate_vectors(session_dir, knowledge)
+    state = load_cluster_state(session_dir)
+
+    if state is None or state.get("threshold") != threshold:
+        state = _bootstrap_cluster_state(session_dir, knowledge, candidates, threshold)
+    else:
+        clusters = state["clusters"]
+        for c in clusters.values():
+            c["members"] = [m for m in c["members"] if m in candidates]
+        member_of = {m: cid for cid, c in clusters.items() for m in c["members"]}
+
+        seen = [nid for nid in state.get("seen", []) if nid in candidates]
+        seen_set = set(seen)
+        # Seen nodes first, then new ones: new node p is compared with rows < p
+        order = seen + [nid for nid in candidates if nid not in seen_set]
+        units = [_normalize(candidates[nid]) for nid in order]
+        mat = None
+        if np is not None and units and len({len(u) for u in units}) == 1:
+            mat = np.asarray(units, dtype=np.float64)
+
+        for p in range(max(len(seen), 1), len(order)):
+            nid = order[p]
+            nn = order[_nearest(units, mat, p)]
+            if cosine_similarity(candidates[nid], candidates[nn]) < threshold:
+                continue
+            cid = member_of.get(nn)
+            if cid is None:
+                cid = f"cluster-{len(clusters) + 1:03d}"
+                clusters[cid] = {"members": [nn], "concept_id": None, "synthesized": []}
+                member_of[nn] = cid
+            clusters[cid]["members"].append(nid)
+            member_of[nid] = cid
+        state["seen"] = order
+
+    changed = [
+        cid for cid, c in state["clusters"].items()
+        if len(c["members"]) >= 2 and c["members"] != c.get("synthesized")
+    ]
+    return state, changed
+
+
+def maintain_clusters(
+    session_dir: Path,
+    knowledge: dict,
+    threshold: float = 0.90,
+    model: str = None,
+    progress_fn=None,
+) -> dict:
+    """Update cluster membership and re-synthesize only changed clusters.
+
+    A cluster that already has a principle gets a new one superseding it.
+    Clusters whose synthesis failed stay marked changed for the next run.
+
+    Returns {clusters_total, clusters_changed, concepts} where concepts is
+    the synthesize_concepts() result list.
+
+    Membership is updated and saved in one step under session_lock;
+    synthesis runs outside it and its results are recorded on a fresh read
+    of the state, so concurrent ingest jobs don't overwrite each other.
+    """
+    with session_lock(session_dir):
+        state, changed = update_clusters(session_dir, knowledge, threshold=threshold)
+        save_cluster_state(session_dir, state)
+    clusters = state["clusters"]
+
+    concepts: list[dict] = []
+    if changed:
+        concepts = synthesize_concepts(
+            [clusters[cid]["members"] for cid in changed],
+            session_dir, knowledge, model=model, progress_fn=progress_fn,
+            previous_concepts=[clusters[cid]["concept_id"] for cid in changed],
+        )
+    if concepts:
+        with session_lock(session_dir):
+            current = load_cluster_state(session_dir) or state
+            for item in concepts:
+                c = current["clusters"].get(changed[item["cluster_index"]])
+                if c is not None:
+                    c["concept_id"] = item["concept_node_id"]
+                    c["synthesized"] = list(item["member_ids"])
+            save_cluster_state(session_dir, current)
+        clusters = current["clusters"]
+
+    return {
+        "clusters_total": sum(1 for c in clusters.values() if len(c["members"]) >= 2),
+        "clusters_changed": len(changed),
+        "concepts": concepts,
+    }
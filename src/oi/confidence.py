@@ -28,6 +28,7 @@ independent_sources: unique `source` values across the node + its inbound suppor
 import time
 
 from .schemas import get_logical_edge_types
+from . import tracing
 
 
 # --- Topology-based edge weight ---
@@ -93,6 +94,7 @@ def _compute_edge_weight(
     return dissimilarity * source_factor
 
 
+@tracing.traced("confidence.compute_all", cat="compute")
 def compute_all_confidences(
     graph: dict,
     depth: int | None = None,
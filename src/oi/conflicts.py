@@ -1,8 +1,9 @@
 """Conflict resolution: analyze contradictions, classify severity, resolve.
 
-Three public functions:
+Public functions:
 - generate_conflict_report: scan graph for contradictions, classify by priority
 - resolve_conflict: supersede the loser, clean up edges/flags
+- resolve_conflicts: apply many resolutions in memory, write once
 - auto_resolve: batch-resolve all auto_resolvable conflicts
 
 Priority classification uses topology (support counts) as authority.
@@ -19,7 +20,7 @@ from typing import Literal
 from pydantic import BaseModel
 
 from .confidence import compute_confidence, compute_all_confidences
-from .state import _load_knowledge, _save_knowledge
+from .state import _load_knowledge, update_knowledge
 
 
 # --- Data models ---
@@ -196,72 +197,142 @@ def resolve_conflict(
     reason: str,
 ) -> dict:
     """Supersede the loser, clean up edges/flags. Returns result dict."""
-    knowledge = _load_knowledge(session_dir)
-    nodes_by_id = {n["id"]: n for n in knowledge.get("nodes", [])}
-    now = datetime.now().isoformat()
-
-    winner = nodes_by_id.get(winning_id)
-    loser = nodes_by_id.get(losing_id)
-    if not winner:
-        raise ValueError(f"Node not found: {winning_id}")
-    if not loser:
-        raise ValueError(f"Node not found: {losing_id}")
-
-    # 1. Mark loser superseded
-    loser["status"] = "superseded"
-    loser["superseded_by"] = winning_id
-    loser["updated"] = now
-
-    # 2. Add supersedes edge (winner → loser)
-    knowledge["edges"].append({
-        "source": winning_id,
-        "target": losing_id,
-        "type": "supersedes",
-        "reasoning": reason,
-        "created": now,
-    })
-
-    # 3. Remove all contradicts edges between the pair
-    remaining_edges = []
-    for edge in knowledge["edges"]:
-        if edge["type"] == "contradicts":
-            if (edge["source"] == winning_id and edge["target"] == losing_id) or \
-               (edge["source"] == losing_id and edge["target"] == winning_id):
+    result = resolve_conflicts(session_dir, [(winning_id, losing_id, reason)])[0]
+    if result["status"] == "error":
+        raise ValueError(result["error"])
+    return result
+
+
+def _resolution_order(resolutions: list[tuple[str, str, str]]) -> list[int]:
+    """Order resolutions so a node's own losses are applied before its wins.
+
+    Kahn's algorithm over the winner → loser graph, stable in input order:
+    for chains (A beats B, B beats C) A/B is resolved first, so C ends up
+    superseded by the surviving A. Anything left in a cycle follows in
+    input order.
+    """
+    pending_losses: dict[str, int] = {}
+    for _, loser, _ in resolutions:
+        pending_losses[loser] = pending_losses.get(loser, 0) + 1
+
+    order: list[int] = []
+    remaining = list(range(len(resolutions)))
+    while remaining:
+        ready = [i for i in remaining if not pending_losses.get(resolutions[i][0])]
+        if not ready:
+            order.extend(remaining)
+            break
+        for i in ready:
+            pending_losses[resolutions[i][1]] -= 1
+        order.extend(ready)
+        ready_set = set(ready)
+        remaining = [i for i in remaining if i not in ready_set]
+    return order
+
+
+def resolve_conflicts(
+    session_dir: Path,
+    resolutions: list[tuple[str, str, str]],
+) -> list[dict]:
+    """Apply many (winning_id, losing_id, reason) resolutions in one write.
+
+    Resolutions are applied in memory in conflict-graph order (see
+    _resolution_order); a loser whose winner was itself superseded earlier
+    in the batch is superseded by that chain's surviving node. Contradicts
+    edges and has_contradiction flags are cleaned up once at the end.
+
+    Returns one result per resolution, in input order — the same records
+    as resolve_conflict, or {"status": "error", ...} for missing nodes.
+    """
+    def apply(knowledge: dict):
+        nodes_by_id = {n["id"]: n for n in knowledge.get("nodes", [])}
+        now = datetime.now().isoformat()
+
+        results: list[dict] = [{}] * len(resolutions)
+        resolved_pairs: set[frozenset[str]] = set()
+        survivor: dict[str, str] = {}  # loser → node it is superseded by (this batch)
+        winners: set[str] = set()
+        losers: set[str] = set()
+
+        for i in _resolution_order(resolutions):
+            winning_id, losing_id, reason = resolutions[i]
+            missing = next((nid for nid in (winning_id, losing_id) if nid not in nodes_by_id), None)
+            if missing:
+                results[i] = {
+                    "status": "error",
+                    "winner": winning_id,
+                    "loser": losing_id,
+                    "error": f"Node not found: {missing}",
+                }
                 continue
-        remaining_edges.append(edge)
-    knowledge["edges"] = remaining_edges
 
-    # 4. Clean has_contradiction on loser (always — it's superseded)
-    loser.pop("has_contradiction", None)
+            # 1. Mark loser superseded (by the chain's survivor if the winner lost earlier)
+            head, seen = winning_id, {winning_id, losing_id}
+            while survivor.get(head) not in (None, *seen):
+                head = survivor[head]
+                seen.add(head)
+            loser = nodes_by_id[losing_id]
+            loser["status"] = "superseded"
+            loser["superseded_by"] = head
+            loser["updated"] = now
+            survivor[losing_id] = head
+
+            # 2. Add supersedes edge (winner → loser)
+            knowledge["edges"].append({
+                "source": winning_id,
+                "target": losing_id,
+                "type": "supersedes",
+                "reasoning": reason,
+                "created": now,
+            })
 
-    # 5. Clean has_contradiction on winner only if no remaining contradicts edges
-    still_contested = any(
-        e["type"] == "contradicts" and
-        (e["source"] == winning_id or e["target"] == winning_id)
-        for e in knowledge["edges"]
-    )
-    if not still_contested:
-        winner.pop("has_contradiction", None)
+            resolved_pairs.add(frozenset((winning_id, losing_id)))
+            winners.add(winning_id)
+            losers.add(losing_id)
+            results[i] = {
+                "status": "resolved",
+                "winner": winning_id,
+                "loser": losing_id,
+                "reason": reason,
+            }
+
+        if not resolved_pairs:
+            return results, False
 
-    _save_knowledge(session_dir, knowledge)
+        # 3. Remove all contradicts edges between resolved pairs (one pass)
+        knowledge["edges"] = [
+            e for e in knowledge["edges"]
+            if not (e["type"] == "contradicts"
+                    and frozenset((e["source"], e["target"])) in resolved_pairs)
+        ]
 
-    return {
-        "status": "resolved",
-        "winner": winning_id,
-        "loser": losing_id,
-        "reason": reason,
-    }
+        # 4. Clean has_contradiction on losers (always — they're superseded)
+        for losing_id in losers:
+            nodes_by_id[losing_id].pop("has_contradiction", None)
+
+        # 5. Clean has_contradiction on winners with no remaining contradicts edges
+        contested: set[str] = set()
+        for e in knowledge["edges"]:
+            if e["type"] == "contradicts":
+                contested.add(e["source"])
+                contested.add(e["target"])
+        for winning_id in winners - losers - contested:
+            nodes_by_id[winning_id].pop("has_contradiction", None)
+
+        return results, True
+
+    return update_knowledge(session_dir, apply)
 
 
 def auto_resolve(
     session_dir: Path,
     report: ConflictReport | None = None,
 ) -> list[dict]:
-    """Batch-resolve all auto_resolvable conflicts. Returns list of results."""
+    """Batch-resolve all auto_resolvable conflicts in a single write. Returns list of results."""
     if report is None:
         report = generate_conflict_report(session_dir)
 
-    results = []
+    resolutions = []
     for conflict in report.conflicts:
         if conflict.priority != "auto_resolvable":
             continue
@@ -274,21 +345,12 @@ def auto_resolve(
             if winner_id == conflict.node_a.node_id
             else conflict.node_a.node_id
         )
+        resolutions.append((
+            winner_id,
+            loser_id,
+            f"Auto-resolved: overwhelming topological support ({conflict.node_a.node_id} vs {conflict.node_b.node_id})",
+        ))
 
-        try:
-            result = resolve_conflict(
-                session_dir,
-                winning_id=winner_id,
-                losing_id=loser_id,
-                reason=f"Auto-resolved: overwhelming topological support ({conflict.node_a.node_id} vs {conflict.node_b.node_id})",
-            )
-            results.append(result)
-        except (ValueError, KeyError) as exc:
-            results.append({
-                "status": "error",
-                "winner": winner_id,
-                "loser": loser_id,
-                "error": str(exc),
-            })
-
-    return results
+    if not resolutions:
+        return []
+    return resolve_conflicts(session_dir, resolutions)
@@ -18,6 +18,9 @@ from pathlib import Path
 
 import requests
 
+from .locking import atomic_write_text
+from . import tracing
+
 DEFAULT_EMBED_MODEL = os.environ.get("OI_EMBED_MODEL", "nomic-embed-text")
 OLLAMA_URL = os.environ.get("OI_OLLAMA_URL", "http://127.0.0.1:11434")
 
@@ -25,6 +28,7 @@ OLLAMA_URL = os.environ.get("OI_OLLAMA_URL", "http://127.0.0.1:11434")
 EMBEDDINGS_FILE = "embeddings.json"
 
 
+@tracing.traced("embed.get_embedding", cat="embed")
 def get_embedding(text: str, model: str = None) -> list[float] | None:
     """Get embedding vector for text.
 
@@ -92,8 +96,7 @@ def load_embeddings(session_dir: Path) -> dict:
 
 def save_embeddings(session_dir: Path, data: dict) -> None:
     """Save embeddings to disk."""
-    session_dir.mkdir(parents=True, exist_ok=True)
-    _embeddings_path(session_dir).write_text(json.dumps(data))
+    atomic_write_text(_embeddings_path(session_dir), json.dumps(data))
 
 
 def embed_node(node: dict, model: str = None) -> list[float] | None:
@@ -104,28 +107,34 @@ def embed_node(node: dict, model: str = None) -> list[float] | None:
     return get_embedding(summary, model)
 
 
+@tracing.traced("embed.ensure_embeddings", cat="embed")
 def ensure_embeddings(session_dir: Path, knowledge: dict, model: str = None) -> dict:
     """Ensure all active nodes have embeddings. Re-embeds on model change.
 
-    Returns the embeddings dict (loaded or updated).
+    Missing nodes are embedded outside any lock; the new vectors are then
+    merged into a fresh read of embeddings.json under session_lock, so
+    vectors other writers stored meanwhile are kept. Only vectors this call
+    loaded and found inactive are pruned, never ones added since.
+
+    Returns the embeddings dict, restricted to active nodes.
     """
+    from .locking import session_lock
+
     model = model or DEFAULT_EMBED_MODEL
     data = load_embeddings(session_dir)
-
-    # Model changed — re-embed everything
-    if data["model"] and data["model"] != model:
+    model_changed = bool(data["model"]) and data["model"] != model
+    if model_changed:
         data = {"model": model, "vectors": {}}
 
     active_ids = {
         n["id"] for n in knowledge.get("nodes", [])
         if n.get("status") != "superseded"
     }
+    stale = set(data["vectors"]) - active_ids
 
-    # Remove stale embeddings
-    data["vectors"] = {k: v for k, v in data["vectors"].items() if k in active_ids}
-
-    # Embed missing nodes
-    missing = active_ids - set(data["vectors"].keys())
+    # Embed missing nodes (slow: network calls, no lock held)
+    new_vectors = {}
+    missing = active_ids - set(data["vectors"])
     if missing:
         nodes_by_id = {n["id"]: n for n in knowledge.get("nodes", [])}
         for nid in missing:
@@ -133,12 +142,24 @@ def ensure_embeddings(session_dir: Path, knowledge: dict, model: str = None) ->
             if node:
                 vec = embed_node(node, model)
                 if vec:
-                    data["vectors"][nid] = vec
-
-        data["model"] = model
-        save_embeddings(session_dir, data)
-
-    return data
+                    new_vectors[nid] = vec
+
+    if new_vectors or stale or model_changed:
+        with session_lock(session_dir):
+            current = load_embeddings(session_dir)
+            if current["model"] and current["model"] != model:
+                current = {"model": model, "vectors": {}}
+            current["model"] = model
+            for nid in stale:
+                current["vectors"].pop(nid, None)
+            current["vectors"].update(new_vectors)
+            save_embeddings(session_dir, current)
+        data = current
+
+    return {
+        "model": data["model"] or model,
+        "vectors": {k: v for k, v in data["vectors"].items() if k in active_ids},
+    }
 
 
 def semantic_search(
@@ -163,8 +184,21 @@ def semantic_search(
     if not data["vectors"]:
         return []
 
+    return rank_vectors(query_vec, data["vectors"], top_k, min_score)
+
+
+def rank_vectors(
+    query_vec: list[float],
+    vectors: dict[str, list[float]],
+    top_k: int = 10,
+    min_score: float = 0.3,
+) -> list[dict]:
+    """Rank {node_id: vector} by cosine similarity to query_vec.
+
+    Returns [{node_id, score}] sorted by score descending.
+    """
     results = []
-    for nid, vec in data["vectors"].items():
+    for nid, vec in vectors.items():
         score = cosine_similarity(query_vec, vec)
         if score >= min_score:
             results.append({"node_id": nid, "score": score})
@@ -0,0 +1,154 @@
+"""Memoized context fragments for orchestrator._build_messages.
+
+Consecutive turns mostly rebuild the same working context: the summaries
+block, the knowledge section (with a PageRank pass for its confidence
+annotations) and effort logs that only ever grow. Each tier is rendered
+once and reused while its inputs are unchanged, so a steady tier costs a
+few stat() calls and a key comparison.
+
+FragmentCache holds one rendered value per (scope, tier) with the key it
+was rendered from. Keys are built from the tier's inputs — file stamps
+(warm._stamp: inode, mtime_ns, size), the expanded set, the eviction set —
+so any change on disk, from this process or another, re-renders it.
+
+JsonlTail reads append-only JSONL logs incrementally: a log that grew
+since the last read is parsed from the previous offset onward. A log that
+shrank, was replaced, or no longer ends with the bytes last seen is
+re-read from the start.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+MAX_FRAGMENTS = 1024
+MAX_LOGS = 512
+_EDGE_BYTES = 64  # bytes before the offset re-checked to confirm an append
+
+
+class FragmentCache:
+    """Rendered fragments keyed by (scope, tier), LRU-bounded."""
+
+    def __init__(self, max_entries: int = MAX_FRAGMENTS):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[object, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, scope, tier: str, key, render: Callable[[], T]) -> T:
+        """Cached value for (scope, tier) if it was rendered from key, else render() it.
+
+        Treat the returned value as read-only: it is shared with later callers.
+        """
+        slot = (scope, tier)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                return entry[1]
+        value = render()
+        with self._lock:
+            self._entries[slot] = (key, value)
+            self._entries.move_to_end(slot)
+            self.misses += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class _Tail:
+    __slots__ = ("ino", "mtime_ns", "size", "offset", "edge", "messages", "pending")
+
+    def __init__(self):
+        self.ino = self.mtime_ns = self.size = self.offset = 0
+        self.edge = b""
+        self.messages: list[dict] = []  # Parsed from complete lines before offset
+        self.pending: list[dict] = []  # A parseable final line without its newline yet
+
+
+def _parse_line(line: bytes) -> dict | None:
+    """{role, content} from one JSONL line, or None if blank/malformed."""
+    if not line.strip():
+        return None
+    try:
+        entry = json.loads(line)
+        return {"role": entry["role"], "content": entry["content"]}
+    except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError):
+        return None
+
+
+class JsonlTail:
+    """Incremental {role, content} reader for append-only JSONL logs."""
+
+    def __init__(self, max_files: int = MAX_LOGS):
+        self.max_files = max_files
+        self.bytes_read = 0  # For diagnostics/tests
+        self._files: OrderedDict[Path, _Tail] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, path: Path) -> list[dict]:
+        """All {role, content} messages in path (skipping malformed lines); [] if missing."""
+        path = Path(path)
+        try:
+            st = path.stat()
+        except OSError:
+            with self._lock:
+                self._files.pop(path, None)
+            return []
+
+        with self._lock:
+            tail = self._files.get(path)
+            if tail is None or (tail.ino, tail.mtime_ns, tail.size) != (st.st_ino, st.st_mtime_ns, st.st_size):
+                tail = self._advance(path, tail, st)
+                self._files[path] = tail
+            self._files.move_to_end(path)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+            return [dict(m) for m in tail.messages + tail.pending]
+
+    def _advance(self, path: Path, tail: _Tail | None, st) -> _Tail:
+        with open(path, "rb") as f:
+            if tail is not None and tail.ino == st.st_ino and st.st_size >= tail.offset:
+                # Still the same bytes up to our offset? Then only the tail is new.
+                start = max(tail.offset - len(tail.edge), 0)
+                f.seek(start)
+                if f.read(tail.offset - start) == tail.edge:
+                    data = f.read()
+                else:
+                    tail = None
+            else:
+                tail = None
+            if tail is None:
+                tail = _Tail()
+                f.seek(0)
+                data = f.read()
+        self.bytes_read += len(data)
+
+        complete, newline, rest = data.rpartition(b"\n")
+        if newline:
+            tail.messages = tail.messages + [
+                m for m in map(_parse_line, complete.split(b"\n")) if m is not None
+            ]
+            tail.offset += len(complete) + 1
+            tail.edge = (tail.edge + complete + newline)[-_EDGE_BYTES:]
+        last = _parse_line(rest)
+        tail.pending = [last] if last is not None else []
+        tail.ino, tail.mtime_ns, tail.size = st.st_ino, st.st_mtime_ns, st.st_size
+        return tail
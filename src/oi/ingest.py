@@ -1,13 +1,14 @@
 """Document ingestion: extract knowledge claims from parsed document chunks.
 
 Takes ParsedDocument output from parser.py, uses LLM to extract claims per chunk,
-and writes them to the knowledge graph via add_knowledge(). Includes a top-level
-ingest_pipeline() orchestrator that chains parse → extract → write → link → embed → report.
+and writes them to the knowledge graph via add_knowledge_bulk(). Includes a top-level
+ingest_pipeline() orchestrator that chains parse → extract → write → embed → link → report.
 Also provides ingest_chatgpt_export() for ChatGPT conversation sources.
 """
 
 from __future__ import annotations
 
+import functools
 import json
 import re
 from pathlib import Path
@@ -15,6 +16,7 @@ from typing import Callable, Optional
 
 from pydantic import BaseModel
 
+from . import metrics, scheduler
 from .llm import chat, DEFAULT_MODEL, get_max_input_tokens
 from .schemas import get_extractable_types, build_extraction_type_list
 from .parser import ParsedDocument, DocumentChunk
@@ -34,6 +36,7 @@ class ExtractedClaim(BaseModel):
     voice: str = "first_person"  # "first_person" | "reported" | "described"
     authored_at: str = ""  # ISO 8601 timestamp from source (e.g. ChatGPT create_time)
     source_quote: str = ""  # verbatim text from source that this claim was extracted from
+    chunk_id: str = ""  # source chunk (per-chunk extraction only)
 
 
 class ChunkExtractionResult(BaseModel):
@@ -52,6 +55,7 @@ class DocumentExtractionResult(BaseModel):
     chunks_processed: int
     chunks_skipped: int  # empty chunks
     chunks_failed: int
+    failed_chunk_ids: list[str] = []
     claims: list[ExtractedClaim] = []
     errors: list[str] = []
 
@@ -65,6 +69,8 @@ class IngestionResult(BaseModel):
     chunks_processed: int
     chunks_failed: int
     claims_extracted: int
+    failed_chunk_ids: list[str] = []
+    nodes_by_chunk: dict[str, list[str]] = {}  # chunk_id → node IDs (per-chunk extraction)
     errors: list[str] = []
 
 
@@ -79,13 +85,81 @@ class PipelineResult(BaseModel):
     claims_extracted: int = 0
     edges_created: int = 0
     contradictions_found: int = 0
+    classifications_avoided: int = 0  # link pairs settled by embedding triage, not the LLM
     conversations_skipped: int = 0
     documents_skipped: int = 0
+    chunks_unchanged: int = 0  # skipped by content hash (incremental re-ingest)
+    nodes_superseded: list[str] = []  # nodes derived from edited/removed content
     clusters_found: int = 0
     concepts_created: int = 0
     conflicts: dict = {}  # {total, auto_resolvable, strong_recommendations, ambiguous}
     errors: list[str] = []
     dry_run: bool = False
+    timings: dict = {}  # {stage: seconds} wall time per pipeline stage
+    llm: dict = {}  # {phase: stats} this run's LLM calls (see metrics.Metrics.summary)
+
+
+def format_pipeline_result(result: PipelineResult) -> str:
+    """Format a PipelineResult for human-readable output."""
+    lines = []
+
+    if result.dry_run:
+        lines.append("DRY RUN — no graph changes made")
+        lines.append(f"Source: {result.source_path}")
+        lines.append(f"Chunks: {result.chunks_processed}/{result.chunks_total} processed")
+        lines.append(f"Claims: {result.claims_extracted} would be extracted")
+    else:
+        lines.append(f"Ingested: {result.source_path}")
+        if result.documents_skipped:
+            lines.append(f"Documents skipped (already ingested): {result.documents_skipped}")
+        if result.conversations_skipped:
+            lines.append(f"Conversations skipped (already ingested): {result.conversations_skipped}")
+        lines.append(f"Nodes created: {len(result.nodes_created)}")
+        if result.nodes_superseded:
+            lines.append(f"Nodes superseded (source changed): {len(result.nodes_superseded)}")
+        lines.append(f"Chunks: {result.chunks_processed}/{result.chunks_total} processed")
+        if result.chunks_unchanged:
+            lines.append(f"Chunks unchanged (skipped): {result.chunks_unchanged}")
+        lines.append(f"Claims extracted: {result.claims_extracted}")
+        if result.edges_created or result.contradictions_found:
+            lines.append(
+                f"Edges: {result.edges_created} created, "
+                f"{result.contradictions_found} contradictions"
+            )
+        if result.classifications_avoided:
+            lines.append(f"Link classifications settled by embedding triage: {result.classifications_avoided}")
+        if result.clusters_found or result.concepts_created:
+            lines.append(
+                f"Clusters: {result.clusters_found} found, "
+                f"{result.concepts_created} concepts created"
+            )
+        if result.conflicts:
+            c = result.conflicts
+            lines.append(
+                f"Conflicts: {c.get('total', 0)} total "
+                f"({c.get('auto_resolvable', 0)} auto, "
+                f"{c.get('strong_recommendations', 0)} strong, "
+                f"{c.get('ambiguous', 0)} ambiguous)"
+            )
+
+    if result.llm:
+        calls = sum(p["calls"] for p in result.llm.values())
+        tokens = sum(p["prompt_tokens"] + p["completion_tokens"] for p in result.llm.values())
+        cost = sum(p["cost_usd"] for p in result.llm.values())
+        seconds = sum(p["seconds"] for p in result.llm.values())
+        lines.append(f"LLM: {calls} calls, {tokens} tokens, ${cost:.4f}, {seconds:.1f}s")
+
+    if result.chunks_failed:
+        lines.append(f"Chunks failed: {result.chunks_failed}")
+
+    if result.errors:
+        lines.append(f"Errors ({len(result.errors)}):")
+        for e in result.errors[:5]:
+            lines.append(f"  - {e}")
+        if len(result.errors) > 5:
+            lines.append(f"  ... and {len(result.errors) - 5} more")
+
+    return "\n".join(lines)
 
 
 # === Extraction Prompt ===
@@ -253,6 +327,7 @@ def extract_from_chunk(
                     voice=voice,
                     authored_at=authored_at,
                     source_quote=str(n.get("source_quote", "")).strip(),
+                    chunk_id=chunk.chunk_id,
                 )
             )
 
@@ -437,6 +512,7 @@ def _chat_with_retry(
                 errors.append(
                     f"JSON parse failed for {source}, retrying (attempt 2/2)"
                 )
+                metrics.record_retry(phase)
                 continue
             else:
                 return None
@@ -711,6 +787,7 @@ def extract_document(
     chunks_processed = 0
     chunks_skipped = 0
     chunks_failed = 0
+    failed_chunk_ids: list[str] = []
 
     for chunk in doc.chunks:
         if chunk.char_count == 0:
@@ -723,6 +800,7 @@ def extract_document(
 
         if result.error:
             chunks_failed += 1
+            failed_chunk_ids.append(chunk.chunk_id)
             errors.append(f"{chunk.chunk_id}: {result.error}")
         else:
             chunks_processed += 1
@@ -734,61 +812,92 @@ def extract_document(
         chunks_processed=chunks_processed,
         chunks_skipped=chunks_skipped,
         chunks_failed=chunks_failed,
+        failed_chunk_ids=failed_chunk_ids,
         claims=all_claims,
         errors=errors,
     )
 
 
+def _write_claims(
+    claims: list[ExtractedClaim],
+    session_dir: Path,
+    source: str,
+    errors: list[str],
+    on_written: Callable[[list[str]], object] | None = None,
+) -> list[dict | None]:
+    """Write claims to the graph in one batch. Returns one result per claim.
+
+    Results are add_knowledge_bulk dicts, or None for claims that failed
+    (the reason is appended to errors). on_written is passed through to
+    add_knowledge_bulk.
+    """
+    from .knowledge import add_knowledge_bulk
+
+    if not claims:
+        return []
+    items = [
+        {
+            "node_type": claim.node_type,
+            "summary": claim.summary,
+            "source": source,
+            "reasoning": claim.reasoning,
+            "provenance_uri": claim.provenance_uri,
+            "voice": claim.voice,
+            "authored_at": claim.authored_at or None,
+            "source_quote": claim.source_quote or None,
+        }
+        for claim in claims
+    ]
+    try:
+        results = add_knowledge_bulk(session_dir, items, on_written=on_written)
+    except Exception as e:
+        errors.append(f"Failed to add {len(claims)} claims: {e}")
+        return [None] * len(claims)
+
+    out: list[dict | None] = []
+    for result in results:
+        if "error" in result:
+            errors.append(f"add_knowledge error: {result['error']}")
+            out.append(None)
+        else:
+            out.append(result)
+    return out
+
+
 def ingest_document(
     doc: ParsedDocument,
     session_dir: Path,
     model: str = None,
     source_label: str = None,
+    on_written: Callable[[list[str]], object] | None = None,
 ) -> IngestionResult:
     """Extract claims from a document and write them to the knowledge graph.
 
-    Uses add_knowledge(skip_linking=True, skip_embed=True) for each claim.
-    Linking and embedding are deferred to Slice 13c.
+    Writes all claims in one graph save via add_knowledge_bulk (no linking,
+    no embedding). Linking and embedding are deferred to Slice 13c.
 
     Args:
         doc: ParsedDocument from parser.py.
         session_dir: Path to the session/knowledge directory.
         model: LLM model for extraction.
         source_label: Optional source label for nodes (defaults to source_path).
+        on_written: Called with the new node IDs under the graph write's
+                    session_lock (see add_knowledge_bulk).
 
     Returns:
         IngestionResult with created node IDs and error info.
     """
-    from .knowledge import add_knowledge
-
     extraction = extract_document(doc, model=model)
     source = source_label or extraction.source_path
 
     nodes_created: list[str] = []
+    nodes_by_chunk: dict[str, list[str]] = {}
     errors = list(extraction.errors)
 
-    for claim in extraction.claims:
-        try:
-            result_json = add_knowledge(
-                session_dir,
-                node_type=claim.node_type,
-                summary=claim.summary,
-                source=source,
-                reasoning=claim.reasoning,
-                provenance_uri=claim.provenance_uri,
-                voice=claim.voice,
-                authored_at=claim.authored_at or None,
-                source_quote=claim.source_quote or None,
-                skip_linking=True,
-                skip_embed=True,
-            )
-            result = json.loads(result_json)
-            if "error" in result:
-                errors.append(f"add_knowledge error: {result['error']}")
-            else:
-                nodes_created.append(result["node_id"])
-        except Exception as e:
-            errors.append(f"Failed to add claim '{claim.summary[:50]}...': {e}")
+    for claim, result in zip(extraction.claims, _write_claims(extraction.claims, session_dir, source, errors, on_written)):
+        if result:
+            nodes_created.append(result["node_id"])
+            nodes_by_chunk.setdefault(claim.chunk_id, []).append(result["node_id"])
 
     return IngestionResult(
         source_path=extraction.source_path,
@@ -797,6 +906,8 @@ def ingest_document(
         chunks_processed=extraction.chunks_processed,
         chunks_failed=extraction.chunks_failed,
         claims_extracted=len(extraction.claims),
+        failed_chunk_ids=extraction.failed_chunk_ids,
+        nodes_by_chunk=nodes_by_chunk,
         errors=errors,
     )
 
@@ -806,6 +917,7 @@ def ingest_conversation(
     session_dir: Path,
     model: str = None,
     source_label: str = None,
+    on_written: Callable[[list[str]], object] | None = None,
 ) -> IngestionResult:
     """Extract claims from a conversation and write them to the knowledge graph.
 
@@ -818,40 +930,21 @@ def ingest_conversation(
         session_dir: Path to the session/knowledge directory.
         model: LLM model for extraction.
         source_label: Optional source label for nodes (defaults to source_path).
+        on_written: Called with the new node IDs under the graph write's
+                    session_lock (see add_knowledge_bulk).
 
     Returns:
         IngestionResult with created node IDs and error info.
     """
-    from .knowledge import add_knowledge
-
     extraction = extract_from_conversation(doc, model=model)
     source = source_label or extraction.source_path
 
     nodes_created: list[str] = []
     errors = list(extraction.errors)
 
-    for claim in extraction.claims:
-        try:
-            result_json = add_knowledge(
-                session_dir,
-                node_type=claim.node_type,
-                summary=claim.summary,
-                source=source,
-                reasoning=claim.reasoning,
-                provenance_uri=claim.provenance_uri,
-                voice=claim.voice,
-                authored_at=claim.authored_at or None,
-                source_quote=claim.source_quote or None,
-                skip_linking=True,
-                skip_embed=True,
-            )
-            result = json.loads(result_json)
-            if "error" in result:
-                errors.append(f"add_knowledge error: {result['error']}")
-            else:
-                nodes_created.append(result["node_id"])
-        except Exception as e:
-            errors.append(f"Failed to add claim '{claim.summary[:50]}...': {e}")
+    for result in _write_claims(extraction.claims, session_dir, source, errors, on_written):
+        if result:
+            nodes_created.append(result["node_id"])
 
     return IngestionResult(
         source_path=extraction.source_path,
@@ -864,9 +957,159 @@ def ingest_conversation(
     )
 
 
+# === Post-write Stages ===
+
+
+def _run_post_write_stages(
+    node_ids: list[str],
+    session_dir: Path,
+    model: str | None,
+    skip_linking: bool,
+    skip_embedding: bool,
+    skip_clustering: bool,
+    errors: list[str],
+    progress: Callable[[str, str], None],
+    job: dict | None = None,
+) -> dict:
+    """Run auto-link → embed → link → cluster/synthesize → conflict report.
+
+    With a job, each stage only processes nodes it has not checkpointed yet
+    and records them once it succeeds, so a resumed job finishes just the
+    outstanding work. Errors are appended to `errors`.
+
+    Returns {edges_created, contradictions_found, classifications_avoided,
+    clusters_found, concepts_created, concept_ids, conflicts}.
+    """
+    from .ingest_jobs import checkpoint, pending_nodes
+
+    def _todo(stage: str) -> list[str]:
+        return pending_nodes(job, stage) if job else node_ids
+
+    def _done(stage: str, ids: list[str]) -> None:
+        if job:
+            checkpoint(session_dir, job, stage, ids)
+
+    stats: dict = {
+        "edges_created": 0,
+        "contradictions_found": 0,
+        "classifications_avoided": 0,
+        "clusters_found": 0,
+        "concepts_created": 0,
+        "concept_ids": [],
+        "conflicts": {},
+    }
+
+    # Stage 4: Auto-link same group (free, zero LLM calls)
+    todo = _todo("auto_linked")
+    if not skip_linking and todo:
+        progress("auto_link", f"{len(todo)} nodes")
+        try:
+            from .linker import auto_link_same_group
+
+            auto_result = auto_link_same_group(todo, session_dir)
+            errors.extend(auto_result.errors)
+            _done("auto_linked", todo)
+        except Exception as e:
+            errors.append(f"Auto-linking failed: {e}")
+
+    # Stage 5: Embed (before linking, so triage can use the new vectors)
+    todo = _todo("embedded")
+    if not skip_embedding and todo:
+        progress("embed", f"{len(todo)} nodes")
+        try:
+            from .embed import ensure_embeddings
+            from .state import _load_knowledge
+
+            knowledge = _load_knowledge(session_dir)
+            ensure_embeddings(session_dir, knowledge)
+            _done("embedded", todo)
+        except Exception as e:
+            errors.append(f"Embedding failed: {e}")
+
+    # Stage 6: Cross-group link (embedding triage, then LLM classification)
+    todo = _todo("linked")
+    if not skip_linking and todo:
+        progress("link", f"{len(todo)} nodes")
+        try:
+            from .linker import link_new_nodes
+
+            link_result = link_new_nodes(todo, session_dir, model=model)
+            stats["edges_created"] = link_result.edges_created
+            stats["contradictions_found"] = link_result.contradictions_found
+            stats["classifications_avoided"] = link_result.classifications_avoided
+            errors.extend(link_result.errors)
+            _done("linked", todo)
+        except Exception as e:
+            errors.append(f"Linking failed: {e}")
+
+    # Stage 7: Cluster (incremental) + synthesize concepts for changed clusters
+    todo = _todo("clustered")
+    if not skip_clustering and not skip_embedding and todo:
+        progress("cluster", f"placing {len(todo)} nodes")
+        try:
+            from .cluster import maintain_clusters
+            from .state import _load_knowledge as _load_kg
+
+            kg = _load_kg(session_dir)
+            clustered = maintain_clusters(session_dir, kg, model=model)
+            stats["clusters_found"] = clustered["clusters_total"]
+            concepts = clustered["concepts"]
+            stats["concepts_created"] = len(concepts)
+            stats["concept_ids"] = [c["concept_node_id"] for c in concepts]
+            _done("clustered", todo)
+        except Exception as e:
+            errors.append(f"Clustering failed: {e}")
+
+    # Stage 8: Conflict report
+    report_ids = list(node_ids) + stats["concept_ids"]
+    if not skip_linking and report_ids:
+        progress("report", "generating conflict report")
+        try:
+            from .conflicts import generate_conflict_report
+
+            report = generate_conflict_report(session_dir, node_ids=report_ids)
+            stats["conflicts"] = {
+                "total": report.total_contradictions,
+                "auto_resolvable": report.auto_resolvable,
+                "strong_recommendations": report.strong_recommendations,
+                "ambiguous": report.ambiguous,
+            }
+        except Exception as e:
+            errors.append(f"Conflict report failed: {e}")
+
+    return stats
+
+
 # === Top-level Pipeline ===
 
 
+def _instrumented(pipeline: Callable[..., PipelineResult]) -> Callable[..., PipelineResult]:
+    """Fill in PipelineResult.timings and .llm for a pipeline entry point.
+
+    Stages are timed off the pipeline's own progress callbacks: each
+    announced stage runs until the next one ("done", "skip" and "abort"
+    just end it). The pipeline's LLM calls run at scheduler.BULK
+    priority, behind interactive turns.
+    """
+    @functools.wraps(pipeline)
+    def wrapper(*args, progress_fn: Callable[[str, str], None] | None = None, **kwargs) -> PipelineResult:
+        timer = metrics.StageTimer()
+
+        def progress(stage: str, detail: str = "") -> None:
+            timer.mark(None if stage in ("done", "skip", "abort") else stage)
+            if progress_fn:
+                progress_fn(stage, detail)
+
+        with metrics.collect() as run_metrics, scheduler.priority(scheduler.BULK):
+            result = pipeline(*args, progress_fn=progress, **kwargs)
+        result.timings = timer.finish()
+        result.llm = run_metrics.summary()["phases"]
+        return result
+
+    return wrapper
+
+
+@_instrumented
 def ingest_pipeline(
     file_path: str | Path,
     session_dir: Path,
@@ -879,8 +1122,10 @@ def ingest_pipeline(
     skip_existing: bool = True,
     progress_fn: Callable[[str, str], None] | None = None,
     source_id: str | None = None,
+    pdf_workers: int = 1,
+    job_id: str | None = None,
 ) -> PipelineResult:
-    """Run the full ingestion pipeline: parse → extract → write → link → embed → report.
+    """Run the full ingestion pipeline: parse → extract → write → embed → link → report.
 
     Args:
         file_path: Path to the document file (.md, .pdf, .txt).
@@ -891,6 +1136,9 @@ def ingest_pipeline(
         skip_linking: Skip the linking pass (faster, cheaper).
         skip_embedding: Skip the embedding pass.
         progress_fn: Optional callback(stage, detail) for progress reporting.
+        pdf_workers: Processes used for PDF page extraction (1 = serial).
+        job_id: Continue an existing ingest job (see resume_ingest_job)
+                instead of starting a new one.
 
     Returns:
         PipelineResult with counts and any errors.
@@ -916,18 +1164,46 @@ def ingest_pipeline(
             if reg.get("status") == "conflict":
                 errors.append(f"Source registration conflict: {reg['error']}")
 
-    # Check if already ingested (before expensive parse+extract)
-    # Matches by filename regardless of source_id prefix — the same file
-    # ingested as doc://thesis.md and doc://my-source/thesis.md are the same
-    # document and should not be re-ingested.
-    if skip_existing and not dry_run:
-        file_p = Path(file_path).resolve()
-        bd = Path(base_dir).resolve() if base_dir else file_p.parent
+    # Incremental re-ingest: the manifest records file/chunk hashes from the
+    # last run, so an unchanged file is skipped before parsing and an edited
+    # one only has its changed chunks re-extracted.
+    file_p = Path(file_path).resolve()
+    bd = Path(base_dir).resolve() if base_dir else file_p.parent
+    try:
+        rel = file_p.relative_to(bd)
+    except ValueError:
+        rel = Path(file_p.name)
+    rel_str = str(rel).replace("\\", "/")
+
+    manifest = None
+    entry = None
+    raw_hash = ""
+    if not dry_run:
+        from .manifest import file_hash, load_manifest
+        from .sources import build_doc_uri
+
+        manifest = load_manifest(session_dir)
+        doc_key = build_doc_uri(source_id, rel_str) if source_id else f"doc://{rel_str}"
+        entry = manifest["documents"].get(doc_key)
         try:
-            rel = file_p.relative_to(bd)
-        except ValueError:
-            rel = Path(file_p.name)
-        rel_str = str(rel).replace("\\", "/")
+            raw_hash = file_hash(file_p)
+        except OSError:
+            pass
+
+    if skip_existing and entry is not None:
+        if raw_hash and entry.get("file_hash") == raw_hash:
+            _progress("skip", f"{rel_str} unchanged")
+            return PipelineResult(
+                source_path=str(file_path),
+                documents_skipped=1,
+                errors=[f"Already ingested ({rel_str}), unchanged, skipping. Use skip_existing=False to force re-ingest."],
+                dry_run=dry_run,
+            )
+    elif skip_existing and not dry_run:
+        # No manifest entry — fall back to provenance scan (graphs ingested
+        # before the manifest existed). Matches by filename regardless of
+        # source_id prefix — the same file ingested as doc://thesis.md and
+        # doc://my-source/thesis.md is the same document.
         ingested = _get_ingested_doc_paths(session_dir)
         # Match either exact path or path with any source_id prefix
         # e.g. rel_str="thesis.md" matches "thesis.md" or "my-source/thesis.md"
@@ -948,7 +1224,8 @@ def ingest_pipeline(
     # Stage 1: Parse
     _progress("parse", str(file_path))
     try:
-        doc = parse_file(file_path, base_dir=base_dir, source_id=source_id)
+        doc = parse_file(
+            file_path, base_dir=base_dir, source_id=source_id, pdf_workers=pdf_workers)
     except Exception as e:
         return PipelineResult(
             source_path=str(file_path),
@@ -962,9 +1239,41 @@ def ingest_pipeline(
     if hasattr(doc, "parse_errors") and doc.parse_errors:
         errors.extend(doc.parse_errors)
 
+    # Diff chunks against the manifest: only new/edited chunks are extracted.
+    # skip_existing=False re-extracts everything (still superseding old nodes).
+    changed_ids = [c.chunk_id for c in doc.chunks]
+    removed_ids: list[str] = []
+    if entry is not None:
+        from .manifest import diff_document
+
+        diff_changed, removed_ids = diff_document(entry, doc)
+        if skip_existing:
+            changed_ids = diff_changed
+    changed_set = set(changed_ids)
+    work_doc = doc
+    if len(changed_set) < len(doc.chunks):
+        work_doc = doc.model_copy(
+            update={"chunks": [c for c in doc.chunks if c.chunk_id in changed_set]})
+    chunks_unchanged = len(doc.chunks) - len(work_doc.chunks)
+
+    if manifest is not None and entry is not None and not changed_ids and not removed_ids:
+        # File bytes changed but no chunk content did (e.g. whitespace)
+        from .manifest import record_document, update_manifest
+
+        update_manifest(session_dir, lambda m: record_document(m, doc, {}, raw_hash))
+        _progress("skip", f"{rel_str} no chunk changes")
+        return PipelineResult(
+            source_path=source_path,
+            chunks_total=len(doc.chunks),
+            chunks_unchanged=chunks_unchanged,
+            documents_skipped=1,
+            errors=errors,
+        )
+
     # Stage 2: Extract
-    _progress("extract", f"{len(doc.chunks)} chunks")
-    extraction = extract_document(doc, model=model)
+    _progress("extract", f"{len(work_doc.chunks)} chunks"
+              + (f" ({chunks_unchanged} unchanged)" if chunks_unchanged else ""))
+    extraction = extract_document(work_doc, model=model)
     errors.extend(extraction.errors)
 
     if dry_run:
@@ -979,111 +1288,171 @@ def ingest_pipeline(
             dry_run=True,
         )
 
-    # Stage 3: Write to graph
+    # Stage 3: Write to graph (tracked as a resumable job)
+    from .ingest_jobs import add_job_nodes, checkpoint, create_job, finish_job, get_job
+
+    job = get_job(session_dir, job_id) if job_id else None
+    if job is None:
+        job = create_job(session_dir, "document", {
+            "file_path": str(Path(file_path).resolve()),
+            "base_dir": str(Path(base_dir).resolve()) if base_dir else None,
+            "model": model,
+            "skip_linking": skip_linking,
+            "skip_embedding": skip_embedding,
+            "skip_clustering": skip_clustering,
+            "source_id": source_id,
+            "pdf_workers": pdf_workers,
+        })
     _progress("write", f"{len(extraction.claims)} claims")
-    ingestion = ingest_document(doc, session_dir, model=model)
+    ingestion = ingest_document(
+        work_doc, session_dir, model=model,
+        on_written=lambda ids: add_job_nodes(session_dir, job, ids))
     errors.extend(ingestion.errors)
     node_ids = ingestion.nodes_created
 
-    # Stage 4: Auto-link same group (free, zero LLM calls)
-    auto_link_edges = 0
-    if not skip_linking and node_ids:
-        _progress("auto_link", f"{len(node_ids)} nodes")
-        try:
-            from .linker import auto_link_same_group
-
-            auto_result = auto_link_same_group(node_ids, session_dir)
-            auto_link_edges = auto_result.edges_created
-            errors.extend(auto_result.errors)
-        except Exception as e:
-            errors.append(f"Auto-linking failed: {e}")
-
-    # Stage 5: Cross-group link (LLM classification)
-    edges_created = 0
-    contradictions_found = 0
-    if not skip_linking and node_ids:
-        _progress("link", f"{len(node_ids)} nodes")
-        try:
-            from .linker import link_new_nodes
-
-            link_result = link_new_nodes(node_ids, session_dir, model=model)
-            edges_created = link_result.edges_created
-            contradictions_found = link_result.contradictions_found
-            errors.extend(link_result.errors)
-        except Exception as e:
-            errors.append(f"Linking failed: {e}")
-
-    # Stage 6: Embed
-    if not skip_embedding and node_ids:
-        _progress("embed", f"{len(node_ids)} nodes")
-        try:
-            from .embed import ensure_embeddings
-            from .state import _load_knowledge
-
-            knowledge = _load_knowledge(session_dir)
-            ensure_embeddings(session_dir, knowledge)
-        except Exception as e:
-            errors.append(f"Embedding failed: {e}")
-
-    # Stage 6: Cluster
-    clusters_found = 0
-    concepts_created = 0
-    if not skip_clustering and not skip_embedding and node_ids:
-        _progress("cluster", f"finding similar nodes")
-        try:
-            from .cluster import find_clusters, synthesize_concepts
-            from .state import _load_knowledge as _load_kg
-
-            kg = _load_kg(session_dir)
-            clusters = find_clusters(session_dir, kg)
-            clusters_found = len(clusters)
-
-            # Stage 7: Synthesize concepts
-            if clusters:
-                _progress("synthesize", f"{clusters_found} cluster(s)")
-                concepts = synthesize_concepts(clusters, session_dir, kg, model=model)
-                concepts_created = len(concepts)
-                for c in concepts:
-                    node_ids.append(c["concept_node_id"])
-        except Exception as e:
-            errors.append(f"Clustering failed: {e}")
-
-    # Stage 8: Conflict report
-    conflicts: dict = {}
-    if not skip_linking and node_ids:
-        _progress("report", "generating conflict report")
-        try:
-            from .conflicts import generate_conflict_report
-
-            report = generate_conflict_report(session_dir, node_ids=node_ids)
-            conflicts = {
-                "total": report.total_contradictions,
-                "auto_resolvable": report.auto_resolvable,
-                "strong_recommendations": report.strong_recommendations,
-                "ambiguous": report.ambiguous,
-            }
-        except Exception as e:
-            errors.append(f"Conflict report failed: {e}")
+    # Stage 3b: Supersede nodes from edited/removed chunks, record manifest
+    nodes_superseded: list[str] = []
+    if manifest is not None:
+        from .manifest import record_document, update_manifest
+
+        if entry is not None:
+            old_chunks = entry.get("chunks", {})
+            stale: dict[str, list[str]] = {}
+            for cid in changed_ids + removed_ids:
+                if cid in ingestion.failed_chunk_ids:
+                    continue  # keep old nodes until extraction succeeds
+                new_ids = ingestion.nodes_by_chunk.get(cid, [])
+                for old_id in old_chunks.get(cid, {}).get("node_ids", []):
+                    stale[old_id] = new_ids
+            try:
+                nodes_superseded = _supersede_stale_nodes(
+                    session_dir, stale, f"Source changed: {source_path}")
+            except Exception as e:
+                errors.append(f"Supersede failed: {e}")
+        update_manifest(session_dir, lambda m: record_document(
+            m, doc, ingestion.nodes_by_chunk, raw_hash,
+            failed_chunk_ids=ingestion.failed_chunk_ids))
+
+    if job is not None:
+        checkpoint(session_dir, job, "extracted")
+        checkpoint(session_dir, job, "written")
+
+    stats = _run_post_write_stages(
+        node_ids, session_dir, model,
+        skip_linking, skip_embedding, skip_clustering,
+        errors, _progress, job=job,
+    )
+    node_ids = node_ids + stats["concept_ids"]
+    if job is not None:
+        finish_job(session_dir, job, errors)
 
     _progress("done", f"{len(node_ids)} nodes created")
 
     return PipelineResult(
         source_path=source_path,
         nodes_created=node_ids,
-        chunks_total=ingestion.chunks_total,
+        chunks_total=ingestion.chunks_total + chunks_unchanged,
         chunks_processed=ingestion.chunks_processed,
         chunks_failed=ingestion.chunks_failed,
         claims_extracted=ingestion.claims_extracted,
-        edges_created=edges_created,
-        contradictions_found=contradictions_found,
-        clusters_found=clusters_found,
-        concepts_created=concepts_created,
-        conflicts=conflicts,
+        edges_created=stats["edges_created"],
+        contradictions_found=stats["contradictions_found"],
+        classifications_avoided=stats["classifications_avoided"],
+        chunks_unchanged=chunks_unchanged,
+        nodes_superseded=nodes_superseded,
+        clusters_found=stats["clusters_found"],
+        concepts_created=stats["concepts_created"],
+        conflicts=stats["conflicts"],
         errors=errors,
         dry_run=False,
     )
 
 
+# Minimum keyword overlap (Jaccard) for a re-extracted node to count as
+# the replacement of a stale one, rather than new content alongside it
+_REPLACEMENT_MIN_OVERLAP = 0.5
+
+
+def _match_replacements(knowledge: dict, stale: dict[str, list[str]]) -> dict[str, str]:
+    """Pair stale nodes with the re-extracted node that restates them.
+
+    Candidates are compared by summary keyword overlap, best pairs first,
+    and each new node replaces at most one stale node. Stale nodes with no
+    candidate at _REPLACEMENT_MIN_OVERLAP or above are left unmatched.
+    """
+    from .decay import extract_keywords
+
+    summaries = {n["id"]: n.get("summary", "") for n in knowledge.get("nodes", [])}
+    keywords: dict[str, set[str]] = {}
+
+    def kw(node_id: str) -> set[str]:
+        if node_id not in keywords:
+            keywords[node_id] = extract_keywords(summaries.get(node_id, ""))
+        return keywords[node_id]
+
+    pairs = []
+    for old_id, new_ids in stale.items():
+        for new_id in new_ids:
+            if new_id not in summaries:
+                continue
+            union = kw(old_id) | kw(new_id)
+            overlap = len(kw(old_id) & kw(new_id)) / len(union) if union else 0.0
+            if overlap >= _REPLACEMENT_MIN_OVERLAP:
+                pairs.append((overlap, old_id, new_id))
+
+    matched: dict[str, str] = {}
+    used: set[str] = set()
+    for _, old_id, new_id in sorted(pairs, key=lambda p: -p[0]):
+        if old_id not in matched and new_id not in used:
+            matched[old_id] = new_id
+            used.add(new_id)
+    return matched
+
+
+def _supersede_stale_nodes(
+    session_dir: Path,
+    stale: dict[str, list[str]],
+    reason: str,
+) -> list[str]:
+    """Mark nodes derived from edited/removed source content as superseded.
+
+    stale maps old node ID → the nodes re-extracted from the same
+    chunk/conversation. An old node whose claim one of them restates
+    (_match_replacements) gets superseded_by + a supersedes edge; the rest
+    are superseded without a replacement. One graph write for the batch.
+    Returns the IDs actually superseded (already-superseded nodes are skipped).
+    """
+    from datetime import datetime
+    from .state import update_knowledge
+
+    if not stale:
+        return []
+
+    def apply(knowledge: dict):
+        now = datetime.now().isoformat()
+        replacements = _match_replacements(knowledge, stale)
+        superseded: list[str] = []
+        for node in knowledge.get("nodes", []):
+            if node["id"] not in stale or node.get("status") == "superseded":
+                continue
+            node["status"] = "superseded"
+            node["updated"] = now
+            new_id = replacements.get(node["id"])
+            if new_id:
+                node["superseded_by"] = new_id
+                knowledge["edges"].append({
+                    "source": new_id,
+                    "target": node["id"],
+                    "type": "supersedes",
+                    "reasoning": reason,
+                    "created": now,
+                })
+            superseded.append(node["id"])
+        return superseded, bool(superseded)
+
+    return update_knowledge(session_dir, apply)
+
+
 def _get_ingested_conv_ids(session_dir: Path, source_id: str) -> set[str]:
     """Return conversation IDs already ingested for this ChatGPT source.
 
@@ -1128,6 +1497,7 @@ def _get_ingested_doc_paths(session_dir: Path) -> set[str]:
     return paths
 
 
+@_instrumented
 def ingest_chatgpt_export(
     source_id: str,
     session_dir: Path,
@@ -1139,6 +1509,7 @@ def ingest_chatgpt_export(
     skip_embedding: bool = False,
     skip_clustering: bool = True,
     progress_fn: Callable[[str, str], None] | None = None,
+    job_id: str | None = None,
 ) -> PipelineResult:
     """Ingest ChatGPT conversations from a registered source.
 
@@ -1159,6 +1530,8 @@ def ingest_chatgpt_export(
         skip_linking: Skip the linking pass (faster, cheaper).
         skip_embedding: Skip the embedding pass.
         progress_fn: Optional callback(stage, detail) for progress reporting.
+        job_id: Continue an existing ingest job (see resume_ingest_job)
+                instead of starting a new one.
     """
     from .sources import get_source
     from .chatgpt_parser import parse_chatgpt_export
@@ -1194,13 +1567,29 @@ def ingest_chatgpt_export(
             errors=[f"Parse failed: {e}"],
         )
 
-    # Filter out already-ingested conversations
+    # Filter out already-ingested conversations. The manifest catches edits
+    # (update_time / content hash): a changed conversation is re-extracted
+    # and its old nodes superseded. Conversations ingested before the
+    # manifest existed fall back to the provenance scan.
+    manifest = None
+    if not dry_run:
+        from .manifest import conversation_changed, load_manifest
+
+        manifest = load_manifest(session_dir)
     already_ingested = _get_ingested_conv_ids(session_dir, source_id) if not dry_run else set()
     new_docs = []
+    stale_nodes: dict[str, list[str]] = {}  # conversation URI → previous node IDs
     conversations_skipped = 0
     for doc in docs:
         conv_id = doc.metadata.source_path
-        if conv_id in already_ingested:
+        entry = manifest["conversations"].get(doc.metadata.provenance_uri) if manifest else None
+        if entry is not None:
+            if conversation_changed(entry, doc):
+                new_docs.append(doc)
+                stale_nodes[doc.metadata.provenance_uri] = entry.get("node_ids", [])
+            else:
+                conversations_skipped += 1
+        elif conv_id in already_ingested:
             conversations_skipped += 1
         else:
             new_docs.append(doc)
@@ -1248,9 +1637,38 @@ def ingest_chatgpt_export(
     consecutive_empty = 0
     EMPTY_THRESHOLD = 5  # stop after N consecutive conversations with 0 claims
     aborted = False
+    nodes_superseded: list[str] = []
+    from .ingest_jobs import add_job_nodes, checkpoint, create_job, finish_job, get_job
+    from .manifest import record_conversation, update_manifest
+
+    job = get_job(session_dir, job_id) if job_id else None
+    if job is None and docs:
+        job = create_job(session_dir, "chatgpt", {
+            "source_id": source_id,
+            "model": model,
+            "title_filter": title_filter,
+            "chatgpt_project_id": chatgpt_project_id,
+            "skip_linking": skip_linking,
+            "skip_embedding": skip_embedding,
+            "skip_clustering": skip_clustering,
+        })
+
     for idx, doc in enumerate(docs):
-        ingestion = ingest_conversation(doc, session_dir, model=model, source_label=source_id)
+        ingestion = ingest_conversation(
+            doc, session_dir, model=model, source_label=source_id,
+            on_written=lambda ids: add_job_nodes(session_dir, job, ids))
         node_ids.extend(ingestion.nodes_created)
+        if not ingestion.chunks_failed:
+            uri = doc.metadata.provenance_uri
+            old_ids = stale_nodes.get(uri, [])
+            if old_ids:
+                try:
+                    nodes_superseded.extend(_supersede_stale_nodes(
+                        session_dir, {nid: ingestion.nodes_created for nid in old_ids},
+                        f"Conversation changed: {doc.metadata.title}"))
+                except Exception as e:
+                    errors.append(f"Supersede failed: {e}")
+            update_manifest(session_dir, lambda m: record_conversation(m, doc, ingestion.nodes_created))
         chunks_total += ingestion.chunks_total
         chunks_processed += ingestion.chunks_processed
         chunks_failed += ingestion.chunks_failed
@@ -1277,85 +1695,20 @@ def ingest_chatgpt_export(
             aborted = True
             break
 
-    # Stage 4: Auto-link same group (free, zero LLM calls)
-    auto_link_edges = 0
-    if not skip_linking and node_ids:
-        _progress("auto_link", f"{len(node_ids)} nodes")
-        try:
-            from .linker import auto_link_same_group
-
-            auto_result = auto_link_same_group(node_ids, session_dir)
-            auto_link_edges = auto_result.edges_created
-            errors.extend(auto_result.errors)
-        except Exception as e:
-            errors.append(f"Auto-linking failed: {e}")
-
-    # Stage 5: Cross-group link (LLM classification)
-    edges_created = 0
-    contradictions_found = 0
-    if not skip_linking and node_ids:
-        _progress("link", f"{len(node_ids)} nodes")
-        try:
-            from .linker import link_new_nodes
-
-            link_result = link_new_nodes(node_ids, session_dir, model=model)
-            edges_created = link_result.edges_created
-            contradictions_found = link_result.contradictions_found
-            errors.extend(link_result.errors)
-        except Exception as e:
-            errors.append(f"Linking failed: {e}")
-
-    # Stage 5: Embed
-    if not skip_embedding and node_ids:
-        _progress("embed", f"{len(node_ids)} nodes")
-        try:
-            from .embed import ensure_embeddings
-            from .state import _load_knowledge
-
-            knowledge = _load_knowledge(session_dir)
-            ensure_embeddings(session_dir, knowledge)
-        except Exception as e:
-            errors.append(f"Embedding failed: {e}")
-
-    # Stage 6: Cluster
-    clusters_found = 0
-    concepts_created = 0
-    if not skip_clustering and not skip_embedding and node_ids:
-        _progress("cluster", f"finding similar nodes")
-        try:
-            from .cluster import find_clusters, synthesize_concepts
-            from .state import _load_knowledge as _load_kg2
-
-            kg = _load_kg2(session_dir)
-            clusters = find_clusters(session_dir, kg)
-            clusters_found = len(clusters)
-
-            # Stage 7: Synthesize concepts
-            if clusters:
-                _progress("synthesize", f"{clusters_found} cluster(s)")
-                concepts = synthesize_concepts(clusters, session_dir, kg, model=model)
-                concepts_created = len(concepts)
-                for c in concepts:
-                    node_ids.append(c["concept_node_id"])
-        except Exception as e:
-            errors.append(f"Clustering failed: {e}")
-
-    # Stage 8: Conflict report
-    conflicts: dict = {}
-    if not skip_linking and node_ids:
-        _progress("report", "generating conflict report")
-        try:
-            from .conflicts import generate_conflict_report
+    if job is not None and not aborted:
+        checkpoint(session_dir, job, "extracted")
+        checkpoint(session_dir, job, "written")
 
-            report = generate_conflict_report(session_dir, node_ids=node_ids)
-            conflicts = {
-                "total": report.total_contradictions,
-                "auto_resolvable": report.auto_resolvable,
-                "strong_recommendations": report.strong_recommendations,
-                "ambiguous": report.ambiguous,
-            }
-        except Exception as e:
-            errors.append(f"Conflict report failed: {e}")
+    # Post-write stages cover every node the job has written, including
+    # those from earlier interrupted runs that never got linked/embedded.
+    stats = _run_post_write_stages(
+        job["node_ids"] if job else node_ids, session_dir, model,
+        skip_linking, skip_embedding, skip_clustering,
+        errors, _progress, job=job,
+    )
+    node_ids.extend(stats["concept_ids"])
+    if job is not None:
+        finish_job(session_dir, job, errors)
 
     _progress("done", f"{len(node_ids)} nodes created")
 
@@ -1366,12 +1719,101 @@ def ingest_chatgpt_export(
         chunks_processed=chunks_processed,
         chunks_failed=chunks_failed,
         claims_extracted=all_claims_count,
-        edges_created=edges_created,
-        contradictions_found=contradictions_found,
+        edges_created=stats["edges_created"],
+        contradictions_found=stats["contradictions_found"],
+        classifications_avoided=stats["classifications_avoided"],
         conversations_skipped=conversations_skipped,
-        clusters_found=clusters_found,
-        concepts_created=concepts_created,
-        conflicts=conflicts,
+        nodes_superseded=nodes_superseded,
+        clusters_found=stats["clusters_found"],
+        concepts_created=stats["concepts_created"],
+        conflicts=stats["conflicts"],
         errors=errors,
         dry_run=False,
     )
+
+
+@_instrumented
+def resume_ingest_job(
+    session_dir: Path,
+    job_id: str | None = None,
+    model: str = None,
+    progress_fn: Callable[[str, str], None] | None = None,
+) -> PipelineResult:
+    """Finish an interrupted ingest job.
+
+    If extraction never completed, the original ingest call is re-run with
+    the job's parameters — the ingest manifest skips conversations/chunks
+    already written, so only the remainder is extracted. Then every
+    post-write stage runs over the job's nodes it has not yet processed.
+
+    Args:
+        session_dir: Path to the session/knowledge directory.
+        job_id: Job to resume (default: the oldest incomplete job).
+        model: Override the job's LLM model.
+        progress_fn: Optional callback(stage, detail) for progress reporting.
+    """
+    from .ingest_jobs import checkpoint, finish_job, get_job, incomplete_jobs
+
+    if job_id:
+        job = get_job(session_dir, job_id)
+        if not job:
+            return PipelineResult(source_path=job_id, errors=[f"Ingest job '{job_id}' not found."])
+    else:
+        pending = incomplete_jobs(session_dir)
+        if not pending:
+            return PipelineResult(source_path="", errors=["No incomplete ingest jobs."])
+        job = pending[0]
+
+    params = dict(job["params"])
+    model = model or params.pop("model", None)
+    params.pop("model", None)
+    label = params.get("source_id") or params.get("file_path") or job["id"]
+
+    def _progress(stage: str, detail: str = "") -> None:
+        if progress_fn:
+            progress_fn(stage, detail)
+
+    if job.get("status") == "complete":
+        return PipelineResult(source_path=label, errors=[f"Ingest job '{job['id']}' is already complete."])
+
+    if not job["stages"].get("written"):
+        _progress("resume", f"{job['id']}: re-running extraction")
+        if job["kind"] == "chatgpt":
+            result = ingest_chatgpt_export(
+                session_dir=session_dir, model=model, progress_fn=progress_fn,
+                job_id=job["id"], **params)
+        else:
+            result = ingest_pipeline(
+                session_dir=session_dir, model=model, progress_fn=progress_fn,
+                job_id=job["id"], **params)
+        job = get_job(session_dir, job["id"])
+        if job["stages"].get("written") or not result.documents_skipped:
+            return result
+        # Document already fully written before the interruption — nothing
+        # left to extract, fall through to the outstanding stages.
+        checkpoint(session_dir, job, "extracted")
+        checkpoint(session_dir, job, "written")
+
+    _progress("resume", f"{job['id']}: {len(job['node_ids'])} nodes")
+    errors: list[str] = []
+    stats = _run_post_write_stages(
+        job["node_ids"], session_dir, model,
+        params.get("skip_linking", False),
+        params.get("skip_embedding", False),
+        params.get("skip_clustering", True),
+        errors, _progress, job=job,
+    )
+    finish_job(session_dir, job, errors)
+    _progress("done", f"{job['id']} {job['status']}")
+
+    return PipelineResult(
+        source_path=label,
+        nodes_created=stats["concept_ids"],
+        edges_created=stats["edges_created"],
+        contradictions_found=stats["contradictions_found"],
+        classifications_avoided=stats["classifications_avoided"],
+        clusters_found=stats["clusters_found"],
+        concepts_created=stats["concepts_created"],
+        conflicts=stats["conflicts"],
+        errors=errors,
+    )
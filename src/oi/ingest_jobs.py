@@ -0,0 +1,194 @@
+"""Persistent ingestion jobs with per-stage checkpoints.
+
+Each ingest_pipeline / ingest_chatgpt_export run is recorded as a job so an
+interrupted run (rate-limit storm, laptop sleep, crash) can be finished
+later by resume_ingest_job() without redoing completed work.
+
+Checkpoints:
+    extracted, written  — timestamp once every input has been extracted and
+                          written (node IDs are appended under the same lock
+                          as each graph write, so progress survives crashes)
+    auto_linked, linked, embedded, clustered
+                        — node IDs each post-write stage has processed; a
+                          resumed job runs each stage over the remainder only
+
+Finished jobs are compacted to node counts, and only the most recent
+KEEP_FINISHED are kept. Job IDs come from a stored counter, so they stay
+unique after pruning.
+
+Storage: ingest_jobs.json alongside knowledge.yaml.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from .locking import atomic_write_text, session_lock
+
+JOBS_FILE = "ingest_jobs.json"
+
+EXTRACT_STAGES = ("extracted", "written")
+NODE_STAGES = ("auto_linked", "embedded", "linked", "clustered")
+KEEP_FINISHED = 20
+
+
+# === Persistence ===
+
+
+def _load_data(session_dir: Path) -> dict:
+    """Load the jobs file as {"jobs": {...}, "last_id": int}."""
+    path = session_dir / JOBS_FILE
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                return {"jobs": data.get("jobs", {}), "last_id": data.get("last_id", 0)}
+        except json.JSONDecodeError:
+            pass
+    return {"jobs": {}, "last_id": 0}
+
+
+def load_jobs(session_dir: Path) -> dict[str, dict]:
+    """Load all jobs as {job_id: job}. Empty if missing or corrupt."""
+    return _load_data(session_dir)["jobs"]
+
+
+def save_jobs(session_dir: Path, jobs: dict[str, dict], last_id: int = 0) -> None:
+    """Write all jobs, dropping all but the newest KEEP_FINISHED finished ones."""
+    finished = sorted(
+        (j for j in jobs.values() if j.get("status") == "complete"),
+        key=lambda j: j.get("created", ""),
+    )
+    drop = {j["id"] for j in finished[:-KEEP_FINISHED]}
+    jobs = {job_id: j for job_id, j in jobs.items() if job_id not in drop}
+    last_id = max([last_id, *(_id_number(job_id) for job_id in jobs)])
+    atomic_write_text(
+        session_dir / JOBS_FILE,
+        json.dumps({"jobs": jobs, "last_id": last_id}, indent=1),
+    )
+
+
+def _id_number(job_id: str) -> int:
+    """The counter in an "ingest-NNN" job ID (0 if it has none)."""
+    suffix = job_id.rpartition("-")[2]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def get_job(session_dir: Path, job_id: str) -> dict | None:
+    """Return a job by ID, or None."""
+    return load_jobs(session_dir).get(job_id)
+
+
+def save_job(session_dir: Path, job: dict) -> dict:
+    """Persist a single job (stamps updated). Returns the job."""
+    with session_lock(session_dir):
+        data = _load_data(session_dir)
+        job["updated"] = datetime.now().isoformat()
+        data["jobs"][job["id"]] = job
+        save_jobs(session_dir, data["jobs"], data["last_id"])
+    return job
+
+
+# === Lifecycle ===
+
+
+def create_job(session_dir: Path, kind: str, params: dict) -> dict:
+    """Create and persist a running job.
+
+    Args:
+        kind: "document" (ingest_pipeline) or "chatgpt" (ingest_chatgpt_export).
+        params: Keyword arguments needed to re-run the ingest call on resume.
+    """
+    with session_lock(session_dir):
+        data = _load_data(session_dir)
+        last_id = max([data["last_id"], *(_id_number(job_id) for job_id in data["jobs"])]) + 1
+        now = datetime.now().isoformat()
+        job = {
+            "id": f"ingest-{last_id:03d}",
+            "kind": kind,
+            "params": params,
+            "status": "running",
+            "created": now,
+            "updated": now,
+            "node_ids": [],
+            "stages": {stage: None for stage in EXTRACT_STAGES},
+            "done": {stage: [] for stage in NODE_STAGES},
+            "errors": [],
+        }
+        data["jobs"][job["id"]] = job
+        save_jobs(session_dir, data["jobs"], last_id)
+    return job
+
+
+def add_job_nodes(session_dir: Path, job: dict, node_ids: list[str]) -> dict:
+    """Append written node IDs to a job and persist (no-op if none are new)."""
+    known = set(job["node_ids"])
+    new = [n for n in dict.fromkeys(node_ids) if n not in known]
+    if not new:
+        return job
+    job["node_ids"].extend(new)
+    return save_job(session_dir, job)
+
+
+def checkpoint(session_dir: Path, job: dict, stage: str, node_ids: list[str] | None = None) -> dict:
+    """Record stage progress and persist.
+
+    Extraction stages take a timestamp; node stages record the node IDs
+    just processed. Nothing is written if the stage is already stamped or
+    none of the IDs are new.
+    """
+    if stage in EXTRACT_STAGES:
+        if job["stages"].get(stage):
+            return job
+        job["stages"][stage] = datetime.now().isoformat()
+    else:
+        done = job["done"].setdefault(stage, [])
+        seen = set(done)
+        new = [n for n in dict.fromkeys(node_ids or []) if n not in seen]
+        if not new:
+            return job
+        done.extend(new)
+    return save_job(session_dir, job)
+
+
+def pending_nodes(job: dict, stage: str) -> list[str]:
+    """Node IDs written by the job that a node stage has not yet processed."""
+    done = set(job["done"].get(stage, []))
+    return [n for n in job["node_ids"] if n not in done]
+
+
+def enabled_stages(params: dict) -> list[str]:
+    """Node stages the job's ingest options turned on."""
+    stages = []
+    if not params.get("skip_linking"):
+        stages += ["auto_linked", "linked"]
+    if not params.get("skip_embedding"):
+        stages.append("embedded")
+        if not params.get("skip_clustering", True):
+            stages.append("clustered")
+    return stages
+
+
+def finish_job(session_dir: Path, job: dict, errors: list[str] | None = None) -> dict:
+    """Mark a job complete once extraction and every enabled stage are done.
+
+    Otherwise it stays running and resume_ingest_job() picks it up. A
+    completed job keeps only its node count, not the node IDs.
+    """
+    if errors:
+        job["errors"] = list(errors)[-20:]
+    if job["stages"].get("written") and not any(
+        pending_nodes(job, stage) for stage in enabled_stages(job["params"])
+    ):
+        job["status"] = "complete"
+        job["node_count"] = len(job["node_ids"])
+        job["node_ids"] = []
+        job["done"] = {}
+    return save_job(session_dir, job)
+
+
+def incomplete_jobs(session_dir: Path) -> list[dict]:
+    """Jobs that still have outstanding work, oldest first."""
+    return [j for j in load_jobs(session_dir).values() if j.get("status") != "complete"]
@@ -4,13 +4,30 @@ add_knowledge is the primary entry point for creating nodes and auto-linking
 them into the knowledge graph. query_knowledge searches the graph by keyword.
 """
 
+import contextvars
 import json
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
+from typing import Callable, Mapping
 
+from .locking import session_lock
 from .schemas import get_node_type_names
 from .search import graph_walk
-from .state import _load_knowledge, _save_knowledge
+from .state import _load_knowledge, update_knowledge
+
+
+_LOW_CONFIDENCE = {
+    "level": "low",
+    "score": 0.0,
+    "inbound_supports": 0.0,
+    "inbound_contradicts": 0.0,
+    "independent_sources": 0,
+    "iterations": 0,
+    "runtime_ms": 0.0,
+}
 
 
 def _load_embeddings_safe(session_dir: Path) -> dict | None:
@@ -30,17 +47,21 @@ def query_knowledge(
     min_confidence: str = None,
     max_results: int = 10,
     sort_by: str = None,
+    graph=None,
 ) -> str:
     """Search the knowledge graph by keyword. Returns JSON with matching nodes.
 
     Args:
         sort_by: Optional sort order. "salience" sorts by related_to centrality,
                  "confidence" sorts by confidence level. None uses default walk order.
+        graph: Optional warm.WarmGraph; answers from its in-memory graph and
+               indexes instead of reloading and recomputing from disk.
     """
-    from .confidence import compute_confidence, compute_salience
+    from .confidence import compute_all_confidences, compute_salience
     from .decay import extract_keywords
 
-    knowledge = _load_knowledge(session_dir)
+    knowledge = graph.knowledge if graph is not None else _load_knowledge(session_dir)
+    keyword_index = graph.keywords if graph is not None else {}
     active_nodes = [n for n in knowledge.get("nodes", []) if n.get("status") != "superseded"]
 
     query_kw = extract_keywords(query)
@@ -49,7 +70,9 @@ def query_knowledge(
     # Phase 1: Keyword seed matching
     seeds = []
     for node in active_nodes:
-        node_kw = extract_keywords(node.get("summary", ""))
+        node_kw = keyword_index.get(node["id"])
+        if node_kw is None:
+            node_kw = extract_keywords(node.get("summary", ""))
 
         # Match by node ID directly
         if node["id"].lower() in query_lower:
@@ -75,8 +98,11 @@ def query_knowledge(
 
     # Phase 1b: Semantic seed matching (if embeddings available)
     try:
-        from .embed import semantic_search
-        sem_results = semantic_search(query, session_dir, knowledge)
+        if graph is not None:
+            sem_results = graph.semantic_search(query)
+        else:
+            from .embed import semantic_search
+            sem_results = semantic_search(query, session_dir, knowledge)
         # Merge: semantic seeds add to existing keyword scores
         seed_scores = {s["node_id"]: s["score"] for s in seeds}
         for sr in sem_results:
@@ -101,16 +127,27 @@ def query_knowledge(
         if node:
             matches.append((node, entry["score"]))
 
-    # Build results with confidence and edges
-    nodes_by_id = {n["id"]: n for n in knowledge.get("nodes", [])}
-    emb = _load_embeddings_safe(session_dir)
+    # Build results with confidence and edges (confidence computed once for the graph)
+    if graph is not None:
+        nodes_by_id = graph.nodes_by_id
+        edges_by_node = graph.edges_by_node
+        all_conf = graph.confidences if matches else {}
+    else:
+        nodes_by_id = {n["id"]: n for n in knowledge.get("nodes", [])}
+        edges_by_node = {}
+        for edge in knowledge.get("edges", []):
+            edges_by_node.setdefault(edge["source"], []).append(edge)
+            if edge["target"] != edge["source"]:
+                edges_by_node.setdefault(edge["target"], []).append(edge)
+        all_conf = compute_all_confidences(
+            knowledge, embeddings=_load_embeddings_safe(session_dir)) if matches else {}
     results = []
     for node, score in matches:
-        conf = compute_confidence(node["id"], knowledge, embeddings=emb)
+        conf = dict(all_conf.get(node["id"], _LOW_CONFIDENCE))
 
         # Check because_of targets for staleness (1-hop)
         stale_deps = []
-        for edge in knowledge.get("edges", []):
+        for edge in edges_by_node.get(node["id"], []):
             if edge["source"] == node["id"] and edge["type"] == "because_of":
                 target = nodes_by_id.get(edge["target"])
                 if target:
@@ -136,13 +173,12 @@ def query_knowledge(
 
         # Gather edges for this node
         node_edges = []
-        for edge in knowledge.get("edges", []):
-            if edge["source"] == node["id"] or edge["target"] == node["id"]:
-                node_edges.append({
-                    "source": edge["source"],
-                    "target": edge["target"],
-                    "type": edge["type"],
-                })
+        for edge in edges_by_node.get(node["id"], []):
+            node_edges.append({
+                "source": edge["source"],
+                "target": edge["target"],
+                "type": edge["type"],
+            })
 
         entry = {
             "node_id": node["id"],
@@ -164,7 +200,7 @@ def query_knowledge(
         results.append(entry)
 
     # Compute salience and add to results
-    salience_scores = compute_salience(knowledge)
+    salience_scores = graph.salience if graph is not None else compute_salience(knowledge)
     for entry in results:
         entry["salience"] = salience_scores.get(entry["node_id"], 0.0)
 
@@ -184,15 +220,12 @@ def query_knowledge(
     return json.dumps({"results": results, "total_active": total_active})
 
 
-def add_knowledge(
-    session_dir: Path,
+def _build_node(
+    node_id: str,
     node_type: str,
     summary: str,
+    now: str,
     source: str = None,
-    related_to: list = None,
-    edge_type: str = "supports",
-    model: str = None,
-    supersedes: list = None,
     session_id: str = None,
     abstraction_level: int = None,
     instance_count: int = None,
@@ -201,25 +234,8 @@ def add_knowledge(
     voice: str = None,
     authored_at: str = None,
     source_quote: str = None,
-    skip_linking: bool = False,
-    skip_embed: bool = False,
-) -> str:
-    """Add a knowledge node to the knowledge graph. Returns JSON result."""
-    from .llm import DEFAULT_MODEL
-    from .confidence import compute_confidence
-
-    valid_types = get_node_type_names()
-    if node_type not in valid_types:
-        return json.dumps({"error": f"Invalid node_type '{node_type}'. Must be one of: {', '.join(valid_types)}"})
-
-    knowledge = _load_knowledge(session_dir)
-
-    # Generate ID: type-NNN where NNN is max existing + 1
-    existing_ids = [n["id"] for n in knowledge["nodes"] if n["id"].startswith(f"{node_type}-")]
-    counter = len(existing_ids) + 1
-    node_id = f"{node_type}-{counter:03d}"
-    now = datetime.now().isoformat()
-
+) -> dict:
+    """Build a node dict. Optional fields are only set when meaningful."""
     node = {
         "id": node_id,
         "type": node_type,
@@ -246,95 +262,363 @@ def add_knowledge(
         node["authored_at"] = authored_at
     if source_quote:
         node["source_quote"] = source_quote
-    knowledge["nodes"].append(node)
+    return node
 
-    # Handle supersession: mark old nodes and transfer edges
-    superseded_ids = set()
-    if supersedes:
-        superseded_ids = set(supersedes)
-        for old_node in knowledge["nodes"]:
-            if old_node["id"] in superseded_ids:
-                old_node["status"] = "superseded"
-                old_node["superseded_by"] = node_id
-                old_node["updated"] = now
-                # Create supersedes edge from new → old
-                knowledge["edges"].append({
-                    "source": node_id,
-                    "target": old_node["id"],
-                    "type": "supersedes",
-                    "created": now,
-                })
-                # Copy inbound support edges from old node to new node
-                for edge in list(knowledge["edges"]):
-                    if edge["target"] == old_node["id"] and edge["type"] == "supports":
-                        knowledge["edges"].append({
-                            "source": edge["source"],
-                            "target": node_id,
-                            "type": "supports",
-                            "created": now,
-                        })
-
-    # Add edges if related_to provided (manual edges)
-    if related_to:
-        for target_id in related_to:
+
+class _LinkPrefetch:
+    """Embedding-side linking inputs for a node, fetched in the background.
+
+    Started as soon as the summary is known: the embedding call and the
+    nearest-neighbour ranking of the stored vectors overlap the graph load
+    and keyword scan, so candidates() has the keyword and semantic
+    candidates ready when the LLM classification starts. The vector is
+    then stored for the committed node instead of embedding it again.
+    """
+
+    def __init__(self, session_dir: Path, summary: str, graph=None):
+        from .embed import embed_node, DEFAULT_EMBED_MODEL
+        from .linker import SEMANTIC_CANDIDATES, SEMANTIC_MIN_SCORE
+
+        # Extra hits: some will be inactive, unlinkable or keyword candidates already
+        self._top_k = 4 * SEMANTIC_CANDIDATES
+        self._min_score = SEMANTIC_MIN_SCORE
+        self._embeddings: dict | None = None  # Set by _neighbours
+        # Read on this thread: callers may hold graph.lock while we wait
+        embeddings = graph.embeddings if graph is not None else None
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="oi-prefetch")
+        self._vector = pool.submit(contextvars.copy_context().run,
+                                   embed_node, {"summary": summary}, DEFAULT_EMBED_MODEL)
+        stored = None
+        if graph is None:
+            stored = pool.submit(contextvars.copy_context().run, _load_embeddings_safe, session_dir)
+        self._hits = pool.submit(contextvars.copy_context().run, self._neighbours, stored, embeddings)
+        pool.shutdown(wait=False)
+
+    def vector(self) -> list[float] | None:
+        """The node's embedding (None if embedding failed)."""
+        try:
+            return self._vector.result()
+        except Exception:
+            return None
+
+    def _neighbours(self, stored, embeddings: dict | None) -> list[dict]:
+        from .embed import rank_vectors, DEFAULT_EMBED_MODEL
+
+        vector = self.vector()
+        if not vector:
+            return []
+        if stored is not None:
+            embeddings = stored.result()
+        if not embeddings or embeddings.get("model") != DEFAULT_EMBED_MODEL:
+            return []
+        self._embeddings = embeddings
+        return rank_vectors(vector, embeddings["vectors"], self._top_k, self._min_score)
+
+    def candidates(self, node: dict, knowledge: dict) -> list[dict]:
+        """Keyword candidates for node, then its semantic neighbours."""
+        from .linker import find_candidates, semantic_candidates
+
+        keyword = find_candidates(node, knowledge)
+        try:
+            hits = self._hits.result()
+        except Exception:
+            hits = []
+        return keyword + semantic_candidates(
+            node, knowledge, hits, exclude_ids={c["node"]["id"] for c in keyword})
+
+    def vectors(self, node_id: str) -> Mapping[str, list[float]] | None:
+        """Stored vectors plus the node's, for linker.triage_candidates (after candidates())."""
+        vector = self.vector()
+        if not vector or self._embeddings is None:
+            return None
+        return ChainMap({node_id: vector}, self._embeddings["vectors"])
+
+
+def _link_node(node: dict, knowledge: dict, model: str, prefetch: _LinkPrefetch = None) -> list[dict]:
+    """The LLM half of auto-linking: classify node against the graph (read-only).
+
+    With a prefetch, its keyword and semantic candidates are classified,
+    and its vectors let embedding triage settle clear-cut pairs.
+    Best-effort: linking failure yields no links.
+    """
+    try:
+        from .linker import run_linking
+        if prefetch is None:
+            return run_linking(node, knowledge, model=model)
+        candidates = prefetch.candidates(node, knowledge)
+        return run_linking(node, knowledge, model=model, candidates=candidates,
+                           vectors=prefetch.vectors(node["id"]))
+    except Exception:
+        return []
+
+
+def _apply_links(
+    node: dict,
+    knowledge: dict,
+    link_results: list[dict],
+    now: str,
+    superseded_ids: set = frozenset(),
+) -> list[dict]:
+    """Add classified links for a just-appended node to the in-memory graph. Returns the links added."""
+    node_id = node["id"]
+    auto_edges = []
+    existing_targets = {e["target"] for e in knowledge["edges"] if e["source"] == node_id}
+    for lr in link_results:
+        # Skip linking against superseded nodes
+        if lr["target_id"] in superseded_ids:
+            continue
+        if lr["target_id"] not in existing_targets:
             knowledge["edges"].append({
                 "source": node_id,
-                "target": target_id,
-                "type": edge_type,
+                "target": lr["target_id"],
+                "type": lr["edge_type"],
+                "reasoning": lr.get("reasoning", ""),
                 "created": now,
             })
+            existing_targets.add(lr["target_id"])
+            # Include target_summary for contradictions
+            if lr["edge_type"] == "contradicts":
+                for n in knowledge["nodes"]:
+                    if n["id"] == lr["target_id"]:
+                        lr["target_summary"] = n.get("summary", "")
+                        break
+            auto_edges.append(lr)
+            if lr["edge_type"] == "contradicts":
+                node["has_contradiction"] = True
+                for n in knowledge["nodes"]:
+                    if n["id"] == lr["target_id"]:
+                        n["has_contradiction"] = True
+    return auto_edges
+
+
+def _link_pending(
+    session_dir: Path,
+    node: dict,
+    model: str,
+    supersedes: list = None,
+    prefetch: _LinkPrefetch = None,
+    graph=None,
+) -> list[dict]:
+    """Classify links for a not-yet-added node against a snapshot of the graph.
 
-    # Auto-linking: find candidates and classify relationships
-    auto_edges = []
+    Runs ahead of the graph write, so the LLM call is neither repeated on a
+    write conflict nor made under the session lock.
+    """
+    knowledge = graph.knowledge if graph is not None else _load_knowledge(session_dir)
+    if supersedes:
+        # Candidates as the committed graph will have them: superseded nodes inactive
+        superseded_ids = set(supersedes)
+        knowledge = {**knowledge, "nodes": [
+            {**n, "status": "superseded"} if n["id"] in superseded_ids else n
+            for n in knowledge.get("nodes", [])
+        ]}
+    return _link_node(node, knowledge, model, prefetch=prefetch)
+
+
+def _embed_new_nodes(session_dir: Path, nodes: list[dict]) -> None:
+    """Embed nodes and store the vectors in one embeddings save (best-effort)."""
+    try:
+        from .embed import embed_node, DEFAULT_EMBED_MODEL
+        vecs = {}
+        for node in nodes:
+            vec = embed_node(node, DEFAULT_EMBED_MODEL)
+            if vec:
+                vecs[node["id"]] = vec
+        _store_vectors(session_dir, vecs)
+    except Exception:
+        pass  # Embedding failure doesn't block node addition
+
+
+def _store_vectors(session_dir: Path, vecs: dict[str, list[float]]) -> None:
+    """Merge {node_id: vector} into embeddings.json (best-effort)."""
+    if not vecs:
+        return
+    try:
+        from .embed import load_embeddings, save_embeddings, DEFAULT_EMBED_MODEL
+        with session_lock(session_dir):
+            emb_data = load_embeddings(session_dir)
+            if emb_data["model"] and emb_data["model"] != DEFAULT_EMBED_MODEL:
+                emb_data = {"model": DEFAULT_EMBED_MODEL, "vectors": {}}
+            emb_data["model"] = DEFAULT_EMBED_MODEL
+            emb_data["vectors"].update(vecs)
+            save_embeddings(session_dir, emb_data)
+    except Exception:
+        pass  # Embedding failure doesn't block node addition
+
+
+def prepare_knowledge(
+    session_dir: Path,
+    node_type: str,
+    summary: str,
+    model: str = None,
+    supersedes: list = None,
+    skip_linking: bool = False,
+    skip_embed: bool = False,
+    graph=None,
+    **node_fields,
+) -> dict:
+    """The LLM-bound half of add_knowledge, run ahead of the graph commit.
+
+    Classifies links for the would-be node against a lock-free snapshot of
+    the graph (keyword and, once its summary is embedded, semantic
+    candidates) and embeds its summary. Nothing is written, so several can
+    run concurrently; add_knowledge(prepared=...) then commits without
+    further LLM or embedding calls. Nodes prepared together are not linked
+    to each other.
+
+    node_fields are the remaining add_knowledge node fields (source, voice,
+    session_id, ...), which linking takes into account.
+    """
+    from .llm import DEFAULT_MODEL
+
+    node = _build_node(f"{node_type}-pending", node_type, summary, datetime.now().isoformat(), **node_fields)
+    prepared = {"link_results": [], "vector": None}
+    prefetch = None
+    if not skip_linking and not skip_embed:
+        prefetch = _LinkPrefetch(session_dir, summary, graph)
     if not skip_linking:
+        prepared["link_results"] = _link_pending(
+            session_dir, node, model or DEFAULT_MODEL, supersedes, prefetch, graph,
+        )
+    if prefetch is not None:
+        prepared["vector"] = prefetch.vector()
+    elif not skip_embed:
         try:
-            from .linker import run_linking
-            link_results = run_linking(node, knowledge, model=model or DEFAULT_MODEL)
-            existing_targets = {e["target"] for e in knowledge["edges"] if e["source"] == node_id}
-            for lr in link_results:
-                # Skip linking against superseded nodes
-                if lr["target_id"] in superseded_ids:
-                    continue
-                if lr["target_id"] not in existing_targets:
+            from .embed import embed_node, DEFAULT_EMBED_MODEL
+            prepared["vector"] = embed_node(node, DEFAULT_EMBED_MODEL)
+        except Exception:
+            pass  # Embedded after the commit instead
+    return prepared
+
+
+def add_knowledge(
+    session_dir: Path,
+    node_type: str,
+    summary: str,
+    source: str = None,
+    related_to: list = None,
+    edge_type: str = "supports",
+    model: str = None,
+    supersedes: list = None,
+    session_id: str = None,
+    abstraction_level: int = None,
+    instance_count: int = None,
+    reasoning: str = None,
+    provenance_uri: str = None,
+    voice: str = None,
+    authored_at: str = None,
+    source_quote: str = None,
+    skip_linking: bool = False,
+    skip_embed: bool = False,
+    graph=None,
+    prepared: dict = None,
+) -> str:
+    """Add a knowledge node to the knowledge graph. Returns JSON result.
+
+    With a warm.WarmGraph the node is added to its in-memory graph and
+    written through, instead of a load/save round trip (callers sharing
+    the graph across threads hold graph.lock).
+
+    With prepared (from prepare_knowledge) the precomputed links and
+    vector are used, so the commit makes no LLM or embedding calls.
+    Otherwise the summary is embedded in the background while the graph
+    loads, and linking also considers the node's semantic neighbours.
+    """
+    from .llm import DEFAULT_MODEL
+    from .confidence import compute_confidence
+
+    valid_types = get_node_type_names()
+    if node_type not in valid_types:
+        return json.dumps({"error": f"Invalid node_type '{node_type}'. Must be one of: {', '.join(valid_types)}"})
+
+    prefetch = None
+    if prepared is None and not skip_linking and not skip_embed:
+        prefetch = _LinkPrefetch(session_dir, summary, graph)
+
+    node_fields = dict(
+        source=source,
+        session_id=session_id,
+        abstraction_level=abstraction_level,
+        instance_count=instance_count,
+        reasoning=reasoning,
+        provenance_uri=provenance_uri,
+        voice=voice,
+        authored_at=authored_at,
+        source_quote=source_quote,
+    )
+
+    # Auto-linking: find candidates and classify relationships, before the write
+    link_results = []
+    if prepared is not None:
+        link_results = prepared["link_results"]
+    elif not skip_linking:
+        pending = _build_node(f"{node_type}-pending", node_type, summary, datetime.now().isoformat(), **node_fields)
+        link_results = _link_pending(session_dir, pending, model or DEFAULT_MODEL, supersedes, prefetch, graph)
+
+    # Applied to a fresh graph (and re-run in full) if another writer got in first
+    def apply(knowledge: dict):
+        # Generate ID: type-NNN where NNN is max existing + 1
+        existing_ids = [n["id"] for n in knowledge["nodes"] if n["id"].startswith(f"{node_type}-")]
+        counter = len(existing_ids) + 1
+        node_id = f"{node_type}-{counter:03d}"
+        now = datetime.now().isoformat()
+
+        node = _build_node(node_id, node_type, summary, now, **node_fields)
+        knowledge["nodes"].append(node)
+
+        # Handle supersession: mark old nodes and transfer edges
+        superseded_ids = set()
+        if supersedes:
+            superseded_ids = set(supersedes)
+            for old_node in knowledge["nodes"]:
+                if old_node["id"] in superseded_ids:
+                    old_node["status"] = "superseded"
+                    old_node["superseded_by"] = node_id
+                    old_node["updated"] = now
+                    # Create supersedes edge from new → old
                     knowledge["edges"].append({
                         "source": node_id,
-                        "target": lr["target_id"],
-                        "type": lr["edge_type"],
-                        "reasoning": lr.get("reasoning", ""),
+                        "target": old_node["id"],
+                        "type": "supersedes",
                         "created": now,
                     })
-                    existing_targets.add(lr["target_id"])
-                    # Include target_summary for contradictions
-                    if lr["edge_type"] == "contradicts":
-                        for n in knowledge["nodes"]:
-                            if n["id"] == lr["target_id"]:
-                                lr["target_summary"] = n.get("summary", "")
-                                break
-                    auto_edges.append(lr)
-                    if lr["edge_type"] == "contradicts":
-                        node["has_contradiction"] = True
-                        for n in knowledge["nodes"]:
-                            if n["id"] == lr["target_id"]:
-                                n["has_contradiction"] = True
-        except Exception:
-            pass  # Best-effort: linking failure doesn't block knowledge addition
+                    # Copy inbound support edges from old node to new node
+                    for edge in list(knowledge["edges"]):
+                        if edge["target"] == old_node["id"] and edge["type"] == "supports":
+                            knowledge["edges"].append({
+                                "source": edge["source"],
+                                "target": node_id,
+                                "type": "supports",
+                                "created": now,
+                            })
+
+        # Add edges if related_to provided (manual edges)
+        if related_to:
+            for target_id in related_to:
+                knowledge["edges"].append({
+                    "source": node_id,
+                    "target": target_id,
+                    "type": edge_type,
+                    "created": now,
+                })
+
+        # Copies: _apply_links annotates results, and apply may re-run
+        auto_edges = _apply_links(node, knowledge, [dict(lr) for lr in link_results], now, superseded_ids)
+        return (node, auto_edges, knowledge), True
 
-    _save_knowledge(session_dir, knowledge)
+    node, auto_edges, knowledge = update_knowledge(session_dir, apply, graph=graph)
+    node_id = node["id"]
 
     # Embed the new node (best-effort)
     if not skip_embed:
-        try:
-            from .embed import embed_node, load_embeddings, save_embeddings, DEFAULT_EMBED_MODEL
-            vec = embed_node(node, DEFAULT_EMBED_MODEL)
-            if vec:
-                emb_data = load_embeddings(session_dir)
-                if emb_data["model"] and emb_data["model"] != DEFAULT_EMBED_MODEL:
-                    emb_data = {"model": DEFAULT_EMBED_MODEL, "vectors": {}}
-                emb_data["model"] = DEFAULT_EMBED_MODEL
-                emb_data["vectors"][node_id] = vec
-                save_embeddings(session_dir, emb_data)
-        except Exception:
-            pass  # Embedding failure doesn't block node addition
+        if prepared is not None and prepared.get("vector"):
+            _store_vectors(session_dir, {node_id: prepared["vector"]})
+        elif prefetch is not None:
+            vector = prefetch.vector()  # None: embedding failed, don't retry
+            if vector:
+                _store_vectors(session_dir, {node_id: vector})
+        else:
+            _embed_new_nodes(session_dir, [node])
 
     result = {"status": "added", "node_id": node_id, "node_type": node_type, "summary": summary}
     if reasoning:
@@ -345,13 +629,113 @@ def add_knowledge(
         result["edges_created"] = auto_edges
 
     # Compute confidence from current graph state
-    emb = _load_embeddings_safe(session_dir)
-    conf = compute_confidence(node_id, knowledge, embeddings=emb)
+    if graph is not None:
+        conf = dict(graph.confidences.get(node_id, _LOW_CONFIDENCE))
+    else:
+        emb = _load_embeddings_safe(session_dir)
+        conf = compute_confidence(node_id, knowledge, embeddings=emb)
     result["confidence"] = conf
 
     return json.dumps(result)
 
 
+_BULK_FIELDS = (
+    "source", "session_id", "abstraction_level", "instance_count", "reasoning",
+    "provenance_uri", "voice", "authored_at", "source_quote",
+)
+
+
+def add_knowledge_bulk(
+    session_dir: Path,
+    items: list[dict],
+    with_confidence: bool = False,
+    on_written: Callable[[list[str]], object] | None = None,
+) -> list[dict]:
+    """Add many knowledge nodes with a single graph load and save.
+
+    The batch counterpart of add_knowledge(skip_linking=True, skip_embed=True)
+    for ingestion: no auto-linking, no embedding, no supersession. IDs come
+    from a per-type counter seeded once from the graph, so they match what
+    sequential add_knowledge calls would have produced.
+
+    Args:
+        session_dir: Path to the session/knowledge directory.
+        items: Dicts with node_type and summary, plus any of source,
+               reasoning, provenance_uri, voice, authored_at, source_quote,
+               session_id, abstraction_level, instance_count, related_to
+               (node IDs) and edge_type (default "supports").
+        with_confidence: Attach confidence to each result. Computed once for
+                         the whole graph (PageRank), not per node.
+        on_written: Called with the added node IDs right after the save,
+                    still under session_lock (e.g. to record them in an
+                    ingest job before anything else can run).
+
+    Returns:
+        One dict per item, in order — {"status": "added", "node_id", ...}
+        like add_knowledge, or {"error": ...} for items that failed validation.
+    """
+    valid_types = get_node_type_names()
+
+    def apply(knowledge: dict):
+        now = datetime.now().isoformat()
+        counters: dict[str, int] = {}
+
+        results: list[dict] = []
+        added: list[dict] = []
+        for item in items:
+            node_type = item.get("node_type", "")
+            summary = item.get("summary", "")
+            if node_type not in valid_types:
+                results.append({"error": f"Invalid node_type '{node_type}'. Must be one of: {', '.join(valid_types)}"})
+                continue
+            if not isinstance(summary, str) or not summary.strip():
+                results.append({"error": "Empty summary"})
+                continue
+
+            if node_type not in counters:
+                counters[node_type] = sum(
+                    1 for n in knowledge["nodes"] if n["id"].startswith(f"{node_type}-"))
+            counters[node_type] += 1
+            node_id = f"{node_type}-{counters[node_type]:03d}"
+
+            node = _build_node(
+                node_id, node_type, summary, now,
+                **{k: item.get(k) for k in _BULK_FIELDS},
+            )
+            knowledge["nodes"].append(node)
+            for target_id in item.get("related_to") or []:
+                knowledge["edges"].append({
+                    "source": node_id,
+                    "target": target_id,
+                    "type": item.get("edge_type", "supports"),
+                    "created": now,
+                })
+
+            result = {"status": "added", "node_id": node_id, "node_type": node_type, "summary": summary}
+            if item.get("reasoning"):
+                result["reasoning"] = item["reasoning"]
+            if item.get("provenance_uri"):
+                result["provenance_uri"] = item["provenance_uri"]
+            results.append(result)
+            added.append(result)
+        return (results, added, knowledge), bool(added)
+
+    with session_lock(session_dir) if on_written else nullcontext():
+        results, added, knowledge = update_knowledge(session_dir, apply)
+        if on_written and added:
+            on_written([r["node_id"] for r in added])
+
+    if with_confidence and added:
+        from .confidence import compute_all_confidences
+
+        all_conf = compute_all_confidences(knowledge, embeddings=_load_embeddings_safe(session_dir))
+        for result in added:
+            if result["node_id"] in all_conf:
+                result["confidence"] = all_conf[result["node_id"]]
+
+    return results
+
+
 def remove_edge(
     session_dir: Path,
     source_id: str,
@@ -359,37 +743,38 @@ def remove_edge(
     edge_type: str = None,
 ) -> str:
     """Remove an edge from the knowledge graph. Returns JSON result."""
-    knowledge = _load_knowledge(session_dir)
+    def apply(knowledge: dict):
+        remaining = []
+        removed = []
+        for edge in knowledge["edges"]:
+            if edge["source"] == source_id and edge["target"] == target_id:
+                if edge_type is None or edge["type"] == edge_type:
+                    removed.append(edge)
+                    continue
+            remaining.append(edge)
 
-    original_count = len(knowledge["edges"])
-    remaining = []
-    removed = []
-    for edge in knowledge["edges"]:
-        if edge["source"] == source_id and edge["target"] == target_id:
-            if edge_type is None or edge["type"] == edge_type:
-                removed.append(edge)
-                continue
-        remaining.append(edge)
+        if not removed:
+            return removed, False
 
+        knowledge["edges"] = remaining
+
+        # Clear has_contradiction flags if no contradicts edges remain
+        for node in knowledge["nodes"]:
+            if node["id"] in (source_id, target_id) and node.get("has_contradiction"):
+                still_contested = any(
+                    e["type"] == "contradicts" and
+                    (e["source"] == node["id"] or e["target"] == node["id"])
+                    for e in remaining
+                )
+                if not still_contested:
+                    del node["has_contradiction"]
+        return removed, True
+
+    removed = update_knowledge(session_dir, apply)
     if not removed:
         return json.dumps({"error": f"No edge found from {source_id} to {target_id}"
                            + (f" of type '{edge_type}'" if edge_type else "")})
 
-    knowledge["edges"] = remaining
-
-    # Clear has_contradiction flags if no contradicts edges remain
-    for node in knowledge["nodes"]:
-        if node["id"] in (source_id, target_id) and node.get("has_contradiction"):
-            still_contested = any(
-                e["type"] == "contradicts" and
-                (e["source"] == node["id"] or e["target"] == node["id"])
-                for e in remaining
-            )
-            if not still_contested:
-                del node["has_contradiction"]
-
-    _save_knowledge(session_dir, knowledge)
-
     return json.dumps({
         "status": "removed",
         "removed_count": len(removed),
@@ -425,54 +810,54 @@ def reclassify_edge(
     Returns:
         JSON string with result.
     """
-    knowledge = _load_knowledge(session_dir)
     now = datetime.now().isoformat()
-
-    # Find the edge (check both directions for undirected edge types)
-    found = None
-    for edge in knowledge["edges"]:
-        if edge.get("type") != old_type:
-            continue
-        if (edge["source"] == source_id and edge["target"] == target_id) or \
-           (edge["source"] == target_id and edge["target"] == source_id):
-            found = edge
-            break
-
+    if review_text and not review_filename:
+        review_filename = f"{source_id}-{target_id}.md"
+    provenance_uri = f"review://{review_filename}" if review_text else ""
+
+    def apply(knowledge: dict):
+        # Find the edge (check both directions for undirected edge types)
+        found = None
+        for edge in knowledge["edges"]:
+            if edge.get("type") != old_type:
+                continue
+            if (edge["source"] == source_id and edge["target"] == target_id) or \
+               (edge["source"] == target_id and edge["target"] == source_id):
+                found = edge
+                break
+
+        if not found:
+            return None, False
+
+        # Reclassify
+        found["type"] = new_type
+        found["reasoning"] = reasoning
+        found["reviewed_at"] = now
+        if provenance_uri:
+            found["provenance_uri"] = provenance_uri
+
+        # Clean has_contradiction flags if old_type was contradicts
+        if old_type == "contradicts":
+            for node in knowledge["nodes"]:
+                if node["id"] in (source_id, target_id) and node.get("has_contradiction"):
+                    still_contested = any(
+                        e["type"] == "contradicts" and
+                        (e["source"] == node["id"] or e["target"] == node["id"])
+                        for e in knowledge["edges"]
+                    )
+                    if not still_contested:
+                        del node["has_contradiction"]
+        return found, True
+
+    found = update_knowledge(session_dir, apply)
     if not found:
         return json.dumps({"error": f"No {old_type} edge found between {source_id} and {target_id}"})
 
     # Save review provenance file
-    provenance_uri = ""
     if review_text:
         reviews_dir = session_dir / "reviews"
         reviews_dir.mkdir(exist_ok=True)
-        if not review_filename:
-            review_filename = f"{source_id}-{target_id}.md"
-        review_path = reviews_dir / review_filename
-        review_path.write_text(review_text, encoding="utf-8")
-        provenance_uri = f"review://{review_filename}"
-
-    # Reclassify
-    old_reasoning = found.get("reasoning", "")
-    found["type"] = new_type
-    found["reasoning"] = reasoning
-    found["reviewed_at"] = now
-    if provenance_uri:
-        found["provenance_uri"] = provenance_uri
-
-    # Clean has_contradiction flags if old_type was contradicts
-    if old_type == "contradicts":
-        for node in knowledge["nodes"]:
-            if node["id"] in (source_id, target_id) and node.get("has_contradiction"):
-                still_contested = any(
-                    e["type"] == "contradicts" and
-                    (e["source"] == node["id"] or e["target"] == node["id"])
-                    for e in knowledge["edges"]
-                )
-                if not still_contested:
-                    del node["has_contradiction"]
-
-    _save_knowledge(session_dir, knowledge)
+        (reviews_dir / review_filename).write_text(review_text, encoding="utf-8")
 
     return json.dumps({
         "status": "reclassified",
@@ -516,44 +901,45 @@ def mark_reviewed(
     Returns:
         JSON string with result.
     """
-    knowledge = _load_knowledge(session_dir)
     now = datetime.now().isoformat()
-
-    # Find the edge (check both directions)
-    found = None
-    for edge in knowledge["edges"]:
-        if edge.get("type") != edge_type:
-            continue
-        if (edge["source"] == source_id and edge["target"] == target_id) or \
-           (edge["source"] == target_id and edge["target"] == source_id):
-            found = edge
-            break
-
+    if review_text and not review_filename:
+        review_filename = f"{source_id}-{target_id}-review.md"
+    provenance_uri = f"review://{review_filename}" if review_text else ""
+
+    def apply(knowledge: dict):
+        # Find the edge (check both directions)
+        found = None
+        for edge in knowledge["edges"]:
+            if edge.get("type") != edge_type:
+                continue
+            if (edge["source"] == source_id and edge["target"] == target_id) or \
+               (edge["source"] == target_id and edge["target"] == source_id):
+                found = edge
+                break
+
+        if not found:
+            return None, False
+
+        # Annotate edge
+        found["reviewed_at"] = now
+        found["review_status"] = review_status
+        if notes:
+            found["review_notes"] = notes
+        if provenance_uri:
+            found["provenance_uri"] = provenance_uri
+        if effort:
+            found["effort"] = effort
+        return found, True
+
+    found = update_knowledge(session_dir, apply)
     if not found:
         return json.dumps({"error": f"No {edge_type} edge found between {source_id} and {target_id}"})
 
     # Save review provenance file
-    provenance_uri = ""
     if review_text:
         reviews_dir = session_dir / "reviews"
         reviews_dir.mkdir(exist_ok=True)
-        if not review_filename:
-            review_filename = f"{source_id}-{target_id}-review.md"
-        review_path = reviews_dir / review_filename
-        review_path.write_text(review_text, encoding="utf-8")
-        provenance_uri = f"review://{review_filename}"
-
-    # Annotate edge
-    found["reviewed_at"] = now
-    found["review_status"] = review_status
-    if notes:
-        found["review_notes"] = notes
-    if provenance_uri:
-        found["provenance_uri"] = provenance_uri
-    if effort:
-        found["effort"] = effort
-
-    _save_knowledge(session_dir, knowledge)
+        (reviews_dir / review_filename).write_text(review_text, encoding="utf-8")
 
     return json.dumps({
         "status": "reviewed",
@@ -684,22 +1070,26 @@ def correct_terminology(
             pass  # Fall through to default related_to
 
     # Step 4: Create edge between corrected node and conflicting node
+    # (on the current graph: the classification above ran against a snapshot)
     now = datetime.now().isoformat()
-    knowledge["edges"].append({
-        "source": new_node_id,
-        "target": conflicting_node_id,
-        "type": new_edge_type,
-        "reasoning": link_reasoning or f"Re-assessed after terminology correction of {node_id}",
-        "created": now,
-    })
-
-    # Update has_contradiction flags
-    if new_edge_type == "contradicts":
-        for n in knowledge["nodes"]:
-            if n["id"] in (new_node_id, conflicting_node_id):
-                n["has_contradiction"] = True
 
-    _save_knowledge(session_dir, knowledge)
+    def apply(knowledge: dict):
+        knowledge["edges"].append({
+            "source": new_node_id,
+            "target": conflicting_node_id,
+            "type": new_edge_type,
+            "reasoning": link_reasoning or f"Re-assessed after terminology correction of {node_id}",
+            "created": now,
+        })
+
+        # Update has_contradiction flags
+        if new_edge_type == "contradicts":
+            for n in knowledge["nodes"]:
+                if n["id"] in (new_node_id, conflicting_node_id):
+                    n["has_contradiction"] = True
+        return None, True
+
+    update_knowledge(session_dir, apply)
 
     # Step 5: Save review provenance
     if review_text:
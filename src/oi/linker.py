@@ -1,25 +1,30 @@
 """Node linking: find related knowledge nodes and classify relationships.
 
-Three-stage pipeline:
+Four-stage pipeline:
 1. Auto-link same-group nodes (same conversation/document) as related_to — zero LLM cost
-2. Candidate retrieval via keyword overlap (Jaccard similarity), excluding same-group nodes
-3. LLM classification of cross-group pairs as supports/contradicts/none
+2. Candidate retrieval via keyword overlap (Jaccard similarity), excluding same-group nodes;
+   add_knowledge adds the new node's embedding neighbours (semantic_candidates)
+3. Embedding triage: clearly unrelated pairs → none, near-identical same-type
+   pairs → related_to, both without an LLM call (triage_candidates)
+4. LLM classification of the remaining cross-group pairs as supports/contradicts/none
 
 Also provides batch linking for ingested document nodes (Slice 13c).
 """
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Mapping
 
 from pydantic import BaseModel
 
 from .decay import extract_keywords
+from .embed import DEFAULT_EMBED_MODEL, cosine_similarity, load_embeddings
 from .llm import chat
 from .schemas import get_linkable_edge_types, load_schema
 from .search import graph_walk
-from .state import _load_knowledge, _save_knowledge
+from .state import _load_knowledge, update_knowledge
 
 
 def _node_type_is_linkable(node_type: str) -> bool:
@@ -46,6 +51,29 @@ def _get_provenance_group(node: dict) -> str:
     return uri.split("#")[0]
 
 
+# Embedding neighbours a prefetch adds to the keyword candidates (knowledge._LinkPrefetch)
+SEMANTIC_CANDIDATES = 4
+SEMANTIC_MIN_SCORE = 0.5
+
+# Embedding triage: cosine below TRIAGE_UNRELATED is "none", at or above
+# TRIAGE_DUPLICATE (same node type) a paraphrase → "related_to". The paraphrase
+# line matches confidence._COSINE_PARAPHRASE. Recalibrate per embedding model
+# with OI_LINK_TRIAGE_UNRELATED / OI_LINK_TRIAGE_DUPLICATE.
+TRIAGE_UNRELATED = float(os.environ.get("OI_LINK_TRIAGE_UNRELATED", 0.30))
+TRIAGE_DUPLICATE = float(os.environ.get("OI_LINK_TRIAGE_DUPLICATE", 0.95))
+
+
+class LinkingResult(BaseModel):
+    """Result of a batch linking operation."""
+
+    edges_created: int = 0
+    contradictions_found: int = 0
+    nodes_processed: int = 0
+    nodes_skipped: int = 0
+    classifications_avoided: int = 0  # pairs settled by embedding triage, not the LLM
+    errors: list[str] = []
+
+
 def auto_link_same_group(
     node_ids: list[str],
     session_dir: Path,
@@ -62,62 +90,54 @@ def auto_link_same_group(
     if not node_ids:
         return LinkingResult()
 
-    graph = _load_knowledge(session_dir)
-    nodes_by_id = {n["id"]: n for n in graph.get("nodes", [])}
-    node_id_set = set(node_ids)
-
-    # Index existing edges
-    seen_pairs: set[frozenset] = set()
-    for edge in graph.get("edges", []):
-        seen_pairs.add(frozenset({edge["source"], edge["target"]}))
-
-    # Group nodes by provenance
-    groups: dict[str, list[str]] = {}
-    for nid in node_ids:
-        node = nodes_by_id.get(nid)
-        if not node:
-            continue
-        if not _node_type_is_linkable(node.get("type", "")):
-            continue
-        group_key = _get_provenance_group(node)
-        if group_key:
-            groups.setdefault(group_key, []).append(nid)
+    result = LinkingResult(nodes_processed=len(node_ids))
 
-    result = LinkingResult()
-    now = datetime.now().isoformat()
+    # Zero LLM calls, so the whole pass runs against the freshest graph
+    def apply(graph: dict):
+        nodes_by_id = {n["id"]: n for n in graph.get("nodes", [])}
 
-    for group_key, members in groups.items():
-        if len(members) < 2:
-            continue
-        # Create related_to edges between all pairs in this group
-        for i, nid_a in enumerate(members):
-            for nid_b in members[i + 1:]:
-                pair = frozenset({nid_a, nid_b})
-                if pair in seen_pairs:
-                    continue
-                seen_pairs.add(pair)
-                graph.setdefault("edges", []).append({
-                    "source": nid_a,
-                    "target": nid_b,
-                    "type": "related_to",
-                    "reasoning": "Same source context",
-                    "created": now,
-                })
-                result.edges_created += 1
-
-    result.nodes_processed = len(node_ids)
-    _save_knowledge(session_dir, graph)
-    return result
+        # Index existing edges
+        seen_pairs: set[frozenset] = set()
+        for edge in graph.get("edges", []):
+            seen_pairs.add(frozenset({edge["source"], edge["target"]}))
 
+        # Group nodes by provenance
+        groups: dict[str, list[str]] = {}
+        for nid in node_ids:
+            node = nodes_by_id.get(nid)
+            if not node:
+                continue
+            if not _node_type_is_linkable(node.get("type", "")):
+                continue
+            group_key = _get_provenance_group(node)
+            if group_key:
+                groups.setdefault(group_key, []).append(nid)
 
-class LinkingResult(BaseModel):
-    """Result of a batch linking operation."""
+        result.edges_created = 0
+        now = datetime.now().isoformat()
 
-    edges_created: int = 0
-    contradictions_found: int = 0
-    nodes_processed: int = 0
-    nodes_skipped: int = 0
-    errors: list[str] = []
+        for group_key, members in groups.items():
+            if len(members) < 2:
+                continue
+            # Create related_to edges between all pairs in this group
+            for i, nid_a in enumerate(members):
+                for nid_b in members[i + 1:]:
+                    pair = frozenset({nid_a, nid_b})
+                    if pair in seen_pairs:
+                        continue
+                    seen_pairs.add(pair)
+                    graph.setdefault("edges", []).append({
+                        "source": nid_a,
+                        "target": nid_b,
+                        "type": "related_to",
+                        "reasoning": "Same source context",
+                        "created": now,
+                    })
+                    result.edges_created += 1
+        return None, result.edges_created > 0
+
+    update_knowledge(session_dir, apply)
+    return result
 
 
 def find_candidates(
@@ -195,6 +215,80 @@ def find_candidates(
     return candidates[:max_candidates]
 
 
+def semantic_candidates(
+    new_node: dict,
+    graph: dict,
+    hits: list[dict],
+    exclude_ids: set = frozenset(),
+    max_candidates: int = SEMANTIC_CANDIDATES,
+) -> list[dict]:
+    """Linking candidates from new_node's embedding neighbours.
+
+    hits are [{node_id, score}] by cosine similarity, best first (as from
+    embed.rank_vectors). Keeps active, linkable nodes other than new_node
+    and exclude_ids (e.g. the keyword candidates), in find_candidates'
+    {node, score} form.
+    """
+    nodes_by_id = {n["id"]: n for n in graph.get("nodes", []) if n.get("status") == "active"}
+    candidates = []
+    for hit in hits:
+        node = nodes_by_id.get(hit["node_id"])
+        if node is None or node["id"] == new_node.get("id") or node["id"] in exclude_ids:
+            continue
+        if not _node_type_is_linkable(node.get("type", "")):
+            continue
+        candidates.append({"node": node, "score": hit["score"]})
+        if len(candidates) >= max_candidates:
+            break
+    return candidates
+
+
+def triage_candidates(
+    new_node: dict,
+    candidates: list[dict],
+    vectors: Mapping[str, list[float]] | None,
+    unrelated: float = TRIAGE_UNRELATED,
+    duplicate: float = TRIAGE_DUPLICATE,
+) -> tuple[list[dict], list[dict]]:
+    """Split candidates into (ambiguous, decided) by embedding similarity.
+
+    decided holds classifications for the clear-cut pairs, in
+    batch_link_nodes' {target_id, edge_type, reasoning} form: cosine below
+    unrelated → "none"; at or above duplicate between nodes of the same
+    type → "related_to" (a paraphrase neither supports nor contradicts).
+    The rest, and pairs missing a vector, are ambiguous: the LLM decides.
+
+    vectors maps node_id → embedding and must include new_node's id.
+    """
+    new_vec = vectors.get(new_node["id"]) if vectors else None
+    if not new_vec:
+        return list(candidates), []
+    paraphrase_type = "related_to" if "related_to" in get_linkable_edge_types() else None
+
+    ambiguous, decided = [], []
+    for c in candidates:
+        node = c["node"]
+        vec = vectors.get(node["id"])
+        score = cosine_similarity(new_vec, vec) if vec else None
+        if score is None:
+            ambiguous.append(c)
+        elif score < unrelated:
+            decided.append({
+                "target_id": node["id"],
+                "edge_type": "none",
+                "reasoning": f"Embedding similarity {score:.2f}: unrelated",
+            })
+        elif score >= duplicate and paraphrase_type and node.get("type") == new_node.get("type"):
+            decided.append({
+                "target_id": node["id"],
+                "edge_type": paraphrase_type,
+                "reasoning": f"Embedding similarity {score:.2f}: near-identical restatement",
+            })
+        else:
+            ambiguous.append(c)
+    return ambiguous, decided
+
+
 def _voice_caps_contradicts(node_a: dict, node_b: dict) -> bool:
     """Return True if voice metadata forbids a contradicts edge between these nodes.
 
@@ -413,14 +507,28 @@ def batch_link_nodes(new_node: dict, candidates: list[dict], model: str) -> list
         return results
 
 
-def run_linking(new_node: dict, graph: dict, model: str, max_candidates: int = 8) -> list[dict]:
-    """Run the full linking pipeline: find candidates then classify all at once.
+def run_linking(
+    new_node: dict,
+    graph: dict,
+    model: str,
+    max_candidates: int = 8,
+    candidates: list[dict] | None = None,
+    vectors: Mapping[str, list[float]] | None = None,
+) -> list[dict]:
+    """Run the full linking pipeline: find candidates, triage, classify the rest at once.
+
+    candidates, if given, replaces the find_candidates step (they must
+    come from graph — e.g. keyword plus semantic candidates). With
+    vectors (node_id → embedding, including new_node's), clear-cut pairs
+    are settled by triage_candidates instead of the LLM.
 
     Returns list of edges (excluding "none"):
     [{"target_id": str, "edge_type": str, "reasoning": str}, ...]
     """
-    candidates = find_candidates(new_node, graph, max_candidates)
-    results = batch_link_nodes(new_node, candidates, model)
+    if candidates is None:
+        candidates = find_candidates(new_node, graph, max_candidates)
+    ambiguous, decided = triage_candidates(new_node, candidates, vectors)
+    results = decided + batch_link_nodes(new_node, ambiguous, model)
     return [r for r in results if r["edge_type"] != "none"]
 
 
@@ -433,9 +541,10 @@ def link_new_nodes(
 ) -> LinkingResult:
     """Link a batch of nodes with full graph visibility.
 
-    For each node_id, finds candidates among ALL graph nodes, classifies
-    relationships via LLM, creates edges, and flags contradictions.
-    Deduplicates symmetric pairs (A→B == B→A).
+    For each node_id, finds candidates among ALL graph nodes, settles
+    clear-cut pairs by embedding similarity (triage_candidates, using the
+    stored embeddings), classifies the rest via LLM, creates edges, and
+    flags contradictions. Deduplicates symmetric pairs (A→B == B→A).
 
     Args:
         node_ids: IDs of nodes to link.
@@ -457,12 +566,15 @@ def link_new_nodes(
     graph = _load_knowledge(session_dir)
     nodes_by_id = {n["id"]: n for n in graph.get("nodes", [])}
     seen_pairs: set[frozenset] = set()
+    embeddings = load_embeddings(session_dir)
+    vectors = embeddings["vectors"] if embeddings["model"] == DEFAULT_EMBED_MODEL else None
 
     # Index existing edges to avoid duplicates
     for edge in graph.get("edges", []):
         seen_pairs.add(frozenset({edge["source"], edge["target"]}))
 
     result = LinkingResult()
+    planned: list[dict] = []
     total = len(node_ids)
 
     for i, node_id in enumerate(node_ids):
@@ -488,7 +600,9 @@ def link_new_nodes(
                     progress_fn(i + 1, total, node_id)
                 continue
 
-            classifications = batch_link_nodes(node, candidates, model)
+            ambiguous, decided = triage_candidates(node, candidates, vectors)
+            result.classifications_avoided += len(decided)
+            classifications = decided + batch_link_nodes(node, ambiguous, model)
 
             for cls in classifications:
                 if cls["edge_type"] == "none":
@@ -505,16 +619,9 @@ def link_new_nodes(
                     "type": cls["edge_type"],
                     "reasoning": cls.get("reasoning", ""),
                 }
+                # Later nodes' graph walks see it; applied to the saved graph below
                 graph.setdefault("edges", []).append(edge)
-                result.edges_created += 1
-
-                if cls["edge_type"] == "contradicts":
-                    result.contradictions_found += 1
-                    # Flag both nodes
-                    for nid in (node_id, cls["target_id"]):
-                        n = nodes_by_id.get(nid)
-                        if n:
-                            n["has_contradiction"] = True
+                planned.append(edge)
 
             result.nodes_processed += 1
 
@@ -525,5 +632,25 @@ def link_new_nodes(
         if progress_fn:
             progress_fn(i + 1, total, node_id)
 
-    _save_knowledge(session_dir, graph)
+    # The LLM work ran on a snapshot: apply its edges to the current graph,
+    # so writes that landed meanwhile are kept rather than conflicting
+    def apply(current: dict):
+        result.edges_created = result.contradictions_found = 0
+        current_nodes = {n["id"]: n for n in current.get("nodes", [])}
+        current_pairs = {frozenset({e["source"], e["target"]}) for e in current.get("edges", [])}
+        for edge in planned:
+            pair = frozenset({edge["source"], edge["target"]})
+            if pair in current_pairs or edge["source"] not in current_nodes or edge["target"] not in current_nodes:
+                continue
+            current_pairs.add(pair)
+            current.setdefault("edges", []).append(dict(edge))
+            result.edges_created += 1
+            if edge["type"] == "contradicts":
+                result.contradictions_found += 1
+                # Flag both nodes
+                for nid in pair:
+                    current_nodes[nid]["has_contradiction"] = True
+        return None, result.edges_created > 0
+
+    update_knowledge(session_dir, apply)
     return result
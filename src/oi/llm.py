@@ -2,10 +2,12 @@
 
 import json
 import os
+import time
 from datetime import datetime, timezone
-from pathlib import Path
-from litellm import completion, get_model_info
+from types import SimpleNamespace
+from litellm import Message, completion, cost_per_token, get_model_info
 
+from . import llm_log, metrics, scheduler, tracing
 from .schemas import get_extractable_types, build_extraction_type_list
 
 
@@ -25,29 +27,108 @@ def get_max_input_tokens(model: str = None) -> int:
         return 8192
 
 
-def _log_llm_call(phase: str, model: str, messages: list[dict], response: str, meta: dict | None = None) -> None:
-    """Append one JSONL line to {OI_SESSION_DIR}/llm_log.jsonl. Silently fails on error."""
-    session_dir = os.environ.get("OI_SESSION_DIR") or str(Path.home() / ".oi")
-    if not session_dir:
-        return
+def _log_llm_call(phase: str, model: str, messages: list[dict], response: str, meta: dict | None = None, stats: dict | None = None) -> None:
+    """Queue one entry for {session_dir}/llm_log.jsonl. Silently fails on error.
+
+    The session dir is llm_log.log_dir(): the tenant's under the session
+    server, else OI_SESSION_DIR. The prompt is stored deduplicated (see
+    llm_log); read entries back with llm_log.read_llm_log. stats
+    (latency_ms, prompt_tokens, completion_tokens, cost_usd) are stored
+    alongside the response.
+    """
     try:
-        path = Path(session_dir) / "llm_log.jsonl"
-        path.parent.mkdir(parents=True, exist_ok=True)
+        session_dir = llm_log.log_dir()
         entry = {
             "ts": datetime.now(timezone.utc).isoformat(),
             "phase": phase,
             "model": model,
-            "prompt": messages,
+            "prompt_refs": [],
             "response": response,
         }
         if meta:
             entry["meta"] = meta
-        with open(path, "a") as f:
-            f.write(json.dumps(entry, default=str) + "\n")
+        if stats:
+            entry.update(stats)
+        # Serialized now: callers keep appending to their messages list
+        blocks = [llm_log.serialize_message(m) for m in messages]
+        llm_log.writer(session_dir).write(entry, blocks)
     except Exception:
         pass
 
 
+def _usage_tokens(usage) -> tuple[int, int]:
+    """(prompt_tokens, completion_tokens) from a litellm usage object; zeros if absent."""
+    prompt = getattr(usage, "prompt_tokens", 0)
+    output = getattr(usage, "completion_tokens", 0)
+    return (
+        prompt if isinstance(prompt, int) else 0,
+        output if isinstance(output, int) else 0,
+    )
+
+
+def _estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float | None:
+    """USD cost from litellm's price map; None if the model has no known price."""
+    if not prompt_tokens and not completion_tokens:
+        return None
+    try:
+        prompt_cost, completion_cost = cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        return float(prompt_cost) + float(completion_cost)
+    except Exception:
+        return None
+
+
+def _record(phase: str | None, model: str, started: float, usage=None, error: bool = False,
+            ticket: scheduler.Ticket | None = None) -> dict:
+    """Record one call in metrics and release its scheduler ticket. Returns the stats for the LLM log entry."""
+    seconds = time.perf_counter() - started
+    prompt_tokens, completion_tokens = _usage_tokens(usage)
+    if ticket is not None:
+        ticket.release(used=(prompt_tokens + completion_tokens) or None)
+    cost = _estimate_cost(model, prompt_tokens, completion_tokens)
+    metrics.record_call(phase, seconds, prompt_tokens, completion_tokens, cost, error=error)
+    tracing.complete("llm", seconds, cat="llm", phase=phase or metrics.UNPHASED, model=model,
+                     prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, error=error)
+    return {
+        "latency_ms": round(seconds * 1000, 1),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": cost,
+    }
+
+
+def _estimate_prompt_tokens(messages: list) -> int:
+    """Rough prompt size (~4 chars per token) for the scheduler's token budget."""
+    chars = 0
+    for m in messages or []:
+        content = m.get("content") if isinstance(m, dict) else getattr(m, "content", None)
+        chars += len(str(content or ""))
+    return chars // 4
+
+
+def _timed_completion(phase: str | None, model: str, **kwargs):
+    """completion() through the scheduler, with an error recorded in metrics if it fails.
+
+    Returns (response, started, ticket): started is when the successful
+    attempt began (queueing and retries excluded); pass ticket to _record.
+    """
+    attempt = {"started": time.perf_counter()}
+
+    def call():
+        attempt["started"] = time.perf_counter()
+        return completion(model=model, **kwargs)
+
+    try:
+        response, ticket = scheduler.get().call(
+            model, call, tokens=_estimate_prompt_tokens(kwargs.get("messages")),
+            on_retry=lambda exc: metrics.record_retry(phase),
+        )
+    except Exception:
+        _record(phase, model, attempt["started"], error=True)
+        raise
+    return response, attempt["started"], ticket
+
+
 def chat(
     messages: list[dict],
     model: str = DEFAULT_MODEL,
@@ -56,13 +137,14 @@ def chat(
     log_meta: dict = None,
 ) -> str:
     """Send messages to LLM and get response text."""
-    kwargs = {"model": model, "messages": messages}
+    kwargs = {"messages": messages}
     if temperature is not None:
         kwargs["temperature"] = temperature
-    response = completion(**kwargs)
+    response, started, ticket = _timed_completion(phase, model, **kwargs)
+    stats = _record(phase, model, started, getattr(response, "usage", None), ticket=ticket)
     text = response.choices[0].message.content
     if phase:
-        _log_llm_call(phase, model, messages, text, log_meta)
+        _log_llm_call(phase, model, messages, text, log_meta, stats)
     return text
 
 
@@ -77,13 +159,87 @@ def chat_with_tools(
 
     Returns the full response message object (may contain tool_calls).
     """
-    response = completion(model=model, messages=messages, tools=tools)
+    response, started, ticket = _timed_completion(phase, model, messages=messages, tools=tools)
+    stats = _record(phase, model, started, getattr(response, "usage", None), ticket=ticket)
     msg = response.choices[0].message
     if phase:
-        _log_llm_call(phase, model, messages, str(msg.content), log_meta)
+        _log_llm_call(phase, model, messages, str(msg.content), log_meta, stats)
     return msg
 
 
+def chat_with_tools_stream(
+    messages: list[dict],
+    tools: list[dict],
+    model: str = DEFAULT_MODEL,
+    phase: str = None,
+    log_meta: dict = None,
+):
+    """Streaming chat_with_tools: a generator yielding content deltas (str).
+
+    Tool-call deltas are buffered by index until the stream ends. The
+    assembled message (same shape as chat_with_tools' return) is the
+    generator's return value: `msg = yield from chat_with_tools_stream(...)`.
+
+    Usage is requested on the stream; providers that still send none are
+    charged a local estimate (see _estimate_stream_usage).
+    """
+    content: list[str] = []
+    calls: dict[int, dict] = {}
+    usage = None
+    stream, started, ticket = _timed_completion(
+        phase, model, messages=messages, tools=tools, stream=True,
+        stream_options={"include_usage": True},
+    )
+    try:
+        for chunk in stream:
+            usage = getattr(chunk, "usage", None) or usage  # Sent on the last chunk, if at all
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content.append(delta.content)
+                yield delta.content
+            for tc in getattr(delta, "tool_calls", None) or []:
+                call = calls.setdefault(tc.index or 0, {
+                    "id": None, "type": "function", "function": {"name": "", "arguments": ""},
+                })
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function is not None:
+                    call["function"]["name"] += tc.function.name or ""
+                    call["function"]["arguments"] += tc.function.arguments or ""
+    except Exception:
+        _record(phase, model, started, usage, error=True, ticket=ticket)
+        raise
+    except GeneratorExit:
+        ticket.release()  # Stream abandoned by the consumer
+        raise
+
+    text = "".join(content)
+    msg = Message(
+        role="assistant",
+        content=text or None,
+        tool_calls=[calls[i] for i in sorted(calls)] or None,
+    )
+    if not any(_usage_tokens(usage)):
+        usage = _estimate_stream_usage(messages, text, calls.values())
+    stats = _record(phase, model, started, usage, ticket=ticket)
+    if phase:
+        _log_llm_call(phase, model, messages, str(msg.content), log_meta, stats)
+    return msg
+
+
+def _estimate_stream_usage(messages: list, text: str, tool_calls) -> SimpleNamespace:
+    """Usage for a stream the provider sent none for (~4 chars per token)."""
+    chars = len(text) + sum(
+        len(c["function"]["name"]) + len(c["function"]["arguments"]) for c in tool_calls
+    )
+    return SimpleNamespace(
+        prompt_tokens=_estimate_prompt_tokens(messages),
+        completion_tokens=chars // 4,
+    )
+
+
 def summarize_effort(effort_content: str, effort_id: str = "", model: str = DEFAULT_MODEL) -> str:
     """Summarize an effort's raw log into a concise paragraph."""
     messages = [
@@ -0,0 +1,285 @@
+"""Buffered, deduplicated writer for the LLM audit log (llm_log.jsonl).
+
+llm._log_llm_call hands each entry to the session's LogWriter and returns;
+a daemon thread appends queued entries in batches, so parallel callers
+never contend on the file.
+
+Prompts are stored by reference. Each message of a prompt is serialized
+once into llm_prompts.jsonl ({"h": hash, "message": ...}) and log entries
+carry "prompt_refs" (the hashes, in order) instead of the full prompt, so
+a system prompt sent thousands of times is stored once. read_llm_log()
+puts the prompts back together.
+
+When llm_log.jsonl passes OI_LLM_LOG_ROTATE_MB (default 256; 0 disables)
+it is moved to llm_log.<timestamp>.jsonl and compressed with
+OI_LLM_LOG_COMPRESSION: "gzip" (default), "zstd" (needs the zstandard
+package; falls back to gzip) or "none". llm_prompts.jsonl is not rotated:
+archived entries still reference it.
+
+Write errors are swallowed: the audit log never breaks an LLM call.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import hashlib
+import io
+import json
+import os
+import queue
+import shutil
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+LOG_FILE = "llm_log.jsonl"
+PROMPTS_FILE = "llm_prompts.jsonl"
+DEFAULT_ROTATE_MB = 256
+MAX_PENDING = 10_000  # Queued entries before callers block
+MAX_BATCH = 500
+
+try:
+    import zstandard
+except ImportError:  # Optional: pip install zstandard
+    zstandard = None
+
+
+def block_hash(block: str) -> str:
+    """Reference for one serialized message."""
+    return hashlib.sha256(block.encode("utf-8")).hexdigest()[:20]
+
+
+def serialize_message(message) -> str:
+    """Canonical JSON for a prompt message (equal messages, equal text)."""
+    return json.dumps(message, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _compression() -> str:
+    choice = os.environ.get("OI_LLM_LOG_COMPRESSION", "gzip").lower()
+    if choice == "zstd" and zstandard is None:
+        return "gzip"
+    return choice if choice in ("gzip", "zstd", "none") else "gzip"
+
+
+def _rotate_bytes() -> int:
+    try:
+        return int(float(os.environ.get("OI_LLM_LOG_ROTATE_MB", DEFAULT_ROTATE_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_ROTATE_MB * 1024 * 1024
+
+
+class LogWriter:
+    """One session dir's log: a queue drained in batches by a daemon thread."""
+
+    def __init__(self, session_dir: Path, rotate_bytes: int | None = None, compression: str | None = None):
+        self.session_dir = Path(session_dir)
+        self.rotate_bytes = _rotate_bytes() if rotate_bytes is None else rotate_bytes
+        self.compression = compression or _compression()
+        self._queue: queue.Queue[tuple[dict, list[str]]] = queue.Queue(maxsize=MAX_PENDING)
+        self._known: set[str] | None = None  # Hashes already in PROMPTS_FILE
+        threading.Thread(target=self._run, name="oi-llm-log", daemon=True).start()
+
+    def write(self, entry: dict, blocks: list[str]) -> None:
+        """Queue entry; blocks are its prompt's serialize_message() strings."""
+        self._queue.put((entry, blocks))
+
+    def flush(self) -> None:
+        """Block until everything queued so far is on disk."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception:
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _known_hashes(self) -> set[str]:
+        if self._known is None:
+            self._known = set()
+            try:
+                with open(self.session_dir / PROMPTS_FILE, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            self._known.add(json.loads(line)["h"])
+                        except (json.JSONDecodeError, KeyError, TypeError):
+                            continue
+            except OSError:
+                pass
+        return self._known
+
+    def _write_batch(self, batch: list[tuple[dict, list[str]]]) -> None:
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        known = self._known_hashes()
+        new: dict[str, str] = {}
+        lines = []
+        for entry, blocks in batch:
+            refs = []
+            for block in blocks:
+                h = block_hash(block)
+                refs.append(h)
+                if h not in known and h not in new:
+                    new[h] = f'{{"h": "{h}", "message": {block}}}\n'
+            entry["prompt_refs"] = refs
+            lines.append(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+        # Prompts first: an entry on disk never references a missing block
+        if new:
+            with open(self.session_dir / PROMPTS_FILE, "a", encoding="utf-8") as f:
+                f.write("".join(new.values()))
+            known.update(new)
+        log_path = self.session_dir / LOG_FILE
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+            size = f.tell()
+        if self.rotate_bytes and size >= self.rotate_bytes:
+            self._rotate(log_path)
+
+    def _rotate(self, log_path: Path) -> None:
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        archive = log_path.with_name(f"{log_path.stem}.{stamp}.jsonl")
+        n = 1
+        while any(archive.with_name(archive.name + ext).exists() for ext in ("", ".gz", ".zst")):
+            archive = log_path.with_name(f"{log_path.stem}.{stamp}_{n}.jsonl")  # Sorts after the first
+            n += 1
+        os.replace(log_path, archive)
+        if self.compression == "none":
+            return
+        if self.compression == "zstd":
+            target = archive.with_name(archive.name + ".zst")
+            with open(archive, "rb") as src, open(target, "wb") as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+        else:
+            target = archive.with_name(archive.name + ".gz")
+            with open(archive, "rb") as src, gzip.open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        archive.unlink()
+
+
+_writers: dict[Path, LogWriter] = {}
+_writers_guard = threading.Lock()
+_log_dir: ContextVar[Path | None] = ContextVar("oi_llm_log_dir", default=None)
+
+
+def log_dir() -> Path:
+    """Session dir LLM calls in this context log to: the one set by
+    using_log_dir (a server tenant), else OI_SESSION_DIR, else ~/.oi/."""
+    current = _log_dir.get()
+    if current is not None:
+        return current
+    return Path(os.environ.get("OI_SESSION_DIR") or Path.home() / ".oi")
+
+
+@contextmanager
+def using_log_dir(session_dir: Path):
+    """Log LLM calls made in this context to session_dir."""
+    token = _log_dir.set(Path(session_dir))
+    try:
+        yield
+    finally:
+        _log_dir.reset(token)
+
+
+def writer(session_dir: Path) -> LogWriter:
+    """The log writer for a session dir (created on first use)."""
+    key = Path(session_dir).absolute()
+    with _writers_guard:
+        w = _writers.get(key)
+        if w is None:
+            w = _writers[key] = LogWriter(key)
+        return w
+
+
+def flush(session_dir: Path | None = None) -> None:
+    """Finish queued writes for session_dir (default: every session)."""
+    with _writers_guard:
+        if session_dir is None:
+            pending = list(_writers.values())
+        else:
+            w = _writers.get(Path(session_dir).absolute())
+            pending = [w] if w is not None else []
+    for w in pending:
+        w.flush()
+
+
+atexit.register(flush)
+
+
+def log_files(session_dir: Path) -> list[Path]:
+    """Rotated archives (oldest first), then the live log if present."""
+    session_dir = Path(session_dir)
+    stem = Path(LOG_FILE).stem
+    archives = sorted(
+        p for p in session_dir.glob(f"{stem}.*.jsonl*")
+        if p.name.endswith((".jsonl", ".jsonl.gz", ".jsonl.zst"))
+    )
+    live = session_dir / LOG_FILE
+    return archives + ([live] if live.exists() else [])
+
+
+def _open_text(path: Path):
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path.name} is zstd-compressed: pip install zstandard")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True),
+                                encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _load_blocks(session_dir: Path) -> dict[str, object]:
+    blocks: dict[str, object] = {}
+    try:
+        with open(Path(session_dir) / PROMPTS_FILE, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    blocks.setdefault(record["h"], record["message"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+    except OSError:
+        pass
+    return blocks
+
+
+def read_llm_log(session_dir: Path, include_rotated: bool = True) -> Iterator[dict]:
+    """Full log entries, oldest first, with "prompt" rebuilt from its refs.
+
+    Flushes this process's pending writes for session_dir first. Entries
+    written before deduplication (with an inline "prompt") pass through;
+    a reference whose block is missing comes back as None.
+    """
+    flush(session_dir)
+    blocks = _load_blocks(session_dir)
+    paths = log_files(session_dir)
+    if not include_rotated:
+        paths = [p for p in paths if p.name == LOG_FILE]
+    for path in paths:
+        with _open_text(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                refs = entry.pop("prompt_refs", None)
+                if refs is not None:
+                    entry = {**{k: v for k, v in entry.items() if k in ("ts", "phase", "model")},
+                             "prompt": [blocks.get(h) for h in refs],
+                             **entry}
+                yield entry
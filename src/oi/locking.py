@@ -0,0 +1,129 @@
+"""Session-dir locking for concurrent writers (CLI, MCP server, scripts).
+
+session_lock(session_dir) is an exclusive lock over one session dir:
+- across processes: fcntl.flock on {session_dir}/.lock (advisory; POSIX).
+  Where fcntl is unavailable only the in-process lock below applies.
+- across threads: a per-directory RLock, so the lock is reentrant within
+  a thread and nested helpers (save inside update) don't deadlock.
+
+Writers hold it only around the final read-check-write of a file; reads
+never take it. Files are replaced atomically (write temp + os.replace), so
+a lock-free reader sees either the old or the new file, never a partial
+one.
+
+Knowledge graph version stamps (state._save_knowledge) build on this to
+detect conflicting writes; GraphConflict is raised when a writer's base
+version is stale.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+LOCK_FILE = ".lock"
+DEFAULT_TIMEOUT = 30.0
+
+
+class GraphConflict(RuntimeError):
+    """The knowledge graph changed on disk since the writer loaded it."""
+
+
+class LockTimeout(TimeoutError):
+    """session_lock could not be acquired in time."""
+
+
+class _DirLock:
+    """Reentrant in-process lock plus the flock held while depth > 0."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.rlock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+    def acquire(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        if not self.rlock.acquire(timeout=timeout):
+            raise LockTimeout(f"Timed out waiting for {self.path}")
+        if self.depth == 0 and fcntl is not None:
+            try:
+                self.fd = self._flock(deadline)
+            except BaseException:
+                self.rlock.release()
+                raise
+        self.depth += 1
+
+    def _flock(self, deadline: float) -> int:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"Timed out waiting for {self.path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+
+    def release(self) -> None:
+        self.depth -= 1
+        if self.depth == 0 and self.fd is not None:
+            try:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            finally:
+                os.close(self.fd)
+                self.fd = None
+        self.rlock.release()
+
+
+_locks: dict[Path, _DirLock] = {}
+_locks_guard = threading.Lock()
+
+
+def _dir_lock(session_dir: Path) -> _DirLock:
+    key = Path(session_dir).resolve()
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = _DirLock(key / LOCK_FILE)
+        return lock
+
+
+@contextmanager
+def session_lock(session_dir: Path, timeout: float = DEFAULT_TIMEOUT):
+    """Hold the session dir's exclusive write lock (reentrant per thread)."""
+    lock = _dir_lock(session_dir)
+    lock.acquire(timeout)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """Write a file via a temp file + os.replace so readers never see a partial write."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "w", encoding=encoding) as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,99 @@
+"""Deferred post-turn maintenance.
+
+process_turn(defer_maintenance=True) hands back the reply as soon as it is
+ready and queues the bookkeeping that used to follow it — embedding new
+nodes, pattern detection, decay checks, reference tracking — as one job
+on the session's worker thread. Jobs run in submission order.
+
+The next turn calls wait() before it builds context, so it always sees
+the state those tasks leave behind: results are the same as running them
+inline. Notices a task returns (auto-collapse and pattern banners) are
+collected for that next turn to show.
+
+A failing task is reported on stderr and skipped; the rest of its job
+still runs. Jobs run in a copy of the submitter's context, so their
+tracing spans and metrics are attributed to the turn that queued them.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import queue
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Callable
+
+Task = Callable[[], "list[str] | None"]
+
+
+class MaintenanceWorker:
+    """One session's serial maintenance queue on a daemon thread."""
+
+    def __init__(self, name: str = "oi-maintenance"):
+        self._queue: queue.Queue[tuple[contextvars.Context, list[Task]]] = queue.Queue()
+        self._notices: list[str] = []
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def submit(self, tasks: list[Task]) -> None:
+        """Queue tasks to run, in order, as one job."""
+        if tasks:
+            self._queue.put((contextvars.copy_context(), list(tasks)))
+
+    def _run(self) -> None:
+        while True:
+            context, tasks = self._queue.get()
+            try:
+                for task in tasks:
+                    try:
+                        notices = context.run(task)
+                    except Exception:
+                        traceback.print_exc(file=sys.stderr)
+                        continue
+                    if notices:
+                        with self._lock:
+                            self._notices.extend(notices)
+            finally:
+                self._queue.task_done()
+
+    def wait(self) -> list[str]:
+        """Block until every queued job has finished. Returns (and clears) their notices."""
+        self._queue.join()
+        with self._lock:
+            notices, self._notices = self._notices, []
+        return notices
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued or running."""
+        return self._queue.unfinished_tasks
+
+
+_workers: dict[Path, MaintenanceWorker] = {}
+_workers_guard = threading.Lock()
+
+
+def worker(session_dir: Path) -> MaintenanceWorker:
+    """The maintenance worker for a session dir (created on first use)."""
+    key = Path(session_dir).resolve()
+    with _workers_guard:
+        w = _workers.get(key)
+        if w is None:
+            w = _workers[key] = MaintenanceWorker(name=f"oi-maintenance-{len(_workers) + 1}")
+        return w
+
+
+def submit(session_dir: Path, tasks: list[Task]) -> None:
+    """Queue a job of maintenance tasks for session_dir."""
+    if tasks:
+        worker(session_dir).submit(tasks)
+
+
+def wait(session_dir: Path) -> list[str]:
+    """Finish session_dir's queued maintenance; returns its notices (if any)."""
+    key = Path(session_dir).resolve()
+    with _workers_guard:
+        w = _workers.get(key)
+    return w.wait() if w is not None else []
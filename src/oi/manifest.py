@@ -0,0 +1,184 @@
+"""Ingest manifest: content hashes for incremental re-ingestion.
+
+Records what was ingested from each document and ChatGPT conversation so
+re-runs can tell unchanged, edited and new content apart:
+
+- Documents are keyed by their base provenance URI (doc://[source/]path).
+  Each entry stores a hash of the raw file, a hash per chunk, and the node
+  IDs extracted from each chunk.
+- Conversations are keyed by their base provenance URI
+  (chatgpt://source/conv-id). Each entry stores ChatGPT's update_time, a
+  content hash over all chunks, and the node IDs extracted from it.
+
+Storage: ingest_manifest.json alongside knowledge.yaml.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Sequence
+
+from .locking import atomic_write_text, session_lock
+from .parser import ParsedDocument
+
+MANIFEST_FILE = "ingest_manifest.json"
+
+
+# === Persistence ===
+
+
+def load_manifest(session_dir: Path) -> dict:
+    """Load the ingest manifest, returning an empty structure if missing or corrupt."""
+    path = session_dir / MANIFEST_FILE
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                data.setdefault("documents", {})
+                data.setdefault("conversations", {})
+                return data
+        except json.JSONDecodeError:
+            pass
+    return {"documents": {}, "conversations": {}}
+
+
+def save_manifest(session_dir: Path, manifest: dict) -> None:
+    """Write the ingest manifest (atomically; see update_manifest)."""
+    session_dir.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(session_dir / MANIFEST_FILE, json.dumps(manifest, indent=1, sort_keys=True))
+
+
+def update_manifest(session_dir: Path, apply: Callable[[dict], object]) -> dict:
+    """Load, apply(manifest) and save under session_lock. Returns the manifest.
+
+    Concurrent ingest jobs each record their own entries without
+    overwriting the others'.
+    """
+    with session_lock(session_dir):
+        manifest = load_manifest(session_dir)
+        apply(manifest)
+        save_manifest(session_dir, manifest)
+    return manifest
+
+
+# === Hashing ===
+
+
+def content_hash(text: str | bytes) -> str:
+    """sha256 hex digest of text (utf-8) or bytes."""
+    if isinstance(text, str):
+        text = text.encode("utf-8")
+    return hashlib.sha256(text).hexdigest()
+
+
+def file_hash(path: str | Path) -> str:
+    """sha256 hex digest of a file's raw bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def chunk_hashes(doc: ParsedDocument) -> dict[str, str]:
+    """Return {chunk_id: content hash} for every chunk in a document."""
+    return {c.chunk_id: content_hash(c.content) for c in doc.chunks}
+
+
+def document_hash(doc: ParsedDocument) -> str:
+    """Hash over all chunk ids and contents, in order."""
+    h = hashlib.sha256()
+    for c in doc.chunks:
+        h.update(c.chunk_id.encode("utf-8"))
+        h.update(b"\0")
+        h.update(c.content.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# === Documents ===
+
+
+def diff_document(entry: dict | None, doc: ParsedDocument) -> tuple[list[str], list[str]]:
+    """Compare a parsed document against its manifest entry.
+
+    Returns (changed_chunk_ids, removed_chunk_ids). New chunks count as
+    changed; with no entry every chunk is changed.
+    """
+    hashes = chunk_hashes(doc)
+    if not entry:
+        return list(hashes), []
+    old = entry.get("chunks", {})
+    changed = [cid for cid, h in hashes.items() if old.get(cid, {}).get("hash") != h]
+    removed = [cid for cid in old if cid not in hashes]
+    return changed, removed
+
+
+def record_document(
+    manifest: dict,
+    doc: ParsedDocument,
+    nodes_by_chunk: dict[str, list[str]],
+    raw_hash: str = "",
+    failed_chunk_ids: Sequence[str] = (),
+) -> dict:
+    """Write/refresh a document entry. Mutates and returns manifest.
+
+    nodes_by_chunk holds node IDs for chunks that were (re-)extracted this
+    run; other chunks keep the node IDs already on record. Failed chunks
+    keep their previous entry (or get none) so the next run retries them.
+    """
+    key = doc.metadata.provenance_uri
+    old_chunks = manifest["documents"].get(key, {}).get("chunks", {})
+    chunks = {}
+    for cid, h in chunk_hashes(doc).items():
+        if cid in failed_chunk_ids:
+            if cid in old_chunks:
+                chunks[cid] = old_chunks[cid]
+            continue
+        if cid in nodes_by_chunk:
+            node_ids = nodes_by_chunk[cid]
+        else:
+            node_ids = old_chunks.get(cid, {}).get("node_ids", [])
+        chunks[cid] = {"hash": h, "node_ids": node_ids}
+
+    manifest["documents"][key] = {
+        "source_path": doc.metadata.source_path,
+        # A partial failure must not let the file-level hash short-circuit a retry
+        "file_hash": "" if failed_chunk_ids else raw_hash,
+        "content_hash": document_hash(doc),
+        "chunks": chunks,
+        "ingested_at": datetime.now().isoformat(),
+    }
+    return manifest
+
+
+# === Conversations ===
+
+
+def conversation_changed(entry: dict | None, doc: ParsedDocument) -> bool:
+    """True if a conversation is new or edited since its manifest entry.
+
+    ChatGPT's update_time is checked first (cheap, and bumps on any edit);
+    the content hash decides when update_time is missing or differs.
+    """
+    if not entry:
+        return True
+    update_time = doc.metadata.update_time
+    if update_time is not None and entry.get("update_time") == update_time:
+        return False
+    return entry.get("content_hash") != document_hash(doc)
+
+
+def record_conversation(manifest: dict, doc: ParsedDocument, node_ids: list[str]) -> dict:
+    """Write/refresh a conversation entry. Mutates and returns manifest."""
+    manifest["conversations"][doc.metadata.provenance_uri] = {
+        "conv_id": doc.metadata.source_path,
+        "update_time": doc.metadata.update_time,
+        "content_hash": document_hash(doc),
+        "node_ids": list(node_ids),
+        "ingested_at": datetime.now().isoformat(),
+    }
+    return manifest
@@ -2,11 +2,21 @@
 
 Thin wrapper — each tool delegates to existing functions in tools.py / knowledge.py.
 Uses stdio transport (Claude Code spawns as subprocess).
+
+The process is long-lived, so knowledge tools share a warm.WarmGraph per
+session dir: the graph, keyword/vector indexes and confidence vector stay
+in memory (reloaded only when the files change on disk) and writes go
+through it. Per-tool latency is exposed by mcp_server_stats.
+
+Ingestion tools run as background jobs (background.BackgroundJobs) and
+return a job ID immediately; mcp_job_status / mcp_job_cancel follow them.
 """
 
 import json
 import os
 import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
 
@@ -16,8 +26,10 @@ load_dotenv()
 
 from mcp.server.fastmcp import FastMCP
 
-from .knowledge import add_knowledge, correct_terminology, query_knowledge, remove_edge
+from . import llm_log
+from .knowledge import add_knowledge, correct_terminology, prepare_knowledge, query_knowledge, remove_edge
 from .provenance import discover_claude_code_chatlog
+from .schemas import get_node_type_names
 from .tools import (
     open_effort,
     close_effort,
@@ -26,19 +38,53 @@ from .tools import (
     reopen_effort,
     switch_effort,
 )
+from .background import BackgroundJobs
+from .warm import GraphPool, LatencyStats, WarmGraph
 
 mcp = FastMCP("knowledge-network")
 
 # --- Internals ---
 
 _session_id: str | None = None
+_graphs = GraphPool()
+_latency = LatencyStats()
+_jobs = BackgroundJobs()
+_tenant_dir: ContextVar[Path | None] = ContextVar("oi_tenant_dir", default=None)
+_tenant_graphs: ContextVar[GraphPool | None] = ContextVar("oi_tenant_graphs", default=None)
 
 
 def _get_session_dir() -> Path:
-    """Session directory from OI_SESSION_DIR env var, defaults to ~/.oi/."""
+    """Session directory for this call: the tenant set by using_session_dir
+    (server.py), else OI_SESSION_DIR, defaulting to ~/.oi/."""
+    tenant = _tenant_dir.get()
+    if tenant is not None:
+        return tenant
     return Path(os.environ.get("OI_SESSION_DIR", Path.home() / ".oi"))
 
 
+@contextmanager
+def using_session_dir(session_dir: Path, graphs: GraphPool | None = None):
+    """Run tool calls in this context against session_dir (one tenant).
+
+    graphs is the pool to keep its warm graph in (default: the module's).
+    LLM calls made meanwhile are logged to the tenant's llm_log too.
+    """
+    token = _tenant_dir.set(Path(session_dir))
+    graphs_token = _tenant_graphs.set(graphs)
+    try:
+        with llm_log.using_log_dir(session_dir):
+            yield
+    finally:
+        _tenant_graphs.reset(graphs_token)
+        _tenant_dir.reset(token)
+
+
+def _get_graph() -> WarmGraph:
+    """Warm graph for the current session dir, pooled for the process lifetime."""
+    graphs = _tenant_graphs.get()
+    return (_graphs if graphs is None else graphs).get(_get_session_dir())
+
+
 def _get_model() -> str:
     """Reuse the project's default model setting."""
     from .llm import DEFAULT_MODEL
@@ -58,10 +104,16 @@ def _or_none(val: str) -> str | None:
     return val if val else None
 
 
-def _log_tool_call(tool_name: str, inputs: dict, result_summary: str = "") -> None:
-    """Log an MCP tool invocation to {session_dir}/mcp_sessions/{session_id}.jsonl."""
+def _log_tool_call(
+    tool_name: str, inputs: dict, result_summary: str = "", session_dir: Path = None,
+) -> None:
+    """Log an MCP tool invocation to {session_dir}/mcp_sessions/{session_id}.jsonl.
+
+    Pass session_dir when logging from a background job thread, which
+    doesn't see the caller's using_session_dir tenant.
+    """
     try:
-        session_dir = _get_session_dir()
+        session_dir = session_dir or _get_session_dir()
         log_dir = session_dir / "mcp_sessions"
         log_dir.mkdir(parents=True, exist_ok=True)
         log_file = log_dir / f"{_get_session_id()}.jsonl"
@@ -202,19 +254,36 @@ def mcp_add_knowledge(
     # Auto-discover chatlog URI for provenance
     provenance_uri = discover_claude_code_chatlog()
 
-    raw = add_knowledge(
-        session_dir=_get_session_dir(),
-        node_type=node_type,
-        summary=summary,
+    session_dir, model = _get_session_dir(), _get_model()
+    node_fields = dict(
         source=_or_none(source),
-        related_to=related_list,
-        edge_type=_or_none(edge_type) or "supports",
-        model=_get_model(),
-        supersedes=supersedes_list,
         session_id=_get_session_id(),
         reasoning=_or_none(reasoning),
         provenance_uri=provenance_uri,
     )
+    graph = _get_graph()
+    with _latency.timed("mcp_add_knowledge"):
+        # LLM linking and embedding run against a lock-free snapshot, so other
+        # tools for this session don't wait on them; the lock covers the commit
+        prepared = None
+        if node_type in get_node_type_names():
+            prepared = prepare_knowledge(
+                session_dir, node_type, summary,
+                model=model, supersedes=supersedes_list, **node_fields,
+            )
+        with graph.lock:
+            raw = add_knowledge(
+                session_dir=session_dir,
+                node_type=node_type,
+                summary=summary,
+                related_to=related_list,
+                edge_type=_or_none(edge_type) or "supports",
+                model=model,
+                supersedes=supersedes_list,
+                graph=graph,
+                prepared=prepared,
+                **node_fields,
+            )
 
     # Parse result to get node_id for log
     result_data = json.loads(raw)
@@ -242,13 +311,16 @@ def mcp_query_knowledge(
         min_confidence: Minimum confidence level (low, medium, high)
         sort_by: Sort order: "salience" (by centrality), "confidence" (by level), or empty (default walk order)
     """
-    raw = query_knowledge(
-        session_dir=_get_session_dir(),
-        query=query,
-        node_type=_or_none(node_type),
-        min_confidence=_or_none(min_confidence),
-        sort_by=_or_none(sort_by),
-    )
+    graph = _get_graph()
+    with _latency.timed("mcp_query_knowledge"), graph.lock:
+        raw = query_knowledge(
+            session_dir=_get_session_dir(),
+            query=query,
+            node_type=_or_none(node_type),
+            min_confidence=_or_none(min_confidence),
+            sort_by=_or_none(sort_by),
+            graph=graph,
+        )
     result_data = json.loads(raw)
     _log_tool_call("mcp_query_knowledge", {"query": query},
                    f"{len(result_data.get('results', []))} matches")
@@ -268,12 +340,13 @@ def mcp_remove_edge(
         target_id: The target node ID of the edge to remove
         edge_type: Optional edge type filter (supports, contradicts, etc). If empty, removes all edges between the two nodes.
     """
-    raw = remove_edge(
-        session_dir=_get_session_dir(),
-        source_id=source_id,
-        target_id=target_id,
-        edge_type=_or_none(edge_type),
-    )
+    with _latency.timed("mcp_remove_edge"), _get_graph().lock:
+        raw = remove_edge(
+            session_dir=_get_session_dir(),
+            source_id=source_id,
+            target_id=target_id,
+            edge_type=_or_none(edge_type),
+        )
     result_data = json.loads(raw)
     _log_tool_call("mcp_remove_edge", {
         "source_id": source_id, "target_id": target_id, "edge_type": edge_type,
@@ -309,15 +382,16 @@ def mcp_correct_terminology(
         review_text: Optional review excerpt for provenance
         source_quote: Optional source quote for the corrected node (inherits from original if empty)
     """
-    raw = correct_terminology(
-        session_dir=_get_session_dir(),
-        node_id=node_id,
-        corrected_summary=corrected_summary,
-        conflicting_node_id=conflicting_node_id,
-        reasoning=reasoning,
-        review_text=review_text,
-        source_quote=_or_none(source_quote),
-    )
+    with _latency.timed("mcp_correct_terminology"), _get_graph().lock:
+        raw = correct_terminology(
+            session_dir=_get_session_dir(),
+            node_id=node_id,
+            corrected_summary=corrected_summary,
+            conflicting_node_id=conflicting_node_id,
+            reasoning=reasoning,
+            review_text=review_text,
+            source_quote=_or_none(source_quote),
+        )
     result_data = json.loads(raw)
     _log_tool_call("mcp_correct_terminology", {
         "node_id": node_id, "corrected_summary": corrected_summary,
@@ -426,52 +500,8 @@ def mcp_switch_effort(id: str) -> str:
 
 def _fmt_ingest(result) -> str:
     """Format a PipelineResult for human-readable output."""
-    lines = []
-
-    if result.dry_run:
-        lines.append("DRY RUN — no graph changes made")
-        lines.append(f"Source: {result.source_path}")
-        lines.append(f"Chunks: {result.chunks_processed}/{result.chunks_total} processed")
-        lines.append(f"Claims: {result.claims_extracted} would be extracted")
-    else:
-        lines.append(f"Ingested: {result.source_path}")
-        if result.documents_skipped:
-            lines.append(f"Documents skipped (already ingested): {result.documents_skipped}")
-        if result.conversations_skipped:
-            lines.append(f"Conversations skipped (already ingested): {result.conversations_skipped}")
-        lines.append(f"Nodes created: {len(result.nodes_created)}")
-        lines.append(f"Chunks: {result.chunks_processed}/{result.chunks_total} processed")
-        lines.append(f"Claims extracted: {result.claims_extracted}")
-        if result.edges_created or result.contradictions_found:
-            lines.append(
-                f"Edges: {result.edges_created} created, "
-                f"{result.contradictions_found} contradictions"
-            )
-        if result.clusters_found or result.concepts_created:
-            lines.append(
-                f"Clusters: {result.clusters_found} found, "
-                f"{result.concepts_created} concepts created"
-            )
-        if result.conflicts:
-            c = result.conflicts
-            lines.append(
-                f"Conflicts: {c.get('total', 0)} total "
-                f"({c.get('auto_resolvable', 0)} auto, "
-                f"{c.get('strong_recommendations', 0)} strong, "
-                f"{c.get('ambiguous', 0)} ambiguous)"
-            )
-
-    if result.chunks_failed:
-        lines.append(f"Chunks failed: {result.chunks_failed}")
-
-    if result.errors:
-        lines.append(f"Errors ({len(result.errors)}):")
-        for e in result.errors[:5]:
-            lines.append(f"  - {e}")
-        if len(result.errors) > 5:
-            lines.append(f"  ... and {len(result.errors) - 5} more")
-
-    return "\n".join(lines)
+    from .ingest import format_pipeline_result
+    return format_pipeline_result(result)
 
 
 @mcp.tool()
@@ -481,11 +511,14 @@ def mcp_ingest_document(
     skip_linking: bool = False,
     skip_clustering: bool = False,
     source_id: str = "",
+    wait: bool = False,
 ) -> str:
     """Ingest a document into the knowledge graph.
 
     Parses the document, extracts knowledge claims via LLM, writes nodes,
     links them with full graph visibility, and reports conflicts.
+    Runs as a background job: returns a job ID at once — follow it with
+    mcp_job_status, stop it with mcp_job_cancel.
 
     Args:
         file_path: Absolute path to the document file (.md, .pdf, .txt)
@@ -493,31 +526,37 @@ def mcp_ingest_document(
         skip_linking: If true, skip the linking pass (faster, cheaper, no contradiction detection)
         skip_clustering: If true, skip the cluster + concept synthesis pass
         source_id: Registered source name for logical provenance URIs (e.g. 'my-docs')
+        wait: If true, run inline and return the full report (blocks until done)
     """
     from .ingest import ingest_pipeline
 
     session_dir = _get_session_dir()
     model = _get_model()
-
-    result = ingest_pipeline(
-        file_path=file_path,
-        session_dir=session_dir,
-        model=model,
-        dry_run=dry_run,
-        skip_linking=skip_linking,
-        skip_clustering=skip_clustering,
-        source_id=_or_none(source_id),
-    )
-
-    _log_tool_call("mcp_ingest_document", {
+    inputs = {
         "file_path": file_path,
         "dry_run": dry_run,
         "skip_linking": skip_linking,
         "skip_clustering": skip_clustering,
         "source_id": source_id or None,
-    }, f"{len(result.nodes_created)} nodes")
-
-    return _fmt_ingest(result)
+    }
+
+    def work(progress_fn=None) -> str:
+        result = ingest_pipeline(
+            file_path=file_path,
+            session_dir=session_dir,
+            model=model,
+            dry_run=dry_run,
+            skip_linking=skip_linking,
+            skip_clustering=skip_clustering,
+            source_id=_or_none(source_id),
+            progress_fn=progress_fn,
+        )
+        _log_tool_call("mcp_ingest_document", inputs, f"{len(result.nodes_created)} nodes", session_dir)
+        return _fmt_ingest(result)
+
+    if wait:
+        return work()
+    return _submit_job("ingest_document", file_path, work, session_dir, inputs)
 
 
 @mcp.tool()
@@ -527,11 +566,14 @@ def mcp_ingest_chatgpt_export(
     chatgpt_project_id: str = "",
     dry_run: bool = False,
     skip_linking: bool = False,
+    wait: bool = False,
 ) -> str:
     """Ingest conversations from a registered ChatGPT export source.
 
     Parses conversations, extracts knowledge claims per turn pair, writes
     nodes to the graph, links them, and reports conflicts.
+    Runs as a background job: returns a job ID at once — follow it with
+    mcp_job_status, stop it with mcp_job_cancel.
 
     Args:
         source_id: Registered source name (from mcp_add_source / mcp_list_sources)
@@ -542,31 +584,159 @@ def mcp_ingest_chatgpt_export(
                             mcp_list_chatgpt_projects to find project IDs.
         dry_run: If true, parse + extract only — no graph changes.
         skip_linking: Skip the linking pass (faster, cheaper).
+        wait: If true, run inline and return the full report (blocks until done)
     """
     from .ingest import ingest_chatgpt_export
 
     session_dir = _get_session_dir()
     model = _get_model()
-
-    result = ingest_chatgpt_export(
-        source_id=source_id,
-        session_dir=session_dir,
-        model=model,
-        title_filter=title_filter,
-        chatgpt_project_id=chatgpt_project_id,
-        dry_run=dry_run,
-        skip_linking=skip_linking,
-    )
-
-    _log_tool_call("mcp_ingest_chatgpt_export", {
+    inputs = {
         "source_id": source_id,
         "title_filter": title_filter or None,
         "chatgpt_project_id": chatgpt_project_id or None,
         "dry_run": dry_run,
         "skip_linking": skip_linking,
-    }, f"{len(result.nodes_created)} nodes")
+    }
+
+    def work(progress_fn=None) -> str:
+        result = ingest_chatgpt_export(
+            source_id=source_id,
+            session_dir=session_dir,
+            model=model,
+            title_filter=title_filter,
+            chatgpt_project_id=chatgpt_project_id,
+            dry_run=dry_run,
+            skip_linking=skip_linking,
+            progress_fn=progress_fn,
+        )
+        _log_tool_call("mcp_ingest_chatgpt_export", inputs, f"{len(result.nodes_created)} nodes", session_dir)
+        return _fmt_ingest(result)
+
+    if wait:
+        return work()
+    return _submit_job("ingest_chatgpt_export", source_id, work, session_dir, inputs)
+
+
+@mcp.tool()
+def mcp_resume_ingest(job_id: str = "", wait: bool = False) -> str:
+    """Finish an interrupted (or cancelled) ingestion job.
+
+    Re-runs extraction for inputs not yet written (already-ingested
+    conversations/chunks are skipped), then runs any linking, embedding and
+    clustering the job never completed. Runs as a background job.
+
+    Args:
+        job_id: Ingest job ID (e.g. 'ingest-003'). Empty = oldest incomplete job.
+        wait: If true, run inline and return the full report (blocks until done)
+    """
+    from .ingest import resume_ingest_job
+
+    session_dir = _get_session_dir()
+    model = _get_model()
+    inputs = {"job_id": job_id or None}
+
+    def work(progress_fn=None) -> str:
+        result = resume_ingest_job(
+            session_dir, job_id=_or_none(job_id), model=model, progress_fn=progress_fn)
+        _log_tool_call("mcp_resume_ingest", inputs, f"{len(result.nodes_created)} nodes", session_dir)
+        return _fmt_ingest(result)
+
+    if wait:
+        return work()
+    return _submit_job("resume_ingest", job_id or "oldest incomplete", work, session_dir, inputs)
 
-    return _fmt_ingest(result)
+
+# --- Background jobs ---
+
+
+def _submit_job(kind: str, label: str, work, session_dir: Path, inputs: dict) -> str:
+    """Queue an ingestion on the session's worker thread; return the job ID message."""
+    tenant, graphs = _tenant_dir.get(), _tenant_graphs.get()
+
+    def run(progress_fn) -> str:
+        # The worker thread doesn't inherit this context: restore the tenant
+        if tenant is None:
+            return work(progress_fn)
+        with using_session_dir(tenant, graphs):
+            return work(progress_fn)
+
+    job = _jobs.submit(kind, label, run, session_key=str(session_dir))
+    _log_tool_call(f"mcp_{kind}", {**inputs, "background": True}, job["id"])
+    return (
+        f"Started {job['id']} ({kind}: {label}). "
+        f"Check progress with mcp_job_status('{job['id']}')."
+    )
+
+
+def _is_own_job(job: dict) -> bool:
+    """Under server.py each tenant sees only its own jobs; oi-mcp sees all."""
+    tenant = _tenant_dir.get()
+    return tenant is None or job["session"] == str(tenant)
+
+
+def _own_job(job_id: str) -> dict | None:
+    job = _jobs.status(job_id)
+    return job if job is not None and _is_own_job(job) else None
+
+
+def _fmt_job(job: dict, verbose: bool = False) -> str:
+    line = f"{job['id']} [{job['status']}] {job['kind']}: {job['label']}"
+    if job["stage"]:
+        line += f" — {job['stage']}"
+        if job["detail"]:
+            line += f" ({job['detail']})"
+    if not verbose:
+        return line
+    lines = [line]
+    if job.get("elapsed_s") is not None:
+        lines.append(f"Elapsed: {job['elapsed_s']:.1f}s")
+    for t, stage, detail in job["history"][-10:]:
+        lines.append(f"  +{t:.1f}s {stage}" + (f": {detail}" if detail else ""))
+    if job["error"]:
+        lines.append(f"Error: {job['error']}")
+    if job["status"] == "cancelled":
+        lines.append("Cancelled — finish the partial ingest later with mcp_resume_ingest.")
+    if job["result"]:
+        lines.append("")
+        lines.append(job["result"])
+    return "\n".join(lines)
+
+
+@mcp.tool()
+def mcp_job_status(job_id: str = "") -> str:
+    """Show a background job's status, stage progress and (when done) its report.
+
+    Args:
+        job_id: Background job ID (e.g. 'job-001'). Empty = list all jobs.
+    """
+    if not job_id:
+        jobs = [j for j in _jobs.jobs() if _is_own_job(j)]
+        if not jobs:
+            return "No background jobs."
+        return "\n".join(_fmt_job(j) for j in jobs)
+    job = _own_job(job_id)
+    if job is None:
+        return f"Error: unknown job '{job_id}'"
+    return _fmt_job(job, verbose=True)
+
+
+@mcp.tool()
+def mcp_job_cancel(job_id: str) -> str:
+    """Cancel a background job. A queued job never starts; a running one stops
+    at its next pipeline stage (resume ingests later with mcp_resume_ingest).
+
+    Args:
+        job_id: Background job ID (e.g. 'job-001')
+    """
+    job = _jobs.cancel(job_id) if _own_job(job_id) else None
+    _log_tool_call("mcp_job_cancel", {"job_id": job_id}, job["status"] if job else "unknown")
+    if job is None:
+        return f"Error: unknown job '{job_id}'"
+    if job["status"] in ("done", "failed"):
+        return f"{job_id} already finished ({job['status']})."
+    if job["status"] == "cancelled":
+        return f"{job_id} cancelled."
+    return f"{job_id} cancelling — stops at its next stage."
 
 
 @mcp.tool()
@@ -663,8 +833,32 @@ def mcp_list_sources() -> str:
     return "\n".join(lines)
 
 
+@mcp.tool()
+def mcp_server_stats() -> str:
+    """Show warm-graph state and per-tool latency (first call, steady-state p50/p99)."""
+    graph = _get_graph()
+    knowledge = graph.knowledge
+    lines = [
+        f"Graph: {len(knowledge.get('nodes', []))} nodes, {len(knowledge.get('edges', []))} edges "
+        f"(loaded from disk {graph.loads} time(s))",
+    ]
+    stats = _latency.snapshot()
+    if not stats:
+        lines.append("No tool calls timed yet.")
+    for tool, s in sorted(stats.items()):
+        lines.append(
+            f"  {tool}: {s['calls']} call(s), first {s['first_ms']:.1f}ms, "
+            f"p50 {s['p50_ms']:.1f}ms, p99 {s['p99_ms']:.1f}ms"
+        )
+    return "\n".join(lines)
+
+
 def main():
     """Entry point for oi-mcp command."""
+    try:
+        _get_graph().warm()  # Pay graph load + index build before the first query
+    except Exception:
+        pass  # Best-effort: tools load lazily on first use
     mcp.run(transport="stdio")
 
 
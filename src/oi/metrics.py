@@ -0,0 +1,213 @@
+"""LLM and pipeline metrics: where time, tokens and dollars go.
+
+Every llm.chat / chat_with_tools / chat_with_tools_stream call records its
+wall time, prompt/completion tokens and estimated cost under its `phase`
+(extract, link_batch, synthesize, effort_summarize, ...; calls without a
+phase count as "unphased"). The ingest pipelines record per-stage wall
+time (StageTimer) and _chat_with_retry records retries.
+
+Records go to the process-wide registry() and to every collector opened
+with collect() in the current context, so a pipeline run can report just
+its own calls (PipelineResult.llm) while the registry keeps the totals.
+Thread pools that make LLM calls on a pipeline's behalf should submit via
+contextvars.copy_context().run to keep them attributed.
+
+Metrics.summary() aggregates; to_json() and to_prometheus() export it.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+UNPHASED = "unphased"
+
+_PHASE_FIELDS = (
+    "calls", "errors", "retries", "seconds", "max_seconds",
+    "prompt_tokens", "completion_tokens", "cost_usd", "unpriced_calls",
+)
+
+
+def _new_phase() -> dict:
+    return {field: 0 for field in _PHASE_FIELDS}
+
+
+class Metrics:
+    """Thread-safe per-phase LLM stats and per-stage timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases: dict[str, dict] = {}
+        self._stages: dict[str, dict] = {}
+
+    def record_call(
+        self,
+        phase: str | None,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cost_usd: float | None = None,
+        error: bool = False,
+    ) -> None:
+        """One LLM call. cost_usd=None means the model has no known price."""
+        with self._lock:
+            p = self._phases.setdefault(phase or UNPHASED, _new_phase())
+            p["calls"] += 1
+            p["errors"] += int(error)
+            p["seconds"] += seconds
+            p["max_seconds"] = max(p["max_seconds"], seconds)
+            p["prompt_tokens"] += prompt_tokens
+            p["completion_tokens"] += completion_tokens
+            if cost_usd is None:
+                p["unpriced_calls"] += 1
+            else:
+                p["cost_usd"] += cost_usd
+
+    def record_retry(self, phase: str | None) -> None:
+        with self._lock:
+            self._phases.setdefault(phase or UNPHASED, _new_phase())["retries"] += 1
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            s = self._stages.setdefault(stage, {"runs": 0, "seconds": 0.0})
+            s["runs"] += 1
+            s["seconds"] += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._phases.clear()
+            self._stages.clear()
+
+    def summary(self) -> dict:
+        """{"phases": {phase: stats}, "stages": {stage: {runs, seconds}}, "totals": stats}.
+
+        Phase stats: calls, errors, retries, seconds, max_seconds,
+        mean_seconds, prompt_tokens, completion_tokens, cost_usd and
+        unpriced_calls (calls whose cost could not be estimated).
+        """
+        with self._lock:
+            phases = {name: dict(p) for name, p in sorted(self._phases.items())}
+            stages = {name: dict(s) for name, s in sorted(self._stages.items())}
+
+        totals = _new_phase()
+        for p in phases.values():
+            for field in _PHASE_FIELDS:
+                if field == "max_seconds":
+                    totals[field] = max(totals[field], p[field])
+                else:
+                    totals[field] += p[field]
+        for p in (*phases.values(), totals):
+            p["mean_seconds"] = p["seconds"] / p["calls"] if p["calls"] else 0.0
+            for field in ("seconds", "max_seconds", "mean_seconds"):
+                p[field] = round(p[field], 4)
+            p["cost_usd"] = round(p["cost_usd"], 6)
+        for s in stages.values():
+            s["seconds"] = round(s["seconds"], 4)
+        return {"phases": phases, "stages": stages, "totals": totals}
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.summary(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "oi") -> str:
+        """Prometheus text exposition format (counters since process start/reset)."""
+        summary = self.summary()
+        lines: list[str] = []
+
+        def family(name: str, help_text: str, kind: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{{{labels}}} {value}")
+
+        phases = summary["phases"]
+
+        def per_phase(field: str) -> list[tuple[str, float]]:
+            return [(f'phase="{_escape(name)}"', p[field]) for name, p in phases.items()]
+
+        family("llm_calls_total", "LLM calls.", "counter", per_phase("calls"))
+        family("llm_errors_total", "LLM calls that raised.", "counter", per_phase("errors"))
+        family("llm_retries_total", "LLM calls retried after a bad response.", "counter", per_phase("retries"))
+        family("llm_seconds_total", "Wall time spent in LLM calls.", "counter", per_phase("seconds"))
+        family("llm_prompt_tokens_total", "Prompt tokens sent.", "counter", per_phase("prompt_tokens"))
+        family("llm_completion_tokens_total", "Completion tokens received.", "counter", per_phase("completion_tokens"))
+        family("llm_cost_usd_total", "Estimated LLM cost in USD.", "counter", per_phase("cost_usd"))
+        family("llm_unpriced_calls_total", "LLM calls with no cost estimate.", "counter", per_phase("unpriced_calls"))
+        family("stage_seconds_total", "Wall time per pipeline stage.", "counter",
+               [(f'stage="{_escape(name)}"', s["seconds"]) for name, s in summary["stages"].items()])
+        family("stage_runs_total", "Pipeline stage runs.", "counter",
+               [(f'stage="{_escape(name)}"', s["runs"]) for name, s in summary["stages"].items()])
+        return "\n".join(lines) + "\n"
+
+
+def _escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_registry = Metrics()
+_collectors: ContextVar[tuple[Metrics, ...]] = ContextVar("oi_metrics_collectors", default=())
+
+
+def registry() -> Metrics:
+    """The process-wide metrics."""
+    return _registry
+
+
+def _targets() -> tuple[Metrics, ...]:
+    return (_registry, *_collectors.get())
+
+
+def record_call(phase: str | None, seconds: float, prompt_tokens: int = 0, completion_tokens: int = 0,
+                cost_usd: float | None = None, error: bool = False) -> None:
+    for m in _targets():
+        m.record_call(phase, seconds, prompt_tokens, completion_tokens, cost_usd, error)
+
+
+def record_retry(phase: str | None) -> None:
+    for m in _targets():
+        m.record_retry(phase)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    for m in _targets():
+        m.record_stage(stage, seconds)
+
+
+@contextmanager
+def collect() -> Iterator[Metrics]:
+    """Also record this context's calls and stages into a fresh Metrics."""
+    m = Metrics()
+    token = _collectors.set(_collectors.get() + (m,))
+    try:
+        yield m
+    finally:
+        _collectors.reset(token)
+
+
+class StageTimer:
+    """Times consecutive pipeline stages: mark(stage) ends the previous one.
+
+    Fits the pipelines' progress callbacks, which announce each stage as it
+    starts. Repeated stages accumulate.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        self._stage: str | None = None
+        self._start = 0.0
+
+    def mark(self, stage: str | None) -> None:
+        now = time.perf_counter()
+        if self._stage is not None:
+            elapsed = now - self._start
+            self.timings[self._stage] = self.timings.get(self._stage, 0.0) + elapsed
+            record_stage(self._stage, elapsed)
+        self._stage, self._start = stage, now
+
+    def finish(self) -> dict[str, float]:
+        """End the current stage. Returns {stage: seconds}."""
+        self.mark(None)
+        return {stage: round(seconds, 4) for stage, seconds in self.timings.items()}
@@ -1,29 +1,41 @@
 """Orchestrator: handles each conversation turn with tool-calling flow.
 
 Flow per turn:
-1. Build working context (system prompt + ambient + effort summaries + expanded raw + open effort raw)
+1. Build working context (stable prefix: system prompt + effort summaries; then ambient
+   + expanded raw + open effort raw; volatile knowledge graph last)
 2. Add user message
 3. Send to LLM with tool definitions
 4. If tool call: execute tool, send result back, get next response (loop)
 5. Log messages to appropriate log (active effort or ambient)
 6. Return assistant response
+
+process_turn_stream runs the same turn but yields content deltas as the
+model produces them (see its docstring for the event kinds).
+
+With defer_maintenance, post-turn bookkeeping runs after the response on
+a background worker (maintenance.py); the next turn waits for it first.
 """
 
+import hashlib
 import json
+from functools import partial
 from pathlib import Path
 from datetime import datetime
-from typing import Callable
+from typing import Callable, Iterator
 
-from .llm import chat_with_tools, DEFAULT_MODEL
-from .prompts import load_prompt
+from .locking import atomic_write_text
+from .llm import chat_with_tools, chat_with_tools_stream, DEFAULT_MODEL
+from .embed import EMBEDDINGS_FILE
+from .fragments import FragmentCache, JsonlTail
+from .prompts import PROMPTS_DIR, load_prompt
 from .schemas import get_display_visible_types, node_display_prefix
 from .state import (
-    _load_expanded, _load_knowledge, _load_expanded_knowledge,
-    _load_expanded_state, _load_efforts, increment_turn,
+    _load_expanded, _load_expanded_knowledge,
+    _load_efforts, increment_turn, update_knowledge,
 )
-from .confidence import compute_confidence, confidence_annotation
+from .confidence import confidence_annotation
 from .tools import (
-    TOOL_DEFINITIONS, execute_tool,
+    TOOL_DEFINITIONS, execute_tools,
     get_active_effort, get_all_open_efforts,
 )
 from .decay import (
@@ -32,6 +44,9 @@ from .decay import (
     update_knowledge_references, get_evicted_knowledge_ids, AMBIENT_WINDOW,
 )
 from .session_log import log_event, extract_node_context
+from .tokens import count_tokens
+from .warm import GraphPool, WarmGraph, _stamp
+from . import maintenance, scheduler, tracing
 
 
 MAX_TOOL_ROUNDS = 5
@@ -57,48 +72,35 @@ def _read_jsonl_messages(filepath: Path, max_messages: int | None = None) -> lis
 
     Skips malformed lines rather than crashing the whole session.
     If max_messages is set, returns only the last N messages.
+    Reads are incremental: only lines appended since the last call are parsed.
     """
-    messages = []
-    if filepath.exists():
-        text = filepath.read_text(encoding="utf-8").strip()
-        if text:
-            for line in text.split("\n"):
-                if line.strip():
-                    try:
-                        entry = json.loads(line)
-                        messages.append({"role": entry["role"], "content": entry["content"]})
-                    except (json.JSONDecodeError, KeyError):
-                        continue
+    messages = _logs.read(filepath)
     if max_messages and len(messages) > max_messages:
         messages = messages[-max_messages:]
     return messages
 
 
+# Warm state for _build_messages, reused across turns (see fragments.py)
+_graphs = GraphPool(max_graphs=8)
+_fragments = FragmentCache()
+_logs = JsonlTail()
 
+_SYSTEM_PROMPT_FILE = PROMPTS_DIR / "system.md"
 
-def _build_messages(session_dir: Path, current_turn: int | None = None) -> list[dict]:
-    """Build the LLM message list from working context.
-
-    Working Context = system_prompt + ambient (windowed) + effort_summaries (non-expanded, non-evicted)
-                    + expanded_effort_raw + all_open_effort_raw (active last)
 
-    If current_turn is provided, summary eviction is applied.
-    """
-    # System prompt
+def _render_summaries(session_dir: Path, expanded: set, evicted: set) -> str:
+    """Stable tier: system prompt + concluded-effort summaries + memory note."""
     system_prompt = load_prompt("system")
 
-    # Read efforts from unified knowledge store
     effort_section = ""
     memory_section = ""
-    efforts = _load_efforts(session_dir)
-    expanded = _load_expanded(session_dir)
-
-    concluded = [e for e in efforts if e.get("status") == "concluded"]
+    concluded = [e for e in _load_efforts(session_dir) if e.get("status") == "concluded"]
 
     if concluded:
         # Filter out expanded and evicted summaries
-        evicted = get_evicted_summary_ids(session_dir, current_turn) if current_turn is not None else set()
         summary_efforts = [e for e in concluded if e["id"] not in expanded and e["id"] not in evicted]
+        # Creation order: a newly concluded effort appends rather than reshuffles
+        summary_efforts.sort(key=lambda e: e.get("created") or "")
 
         if summary_efforts:
             parts = ["\nConcluded efforts (summaries only):"]
@@ -114,22 +116,26 @@ def _build_messages(session_dir: Path, current_turn: int | None = None) -> list[
             "not shown in working memory. You can then expand_effort(id) for full details."
         )
 
-    # Knowledge graph nodes with confidence annotations (filtered by eviction)
+    full_system = system_prompt
+    if effort_section:
+        full_system += "\n" + effort_section
+    if memory_section:
+        full_system += memory_section
+    return full_system
+
+
+def _render_knowledge(graph: WarmGraph, display_types: tuple[str, ...], evicted: set) -> str:
+    """Volatile tier: active knowledge nodes with confidence annotations."""
     # Only show non-effort active nodes in the knowledge section
-    knowledge_section = ""
-    knowledge = _load_knowledge(session_dir)
-    display_types = set(get_display_visible_types())
+    knowledge = graph.knowledge
     active_nodes = [n for n in knowledge.get("nodes", []) if n.get("status") == "active" and n.get("type") in display_types]
-    evicted_knowledge = get_evicted_knowledge_ids(session_dir, current_turn) if current_turn is not None else set()
-    visible_nodes = [n for n in active_nodes if n["id"] not in evicted_knowledge]
+    visible_nodes = [n for n in active_nodes if n["id"] not in evicted]
     evicted_count = len(active_nodes) - len(visible_nodes)
     if visible_nodes:
-        from .knowledge import _load_embeddings_safe
-        emb = _load_embeddings_safe(session_dir)
-        kg_parts = ["\nKnowledge graph:"]
+        confidences = graph.confidences  # One PageRank pass for every annotation
+        kg_parts = ["Knowledge graph:"]
         for n in visible_nodes:
-            conf = compute_confidence(n["id"], knowledge, embeddings=emb)
-            annotation = confidence_annotation(conf)
+            annotation = confidence_annotation(confidences.get(n["id"], {}))
             prefix = node_display_prefix(n)
             if annotation:
                 kg_parts.append(f"- {prefix} {n['summary']} {annotation}")
@@ -137,17 +143,58 @@ def _build_messages(session_dir: Path, current_turn: int | None = None) -> list[
                 kg_parts.append(f"- {prefix} {n['summary']}")
         if evicted_count > 0:
             kg_parts.append(f"({evicted_count} older knowledge node(s) not shown — use query_knowledge to find them)")
-        knowledge_section = "\n".join(kg_parts)
-    elif evicted_count > 0:
-        knowledge_section = f"\nKnowledge graph:\n({evicted_count} older knowledge node(s) not shown — use query_knowledge to find them)"
+        return "\n".join(kg_parts)
+    if evicted_count > 0:
+        return f"Knowledge graph:\n({evicted_count} older knowledge node(s) not shown — use query_knowledge to find them)"
+    return ""
 
-    full_system = system_prompt
-    if effort_section:
-        full_system += "\n" + effort_section
-    if knowledge_section:
-        full_system += "\n" + knowledge_section
-    if memory_section:
-        full_system += memory_section
+
+def _open_efforts(session_dir: Path) -> tuple[list[dict], str | None]:
+    """(open efforts, active effort id)."""
+    active = get_active_effort(session_dir)
+    return get_all_open_efforts(session_dir), active["id"] if active else None
+
+
+@tracing.traced("turn.build_messages", cat="turn")
+def _build_messages(session_dir: Path, current_turn: int | None = None) -> list[dict]:
+    """Build the LLM message list from working context.
+
+    Working Context = stable prefix (system_prompt + effort_summaries)
+                    + ambient (windowed) + expanded_effort_raw + all_open_effort_raw (active last)
+                    + volatile tier (knowledge graph)
+
+    Layout is cache-aware: provider prompt caches match on an exact prefix,
+    so content that rarely changes comes first (concluded summaries in
+    creation order) and the knowledge graph — whose confidence annotations
+    and eviction shift turn to turn — is a separate system message at the
+    end, where it cannot invalidate the conversation before it.
+
+    Each tier is memoized (fragments.py) on the inputs it is rendered from:
+    file stamps, the expanded set and the eviction set. An unchanged tier
+    costs a few stat() calls; effort logs are read incrementally.
+
+    If current_turn is provided, summary eviction is applied.
+    """
+    graph = _graphs.get(session_dir)
+    graph_stamp = (_stamp(session_dir / "knowledge.yaml"), _stamp(session_dir / "manifest.yaml"))
+    expanded = _load_expanded(session_dir)
+
+    # Stable tier: system prompt + effort summaries (filtered by expansion and eviction)
+    evicted = get_evicted_summary_ids(session_dir, current_turn) if current_turn is not None else set()
+    full_system = _fragments.get(
+        session_dir, "summaries",
+        (_stamp(_SYSTEM_PROMPT_FILE), graph_stamp, frozenset(expanded), frozenset(evicted)),
+        lambda: _render_summaries(session_dir, expanded, evicted),
+    )
+
+    # Knowledge graph nodes with confidence annotations (filtered by eviction)
+    display_types = tuple(get_display_visible_types())
+    evicted_knowledge = get_evicted_knowledge_ids(session_dir, current_turn) if current_turn is not None else set()
+    knowledge_section = _fragments.get(
+        session_dir, "knowledge",
+        (graph_stamp, _stamp(session_dir / EMBEDDINGS_FILE), display_types, frozenset(evicted_knowledge)),
+        lambda: _render_knowledge(graph, display_types, evicted_knowledge),
+    )
 
     messages = [{"role": "system", "content": full_system}]
 
@@ -162,33 +209,31 @@ def _build_messages(session_dir: Path, current_turn: int | None = None) -> list[
     # Expanded knowledge fragments (session-sourced nodes with context loaded)
     expanded_knowledge = _load_expanded_knowledge(session_dir)
     if expanded_knowledge:
-        knowledge = _load_knowledge(session_dir)
-        expanded_state = _load_expanded_state(session_dir)
+        nodes_by_id = graph.nodes_by_id
         for node_id in sorted(expanded_knowledge):
-            # Find node to get session_id
-            node = None
-            for n in knowledge.get("nodes", []):
-                if n["id"] == node_id:
-                    node = n
-                    break
+            node = nodes_by_id.get(node_id)
             if not node:
                 continue
             session_id = node.get("created_in_session")
             if not session_id:
                 continue
-            fragment = extract_node_context(session_dir, session_id, node_id)
+            fragment = _fragments.get(
+                session_dir, f"expanded:{node_id}",
+                (graph_stamp, _stamp(session_dir / "sessions" / f"{session_id}.jsonl")),
+                lambda: extract_node_context(session_dir, session_id, node_id),
+            )
             if fragment:
                 # Inject as system message banner + conversation fragment
                 messages.append({
                     "role": "system",
                     "content": f"--- Expanded knowledge: {node_id} ({node.get('summary', '')}) ---",
                 })
-                messages.extend(fragment)
+                messages.extend(dict(m) for m in fragment)
 
     # All open effort raw logs, with active effort last
-    open_efforts = get_all_open_efforts(session_dir)
-    active = get_active_effort(session_dir)
-    active_id = active["id"] if active else None
+    open_efforts, active_id = _fragments.get(
+        session_dir, "open_efforts", graph_stamp, lambda: _open_efforts(session_dir),
+    )
 
     # Non-active open efforts first
     for effort in open_efforts:
@@ -201,9 +246,83 @@ def _build_messages(session_dir: Path, current_turn: int | None = None) -> list[
         effort_file = session_dir / "efforts" / f"{active_id}.jsonl"
         messages.extend(_read_jsonl_messages(effort_file))
 
+    # Volatile tier last
+    if knowledge_section:
+        messages.append({"role": "system", "content": knowledge_section})
+
     return messages
 
 
+PREFIX_FILE = "context_prefix.json"
+
+
+def _prompt_text(messages: list[dict]) -> str:
+    """Messages flattened in order — the byte sequence a prompt cache keys on."""
+    return "".join(f"<|{m['role']}|>\n{m['content']}\n" for m in messages)
+
+
+def _count_or_none(text: str) -> int | None:
+    try:
+        return count_tokens(text)
+    except Exception:
+        return None
+
+
+def _sum_tokens(rows: list[list]) -> int | None:
+    """Total tokens over [hash, chars, tokens] rows; None if any count is missing."""
+    counts = [tokens for _, _, tokens in rows]
+    return None if None in counts else sum(counts)
+
+
+def _record_prefix_reuse(session_dir: Path, session_id: str | None, context: list[dict]) -> dict:
+    """Report how much of this turn's context repeats the previous turn's prefix.
+
+    context is the built message list before the user message. Reuse is
+    measured per message: the leading messages whose hash matches the
+    previous turn's. PREFIX_FILE keeps only the report and a [hash, chars,
+    tokens] row per message, so messages seen last turn are not
+    re-tokenized. Logs the report as a "context-prefix" session event.
+    Token counts are None when no tokenizer is available.
+
+    Returns {"turn_chars", "reused_chars", "prefix_chars",
+             "turn_tokens", "reused_tokens", "prefix_tokens"}
+    where prefix_* is the stable system block and reused_* is the longest
+    prefix shared with the previous turn.
+    """
+    path = session_dir / PREFIX_FILE
+    try:
+        previous = json.loads(path.read_text(encoding="utf-8")).get("messages", [])
+    except (OSError, ValueError, AttributeError):
+        previous = []
+    known = {row[0]: row[2] for row in previous}
+
+    rows = []
+    for message in context:
+        text = _prompt_text([message])
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        tokens = known.get(digest)
+        rows.append([digest, len(text), _count_or_none(text) if tokens is None else tokens])
+
+    shared = 0
+    for old, new in zip(previous, rows):
+        if old[0] != new[0]:
+            break
+        shared += 1
+
+    report = {
+        "turn_chars": sum(chars for _, chars, _ in rows),
+        "reused_chars": sum(chars for _, chars, _ in rows[:shared]),
+        "prefix_chars": sum(chars for _, chars, _ in rows[:1]),
+        "turn_tokens": _sum_tokens(rows),
+        "reused_tokens": _sum_tokens(rows[:shared]),
+        "prefix_tokens": _sum_tokens(rows[:1]),
+    }
+    atomic_write_text(path, json.dumps({**report, "messages": rows}))
+    if session_id:
+        log_event(session_dir, session_id, "context-prefix", report)
+    return report
+
+
 def _build_tool_banners(tools_fired: list[tuple[str, dict, str]]) -> str:
     """Build programmatic notification banners for tool actions."""
     parts = []
@@ -288,16 +407,97 @@ def _build_tool_banners(tools_fired: list[tuple[str, dict, str]]) -> str:
     return "\n".join(parts)
 
 
-def process_turn(session_dir: Path, user_message: str, model: str = DEFAULT_MODEL, confirmation_callback: Callable[[str], bool] | None = None, session_id: str = None) -> str:
+@tracing.traced("turn.post_maintenance", cat="turn")
+def _post_turn_maintenance(session_dir: Path, current_turn: int, user_message: str, final_response: str, session_id: str | None = None, context: list[dict] | None = None) -> list[str]:
+    """Decay checks, reference tracking and the prefix-reuse report after a turn. Returns decay banners."""
+    if context is not None:
+        _record_prefix_reuse(session_dir, session_id, context)
+
+    # Check decay for all expanded efforts
+    decayed_ids = check_decay(session_dir, current_turn, user_message, final_response)
+
+    # Check decay for expanded knowledge nodes
+    decayed_knowledge_ids = check_knowledge_decay(session_dir, current_turn, user_message, final_response)
+
+    # Update summary reference tracking for eviction
+    update_summary_references(session_dir, current_turn, user_message, final_response)
+
+    # Update knowledge reference tracking for eviction
+    update_knowledge_references(session_dir, current_turn, user_message, final_response)
+
+    decay_parts = []
+    for eid in decayed_ids:
+        decay_parts.append(f"--- Auto-collapsed effort: {eid} (inactive for {DECAY_THRESHOLD} turns) ---")
+    for nid in decayed_knowledge_ids:
+        decay_parts.append(f"--- Auto-collapsed knowledge: {nid} (inactive for {DECAY_THRESHOLD} turns) ---")
+    return decay_parts
+
+
+def process_turn(session_dir: Path, user_message: str, model: str = DEFAULT_MODEL, confirmation_callback: Callable[[str], bool] | None = None, session_id: str = None, defer_maintenance: bool = False) -> str:
     """Process a single conversation turn.
 
     Returns the assistant's final response text.
+
+    With defer_maintenance, the response is returned as soon as it is ready
+    and the post-turn work (decay, reference tracking, embedding new nodes,
+    pattern detection) runs on the session's maintenance worker. The next
+    turn waits for it before building context and shows its banners first.
+    """
+    for kind, text in _run_turn(session_dir, user_message, model, confirmation_callback, session_id, stream=False, defer_maintenance=defer_maintenance):
+        if kind == "done":
+            return text
+
+
+def process_turn_stream(session_dir: Path, user_message: str, model: str = DEFAULT_MODEL, confirmation_callback: Callable[[str], bool] | None = None, session_id: str = None, defer_maintenance: bool = False) -> Iterator[tuple[str, str]]:
+    """Process a single conversation turn, streaming the model's output.
+
+    Yields (kind, text) events:
+    - ("text", delta): assistant content as it arrives
+    - ("reset", ""): the text streamed so far belonged to a tool-calling
+      round and is not part of the answer (renderers end the line)
+    - ("banner", text): tool banners after each tool round, decay banners
+      after the answer
+    - ("done", final_response): exactly what process_turn returns
+
+    Logging (session log, effort/ambient logs, decay) matches process_turn,
+    as does defer_maintenance.
     """
+    return _run_turn(session_dir, user_message, model, confirmation_callback, session_id, stream=True, defer_maintenance=defer_maintenance)
+
+
+def _stream_round(messages: list, model: str):
+    """One streamed LLM round: yields ("text", delta), returns the assembled message."""
+    deltas = chat_with_tools_stream(messages, TOOL_DEFINITIONS, model)
+    while True:
+        try:
+            delta = next(deltas)
+        except StopIteration as done:
+            return done.value
+        yield ("text", delta)
+
+
+def _run_turn(session_dir: Path, user_message: str, model: str, confirmation_callback: Callable[[str], bool] | None, session_id: str | None, stream: bool, defer_maintenance: bool = False):
+    """The turn loop behind process_turn / process_turn_stream (event generator)."""
+    with tracing.session(session_dir), scheduler.priority(scheduler.INTERACTIVE), \
+            tracing.span("turn", cat="turn", stream=stream):
+        return (yield from _turn_events(session_dir, user_message, model, confirmation_callback, session_id, stream, defer_maintenance))
+
+
+def _turn_events(session_dir: Path, user_message: str, model: str, confirmation_callback: Callable[[str], bool] | None, session_id: str | None, stream: bool, defer_maintenance: bool):
+    # 0. Finish the previous turn's deferred maintenance before reading any state
+    with tracing.span("turn.wait_maintenance", cat="turn"):
+        notices = maintenance.wait(session_dir)
+    if stream and notices:
+        yield ("banner", "\n".join(notices))
+    deferred = []  # Maintenance tasks handed over by this turn's tools
+    defer = deferred.append if defer_maintenance else None
+
     # 1. Increment turn counter
     current_turn = increment_turn(session_dir)
 
     # 2. Build working context
     messages = _build_messages(session_dir, current_turn=current_turn)
+    context = list(messages)  # For the prefix-reuse report
 
     # 3. Snapshot effort state before the turn
     active_before = get_active_effort(session_dir)
@@ -313,22 +513,34 @@ def process_turn(session_dir: Path, user_message: str, model: str = DEFAULT_MODE
     assistant_content = ""
     tools_fired = []  # Track (tool_name, tool_args, tool_result) for banners
     for _ in range(MAX_TOOL_ROUNDS):
-        response_msg = chat_with_tools(messages, TOOL_DEFINITIONS, model)
+        with tracing.span("turn.llm_round", cat="turn"):
+            if stream:
+                response_msg = yield from _stream_round(messages, model)
+            else:
+                response_msg = chat_with_tools(messages, TOOL_DEFINITIONS, model)
 
         if not response_msg.tool_calls:
             # No tool calls — we have the final response
             assistant_content = response_msg.content or ""
             break
 
+        if stream and response_msg.content:
+            yield ("reset", "")
+
         # Process tool calls
+        round_start = len(tools_fired)
         messages.append(response_msg)
         effort_opened_id = None  # Track effort opened in this batch
         sourceless_node_ids = []  # Track knowledge nodes created without source
-        for tool_call in response_msg.tool_calls:
-            tool_name = tool_call.function.name
-            tool_args = json.loads(tool_call.function.arguments) if tool_call.function.arguments else {}
-
-            tool_result = execute_tool(session_dir, tool_name, tool_args, model, confirmation_callback=confirmation_callback, session_id=session_id)
+        calls = [
+            (tool_call.function.name,
+             json.loads(tool_call.function.arguments) if tool_call.function.arguments else {})
+            for tool_call in response_msg.tool_calls
+        ]
+        # Independent calls run concurrently; results come back in call order
+        with tracing.span("turn.tools", cat="turn", calls=len(calls)):
+            tool_results = execute_tools(session_dir, calls, model, confirmation_callback=confirmation_callback, session_id=session_id, defer=defer)
+        for tool_call, (tool_name, tool_args), tool_result in zip(response_msg.tool_calls, calls, tool_results):
             tools_fired.append((tool_name, tool_args, tool_result))
 
             # Track open_effort and sourceless add_knowledge in same batch
@@ -386,20 +598,33 @@ def process_turn(session_dir: Path, user_message: str, model: str = DEFAULT_MODE
         # Backfill source on knowledge nodes created without one in the same
         # batch as an open_effort (LLM may emit add_knowledge before open_effort)
         if effort_opened_id and sourceless_node_ids:
-            knowledge = _load_knowledge(session_dir)
-            for node in knowledge.get("nodes", []):
-                if node["id"] in sourceless_node_ids and not node.get("source"):
-                    node["source"] = effort_opened_id
-            _save_knowledge(session_dir, knowledge)
+            def backfill(knowledge: dict):
+                changed = False
+                for node in knowledge.get("nodes", []):
+                    if node["id"] in sourceless_node_ids and not node.get("source"):
+                        node["source"] = effort_opened_id
+                        changed = True
+                return None, changed
+
+            update_knowledge(session_dir, backfill)
+
+        if stream:
+            round_banners = _build_tool_banners(tools_fired[round_start:])
+            if round_banners:
+                yield ("banner", round_banners)
 
     else:
         # Max rounds exhausted — use whatever content we have
         assistant_content = response_msg.content or ""
+        if stream and assistant_content:
+            yield ("text", assistant_content)
 
     # 5b. If we still have no text response, force one without tools
     if not assistant_content.strip():
         from .llm import chat
         assistant_content = chat(messages, model)
+        if stream:
+            yield ("text", assistant_content)
 
     # 6. Build programmatic banners for tool actions
     banners = _build_tool_banners(tools_fired)
@@ -429,25 +654,22 @@ def process_turn(session_dir: Path, user_message: str, model: str = DEFAULT_MODE
         _log_message(session_dir, None, "user", user_message)
         _log_message(session_dir, None, "assistant", final_response)
 
-    # 10. Check decay for all expanded efforts
-    decayed_ids = check_decay(session_dir, current_turn, user_message, final_response)
-
-    # 11. Check decay for expanded knowledge nodes
-    decayed_knowledge_ids = check_knowledge_decay(session_dir, current_turn, user_message, final_response)
-
-    # 12. Update summary reference tracking for eviction
-    update_summary_references(session_dir, current_turn, user_message, final_response)
-
-    # 13. Update knowledge reference tracking for eviction
-    update_knowledge_references(session_dir, current_turn, user_message, final_response)
+    # 10-13. Decay checks and reference tracking (deferred: queued with the
+    # turn's other maintenance and finished before the next turn starts)
+    post_turn = partial(_post_turn_maintenance, session_dir, current_turn, user_message, final_response,
+                        session_id=session_id, context=context)
+    if defer_maintenance:
+        maintenance.submit(session_dir, deferred + [post_turn])
+        decay_parts = []
+    else:
+        decay_parts = post_turn()
 
     # 14. Append decay banners to response if any
-    decay_parts = []
-    for eid in decayed_ids:
-        decay_parts.append(f"--- Auto-collapsed effort: {eid} (inactive for {DECAY_THRESHOLD} turns) ---")
-    for nid in decayed_knowledge_ids:
-        decay_parts.append(f"--- Auto-collapsed knowledge: {nid} (inactive for {DECAY_THRESHOLD} turns) ---")
     if decay_parts:
         final_response = final_response + "\n\n" + "\n".join(decay_parts)
+        if stream:
+            yield ("banner", "\n".join(decay_parts))
 
-    return final_response
+    if notices:
+        final_response = "\n".join(notices) + "\n\n" + final_response
+    yield ("done", final_response)
@@ -26,6 +26,7 @@ class DocumentMetadata(BaseModel):
     source_path: str  # Relative path from base_dir
     format: str  # "markdown", "pdf", "text"
     provenance_uri: str  # doc://relative/path.md
+    update_time: Optional[float] = None  # Source-reported edit time (ChatGPT update_time)
 
 
 class DocumentChunk(BaseModel):
@@ -447,10 +448,103 @@ def _parse_text(
 # === PDF Parser ===
 
 
+def _extract_page_text(page) -> tuple[str, str | None]:
+    """Extract text from one pypdf page. Returns (text, error)."""
+    try:
+        return page.extract_text() or "", None
+    except Exception as e:
+        return "", str(e)
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> list[tuple[str, str | None]]:
+    """Worker: open the PDF and extract pages [start, stop).
+
+    Runs in a child process, so it re-opens the file rather than receiving
+    a PdfReader (which is not picklable).
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return [_extract_page_text(reader.pages[i]) for i in range(start, stop)]
+
+
+def _extract_pages_parallel(
+    path: Path, page_count: int, workers: int
+) -> list[tuple[str, str | None]]:
+    """Extract all page texts over a process pool, reassembled in page order.
+
+    Pages are split into contiguous ranges (a few per worker) so each child
+    parses the PDF structure once per range rather than once per page.
+    Falls back to serial extraction if the pool cannot be used.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    n_ranges = min(page_count, workers * 4)
+    step = -(-page_count // n_ranges)  # ceil division
+    ranges = [(s, min(s + step, page_count)) for s in range(0, page_count, step)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_extract_page_range, str(path), start, stop)
+                for start, stop in ranges
+            ]
+            results: list[tuple[str, str | None]] = []
+            for future in futures:
+                results.extend(future.result())
+        return results
+    except Exception:
+        return _extract_page_range(str(path), 0, page_count)
+
+
+def _build_pdf_chunks(
+    page_texts: list[str], rel_path: str, max_chunk_chars: int
+) -> list[DocumentChunk]:
+    """Turn ordered page texts into page-based chunks (page-N / page-N-part-M)."""
+    chunks: list[DocumentChunk] = []
+    for page_num, text in enumerate(page_texts, start=1):
+        text = text.strip()
+        if not text:
+            continue
+
+        slug = f"page-{page_num}"
+        if len(text) <= max_chunk_chars:
+            chunks.append(
+                DocumentChunk(
+                    chunk_id=f"{rel_path}#{slug}",
+                    content=text,
+                    heading=f"Page {page_num}",
+                    provenance_uri=_build_provenance_uri(rel_path, slug),
+                    char_count=len(text),
+                )
+            )
+        else:
+            # Split long pages at paragraph boundaries
+            sub_chunks = _make_chunks(
+                text, f"Page {page_num}", [f"Page {page_num}"], rel_path, max_chunk_chars
+            )
+            # Fix slugs to include page number
+            for i, sc in enumerate(sub_chunks):
+                if len(sub_chunks) == 1:
+                    sc.chunk_id = f"{rel_path}#{slug}"
+                    sc.provenance_uri = _build_provenance_uri(rel_path, slug)
+                else:
+                    new_slug = f"page-{page_num}-part-{i + 1}"
+                    sc.chunk_id = f"{rel_path}#{new_slug}"
+                    sc.provenance_uri = _build_provenance_uri(rel_path, new_slug)
+            chunks.extend(sub_chunks)
+    return chunks
+
+
 def _parse_pdf(
-    path: Path, rel_path: str, max_chunk_chars: int
+    path: Path, rel_path: str, max_chunk_chars: int, workers: int = 1
 ) -> ParsedDocument:
-    """Parse PDF into page-based chunks."""
+    """Parse PDF into page-based chunks.
+
+    With workers > 1, page text extraction (the CPU hot spot) runs on a
+    process pool; pages are reassembled in order before chunking, so chunk
+    ids and provenance URIs are identical to the serial path.
+    """
     try:
         from pypdf import PdfReader
     except ImportError:
@@ -519,45 +613,20 @@ def _parse_pdf(
         provenance_uri=base_uri,
     )
 
-    # Extract pages
-    chunks: list[DocumentChunk] = []
-    for page_num, page in enumerate(reader.pages, start=1):
-        try:
-            text = page.extract_text() or ""
-        except Exception as e:
-            errors.append(f"Page {page_num}: {e}")
-            text = ""
+    # Extract pages (serially, or fanned out over a process pool)
+    page_count = len(reader.pages)
+    if workers > 1 and page_count > 1:
+        page_texts = _extract_pages_parallel(path, page_count, workers)
+    else:
+        page_texts = [_extract_page_text(page) for page in reader.pages]
 
-        text = text.strip()
-        if not text:
-            continue
+    for page_num, (_, err) in enumerate(page_texts, start=1):
+        if err:
+            errors.append(f"Page {page_num}: {err}")
 
-        slug = f"page-{page_num}"
-        if len(text) <= max_chunk_chars:
-            chunks.append(
-                DocumentChunk(
-                    chunk_id=f"{rel_path}#{slug}",
-                    content=text,
-                    heading=f"Page {page_num}",
-                    provenance_uri=_build_provenance_uri(rel_path, slug),
-                    char_count=len(text),
-                )
-            )
-        else:
-            # Split long pages at paragraph boundaries
-            sub_chunks = _make_chunks(
-                text, f"Page {page_num}", [f"Page {page_num}"], rel_path, max_chunk_chars
-            )
-            # Fix slugs to include page number
-            for i, sc in enumerate(sub_chunks):
-                if len(sub_chunks) == 1:
-                    sc.chunk_id = f"{rel_path}#{slug}"
-                    sc.provenance_uri = _build_provenance_uri(rel_path, slug)
-                else:
-                    new_slug = f"page-{page_num}-part-{i + 1}"
-                    sc.chunk_id = f"{rel_path}#{new_slug}"
-                    sc.provenance_uri = _build_provenance_uri(rel_path, new_slug)
-            chunks.extend(sub_chunks)
+    chunks = _build_pdf_chunks(
+        [text for text, _ in page_texts], rel_path, max_chunk_chars
+    )
 
     total = sum(c.char_count for c in chunks)
     return ParsedDocument(
@@ -598,6 +667,7 @@ def parse_file(
     base_dir: str | Path | None = None,
     max_chunk_chars: int = 2000,
     source_id: str | None = None,
+    pdf_workers: int = 1,
 ) -> ParsedDocument:
     """Parse a single file into chunks.
 
@@ -606,6 +676,7 @@ def parse_file(
         base_dir: Base directory for computing relative paths and provenance URIs.
                   Defaults to the file's parent directory.
         max_chunk_chars: Soft limit for chunk size. Splits at natural boundaries.
+        pdf_workers: Processes used for PDF page extraction. 1 = serial.
 
     Returns:
         ParsedDocument with metadata and chunks.
@@ -676,7 +747,7 @@ def parse_file(
             parse_errors=[f"Unsupported format: {suffix}"],
         )
     elif fmt == "pdf":
-        doc = _parse_pdf(path, rel_path, max_chunk_chars)
+        doc = _parse_pdf(path, rel_path, max_chunk_chars, workers=pdf_workers)
     else:
         # Text-based formats: read the file
         try:
@@ -710,6 +781,7 @@ def parse_directory(
     base_dir: str | Path | None = None,
     max_chunk_chars: int = 2000,
     extensions: set[str] | None = None,
+    pdf_workers: int = 1,
 ) -> list[ParsedDocument]:
     """Parse all supported files in a directory tree.
 
@@ -718,6 +790,7 @@ def parse_directory(
         base_dir: Base for relative paths. Defaults to directory.
         max_chunk_chars: Soft limit for chunk size.
         extensions: File extensions to include (with dots). Defaults to {".md", ".pdf", ".txt"}.
+        pdf_workers: Processes used for PDF page extraction. 1 = serial.
 
     Returns:
         List of ParsedDocument, one per file. Sorted by relative path.
@@ -738,7 +811,12 @@ def parse_directory(
         if file_path.suffix.lower() not in extensions:
             continue
         results.append(
-            parse_file(file_path, base_dir=base_dir, max_chunk_chars=max_chunk_chars)
+            parse_file(
+                file_path,
+                base_dir=base_dir,
+                max_chunk_chars=max_chunk_chars,
+                pdf_workers=pdf_workers,
+            )
         )
 
     return results
@@ -6,64 +6,151 @@ exemplifying instances.
 """
 
 import json
+from datetime import datetime
 from pathlib import Path
 
-from .state import _load_knowledge
-from .knowledge import add_knowledge
+from .state import _load_knowledge, update_knowledge
+from .knowledge import _apply_links, _build_node, _embed_new_nodes, _link_node
 
 MIN_CLUSTER_SIZE = 3
 MIN_INDEPENDENT_SOURCES = 2
 
+CLUSTER_EDGE_TYPES = ("supports", "exemplifies")
+
+
+class _GraphIndex:
+    """In-memory knowledge graph with the lookups pattern detection needs.
+
+    Built per pass of detect_patterns(); nodes/edges added through it keep
+    the underlying knowledge dict and the indexes in sync, so the graph is
+    persisted once at the end.
+
+    - nodes_by_id: every node
+    - adjacency: bidirectional supports/exemplifies neighbours
+    - exemplifies_out / exemplifies_in: node → [(edge position, other node)]
+      (positions preserve edge-list order for deterministic lookups)
+    """
+
+    def __init__(self, knowledge: dict):
+        self.knowledge = knowledge
+        self.nodes_by_id: dict[str, dict] = {}
+        self.adjacency: dict[str, set[str]] = {}
+        self.exemplifies_out: dict[str, list[tuple[int, str]]] = {}
+        self.exemplifies_in: dict[str, list[tuple[int, str]]] = {}
+        self.type_counts: dict[str, int] = {}
+        for node in knowledge.get("nodes", []):
+            self._index_node(node)
+        for pos, edge in enumerate(knowledge.get("edges", [])):
+            self._index_edge(pos, edge)
+
+    def _index_node(self, node: dict) -> None:
+        self.nodes_by_id[node["id"]] = node
+        ntype = node["id"].rsplit("-", 1)[0]
+        self.type_counts[ntype] = self.type_counts.get(ntype, 0) + 1
+
+    def _index_edge(self, pos: int, edge: dict) -> None:
+        if edge["type"] in CLUSTER_EDGE_TYPES:
+            self.adjacency.setdefault(edge["source"], set()).add(edge["target"])
+            self.adjacency.setdefault(edge["target"], set()).add(edge["source"])
+        if edge["type"] == "exemplifies":
+            self.exemplifies_out.setdefault(edge["source"], []).append((pos, edge["target"]))
+            self.exemplifies_in.setdefault(edge["target"], []).append((pos, edge["source"]))
+
+    def active(self, node_id: str) -> dict | None:
+        node = self.nodes_by_id.get(node_id)
+        return node if node and node.get("status") == "active" else None
+
+    def next_id(self, node_type: str) -> str:
+        """Same scheme as add_knowledge: type-NNN from the per-type count."""
+        return f"{node_type}-{self.type_counts.get(node_type, 0) + 1:03d}"
+
+    def add_node(self, node: dict) -> None:
+        self.knowledge["nodes"].append(node)
+        self._index_node(node)
+
+    def add_edge(self, edge: dict) -> None:
+        self.knowledge["edges"].append(edge)
+        self._index_edge(len(self.knowledge["edges"]) - 1, edge)
+
+    def reindex_edges_from(self, start: int) -> None:
+        """Index edges appended to knowledge directly (e.g. by auto-linking)."""
+        for pos in range(start, len(self.knowledge["edges"])):
+            self._index_edge(pos, self.knowledge["edges"][pos])
+
 
 def detect_patterns(session_dir: Path, new_node_ids: list[str], model: str) -> list[dict]:
     """Main entry. Returns [{"action": "created"|"updated"|"skipped", "principle_id", "instance_count", "summary"}].
-    Best-effort: returns [] on any failure."""
+    Best-effort: returns [] on any failure.
+
+    Works on one indexed in-memory graph, so cost scales with the clusters
+    touched rather than graph size × clusters. The LLM calls run against a
+    snapshot; their answers are then replayed onto the current graph in
+    one update_knowledge write, so writes that landed meanwhile are kept."""
     try:
-        results = []
-        knowledge = _load_knowledge(session_dir)
-        clusters = _build_clusters(new_node_ids, knowledge)
-
-        for cluster in clusters:
-            existing = _find_existing_principle(cluster["node_ids"], knowledge)
-            if existing:
-                r = _update_existing_principle(session_dir, existing, cluster["new_ids"])
-                results.append(r)
-            else:
-                r = _generate_principle(session_dir, cluster["nodes"], model)
-                results.append(r)
-            # Reload knowledge between iterations (new nodes/edges may have been created)
-            knowledge = _load_knowledge(session_dir)
+        answers: dict[frozenset, tuple] = {}
+        _detect(_load_knowledge(session_dir), new_node_ids, model, answers)
+
+        created: list[dict] = []
+
+        def apply(knowledge: dict):
+            results, created[:] = _detect(knowledge, new_node_ids, model, answers, replay=True)
+            return results, any(r["action"] in ("created", "updated") for r in results)
 
+        results = update_knowledge(session_dir, apply)
+        if created:
+            _embed_new_nodes(session_dir, created)
         return results
     except Exception:
         return []
 
 
-def _build_clusters(new_node_ids: list[str], knowledge: dict) -> list[dict]:
+def _detect(
+    knowledge: dict,
+    new_node_ids: list[str],
+    model: str,
+    answers: dict,
+    replay: bool = False,
+) -> tuple[list[dict], list[dict]]:
+    """One pass of pattern detection over knowledge (mutated in place).
+
+    Records each generated principle's LLM answers in answers, or with
+    replay reuses them instead of calling the LLM. Returns (results,
+    principle nodes created)."""
+    results = []
+    index = _GraphIndex(knowledge)
+    clusters = _build_clusters(new_node_ids, knowledge, index=index)
+    created: list[dict] = []
+
+    for cluster in clusters:
+        existing = _find_existing_principle(cluster["node_ids"], knowledge, index=index)
+        if existing:
+            r = _update_existing_principle(None, existing, cluster["new_ids"], index=index)
+        else:
+            r = _generate_principle(None, cluster["nodes"], model, index=index, answers=answers, replay=replay)
+            if r["action"] == "created":
+                created.append(index.nodes_by_id[r["principle_id"]])
+        results.append(r)
+    return results, created
+
+
+def _build_clusters(new_node_ids: list[str], knowledge: dict, index: _GraphIndex | None = None) -> list[dict]:
     """Build 1-hop support-connected clusters from new nodes.
     Returns [{"nodes": [...], "node_ids": set, "new_ids": [...], "sources": set}]
     Filters: >= MIN_CLUSTER_SIZE nodes, >= MIN_INDEPENDENT_SOURCES."""
-    nodes_by_id = {n["id"]: n for n in knowledge.get("nodes", []) if n.get("status") == "active"}
-    edges = knowledge.get("edges", [])
-
-    # Build bidirectional adjacency for supports/exemplifies edges
-    adjacency = {}
-    for edge in edges:
-        if edge["type"] in ("supports", "exemplifies"):
-            adjacency.setdefault(edge["source"], set()).add(edge["target"])
-            adjacency.setdefault(edge["target"], set()).add(edge["source"])
+    if index is None:
+        index = _GraphIndex(knowledge)
 
     seen_clusters = set()
     clusters = []
 
     for nid in new_node_ids:
-        if nid not in nodes_by_id:
+        if not index.active(nid):
             continue
         # Cluster = {new_node} ∪ 1-hop neighbors
-        neighbors = adjacency.get(nid, set())
+        neighbors = index.adjacency.get(nid, set())
         cluster_ids = {nid} | neighbors
         # Only include nodes that exist and are active
-        cluster_ids = {cid for cid in cluster_ids if cid in nodes_by_id}
+        cluster_ids = {cid for cid in cluster_ids if index.active(cid)}
 
         # Deduplicate by frozenset
         key = frozenset(cluster_ids)
@@ -77,14 +164,14 @@ def _build_clusters(new_node_ids: list[str], knowledge: dict) -> list[dict]:
         # Collect sources
         sources = set()
         for cid in cluster_ids:
-            src = nodes_by_id[cid].get("source")
+            src = index.nodes_by_id[cid].get("source")
             if src:
                 sources.add(src)
 
         if len(sources) < MIN_INDEPENDENT_SOURCES:
             continue
 
-        cluster_nodes = [nodes_by_id[cid] for cid in cluster_ids]
+        cluster_nodes = [index.nodes_by_id[cid] for cid in cluster_ids]
         new_ids_in_cluster = [nid2 for nid2 in new_node_ids if nid2 in cluster_ids]
         clusters.append({
             "nodes": cluster_nodes,
@@ -96,52 +183,66 @@ def _build_clusters(new_node_ids: list[str], knowledge: dict) -> list[dict]:
     return clusters
 
 
-def _find_existing_principle(cluster_node_ids: set, knowledge: dict) -> str | None:
-    """Check if any cluster member already has an exemplifies edge to a principle."""
-    edges = knowledge.get("edges", [])
-    nodes_by_id = {n["id"]: n for n in knowledge.get("nodes", [])}
-
-    for edge in edges:
-        if edge["type"] == "exemplifies":
-            # source exemplifies target — target should be a principle
-            if edge["source"] in cluster_node_ids:
-                target = nodes_by_id.get(edge["target"])
-                if target and target.get("type") == "principle" and target.get("status") == "active":
-                    return edge["target"]
-            if edge["target"] in cluster_node_ids:
-                target = nodes_by_id.get(edge["target"])
-                if target and target.get("type") == "principle" and target.get("status") == "active":
-                    return edge["target"]
-    return None
-
-
-def _update_existing_principle(session_dir: Path, principle_id: str, new_exemplifying_ids: list[str]) -> dict:
-    """Add exemplifies edges from new facts, bump instance_count."""
-    knowledge = _load_knowledge(session_dir)
-    nodes_by_id = {n["id"]: n for n in knowledge["nodes"]}
-    principle = nodes_by_id.get(principle_id)
+def _find_existing_principle(
+    cluster_node_ids: set, knowledge: dict, index: _GraphIndex | None = None,
+) -> str | None:
+    """Check if any cluster member already has an exemplifies edge to a principle.
+
+    Looks only at the members' exemplifies edges (both directions); the
+    earliest matching edge wins, as with a scan of the edge list."""
+    if index is None:
+        index = _GraphIndex(knowledge)
+
+    def _is_principle(node_id: str) -> bool:
+        target = index.active(node_id)
+        return bool(target and target.get("type") == "principle")
+
+    best: tuple[int, str] | None = None
+    for nid in cluster_node_ids:
+        for pos, target in index.exemplifies_out.get(nid, []):
+            if _is_principle(target) and (best is None or pos < best[0]):
+                best = (pos, target)
+        # Member is itself the principle being exemplified
+        if _is_principle(nid):
+            for pos, _ in index.exemplifies_in.get(nid, [])[:1]:
+                if best is None or pos < best[0]:
+                    best = (pos, nid)
+    return best[1] if best else None
+
+
+def _update_existing_principle(
+    session_dir: Path,
+    principle_id: str,
+    new_exemplifying_ids: list[str],
+    index: _GraphIndex | None = None,
+) -> dict:
+    """Add exemplifies edges from new facts, bump instance_count.
+
+    With an index the graph is only mutated in memory (caller saves);
+    without one this is a write of its own (update_knowledge)."""
+    if index is None:
+        def apply(knowledge: dict):
+            r = _update_existing_principle(session_dir, principle_id, new_exemplifying_ids, _GraphIndex(knowledge))
+            return r, r["action"] == "updated"
+        return update_knowledge(session_dir, apply)
+
+    principle = index.nodes_by_id.get(principle_id)
 
     if not principle:
         return {"action": "skipped", "principle_id": principle_id, "instance_count": 0, "summary": ""}
 
     # Add exemplifies edges for new nodes that don't already exemplify this principle
-    existing_exemplifiers = set()
-    for edge in knowledge["edges"]:
-        if edge["type"] == "exemplifies" and edge["target"] == principle_id:
-            existing_exemplifiers.add(edge["source"])
+    existing_exemplifiers = {src for _, src in index.exemplifies_in.get(principle_id, [])}
 
-    from datetime import datetime
     now = datetime.now().isoformat()
-    added_count = 0
     for nid in new_exemplifying_ids:
         if nid not in existing_exemplifiers:
-            knowledge["edges"].append({
+            index.add_edge({
                 "source": nid,
                 "target": principle_id,
                 "type": "exemplifies",
                 "created": now,
             })
-            added_count += 1
 
     # Bump instance_count
     old_count = principle.get("instance_count", 0)
@@ -149,9 +250,6 @@ def _update_existing_principle(session_dir: Path, principle_id: str, new_exempli
     principle["instance_count"] = new_count
     principle["updated"] = now
 
-    from .state import _save_knowledge
-    _save_knowledge(session_dir, knowledge)
-
     return {
         "action": "updated",
         "principle_id": principle_id,
@@ -160,43 +258,82 @@ def _update_existing_principle(session_dir: Path, principle_id: str, new_exempli
     }
 
 
-def _generate_principle(session_dir: Path, cluster_nodes: list[dict], model: str) -> dict:
-    """LLM generates principle, creates node via add_knowledge + exemplifies edges."""
-    summaries = [n.get("summary", "") for n in cluster_nodes]
-    result = detect_principle(summaries, model)
+def _generate_principle(
+    session_dir: Path,
+    cluster_nodes: list[dict],
+    model: str,
+    index: _GraphIndex | None = None,
+    answers: dict | None = None,
+    replay: bool = False,
+) -> dict:
+    """LLM generates principle; adds the node (auto-linked, like add_knowledge) + exemplifies edges.
+
+    With an index the graph is only mutated in memory (caller saves and
+    embeds). The LLM answers (principle, links) are recorded in answers,
+    keyed by the cluster's node IDs; with replay they are reused and a
+    cluster without one is skipped. Without an index the LLM runs against
+    a snapshot and the result is written (update_knowledge) and embedded here."""
+    skipped = {"action": "skipped", "principle_id": None, "instance_count": 0, "summary": ""}
+    node_ids = [n["id"] for n in cluster_nodes]
 
-    if not result or not result.get("summary"):
-        return {"action": "skipped", "principle_id": None, "instance_count": 0, "summary": ""}
+    if index is None:
+        answers = {}
+        _generate_principle(session_dir, cluster_nodes, model, _GraphIndex(_load_knowledge(session_dir)), answers)
+        if not answers:
+            return skipped
+        created: list[dict] = []
+
+        def apply(knowledge: dict):
+            graph_index = _GraphIndex(knowledge)
+            r = _generate_principle(session_dir, cluster_nodes, model, graph_index, answers, replay=True)
+            created[:] = [graph_index.nodes_by_id[r["principle_id"]]] if r["action"] == "created" else []
+            return r, r["action"] == "created"
+
+        r = update_knowledge(session_dir, apply)
+        if created:
+            _embed_new_nodes(session_dir, created)
+        return r
+
+    key = frozenset(node_ids)
+    if replay:
+        if key not in answers:
+            return skipped
+        result, link_results = answers[key]
+    else:
+        summaries = [n.get("summary", "") for n in cluster_nodes]
+        result = detect_principle(summaries, model)
+        if not result or not result.get("summary"):
+            return skipped
+        link_results = None
 
     # Create principle node
-    node_ids = [n["id"] for n in cluster_nodes]
-    add_result = json.loads(add_knowledge(
-        session_dir,
-        "principle",
-        result["summary"],
+    now = datetime.now().isoformat()
+    principle_id = index.next_id("principle")
+    node = _build_node(
+        principle_id, "principle", result["summary"], now,
         source="pattern-detection",
         abstraction_level=result.get("abstraction_level", 2),
         instance_count=len(cluster_nodes),
-    ))
-
-    if add_result.get("status") != "added":
-        return {"action": "skipped", "principle_id": None, "instance_count": 0, "summary": ""}
-
-    principle_id = add_result["node_id"]
+    )
+    if link_results is None:
+        link_results = _link_node(node, index.knowledge, model)
+        if answers is not None:
+            answers[key] = (result, link_results)
+    index.add_node(node)
+    edges_before = len(index.knowledge["edges"])
+    # Replayed links may point at nodes that are gone or superseded since
+    live_links = [dict(lr) for lr in link_results if index.active(lr["target_id"])]
+    _apply_links(node, index.knowledge, live_links, now)
+    index.reindex_edges_from(edges_before)
 
     # Add exemplifies edges from cluster nodes to principle
-    from datetime import datetime
-    from .state import _save_knowledge
-    now = datetime.now().isoformat()
-    knowledge = _load_knowledge(session_dir)
     for nid in node_ids:
-        knowledge["edges"].append({
+        index.add_edge({
             "source": nid,
             "target": principle_id,
             "type": "exemplifies",
             "created": now,
         })
-    _save_knowledge(session_dir, knowledge)
 
     return {
         "action": "created",
@@ -0,0 +1,288 @@
+"""Central scheduler for LLM calls: concurrency, token budgets, retries, priorities.
+
+Every llm.chat / chat_with_tools / chat_with_tools_stream call goes
+through Scheduler.call. Each model gets a ModelLimiter with:
+
+- a concurrency limit, adjusted AIMD-style: +1/limit per successful call
+  up to max_concurrency, halved (down to 1) on a 429 or timeout;
+- an optional tokens-per-minute budget (token bucket): a call reserves its
+  estimated prompt tokens before it starts and is charged its actual
+  usage when it finishes;
+- strict priority among waiters — INTERACTIVE, then NORMAL, then BULK,
+  first come first served within a class — and `reserve` slots that only
+  interactive calls may use, so a turn never queues behind a saturated
+  bulk ingest. (Calls already running are not interrupted.)
+
+Rate limits, timeouts and transient provider errors (connection, 5xx)
+are retried up to max_retries times with full-jitter exponential backoff,
+honoring a Retry-After header when the provider sends one. Other errors
+raise immediately.
+
+The priority of a call comes from the context: `with priority(BULK):`.
+The ingest pipelines run as BULK and process_turn as INTERACTIVE; thread
+pools that submit via contextvars.copy_context().run inherit it.
+
+Defaults come from OI_LLM_CONCURRENCY (8), OI_LLM_TPM (0: no budget) and
+OI_LLM_MAX_RETRIES (4); configure(model, ...) overrides them per model.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+INTERACTIVE, NORMAL, BULK = 0, 1, 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", NORMAL: "normal", BULK: "bulk"}
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 4
+BASE_DELAY = 1.0  # Seconds; attempt n waits up to BASE_DELAY * 2**n
+MAX_DELAY = 30.0
+
+_priority: ContextVar[int] = ContextVar("oi_llm_priority", default=NORMAL)
+
+
+@contextmanager
+def priority(level: int) -> Iterator[None]:
+    """Run this context's LLM calls at the given priority class."""
+    previous = _priority.get()
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        try:
+            _priority.reset(token)
+        except ValueError:
+            _priority.set(previous)  # Generator finalized in another context
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def classify(exc: BaseException) -> str | None:
+    """"throttle" (429/timeout), "transient" (connection/5xx) or None (don't retry)."""
+    import litellm
+
+    if isinstance(exc, (litellm.RateLimitError, litellm.Timeout, TimeoutError)):
+        return "throttle"
+    if isinstance(exc, (litellm.APIConnectionError, litellm.ServiceUnavailableError,
+                        litellm.InternalServerError, ConnectionError)):
+        return "transient"
+    return None
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    """Seconds from a Retry-After header on the provider's response, if any."""
+    headers = getattr(exc, "headers", None) or getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return max(float(value), 0.0) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class ModelLimiter:
+    """Admission control for one model's calls."""
+
+    def __init__(self, model: str, max_concurrency: int = DEFAULT_CONCURRENCY,
+                 tokens_per_minute: int = 0, reserve: int = 1):
+        self.model = model
+        self.max_concurrency = max(max_concurrency, 1)
+        self.tokens_per_minute = max(tokens_per_minute, 0)
+        self.reserve = max(reserve, 0)
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self._tokens = float(self.tokens_per_minute)
+        self._refilled = time.monotonic()
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self) -> None:
+        if not self.tokens_per_minute:
+            return
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._refilled) * self.tokens_per_minute / 60,
+                           float(self.tokens_per_minute))
+        self._refilled = now
+
+    def _capacity(self, level: int) -> int:
+        cap = max(int(self.limit), 1)
+        if level > INTERACTIVE:
+            cap -= min(self.reserve, cap - 1)  # Slots held back for interactive calls
+        return cap
+
+    def _token_wait(self, tokens: int) -> float:
+        """Seconds until the bucket can cover tokens (0 if it already can)."""
+        if not self.tokens_per_minute:
+            return 0.0
+        need = min(tokens, self.tokens_per_minute)  # A huge prompt waits for a full bucket, not forever
+        if self._tokens >= need:
+            return 0.0
+        return (need - self._tokens) * 60 / self.tokens_per_minute
+
+    def acquire(self, level: int = NORMAL, tokens: int = 0) -> None:
+        """Block until a call at this priority may start; reserves tokens."""
+        entry = (level, next(self._seq))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    self._refill()
+                    timeout = None
+                    if self._waiters[0] == entry and self.in_flight < self._capacity(level):
+                        timeout = self._token_wait(tokens)
+                        if timeout == 0.0:
+                            break
+                    self._cond.wait(timeout)
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._waiters)
+            self.in_flight += 1
+            self._tokens -= tokens
+            self.wait_seconds += time.monotonic() - started
+            self._cond.notify_all()  # The next waiter may fit too
+
+    def release(self, reserved: int = 0, used: int | None = None, throttled: bool = False) -> None:
+        """End a call: charge its actual token use and adjust the limit (AIMD)."""
+        with self._cond:
+            self.in_flight -= 1
+            if used is not None:
+                self._tokens -= used - reserved
+            if throttled:
+                self.throttled += 1
+                self.limit = max(self.limit / 2, 1.0)
+            else:
+                self.limit = min(self.limit + 1 / self.limit, float(self.max_concurrency))
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "throttled": self.throttled,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "tokens_available": round(self._tokens) if self.tokens_per_minute else None,
+            }
+
+
+class Ticket:
+    """An admitted call; release() it (once) when the call is over."""
+
+    def __init__(self, limiter: ModelLimiter, reserved: int):
+        self._limiter = limiter
+        self._reserved = reserved
+        self._released = False
+
+    def release(self, used: int | None = None, throttled: bool = False) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter.release(self._reserved, used, throttled)
+
+
+class Scheduler:
+    """Per-model limiters plus the retry loop."""
+
+    def __init__(self, max_concurrency: int | None = None, tokens_per_minute: int | None = None,
+                 max_retries: int | None = None, base_delay: float = BASE_DELAY, max_delay: float = MAX_DELAY,
+                 sleep: Callable[[float], None] | None = None):
+        self.max_concurrency = max_concurrency or _env_int("OI_LLM_CONCURRENCY", DEFAULT_CONCURRENCY)
+        self.tokens_per_minute = tokens_per_minute if tokens_per_minute is not None else _env_int("OI_LLM_TPM", 0)
+        self.max_retries = max_retries if max_retries is not None else _env_int("OI_LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep  # None: time.sleep
+        self._limiters: dict[str, ModelLimiter] = {}
+        self._overrides: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, model: str, max_concurrency: int | None = None,
+                  tokens_per_minute: int | None = None, reserve: int | None = None) -> None:
+        """Override a model's limits (takes effect for its next limiter)."""
+        with self._lock:
+            settings = self._overrides.setdefault(model, {})
+            for key, value in (("max_concurrency", max_concurrency), ("tokens_per_minute", tokens_per_minute),
+                               ("reserve", reserve)):
+                if value is not None:
+                    settings[key] = value
+            self._limiters.pop(model, None)
+
+    def limiter(self, model: str) -> ModelLimiter:
+        with self._lock:
+            limiter = self._limiters.get(model)
+            if limiter is None:
+                settings = {"max_concurrency": self.max_concurrency, "tokens_per_minute": self.tokens_per_minute,
+                            **self._overrides.get(model, {})}
+                limiter = self._limiters[model] = ModelLimiter(model, **settings)
+            return limiter
+
+    def backoff(self, attempt: int, exc: BaseException | None = None) -> float:
+        """Delay before retry number attempt + 1: Retry-After, else full jitter."""
+        retry_after = _retry_after(exc) if exc is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, model: str, fn: Callable[[], T], tokens: int = 0, level: int | None = None,
+             on_retry: Callable[[BaseException], None] | None = None) -> tuple[T, Ticket]:
+        """Run fn() once admitted, retrying throttles and transient errors.
+
+        Returns (result, ticket); the caller releases the ticket with the
+        call's actual token use once it is over (for a stream: consumed).
+        """
+        level = current_priority() if level is None else level
+        limiter = self.limiter(model)
+        for attempt in itertools.count():
+            limiter.acquire(level, tokens)
+            ticket = Ticket(limiter, tokens)
+            try:
+                return fn(), ticket
+            except Exception as exc:
+                kind = classify(exc)
+                ticket.release(throttled=kind == "throttle")
+                if kind is None or attempt >= self.max_retries:
+                    raise
+                if on_retry:
+                    on_retry(exc)
+                (self._sleep or time.sleep)(self.backoff(attempt, exc))
+
+    def stats(self) -> dict:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {model: limiter.stats() for model, limiter in sorted(limiters.items())}
+
+
+_scheduler = Scheduler()
+
+
+def get() -> Scheduler:
+    """The process-wide scheduler."""
+    return _scheduler
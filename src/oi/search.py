@@ -5,6 +5,8 @@ After finding initial seed matches via keyword similarity, walks the graph
 reaching the same node) boosts score via additive aggregation.
 """
 
+from . import tracing
+
 
 def _build_adjacency(knowledge: dict) -> dict[str, list[tuple[str, str]]]:
     """Build bidirectional adjacency list from edges.
@@ -42,6 +44,7 @@ def _build_adjacency(knowledge: dict) -> dict[str, list[tuple[str, str]]]:
     return adj
 
 
+@tracing.traced("search.graph_walk", cat="compute")
 def graph_walk(
     seeds: list[dict],
     knowledge: dict,
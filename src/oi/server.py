@@ -0,0 +1,322 @@
+"""Multi-tenant session server: many session dirs behind one local API.
+
+One process hosts a knowledge network per tenant — tenant "alice" is the
+session dir {root}/alice — instead of one `oi-mcp` process (and one cold
+cache) per user. The tool surface is the MCP server's: every mcp_* tool
+is callable over HTTP, run against the tenant's session dir via
+mcp_server.using_session_dir.
+
+Warm state (graph, indexes, embeddings) lives in each SessionServer's own
+GraphPool, bounded to max_tenants with LRU eviction. Per-tenant locking is the same
+as in the MCP server: each tenant's WarmGraph lock serializes its writers
+in this process, and locking.session_lock / graph version stamps guard
+its files against other processes. Ingestion jobs queue per tenant.
+
+API (JSON in and out), over TCP or a Unix socket:
+    GET  /health
+    GET  /tools                            names, descriptions, input schemas
+    GET  /tenants                          warm tenants, LRU order
+    GET  /stats                            per-tool latency, per-phase LLM stats, LLM scheduler state
+    GET  /metrics                          per-phase LLM counters, Prometheus text format
+    POST /tenants/{tenant}/tools/{tool}    body: tool arguments -> {"result": text}
+
+SessionClient is a small stdlib client for the same API.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.client
+import inspect
+import json
+import os
+import re
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from . import mcp_server, metrics, scheduler
+from .warm import GraphPool
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_TENANTS = 16
+MAX_BODY_BYTES = 1 << 20
+
+_TENANT_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+
+class BadArguments(TypeError):
+    """Tool arguments that don't match the tool's signature."""
+
+
+class ServerError(RuntimeError):
+    """A non-200 response from the session server."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+# === Tenants and tools ===
+
+
+class SessionServer:
+    """Routes tool calls to per-tenant session dirs under root."""
+
+    def __init__(self, root: Path, max_tenants: int = DEFAULT_MAX_TENANTS):
+        self.root = Path(root)
+        self.max_tenants = max_tenants
+        self.graphs = GraphPool(max_graphs=max_tenants)
+        self._tools: dict[str, dict] | None = None
+        self._tools_lock = threading.Lock()
+
+    @property
+    def tools(self) -> dict[str, dict]:
+        """{name: {"fn", "description", "input_schema"}} for every MCP tool."""
+        with self._tools_lock:
+            if self._tools is None:
+                listed = asyncio.run(mcp_server.mcp.list_tools())
+                self._tools = {
+                    t.name: {
+                        "fn": getattr(mcp_server, t.name),
+                        "description": t.description or "",
+                        "input_schema": t.inputSchema,
+                    }
+                    for t in listed
+                }
+            return self._tools
+
+    def tenant_dir(self, tenant: str) -> Path:
+        """Session dir for a tenant name. Raises ValueError for unsafe names."""
+        if not _TENANT_RE.match(tenant) or tenant.strip(".") == "":
+            raise ValueError(f"Invalid tenant name: {tenant!r}")
+        return self.root / tenant
+
+    def call(self, tenant: str, tool: str, args: dict | None = None) -> str:
+        """Run one tool for one tenant. Raises KeyError (unknown tool),
+        ValueError (bad tenant) or BadArguments; errors from the tool
+        itself propagate as they are."""
+        entry = self.tools.get(tool)
+        if entry is None:
+            raise KeyError(tool)
+        session_dir = self.tenant_dir(tenant)
+        args = args or {}
+        try:
+            inspect.signature(entry["fn"]).bind(**args)
+        except TypeError as e:
+            raise BadArguments(str(e)) from e
+        session_dir.mkdir(parents=True, exist_ok=True)
+        with mcp_server.using_session_dir(session_dir, self.graphs):
+            return entry["fn"](**args)
+
+    def tenants(self) -> dict:
+        graphs = self.graphs.graphs()
+        return {
+            "tenants": [
+                {"tenant": g.session_dir.name, "loads": g.loads}
+                for g in graphs if g.session_dir.parent == self.root
+            ],
+            "max_tenants": self.max_tenants,
+            "evictions": self.graphs.evictions,
+        }
+
+
+# === HTTP ===
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "oi-server"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def app(self) -> SessionServer:
+        return self.server.app
+
+    def log_message(self, format, *args):
+        pass  # Quiet by default; tool calls are logged per tenant in mcp_sessions/
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status: int, text: str, content_type: str) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/tools":
+            self._send(200, {"tools": [
+                {"name": name, "description": t["description"], "input_schema": t["input_schema"]}
+                for name, t in self.app.tools.items()
+            ]})
+        elif self.path == "/tenants":
+            self._send(200, self.app.tenants())
+        elif self.path == "/stats":
+            self._send(200, {
+                "latency": mcp_server._latency.snapshot(),
+                "llm": metrics.registry().summary(),
+                "scheduler": scheduler.get().stats(),
+            })
+        elif self.path == "/metrics":
+            self._send_text(200, metrics.registry().to_prometheus(), "text/plain; version=0.0.4")
+        else:
+            self._send(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 4 or parts[0] != "tenants" or parts[2] != "tools":
+            self._send(404, {"error": f"Not found: {self.path}"})
+            return
+        _, tenant, _, tool = parts
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send(413, {"error": "Request body too large"})
+            return
+        try:
+            args = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            self._send(400, {"error": f"Invalid JSON: {e}"})
+            return
+        if not isinstance(args, dict):
+            self._send(400, {"error": "Tool arguments must be a JSON object"})
+            return
+
+        try:
+            result = self.app.call(tenant, tool, args)
+        except KeyError:
+            self._send(404, {"error": f"Unknown tool: {tool}"})
+        except (ValueError, BadArguments) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+        else:
+            self._send(200, {"tenant": tenant, "tool": tool, "result": result})
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)  # BaseHTTPRequestHandler expects (host, port)
+
+
+def make_server(
+    root: Path,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+    max_tenants: int = DEFAULT_MAX_TENANTS,
+):
+    """Build (not start) the HTTP server; a Unix socket when socket_path is set.
+
+    Call serve_forever() to run it and shutdown() / server_close() to stop.
+    """
+    if socket_path is not None:
+        socket_path = Path(socket_path)
+        if socket_path.exists():
+            socket_path.unlink()  # stale socket from a previous run
+        server = _UnixServer(str(socket_path), _Handler)
+    else:
+        server = _TCPServer((host, port), _Handler)
+    server.app = SessionServer(root, max_tenants=max_tenants)
+    return server
+
+
+def serve(root: Path, **kwargs) -> None:
+    """Run the session server until interrupted."""
+    server = make_server(root, **kwargs)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if kwargs.get("socket_path"):
+            try:
+                os.unlink(kwargs["socket_path"])
+            except OSError:
+                pass
+
+
+# === Client ===
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class SessionClient:
+    """Minimal client for the session server (TCP or Unix socket)."""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        socket_path: Path | None = None,
+        timeout: float = 300.0,
+    ):
+        self.host, self.port = host, port
+        self.socket_path = str(socket_path) if socket_path else None
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: dict | None = None) -> dict:
+        if self.socket_path:
+            conn = _UnixHTTPConnection(self.socket_path, self.timeout)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = json.loads(resp.read() or b"{}")
+        finally:
+            conn.close()
+        if resp.status != 200:
+            raise ServerError(resp.status, data.get("error", ""))
+        return data
+
+    def health(self) -> dict:
+        return self._request("GET", "/health")
+
+    def tools(self) -> list[dict]:
+        return self._request("GET", "/tools")["tools"]
+
+    def tenants(self) -> dict:
+        return self._request("GET", "/tenants")
+
+    def stats(self) -> dict:
+        return self._request("GET", "/stats")["latency"]
+
+    def llm_stats(self) -> dict:
+        return self._request("GET", "/stats")["llm"]
+
+    def call(self, tenant: str, tool: str, **args) -> str:
+        """Call a tool for a tenant; returns the tool's text result."""
+        return self._request("POST", f"/tenants/{tenant}/tools/{tool}", args)["result"]
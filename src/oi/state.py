@@ -2,12 +2,22 @@
 
 All file I/O for session state is centralized here to keep tools.py
 focused on tool definitions/handlers and decay.py free of circular imports.
+
+Concurrency: reads are lock-free; every read-modify-write runs under
+locking.session_lock and files are replaced atomically. knowledge.yaml
+carries a version stamp (header comment) that _save_knowledge checks, so a
+writer whose graph went stale gets GraphConflict instead of clobbering —
+update_knowledge() retries the mutation on a fresh load.
 """
 
 import json
 import yaml
 from pathlib import Path
 from datetime import datetime
+from typing import Callable
+
+from .locking import GraphConflict, atomic_write_text, session_lock
+from . import tracing
 
 
 # === Migration: manifest.yaml → knowledge.yaml ===
@@ -23,6 +33,12 @@ def _migrate_manifest_to_knowledge(session_dir: Path):
     if not manifest_path.exists():
         return
 
+    with session_lock(session_dir):
+        if manifest_path.exists():
+            _migrate_manifest_locked(session_dir, manifest_path)
+
+
+def _migrate_manifest_locked(session_dir: Path, manifest_path: Path):
     manifest = yaml.safe_load(manifest_path.read_text(encoding="utf-8")) or {"efforts": []}
     efforts = manifest.get("efforts", [])
     if not efforts:
@@ -91,6 +107,11 @@ def _load_efforts(session_dir: Path) -> list[dict]:
 
 def _save_efforts(session_dir: Path, efforts: list[dict]):
     """Save effort list back to knowledge.yaml, preserving non-effort nodes."""
+    with session_lock(session_dir):
+        _save_efforts_locked(session_dir, efforts)
+
+
+def _save_efforts_locked(session_dir: Path, efforts: list[dict]):
     knowledge = _load_knowledge(session_dir)
 
     # Keep all non-effort nodes
@@ -142,8 +163,12 @@ def _save_expanded(session_dir: Path, expanded_set: set, last_referenced_turn: d
     Preserves existing expanded_at timestamps for efforts that were already expanded.
     Updates last_referenced_turn if provided.
     """
+    with session_lock(session_dir):
+        _save_expanded_locked(session_dir, expanded_set, last_referenced_turn)
+
+
+def _save_expanded_locked(session_dir: Path, expanded_set: set, last_referenced_turn: dict | None):
     expanded_path = session_dir / "expanded.json"
-    expanded_path.parent.mkdir(parents=True, exist_ok=True)
     now = datetime.now().isoformat()
 
     # Load existing state to preserve timestamps
@@ -169,7 +194,7 @@ def _save_expanded(session_dir: Path, expanded_set: set, last_referenced_turn: d
         "last_referenced_turn": lrt,
         "summary_last_referenced_turn": existing_slrt,
     }
-    expanded_path.write_text(json.dumps(data), encoding="utf-8")
+    atomic_write_text(expanded_path, json.dumps(data))
 
 
 # === Session state (turn counter) ===
@@ -185,24 +210,25 @@ def _load_session_state(session_dir: Path) -> dict:
 def _save_session_state(session_dir: Path, state: dict):
     """Write session_state.json."""
     state_path = session_dir / "session_state.json"
-    state_path.parent.mkdir(parents=True, exist_ok=True)
     state["updated"] = datetime.now().isoformat()
-    state_path.write_text(json.dumps(state), encoding="utf-8")
+    atomic_write_text(state_path, json.dumps(state))
 
 
 def increment_turn(session_dir: Path) -> int:
     """Increment the session turn counter. Returns the new turn count."""
-    state = _load_session_state(session_dir)
-    state["turn_count"] = state.get("turn_count", 0) + 1
-    _save_session_state(session_dir, state)
+    with session_lock(session_dir):
+        state = _load_session_state(session_dir)
+        state["turn_count"] = state.get("turn_count", 0) + 1
+        _save_session_state(session_dir, state)
     return state["turn_count"]
 
 
 def increment_session_count(session_dir: Path) -> int:
     """Increment the session count (number of CLI launches). Returns the new count."""
-    state = _load_session_state(session_dir)
-    state["session_count"] = state.get("session_count", 0) + 1
-    _save_session_state(session_dir, state)
+    with session_lock(session_dir):
+        state = _load_session_state(session_dir)
+        state["session_count"] = state.get("session_count", 0) + 1
+        _save_session_state(session_dir, state)
     return state["session_count"]
 
 
@@ -216,30 +242,113 @@ def _load_summary_references(session_dir: Path) -> dict[str, int]:
 
 # === Knowledge graph (nodes + edges) ===
 
+_VERSION_HEADER = "# oi-graph-version: "
+
+
+def _parse_version(first_line: str) -> int:
+    if first_line.startswith(_VERSION_HEADER):
+        try:
+            return int(first_line[len(_VERSION_HEADER):].strip())
+        except ValueError:
+            pass
+    return 0
+
+
+def _knowledge_version(session_dir: Path) -> int:
+    """Version stamp of knowledge.yaml on disk (reads the header line only; 0 if none)."""
+    try:
+        with open(session_dir / "knowledge.yaml", encoding="utf-8") as f:
+            return _parse_version(f.readline())
+    except FileNotFoundError:
+        return 0
+
+
+@tracing.traced("state.load_knowledge", cat="io")
 def _load_knowledge(session_dir: Path) -> dict:
-    """Load knowledge.yaml, returning empty structure if missing."""
+    """Load knowledge.yaml, returning empty structure if missing.
+
+    The loaded graph carries the file's version stamp under "version";
+    _save_knowledge uses it to detect writes made in between.
+    """
     path = session_dir / "knowledge.yaml"
     if path.exists():
-        return yaml.safe_load(path.read_text(encoding="utf-8")) or {"nodes": [], "edges": []}
+        text = path.read_text(encoding="utf-8")
+        knowledge = yaml.safe_load(text) or {"nodes": [], "edges": []}
+        knowledge["version"] = _parse_version(text[:text.find("\n") + 1])
+        return knowledge
     return {"nodes": [], "edges": []}
 
 
+@tracing.traced("state.save_knowledge", cat="io")
 def _save_knowledge(session_dir: Path, knowledge: dict):
-    """Write knowledge.yaml."""
+    """Write knowledge.yaml and bump its version stamp.
+
+    Raises GraphConflict if the graph was loaded at a version older than
+    the one on disk (another writer got in first). Graphs without a
+    "version" (built in memory, or loaded before the file existed) are
+    written unconditionally.
+    """
     path = session_dir / "knowledge.yaml"
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(knowledge, f, default_flow_style=False)
+    body = {k: v for k, v in knowledge.items() if k != "version"}
+    text = yaml.dump(body, default_flow_style=False)
+    with session_lock(session_dir):
+        current = _knowledge_version(session_dir)
+        base = knowledge.get("version")
+        if base is not None and base != current:
+            raise GraphConflict(
+                f"knowledge.yaml changed on disk (loaded v{base}, now v{current})"
+            )
+        atomic_write_text(path, f"{_VERSION_HEADER}{current + 1}\n{text}")
+        knowledge["version"] = current + 1
+
+
+def update_knowledge(
+    session_dir: Path,
+    mutate: Callable[[dict], tuple],
+    retries: int = 3,
+    graph=None,
+):
+    """Optimistic read-modify-write of the knowledge graph.
+
+    mutate(knowledge) applies a change in place and returns
+    (result, changed). The graph is loaded lock-free and saved with a
+    version check; on GraphConflict the mutation is re-applied to a fresh
+    load. The final attempt holds session_lock throughout, so it always
+    lands. Returns mutate's result.
+
+    With a warm.WarmGraph, its in-memory graph is mutated and written
+    through (and dropped on conflict).
+    """
+    def attempt():
+        knowledge = graph.knowledge if graph is not None else _load_knowledge(session_dir)
+        result, changed = mutate(knowledge)
+        if changed:
+            if graph is not None:
+                graph.save()
+            else:
+                _save_knowledge(session_dir, knowledge)
+        return result
+
+    for _ in range(retries):
+        try:
+            return attempt()
+        except GraphConflict:
+            if graph is not None:
+                graph.invalidate()
+    with session_lock(session_dir):
+        if graph is not None:
+            graph.invalidate()
+        return attempt()
 
 
 def _save_summary_references(session_dir: Path, refs: dict[str, int]):
     """Update summary_last_referenced_turn in expanded.json (merge, don't overwrite)."""
     expanded_path = session_dir / "expanded.json"
-    expanded_path.parent.mkdir(parents=True, exist_ok=True)
 
-    existing = _load_expanded_state(session_dir)
-    existing["summary_last_referenced_turn"] = refs
-    expanded_path.write_text(json.dumps(existing), encoding="utf-8")
+    with session_lock(session_dir):
+        existing = _load_expanded_state(session_dir)
+        existing["summary_last_referenced_turn"] = refs
+        atomic_write_text(expanded_path, json.dumps(existing))
 
 
 # === Knowledge reference tracking (for knowledge eviction) ===
@@ -252,9 +361,10 @@ def _load_knowledge_references(session_dir: Path) -> dict[str, int]:
 
 def _save_knowledge_references(session_dir: Path, refs: dict[str, int]):
     """Update knowledge_last_referenced_turn in session_state.json."""
-    state = _load_session_state(session_dir)
-    state["knowledge_last_referenced_turn"] = refs
-    _save_session_state(session_dir, state)
+    with session_lock(session_dir):
+        state = _load_session_state(session_dir)
+        state["knowledge_last_referenced_turn"] = refs
+        _save_session_state(session_dir, state)
 
 
 # === Expanded knowledge state (which knowledge nodes have context loaded) ===
@@ -271,8 +381,12 @@ def _save_expanded_knowledge(session_dir: Path, node_id_set: set, last_expanded_
     Preserves existing expanded_knowledge_at timestamps for nodes that were already expanded.
     Updates knowledge_last_expanded_turn if provided.
     """
+    with session_lock(session_dir):
+        _save_expanded_knowledge_locked(session_dir, node_id_set, last_expanded_turn)
+
+
+def _save_expanded_knowledge_locked(session_dir: Path, node_id_set: set, last_expanded_turn: dict | None):
     expanded_path = session_dir / "expanded.json"
-    expanded_path.parent.mkdir(parents=True, exist_ok=True)
     now = datetime.now().isoformat()
 
     # Load existing state to preserve timestamps and other fields
@@ -294,4 +408,4 @@ def _save_expanded_knowledge(session_dir: Path, node_id_set: set, last_expanded_
     existing["expanded_knowledge_at"] = expanded_at
     existing["knowledge_last_expanded_turn"] = let
 
-    expanded_path.write_text(json.dumps(existing), encoding="utf-8")
+    atomic_write_text(expanded_path, json.dumps(existing))
@@ -17,6 +17,9 @@ Sixteen LLM-callable tools:
 - query_knowledge(query, ...): Search the knowledge graph by topic
 - expand_knowledge(node_id): Load source conversation for a knowledge node into context
 - collapse_knowledge(node_id): Remove expanded knowledge context
+
+execute_tools runs the tool calls of one model response, concurrently
+where TOOL_REGISTRY marks them independent.
 """
 
 import json
@@ -25,7 +28,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import Callable
 
-from .schemas import get_tool_addable_types, get_all_edge_type_names
+from . import tracing
+from .schemas import get_tool_addable_types, get_all_edge_type_names, get_node_type_names
 from .state import (
     _load_efforts, _save_efforts,
     _load_expanded, _load_expanded_state, _save_expanded,
@@ -408,18 +412,33 @@ TOOL_DEFINITIONS = [
 ]
 
 
-# Tool registry: metadata not sent to LLM (e.g. confirmation requirements)
+# Tool registry: metadata not sent to LLM (e.g. confirmation requirements).
+# mutates: changes session state or the environment; read-only tools may
+# run concurrently with each other (see execute_tools). Side writes a
+# read-only tool makes must be safe to race (query_knowledge's embedding
+# backfill merges into embeddings.json under session_lock).
+# schedule: overrides the execute_tools class derived from the above.
 TOOL_REGISTRY = {
-    "read_file": {"requires_confirmation": False},
-    "run_command": {"requires_confirmation": True},
-    "write_file": {"requires_confirmation": True},
-    "append_file": {"requires_confirmation": True},
-    "add_knowledge": {"requires_confirmation": False},
-    "query_knowledge": {"requires_confirmation": False},
-    "expand_knowledge": {"requires_confirmation": False},
-    "collapse_knowledge": {"requires_confirmation": False},
+    "open_effort": {"requires_confirmation": False, "mutates": True},
+    "close_effort": {"requires_confirmation": False, "mutates": True},
+    "effort_status": {"requires_confirmation": False, "mutates": False},
+    "expand_effort": {"requires_confirmation": False, "mutates": True},
+    "collapse_effort": {"requires_confirmation": False, "mutates": True},
+    "switch_effort": {"requires_confirmation": False, "mutates": True},
+    "reopen_effort": {"requires_confirmation": False, "mutates": True},
+    "search_efforts": {"requires_confirmation": False, "mutates": False},
+    "read_file": {"requires_confirmation": False, "mutates": False},
+    "run_command": {"requires_confirmation": True, "mutates": True},
+    "write_file": {"requires_confirmation": True, "mutates": True},
+    "append_file": {"requires_confirmation": True, "mutates": True},
+    "add_knowledge": {"requires_confirmation": False, "mutates": True, "schedule": "add"},
+    "query_knowledge": {"requires_confirmation": False, "mutates": False},
+    "expand_knowledge": {"requires_confirmation": False, "mutates": True},
+    "collapse_knowledge": {"requires_confirmation": False, "mutates": True},
 }
 
+TOOL_WORKERS = 4  # Concurrent tool calls per batch (execute_tools)
+
 READ_FILE_MAX_CHARS = 10_000
 RUN_COMMAND_TIMEOUT = 30
 RUN_COMMAND_MAX_CHARS = 10_000
@@ -487,8 +506,13 @@ def open_effort(session_dir: Path, name: str, description: str = None, provenanc
     return json.dumps({"status": "opened", "effort_id": name})
 
 
-def close_effort(session_dir: Path, model: str = None, effort_id: str = None, session_id: str = None, provenance_uri: str = None) -> str:
-    """Close an effort. If effort_id is None, close the active effort. Returns JSON result."""
+def close_effort(session_dir: Path, model: str = None, effort_id: str = None, session_id: str = None, provenance_uri: str = None, defer: Callable | None = None) -> str:
+    """Close an effort. If effort_id is None, close the active effort. Returns JSON result.
+
+    With defer (see maintenance.py), embedding the extracted nodes and
+    pattern detection are handed to defer(task) instead of run inline;
+    detected patterns then surface as notices rather than in the result.
+    """
     from .llm import summarize_effort as llm_summarize, extract_knowledge as llm_extract_knowledge, DEFAULT_MODEL
 
     if effort_id:
@@ -524,11 +548,14 @@ def close_effort(session_dir: Path, model: str = None, effort_id: str = None, se
         raw_extracted = llm_extract_knowledge(effort_content, effort_id, model or DEFAULT_MODEL)
         extracted_nodes = []
         for node in raw_extracted:
-            result = json.loads(add_knowledge(
+            raw = add_knowledge(
                 session_dir, node["node_type"], node["summary"], source=effort_id,
                 model=model or DEFAULT_MODEL, session_id=session_id,
-                provenance_uri=provenance_uri,
-            ))
+                provenance_uri=provenance_uri, skip_embed=defer is not None,
+            )
+            if defer is not None:
+                _defer_embedding(session_dir, raw, defer)
+            result = json.loads(raw)
             if result.get("status") == "added":
                 extracted_nodes.append({
                     "node_id": result["node_id"],
@@ -563,7 +590,10 @@ def close_effort(session_dir: Path, model: str = None, effort_id: str = None, se
         try:
             from .patterns import detect_patterns
             new_ids = [n["node_id"] for n in extracted_nodes]
-            pattern_results = detect_patterns(session_dir, new_ids, model or DEFAULT_MODEL)
+            if defer is not None:
+                defer(lambda: _pattern_notices(detect_patterns(session_dir, new_ids, model or DEFAULT_MODEL)))
+            else:
+                pattern_results = detect_patterns(session_dir, new_ids, model or DEFAULT_MODEL)
         except Exception:
             pass  # Best-effort
 
@@ -1006,12 +1036,21 @@ def append_file(
 
 
 
-def execute_tool(session_dir: Path, tool_name: str, tool_args: dict, model: str = None, confirmation_callback: Callable[[str], bool] | None = None, session_id: str = None) -> str:
-    """Execute a tool by name. Returns the tool result as a JSON string."""
+def execute_tool(session_dir: Path, tool_name: str, tool_args: dict, model: str = None, confirmation_callback: Callable[[str], bool] | None = None, session_id: str = None, defer: Callable | None = None) -> str:
+    """Execute a tool by name. Returns the tool result as a JSON string.
+
+    With defer, post-commit work (embedding, pattern detection) is handed
+    to defer(task) for deferred maintenance instead of run inline.
+    """
+    with tracing.span(f"tool.{tool_name}", cat="tool"):
+        return _execute_tool(session_dir, tool_name, tool_args, model, confirmation_callback, session_id, defer)
+
+
+def _execute_tool(session_dir: Path, tool_name: str, tool_args: dict, model: str, confirmation_callback: Callable[[str], bool] | None, session_id: str | None, defer: Callable | None) -> str:
     if tool_name == "open_effort":
         return open_effort(session_dir, tool_args["name"])
     elif tool_name == "close_effort":
-        return close_effort(session_dir, model, effort_id=tool_args.get("id"), session_id=session_id)
+        return close_effort(session_dir, model, effort_id=tool_args.get("id"), session_id=session_id, defer=defer)
     elif tool_name == "effort_status":
         return effort_status(session_dir)
     elif tool_name == "expand_effort":
@@ -1045,25 +1084,12 @@ def execute_tool(session_dir: Path, tool_name: str, tool_args: dict, model: str
             confirmation_callback=confirmation_callback,
         )
     elif tool_name == "add_knowledge":
-        # Auto-fill source from active effort if not provided
-        source = tool_args.get("source")
-        if not source:
-            active = get_active_effort(session_dir)
-            if active:
-                source = active["id"]
-        return add_knowledge(
-            session_dir,
-            tool_args["node_type"],
-            tool_args["summary"],
-            source=source,
-            related_to=tool_args.get("related_to"),
-            edge_type=tool_args.get("edge_type", "supports"),
-            model=model,
-            supersedes=tool_args.get("supersedes"),
-            session_id=session_id,
-            abstraction_level=tool_args.get("abstraction_level"),
-            instance_count=tool_args.get("instance_count"),
-        )
+        args = _add_knowledge_args(session_dir, tool_args, model, session_id)
+        if defer is None:
+            return add_knowledge(session_dir, **args)
+        result = add_knowledge(session_dir, **args, skip_embed=True)
+        _defer_embedding(session_dir, result, defer)
+        return result
     elif tool_name == "query_knowledge":
         return query_knowledge(
             session_dir,
@@ -1077,3 +1103,140 @@ def execute_tool(session_dir: Path, tool_name: str, tool_args: dict, model: str
         return collapse_knowledge(session_dir, tool_args["node_id"])
     else:
         return json.dumps({"error": f"Unknown tool: {tool_name}"})
+
+
+def _add_knowledge_args(session_dir: Path, tool_args: dict, model: str, session_id: str) -> dict:
+    """add_knowledge keyword arguments for an add_knowledge tool call."""
+    # Auto-fill source from active effort if not provided
+    source = tool_args.get("source")
+    if not source:
+        active = get_active_effort(session_dir)
+        if active:
+            source = active["id"]
+    return {
+        "node_type": tool_args["node_type"],
+        "summary": tool_args["summary"],
+        "source": source,
+        "related_to": tool_args.get("related_to"),
+        "edge_type": tool_args.get("edge_type", "supports"),
+        "model": model,
+        "supersedes": tool_args.get("supersedes"),
+        "session_id": session_id,
+        "abstraction_level": tool_args.get("abstraction_level"),
+        "instance_count": tool_args.get("instance_count"),
+    }
+
+
+def _defer_embedding(session_dir: Path, add_result: str, defer: Callable) -> None:
+    """Queue embedding of the node an add_knowledge result reports as added."""
+    from .knowledge import _embed_new_nodes
+
+    result = json.loads(add_result)
+    if result.get("status") == "added":
+        node = {"id": result["node_id"], "summary": result["summary"]}
+        defer(lambda: _embed_new_nodes(session_dir, [node]))
+
+
+def _pattern_notices(pattern_results: list[dict]) -> list[str]:
+    """Banners for patterns detected by deferred pattern detection."""
+    notices = []
+    for p in pattern_results:
+        if p["action"] == "created":
+            notices.append(f"--- Pattern detected ({p['instance_count']} instances): {p['summary']} ---")
+        elif p["action"] == "updated":
+            notices.append(f"--- Pattern reinforced ({p['instance_count']} instances): {p['summary']} ---")
+    return notices
+
+
+def _schedule_class(tool_name: str) -> str:
+    """"read" (run concurrently), "add" (concurrent prepare, serial commit) or "serial"."""
+    meta = TOOL_REGISTRY.get(tool_name)
+    if meta and "schedule" in meta:
+        return meta["schedule"]
+    if meta and not meta["mutates"] and not meta["requires_confirmation"]:
+        return "read"
+    return "serial"
+
+
+def execute_tools(
+    session_dir: Path,
+    calls: list[tuple[str, dict]],
+    model: str = None,
+    confirmation_callback: Callable[[str], bool] | None = None,
+    session_id: str = None,
+    workers: int = TOOL_WORKERS,
+    defer: Callable | None = None,
+) -> list[str]:
+    """Execute one response's tool calls. Returns the results in call order.
+
+    Calls are scheduled in consecutive runs of the same class:
+    - read-only tools (TOOL_REGISTRY mutates=False) run concurrently;
+    - add_knowledge calls (TOOL_REGISTRY schedule="add") run their
+      LLM-bound half (prepare_knowledge: linking and embedding)
+      concurrently, then commit one at a time in call order;
+    - every other tool runs alone, in order.
+    A call therefore always sees the effects of the mutating calls before
+    it, as with sequential execute_tool calls. defer is passed through to
+    execute_tool.
+    """
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+    from .knowledge import prepare_knowledge
+
+    results: list[str | None] = [None] * len(calls)
+    i = 0
+    while i < len(calls):
+        kind = _schedule_class(calls[i][0])
+        j = i + 1
+        if kind != "serial":
+            while j < len(calls) and _schedule_class(calls[j][0]) == kind:
+                j += 1
+        batch = list(range(i, j))
+
+        if len(batch) > 1 and workers > 1 and kind == "read":
+            with ThreadPoolExecutor(max_workers=min(workers, len(batch))) as pool:
+                futures = [
+                    # Each call runs in a copy of this context (keeps it in the turn's trace)
+                    pool.submit(contextvars.copy_context().run,
+                                execute_tool, session_dir, calls[k][0], calls[k][1], model,
+                                confirmation_callback=confirmation_callback, session_id=session_id, defer=defer)
+                    for k in batch
+                ]
+            for k, future in zip(batch, futures):
+                results[k] = future.result()
+        elif len(batch) > 1 and workers > 1 and kind == "add":
+            batch_args = []
+            valid_types = get_node_type_names()
+            for k in batch:
+                try:
+                    args = _add_knowledge_args(session_dir, calls[k][1], model, session_id)
+                except KeyError:
+                    args = None
+                if args is not None and args["node_type"] not in valid_types:
+                    args = None
+                # Malformed call or invalid node_type: fails on its own below, unprepared
+                batch_args.append(args)
+            with ThreadPoolExecutor(max_workers=min(workers, len(batch))) as pool:
+                futures = [
+                    pool.submit(contextvars.copy_context().run,
+                                prepare_knowledge, session_dir, skip_embed=defer is not None, **{
+                        key: value for key, value in args.items() if key not in ("related_to", "edge_type")
+                    }) if args else None
+                    for args in batch_args
+                ]
+            # Commits: serialized, in call order
+            for k, args, future in zip(batch, batch_args, futures):
+                if args is None:
+                    results[k] = execute_tool(session_dir, calls[k][0], calls[k][1], model,
+                                              confirmation_callback=confirmation_callback, session_id=session_id, defer=defer)
+                else:
+                    results[k] = add_knowledge(session_dir, **args, prepared=future.result(),
+                                               skip_embed=defer is not None)
+                    if defer is not None:
+                        _defer_embedding(session_dir, results[k], defer)
+        else:
+            for k in batch:
+                results[k] = execute_tool(session_dir, calls[k][0], calls[k][1], model,
+                                          confirmation_callback=confirmation_callback, session_id=session_id, defer=defer)
+        i = j
+    return results
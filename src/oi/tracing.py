@@ -0,0 +1,239 @@
+"""Hot-path tracing: nested timing spans written as a Chrome trace.
+
+Tracing is off unless OI_TRACE is set (or enable() / `oi --trace`). When
+off, span() returns a shared no-op context manager and @traced functions
+pay one global check per call.
+
+When on, session(session_dir) collects the spans opened in its context —
+process_turn wraps each turn in one — and appends them to
+{session_dir}/trace.json when it exits. Spans outside any session are
+dropped. Thread pools and the maintenance worker run their work in a copy
+of the submitting context, so their spans land in the same trace (on
+their own thread rows).
+
+trace.json is the Chrome trace-event JSON array format with the closing
+bracket left off, so later turns can append: load it in chrome://tracing
+or https://ui.perfetto.dev, or summarize it with `oi trace`.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+TRACE_FILE = "trace.json"
+
+_enabled = os.environ.get("OI_TRACE", "").lower() not in ("", "0", "false", "no")
+_current: ContextVar["Tracer | None"] = ContextVar("oi_tracer", default=None)
+_NO_SPAN = nullcontext()
+_write_lock = threading.Lock()
+_EPOCH_NS = time.time_ns() - time.perf_counter_ns()  # Monotonic clock, wall-clock origin
+
+
+def _now_us() -> int:
+    return (time.perf_counter_ns() + _EPOCH_NS) // 1000
+
+
+def enable(on: bool = True) -> None:
+    """Turn tracing on (or off) for this process."""
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+class Tracer:
+    """Complete ("X") events for one session dir, flushed to its trace file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._events: list[dict] = []
+        self._threads: set[int] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def span(self, name: str, cat: str = "oi", **args) -> Iterator[None]:
+        ts = _now_us()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name, "cat": cat, "ph": "X", "ts": ts, "dur": _now_us() - ts,
+                "pid": os.getpid(), "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = args
+            self.add(event)
+
+    def complete(self, name: str, seconds: float, cat: str = "oi", **args) -> None:
+        """Record a span that ends now and lasted seconds."""
+        dur = int(seconds * 1_000_000)
+        event = {
+            "name": name, "cat": cat, "ph": "X", "ts": _now_us() - dur, "dur": dur,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.add(event)
+
+    def add(self, event: dict) -> None:
+        with self._lock:
+            if event["tid"] not in self._threads:
+                self._threads.add(event["tid"])
+                self._events.append({
+                    "name": "thread_name", "ph": "M", "pid": event["pid"], "tid": event["tid"],
+                    "args": {"name": threading.current_thread().name},
+                })
+            self._events.append(event)
+            late = self._closed  # Spans from work that outlived the session (e.g. maintenance)
+        if late:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append buffered events to the trace file."""
+        with self._lock:
+            events, self._events = self._events, []
+        if not events:
+            return
+        lines = "".join(json.dumps(e, separators=(",", ":")) + ",\n" for e in events)
+        try:
+            with _write_lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    if f.tell() == 0:
+                        f.write("[\n")
+                    f.write(lines)
+        except OSError:
+            pass  # Tracing never breaks the traced code
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        self.flush()
+
+
+@contextmanager
+def session(session_dir: Path) -> Iterator[Tracer | None]:
+    """Trace spans opened in this context into session_dir's trace file."""
+    if not _enabled:
+        yield None
+        return
+    path = Path(session_dir) / TRACE_FILE
+    tracer = _current.get()
+    if tracer is not None and tracer.path == path:
+        yield tracer  # Nested: the outer session flushes
+        return
+    tracer = Tracer(path)
+    token = _current.set(tracer)
+    try:
+        yield tracer
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            _current.set(None)  # Generator finalized in another context
+        tracer.close()
+
+
+def span(name: str, cat: str = "oi", **args):
+    """Context manager timing the wrapped block (no-op when not tracing)."""
+    if not _enabled:
+        return _NO_SPAN
+    tracer = _current.get()
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name, cat, **args)
+
+
+def complete(name: str, seconds: float, cat: str = "oi", **args) -> None:
+    """Record an already-timed span that ends now (no-op when not tracing)."""
+    if _enabled and (tracer := _current.get()) is not None:
+        tracer.complete(name, seconds, cat, **args)
+
+
+def traced(name: str, cat: str = "oi") -> Callable[[F], F]:
+    """Decorator: run each call of the function in span(name, cat)."""
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            tracer = _current.get()
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.span(name, cat):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def read_trace(path: Path) -> list[dict]:
+    """Events in a trace file; [] if missing. Tolerates a torn last line."""
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except OSError:
+        return []
+    events = []
+    for line in text.splitlines():
+        line = line.strip().rstrip(",")
+        if line in ("", "[", "]"):
+            continue
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return events
+
+
+def summarize(events: list[dict]) -> list[dict]:
+    """Per-span-name stats, by total time descending.
+
+    Each row: name, cat, count, total_ms, self_ms (total minus time in
+    nested spans on the same thread), mean_ms, p95_ms and max_ms.
+    """
+    spans = [e for e in events if e.get("ph") == "X"]
+    child_us: dict[int, int] = {}  # id(event) -> time in direct children
+    by_thread: dict[tuple, list[dict]] = {}
+    for e in spans:
+        by_thread.setdefault((e.get("pid"), e.get("tid")), []).append(e)
+    for thread_spans in by_thread.values():
+        # Parents start no later and last longer than their children
+        thread_spans.sort(key=lambda e: (e["ts"], -e["dur"]))
+        stack: list[dict] = []
+        for e in thread_spans:
+            while stack and e["ts"] >= stack[-1]["ts"] + stack[-1]["dur"]:
+                stack.pop()
+            if stack:
+                child_us[id(stack[-1])] = child_us.get(id(stack[-1]), 0) + e["dur"]
+            stack.append(e)
+
+    rows: dict[str, dict] = {}
+    durations: dict[str, list[int]] = {}
+    for e in spans:
+        row = rows.setdefault(e["name"], {"name": e["name"], "cat": e.get("cat", ""), "count": 0,
+                                          "total_ms": 0.0, "self_ms": 0.0})
+        row["count"] += 1
+        row["total_ms"] += e["dur"] / 1000
+        row["self_ms"] += max(e["dur"] - child_us.get(id(e), 0), 0) / 1000
+        durations.setdefault(e["name"], []).append(e["dur"])
+
+    for name, row in rows.items():
+        durs = sorted(durations[name])
+        row["mean_ms"] = row["total_ms"] / row["count"]
+        row["p95_ms"] = durs[min(int(len(durs) * 0.95), len(durs) - 1)] / 1000
+        row["max_ms"] = durs[-1] / 1000
+        for field in ("total_ms", "self_ms", "mean_ms", "p95_ms", "max_ms"):
+            row[field] = round(row[field], 3)
+    return sorted(rows.values(), key=lambda r: r["total_ms"], reverse=True)
@@ -0,0 +1,343 @@
+"""Warm in-memory graph state for long-lived processes (the MCP server).
+
+A WarmGraph holds knowledge.yaml, embeddings.json and everything derived
+from them — keyword index, per-node edge index, normalized vector index,
+the confidence vector and salience — so repeated tool calls answer from
+memory instead of re-reading YAML and recomputing PageRank.
+
+Invalidation is by file stamp (inode, mtime_ns, size): every access calls
+refresh(), which reloads a file only when another process (CLI, ingest
+job) has written it. Writers in this process mutate graph.knowledge,
+save, then call wrote() so their own write doesn't trigger a reload.
+
+GraphPool keeps one WarmGraph per session dir, optionally LRU-bounded
+so a process serving many session dirs (server.py) holds warm state for
+only the most recently used ones.
+
+LatencyStats records per-tool call durations (first call + p50/p99).
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .state import _load_knowledge, _save_knowledge
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+KNOWLEDGE_FILE = "knowledge.yaml"
+
+
+def _stamp(path: Path) -> tuple[int, int, int] | None:
+    """(inode, mtime_ns, size) of a file, or None if missing.
+
+    The inode catches atomic replacements (locking.atomic_write_text)
+    that land within one mtime tick at an unchanged size.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class WarmGraph:
+    """File-stamp-invalidated cache of one session's graph and indexes."""
+
+    def __init__(self, session_dir: Path):
+        self.session_dir = Path(session_dir)
+        self.lock = threading.RLock()
+        self.loads = 0  # knowledge.yaml reads, for diagnostics/tests
+        self._knowledge: dict | None = None
+        self._knowledge_stamp = None
+        self._embeddings: dict | None = None
+        self._embeddings_stamp = False  # never loaded (None = file missing)
+        self._derived: dict = {}
+
+    # --- Invalidation ---
+
+    def _embeddings_path(self) -> Path:
+        from .embed import EMBEDDINGS_FILE
+        return self.session_dir / EMBEDDINGS_FILE
+
+    def refresh(self) -> None:
+        """Reload whatever changed on disk since the last access."""
+        with self.lock:
+            stamp = _stamp(self.session_dir / KNOWLEDGE_FILE)
+            if self._knowledge is None or stamp != self._knowledge_stamp:
+                self._knowledge = _load_knowledge(self.session_dir)
+                self._knowledge_stamp = stamp
+                self.loads += 1
+                self._derived.clear()
+
+            emb_stamp = _stamp(self._embeddings_path())
+            if emb_stamp != self._embeddings_stamp:
+                from .knowledge import _load_embeddings_safe
+                self._embeddings = _load_embeddings_safe(self.session_dir)
+                self._embeddings_stamp = emb_stamp
+                self._derived.pop("vectors", None)
+                self._derived.pop("confidences", None)
+
+    def invalidate(self) -> None:
+        """Drop everything; the next access reloads from disk."""
+        with self.lock:
+            self._knowledge = None
+            self._embeddings = None
+            self._embeddings_stamp = False
+            self._derived.clear()
+
+    def wrote(self) -> None:
+        """Record a write-through of self.knowledge by this process.
+
+        The in-memory graph is already current, so only the stamp and the
+        derived indexes are refreshed; embeddings are re-checked on access.
+        """
+        with self.lock:
+            self._knowledge_stamp = _stamp(self.session_dir / KNOWLEDGE_FILE)
+            self._derived.clear()
+
+    def save(self) -> None:
+        """Write self.knowledge through to knowledge.yaml."""
+        with self.lock:
+            _save_knowledge(self.session_dir, self._knowledge)
+            self.wrote()
+
+    def warm(self) -> None:
+        """Load the graph and build the indexes ahead of the first query."""
+        self.keywords
+        self.edges_by_node
+        self.confidences
+        self.salience
+
+    # --- Graph ---
+
+    @property
+    def knowledge(self) -> dict:
+        self.refresh()
+        return self._knowledge
+
+    @property
+    def embeddings(self) -> dict | None:
+        """Embeddings dict if any vectors exist (as _load_embeddings_safe)."""
+        self.refresh()
+        return self._embeddings
+
+    def _cached(self, key: str, build):
+        self.refresh()
+        with self.lock:
+            if key not in self._derived:
+                self._derived[key] = build()
+            return self._derived[key]
+
+    # --- Indexes ---
+
+    @property
+    def keywords(self) -> dict[str, set[str]]:
+        """{node_id: extract_keywords(summary)} for every node."""
+        from .decay import extract_keywords
+        return self._cached("keywords", lambda: {
+            n["id"]: extract_keywords(n.get("summary", ""))
+            for n in self._knowledge.get("nodes", [])
+        })
+
+    @property
+    def nodes_by_id(self) -> dict[str, dict]:
+        return self._cached("nodes_by_id", lambda: {
+            n["id"]: n for n in self._knowledge.get("nodes", [])
+        })
+
+    @property
+    def edges_by_node(self) -> dict[str, list[dict]]:
+        """{node_id: [edges touching it]} in edge-list order."""
+        def build():
+            index: dict[str, list[dict]] = {}
+            for edge in self._knowledge.get("edges", []):
+                index.setdefault(edge["source"], []).append(edge)
+                if edge["target"] != edge["source"]:
+                    index.setdefault(edge["target"], []).append(edge)
+            return index
+        return self._cached("edges_by_node", build)
+
+    @property
+    def confidences(self) -> dict[str, dict]:
+        """compute_all_confidences over the warm graph (treat as read-only)."""
+        from .confidence import compute_all_confidences
+        return self._cached("confidences", lambda: compute_all_confidences(
+            self._knowledge, embeddings=self._embeddings))
+
+    @property
+    def salience(self) -> dict[str, float]:
+        from .confidence import compute_salience
+        return self._cached("salience", lambda: compute_salience(self._knowledge))
+
+    def _vector_index(self) -> tuple[list[str], object]:
+        """(node_ids, unit-normalized rows) over the cached embeddings."""
+        def build():
+            vectors = (self._embeddings or {}).get("vectors", {})
+            ids = list(vectors)
+            if np is not None and ids:
+                mat = np.asarray([vectors[i] for i in ids], dtype=np.float64)
+                norms = np.linalg.norm(mat, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                return ids, mat / norms
+            rows = []
+            for i in ids:
+                norm = math.sqrt(sum(x * x for x in vectors[i])) or 1.0
+                rows.append([x / norm for x in vectors[i]])
+            return ids, rows
+        return self._cached("vectors", build)
+
+    def semantic_search(
+        self,
+        query: str,
+        model: str = None,
+        top_k: int = 10,
+        min_score: float = 0.3,
+    ) -> list[dict]:
+        """embed.semantic_search against the warm vector index.
+
+        Falls back to embed.ensure_embeddings (which embeds missing nodes
+        and writes embeddings.json) only when the index is stale.
+        """
+        from .embed import DEFAULT_EMBED_MODEL, ensure_embeddings, get_embedding
+
+        model = model or DEFAULT_EMBED_MODEL
+        query_vec = get_embedding(query, model)
+        if not query_vec:
+            return []
+
+        knowledge = self.knowledge
+        data = self.embeddings or {"model": "", "vectors": {}}
+        active_ids = {n["id"] for n in knowledge.get("nodes", []) if n.get("status") != "superseded"}
+        if data["model"] != model or not active_ids <= set(data["vectors"]):
+            ensure_embeddings(self.session_dir, knowledge, model)
+            self.refresh()
+
+        ids, rows = self._vector_index()
+        if not ids:
+            return []
+        qnorm = math.sqrt(sum(x * x for x in query_vec)) or 1.0
+        if np is not None:
+            scores = rows @ (np.asarray(query_vec, dtype=np.float64) / qnorm)
+            scores = scores.tolist()
+        else:
+            q = [x / qnorm for x in query_vec]
+            scores = [sum(a * b for a, b in zip(row, q)) for row in rows]
+
+        results = [
+            {"node_id": nid, "score": score}
+            for nid, score in zip(ids, scores)
+            if score >= min_score and nid in active_ids
+        ]
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results[:top_k]
+
+
+class GraphPool:
+    """WarmGraph per session dir, evicting the least recently used past max_graphs.
+
+    An evicted graph is only dropped from the pool: a caller still holding
+    it finishes normally, and the next get() for that dir loads afresh.
+    Writes stay correct either way — they go through the version-checked
+    state._save_knowledge.
+    """
+
+    def __init__(self, max_graphs: int | None = None):
+        self.max_graphs = max_graphs
+        self.lock = threading.Lock()
+        self._graphs: OrderedDict[Path, WarmGraph] = OrderedDict()
+        self.evictions = 0
+
+    def get(self, session_dir: Path) -> WarmGraph:
+        key = Path(session_dir)
+        with self.lock:
+            graph = self._graphs.get(key)
+            if graph is None:
+                graph = self._graphs[key] = WarmGraph(key)
+            self._graphs.move_to_end(key)
+            while self.max_graphs and len(self._graphs) > self.max_graphs:
+                self._graphs.popitem(last=False)
+                self.evictions += 1
+            return graph
+
+    def graphs(self) -> list[WarmGraph]:
+        """Pooled graphs, least recently used first."""
+        with self.lock:
+            return list(self._graphs.values())
+
+    def __contains__(self, session_dir) -> bool:
+        with self.lock:
+            return Path(session_dir) in self._graphs
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._graphs)
+
+
+# === Latency ===
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyStats:
+    """Per-tool call latencies: first call plus steady-state p50/p99."""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.lock = threading.Lock()
+        self._first: dict[str, float] = {}
+        self._samples: dict[str, list[float]] = {}
+        self._counts: dict[str, int] = {}
+
+    def record(self, tool: str, seconds: float) -> None:
+        with self.lock:
+            self._counts[tool] = self._counts.get(tool, 0) + 1
+            if tool not in self._first:
+                self._first[tool] = seconds
+                return
+            samples = self._samples.setdefault(tool, [])
+            samples.append(seconds)
+            if len(samples) > self.window:
+                del samples[: len(samples) - self.window]
+
+    def timed(self, tool: str):
+        """Context manager recording the wrapped block's duration."""
+        stats = self
+
+        class _Timer:
+            def __enter__(self):
+                self.t0 = time.perf_counter()
+                return self
+
+            def __exit__(self, *exc):
+                stats.record(tool, time.perf_counter() - self.t0)
+                return False
+
+        return _Timer()
+
+    def snapshot(self) -> dict[str, dict]:
+        """{tool: {calls, first_ms, p50_ms, p99_ms}} (steady state excludes the first call)."""
+        with self.lock:
+            out = {}
+            for tool, count in self._counts.items():
+                samples = sorted(self._samples.get(tool, []))
+                out[tool] = {
+                    "calls": count,
+                    "first_ms": round(self._first[tool] * 1000, 3),
+                    "p50_ms": round(_percentile(samples, 50) * 1000, 3),
+                    "p99_ms": round(_percentile(samples, 99) * 1000, 3),
+                }
+            return out
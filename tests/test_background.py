@@ -0,0 +1,107 @@
+"""Tests for the MCP background job runner."""
+
+import threading
+
+import pytest
+
+from oi.background import BackgroundJobs, JobCancelled
+
+
+@pytest.fixture
+def jobs():
+    return BackgroundJobs()
+
+
+class TestBackgroundJobs:
+    def test_submit_returns_immediately_and_runs(self, jobs):
+        release = threading.Event()
+
+        def work(progress):
+            progress("extract", "3 chunks")
+            release.wait(5)
+            progress("done", "")
+            return "report"
+
+        job = jobs.submit("ingest_document", "a.md", work)
+        assert job["id"] == "job-001"
+        assert job["status"] in ("queued", "running")
+
+        release.set()
+        done = jobs.wait(job["id"], timeout=5)
+        assert done["status"] == "done"
+        assert done["result"] == "report"
+        assert [h[1] for h in done["history"]] == ["extract", "done"]
+        assert done["stage"] == "done"
+
+    def test_failure_recorded(self, jobs):
+        def work(progress):
+            raise RuntimeError("parse failed")
+
+        job = jobs.submit("ingest_document", "bad.md", work)
+        done = jobs.wait(job["id"], timeout=5)
+        assert done["status"] == "failed"
+        assert "parse failed" in done["error"]
+
+    def test_cancel_running_job_at_next_progress(self, jobs):
+        started, proceed = threading.Event(), threading.Event()
+        reached_end = []
+
+        def work(progress):
+            progress("extract", "")
+            started.set()
+            proceed.wait(5)
+            try:
+                progress("write", "")
+            except Exception:
+                pass  # pipelines' best-effort handlers must not swallow cancellation
+            reached_end.append(True)
+            return "report"
+
+        job = jobs.submit("ingest_document", "a.md", work)
+        assert started.wait(5)
+        assert jobs.cancel(job["id"])["status"] == "running"
+        proceed.set()
+
+        done = jobs.wait(job["id"], timeout=5)
+        assert done["status"] == "cancelled"
+        assert done["result"] is None
+        assert not reached_end
+
+    def test_cancel_queued_job_never_runs(self, jobs):
+        gate = threading.Event()
+        ran = []
+
+        first = jobs.submit("ingest_document", "a.md", lambda p: gate.wait(5) and "a", session_key="s")
+        second = jobs.submit("ingest_document", "b.md", lambda p: ran.append(1) or "b", session_key="s")
+        assert jobs.cancel(second["id"])["status"] == "cancelled"
+        gate.set()
+
+        assert jobs.wait(first["id"], timeout=5)["status"] == "done"
+        jobs.wait(second["id"], timeout=5)
+        assert not ran
+
+    def test_same_session_jobs_run_serially(self, jobs):
+        active, overlap = [], []
+        lock = threading.Lock()
+
+        def work(progress):
+            with lock:
+                active.append(1)
+                overlap.append(len(active))
+            progress("write", "")
+            threading.Event().wait(0.05)
+            with lock:
+                active.pop()
+            return "ok"
+
+        ids = [jobs.submit("ingest_document", f"{i}.md", work, session_key="s")["id"] for i in range(3)]
+        for job_id in ids:
+            assert jobs.wait(job_id, timeout=5)["status"] == "done"
+        assert max(overlap) == 1
+
+    def test_unknown_job(self, jobs):
+        assert jobs.status("job-999") is None
+        assert jobs.cancel("job-999") is None
+
+    def test_cancelled_is_base_exception(self):
+        assert not issubclass(JobCancelled, Exception)
@@ -1,10 +1,11 @@
 """Tests for concept node clustering and synthesis (Phase 3, Decision 020)."""
 
 import json
+from contextlib import nullcontext
 import pytest
 from unittest.mock import patch, MagicMock
 
-from oi.cluster import find_clusters, synthesize_concepts
+from oi.cluster import find_clusters, maintain_clusters, synthesize_concepts
 from oi.embed import save_embeddings
 
 
@@ -125,6 +126,90 @@ class TestFindClusters:
         assert clusters == []
 
 
+def _reference_greedy(vectors, threshold):
+    """The original pairwise greedy loop, for exact-match checks."""
+    from oi.embed import cosine_similarity
+
+    node_ids = list(vectors)
+    assigned, clusters = set(), []
+    for i, nid in enumerate(node_ids):
+        if nid in assigned:
+            continue
+        cluster = [nid]
+        assigned.add(nid)
+        for other in node_ids[i + 1:]:
+            if other not in assigned and cosine_similarity(vectors[nid], vectors[other]) >= threshold:
+                cluster.append(other)
+                assigned.add(other)
+        if len(cluster) >= 2:
+            clusters.append(cluster)
+    clusters.sort(key=len, reverse=True)
+    return clusters
+
+
+def _random_vectors(n, dim=8, centers=6, seed=7):
+    import random
+
+    rng = random.Random(seed)
+    bases = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(centers)]
+    return {
+        f"fact-{i + 1:03d}": [x + rng.gauss(0, 0.25) for x in bases[rng.randrange(centers)]]
+        for i in range(n)
+    }
+
+
+class TestVectorizedClustering:
+    """Blocked similarity engine and clustering modes."""
+
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    @pytest.mark.parametrize("threshold", [0.8, 0.9, 0.97])
+    def test_greedy_matches_reference(self, tmp_path, engine, threshold):
+        if engine == "numpy":
+            pytest.importorskip("numpy")
+        vectors = _random_vectors(120)
+        knowledge = _graph([_node(nid) for nid in vectors])
+        _setup_embeddings(tmp_path, vectors)
+
+        with patch("oi.cluster.np", None) if engine == "python" else nullcontext():
+            clusters = find_clusters(tmp_path, knowledge, threshold=threshold, block_size=16)
+        assert clusters == _reference_greedy(vectors, threshold)
+
+    def test_threshold_boundary_is_exact(self, tmp_path):
+        """A pair exactly at the threshold is kept, as in the pairwise loop."""
+        vectors = {"fact-001": [1.0, 0.0], "fact-002": [0.6, 0.8], "fact-003": [0.0, 1.0]}
+        knowledge = _graph([_node(nid) for nid in vectors])
+        _setup_embeddings(tmp_path, vectors)
+
+        from oi.embed import cosine_similarity
+        t = cosine_similarity(vectors["fact-001"], vectors["fact-002"])
+        assert find_clusters(tmp_path, knowledge, threshold=t) == _reference_greedy(vectors, t)
+
+    def test_union_find_is_transitive(self, tmp_path):
+        """A–B and B–C similar, A–C not: greedy splits, union-find joins."""
+        vectors = {
+            "fact-001": [1.0, 0.0],
+            "fact-002": [0.9, 0.436],   # ~0.9 to both neighbours
+            "fact-003": [0.62, 0.785],
+        }
+        knowledge = _graph([_node(nid) for nid in vectors])
+        _setup_embeddings(tmp_path, vectors)
+
+        greedy = find_clusters(tmp_path, knowledge, threshold=0.89)
+        components = find_clusters(tmp_path, knowledge, threshold=0.89, method="union_find")
+        assert greedy == [["fact-001", "fact-002"]]
+        assert components == [["fact-001", "fact-002", "fact-003"]]
+
+    def test_mixed_dimensions_never_cluster(self, tmp_path):
+        vectors = {"fact-001": [1.0, 0.0], "fact-002": [1.0, 0.0, 0.0], "fact-003": [1.0, 0.0]}
+        knowledge = _graph([_node(nid) for nid in vectors])
+        _setup_embeddings(tmp_path, vectors)
+        assert find_clusters(tmp_path, knowledge) == [["fact-001", "fact-003"]]
+
+    def test_unknown_method_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            find_clusters(tmp_path, _graph([]), method="kmeans")
+
+
 class TestSynthesizeConcepts:
     """Tests for synthesize_concepts()."""
 
@@ -218,3 +303,178 @@ class TestSynthesizeConcepts:
 
         assert len(results) == 2
         assert results[0]["concept_node_id"] != results[1]["concept_node_id"]
+
+
+class TestConcurrentSynthesis:
+    """synthesize_concepts() worker pool and circuit breaker."""
+
+    def _knowledge(self, tmp_path, n_clusters):
+        from oi.state import _save_knowledge
+        tmp_path.mkdir(parents=True, exist_ok=True)
+        nodes = [_node(f"fact-{i + 1:03d}") for i in range(2 * n_clusters)]
+        knowledge = _graph(nodes)
+        _save_knowledge(tmp_path, knowledge)
+        clusters = [[f"fact-{2 * i + 1:03d}", f"fact-{2 * i + 2:03d}"] for i in range(n_clusters)]
+        return knowledge, clusters
+
+    @staticmethod
+    def _echo(messages, **kwargs):
+        """Reply names the cluster's first member; later clusters answer faster."""
+        import re, time
+        first = re.search(r"\[(fact-\d+)\]", messages[1]["content"]).group(1)
+        time.sleep(0.02 * (10 - int(first[-3:]) % 10))
+        return f"Concept for {first}"
+
+    @patch("oi.cluster.chat")
+    def test_write_order_is_cluster_order(self, mock_chat, tmp_path):
+        """Out-of-order completion still yields principle IDs in cluster order."""
+        mock_chat.side_effect = self._echo
+        knowledge, clusters = self._knowledge(tmp_path, 6)
+
+        results = synthesize_concepts(clusters, tmp_path, knowledge, workers=4,
+                                      progress_fn=lambda *a: None)
+
+        assert [r["concept_node_id"] for r in results] == [f"principle-{i:03d}" for i in range(1, 7)]
+        assert [r["summary"] for r in results] == [f"Concept for {c[0]}" for c in clusters]
+
+    @patch("oi.cluster.chat")
+    def test_breaker_stops_submitting(self, mock_chat, tmp_path):
+        mock_chat.side_effect = Exception("rate limited")
+        knowledge, clusters = self._knowledge(tmp_path, 30)
+
+        results = synthesize_concepts(clusters, tmp_path, knowledge, workers=2,
+                                      progress_fn=lambda *a: None)
+
+        assert results == []
+        assert mock_chat.call_count < 10
+
+    @patch("oi.cluster.chat")
+    def test_sparse_errors_do_not_trip(self, mock_chat, tmp_path):
+        """Occasional failures below the error rate don't abort the run."""
+        calls = iter(range(100))
+
+        def _flaky(messages, **kwargs):
+            if next(calls) % 4 == 0:
+                raise Exception("transient")
+            return "Concept"
+
+        mock_chat.side_effect = _flaky
+        knowledge, clusters = self._knowledge(tmp_path, 12)
+
+        results = synthesize_concepts(clusters, tmp_path, knowledge, workers=1,
+                                      progress_fn=lambda *a: None)
+
+        assert mock_chat.call_count == 12
+        assert len(results) == 9
+
+
+class TestIncrementalClusters:
+    """maintain_clusters(): persisted membership, re-synthesize changed only."""
+
+    VECTORS = {
+        "fact-001": [1.0, 0.0, 0.0],
+        "fact-002": [0.99, 0.05, 0.0],
+        "fact-003": [0.0, 1.0, 0.0],
+        "fact-004": [0.0, 0.99, 0.05],
+        "fact-005": [0.0, 0.0, 1.0],
+    }
+
+    def _setup(self, tmp_path, vectors):
+        _setup_embeddings(tmp_path, vectors)
+        from oi.state import _save_knowledge, _load_knowledge
+        _save_knowledge(tmp_path, _graph([_node(nid) for nid in vectors]))
+        return _load_knowledge(tmp_path)
+
+    @patch("oi.cluster.chat", return_value="Canonical concept")
+    def test_unchanged_clusters_not_resynthesized(self, mock_chat, tmp_path):
+        kg = self._setup(tmp_path, self.VECTORS)
+        first = maintain_clusters(tmp_path, kg, threshold=0.85)
+        assert first["clusters_total"] == 2
+        assert mock_chat.call_count == 2
+        assert (tmp_path / "clusters.json").exists()
+
+        mock_chat.reset_mock()
+        from oi.state import _load_knowledge
+        second = maintain_clusters(tmp_path, _load_knowledge(tmp_path), threshold=0.85)
+        assert second["clusters_changed"] == 0
+        mock_chat.assert_not_called()
+
+    @patch("oi.cluster.chat", return_value="Canonical concept")
+    def test_new_node_joins_nearest_cluster(self, mock_chat, tmp_path):
+        from oi.state import _load_knowledge, _save_knowledge
+
+        kg = self._setup(tmp_path, self.VECTORS)
+        first = maintain_clusters(tmp_path, kg, threshold=0.85)
+        old_principles = {c["concept_node_id"]: set(c["member_ids"]) for c in first["concepts"]}
+
+        # fact-006 is near the fact-001/002 cluster only
+        vectors = dict(self.VECTORS, **{"fact-006": [0.98, 0.1, 0.0]})
+        _setup_embeddings(tmp_path, vectors)
+        kg = _load_knowledge(tmp_path)
+        kg["nodes"].append(_node("fact-006"))
+        _save_knowledge(tmp_path, kg)
+
+        mock_chat.reset_mock()
+        second = maintain_clusters(tmp_path, _load_knowledge(tmp_path), threshold=0.85)
+
+        assert mock_chat.call_count == 1
+        [concept] = second["concepts"]
+        assert concept["member_ids"] == ["fact-001", "fact-002", "fact-006"]
+        replaced = next(pid for pid, m in old_principles.items() if "fact-001" in m)
+        by_id = {n["id"]: n for n in _load_knowledge(tmp_path)["nodes"]}
+        assert by_id[replaced]["status"] == "superseded"
+        assert by_id[replaced]["superseded_by"] == concept["concept_node_id"]
+
+    @patch("oi.cluster.chat", return_value="Canonical concept")
+    def test_new_node_pairs_with_singleton(self, mock_chat, tmp_path):
+        from oi.state import _load_knowledge, _save_knowledge
+
+        kg = self._setup(tmp_path, self.VECTORS)
+        maintain_clusters(tmp_path, kg, threshold=0.85)
+
+        vectors = dict(self.VECTORS, **{"fact-006": [0.05, 0.0, 0.99]})  # near fact-005
+        _setup_embeddings(tmp_path, vectors)
+        kg = _load_knowledge(tmp_path)
+        kg["nodes"].append(_node("fact-006"))
+        _save_knowledge(tmp_path, kg)
+
+        mock_chat.reset_mock()
+        result = maintain_clusters(tmp_path, _load_knowledge(tmp_path), threshold=0.85)
+        assert result["clusters_total"] == 3
+        assert [c["member_ids"] for c in result["concepts"]] == [["fact-005", "fact-006"]]
+
+    def test_state_written_during_synthesis_is_kept(self, tmp_path):
+        from oi.cluster import load_cluster_state, save_cluster_state
+
+        kg = self._setup(tmp_path, self.VECTORS)
+
+        def concurrent_chat(*args, **kwargs):
+            # Another ingest job records a cluster while this one synthesizes
+            state = load_cluster_state(tmp_path)
+            state["clusters"].setdefault(
+                "cluster-099", {"members": ["x", "y"], "concept_id": "principle-099", "synthesized": ["x", "y"]})
+            save_cluster_state(tmp_path, state)
+            return "Canonical concept"
+
+        with patch("oi.cluster.chat", side_effect=concurrent_chat):
+            result = maintain_clusters(tmp_path, kg, threshold=0.85)
+
+        clusters = load_cluster_state(tmp_path)["clusters"]
+        assert "cluster-099" in clusters
+        assert {c["concept_node_id"] for c in result["concepts"]} <= {
+            c["concept_id"] for c in clusters.values()}
+
+    @patch("oi.cluster.chat", return_value="Canonical concept")
+    def test_bootstrap_adopts_existing_principles(self, mock_chat, tmp_path):
+        """Principles from earlier full runs are reused, not re-synthesized."""
+        kg = self._setup(tmp_path, self.VECTORS)
+        concepts = synthesize_concepts(
+            find_clusters(tmp_path, kg, threshold=0.85), tmp_path, kg, progress_fn=lambda *a: None)
+        assert len(concepts) == 2
+
+        mock_chat.reset_mock()
+        from oi.state import _load_knowledge
+        result = maintain_clusters(tmp_path, _load_knowledge(tmp_path), threshold=0.85)
+        assert result["clusters_changed"] == 0
+        mock_chat.assert_not_called()
+
@@ -9,6 +9,7 @@ from pathlib import Path
 from oi.conflicts import (
     generate_conflict_report,
     resolve_conflict,
+    resolve_conflicts,
     auto_resolve,
     _classify_conflict,
 )
@@ -289,3 +290,81 @@ class TestAutoResolve:
 
         results = auto_resolve(tmp_path)
         assert results == []
+
+
+class TestResolveConflicts:
+
+    def test_single_write_for_many_resolutions(self, tmp_path, monkeypatch):
+        """All resolutions are applied in memory and saved once."""
+        nodes = [_make_node(f"fact-{i:03d}", has_contradiction=True) for i in range(1, 7)]
+        edges = [
+            _make_edge("fact-001", "fact-002", "contradicts"),
+            _make_edge("fact-003", "fact-004", "contradicts"),
+            _make_edge("fact-005", "fact-006", "contradicts"),
+        ]
+        _setup_graph(tmp_path, nodes, edges)
+
+        import oi.state as state
+        saves = []
+        real_save = state._save_knowledge
+        monkeypatch.setattr(state, "_save_knowledge",
+                            lambda d, k: (saves.append(1), real_save(d, k)))
+
+        results = resolve_conflicts(tmp_path, [
+            ("fact-001", "fact-002", "r1"),
+            ("fact-003", "fact-004", "r2"),
+            ("fact-005", "fact-006", "r3"),
+        ])
+        assert len(saves) == 1
+        assert [r["loser"] for r in results] == ["fact-002", "fact-004", "fact-006"]
+        assert all(r["status"] == "resolved" for r in results)
+
+        knowledge = _load_knowledge(tmp_path)
+        assert not [e for e in knowledge["edges"] if e["type"] == "contradicts"]
+        by_id = {n["id"]: n for n in knowledge["nodes"]}
+        assert not any(n.get("has_contradiction") for n in by_id.values())
+
+    def test_chain_resolves_to_surviving_winner(self, tmp_path):
+        """B beats C listed before A beats B → C is superseded by A, the survivor."""
+        nodes = [
+            _make_node("fact-001", has_contradiction=True),
+            _make_node("fact-002", has_contradiction=True),
+            _make_node("fact-003", has_contradiction=True),
+        ]
+        edges = [
+            _make_edge("fact-001", "fact-002", "contradicts"),
+            _make_edge("fact-002", "fact-003", "contradicts"),
+        ]
+        _setup_graph(tmp_path, nodes, edges)
+
+        results = resolve_conflicts(tmp_path, [
+            ("fact-002", "fact-003", "B over C"),
+            ("fact-001", "fact-002", "A over B"),
+        ])
+        # Results stay in input order with the requested winner/loser
+        assert results[0] == {"status": "resolved", "winner": "fact-002",
+                              "loser": "fact-003", "reason": "B over C"}
+
+        knowledge = _load_knowledge(tmp_path)
+        by_id = {n["id"]: n for n in knowledge["nodes"]}
+        assert by_id["fact-001"]["status"] == "active"
+        assert by_id["fact-002"]["superseded_by"] == "fact-001"
+        assert by_id["fact-003"]["superseded_by"] == "fact-001"
+        assert "has_contradiction" not in by_id["fact-001"]
+
+    def test_missing_node_is_error_record(self, tmp_path):
+        """A missing node yields an error record; the rest still resolve."""
+        nodes = [
+            _make_node("fact-001", has_contradiction=True),
+            _make_node("fact-002", has_contradiction=True),
+        ]
+        edges = [_make_edge("fact-001", "fact-002", "contradicts")]
+        _setup_graph(tmp_path, nodes, edges)
+
+        results = resolve_conflicts(tmp_path, [
+            ("fact-001", "fact-999", "missing"),
+            ("fact-001", "fact-002", "ok"),
+        ])
+        assert results[0]["status"] == "error"
+        assert "fact-999" in results[0]["error"]
+        assert results[1]["status"] == "resolved"
@@ -1251,7 +1251,7 @@ class TestConfidenceE2E:
 
             # Check system prompt annotation
             messages = _build_messages(session_dir)
-            system_content = messages[0]["content"]
+            system_content = messages[-1]["content"]  # Knowledge tier is last
             assert "contested" in system_content, (
                 f"Expected 'contested' in system prompt. Got: {system_content[-500:]}"
             )
@@ -178,6 +178,19 @@ class TestEnsureEmbeddings:
             data = ensure_embeddings(tmp_path, knowledge, model="test-model")
         assert "deleted-node" not in data["vectors"]
 
+    def test_keeps_vectors_stored_while_embedding(self, tmp_path):
+        knowledge = {"nodes": [_node("fact-001", "test")], "edges": []}
+
+        def slow_post(*args, **kwargs):
+            # Another writer stores a vector for a node this snapshot doesn't know
+            save_embeddings(tmp_path, {"model": "test-model", "vectors": {"fact-002": [0.7]}})
+            return _mock_ollama_response([0.1])
+
+        with patch("oi.embed.requests.post", side_effect=slow_post):
+            data = ensure_embeddings(tmp_path, knowledge, model="test-model")
+        assert data["vectors"] == {"fact-001": [0.1]}
+        assert load_embeddings(tmp_path)["vectors"] == {"fact-001": [0.1], "fact-002": [0.7]}
+
     def test_skips_superseded_nodes(self, tmp_path):
         knowledge = {
             "nodes": [
@@ -0,0 +1,86 @@
+"""Tests for memoized context fragments and incremental JSONL reads."""
+
+import json
+
+from oi.fragments import FragmentCache, JsonlTail
+
+
+def _line(role, content):
+    return json.dumps({"role": role, "content": content, "ts": "t"}) + "\n"
+
+
+class TestFragmentCache:
+    def test_reuses_value_while_key_matches(self):
+        cache = FragmentCache()
+        renders = []
+
+        def render():
+            renders.append(1)
+            return f"render {len(renders)}"
+
+        assert cache.get("s", "tier", ("k", 1), render) == "render 1"
+        assert cache.get("s", "tier", ("k", 1), render) == "render 1"
+        assert cache.get("s", "tier", ("k", 2), render) == "render 2"
+        assert cache.get("other", "tier", ("k", 2), render) == "render 3"  # scopes are separate
+        assert cache.stats() == {"entries": 2, "hits": 1, "misses": 3}
+
+    def test_lru_bound(self):
+        cache = FragmentCache(max_entries=2)
+        for scope in ("a", "b", "c"):
+            cache.get(scope, "t", 1, lambda: scope)
+        assert cache.stats()["entries"] == 2
+        assert cache.get("a", "t", 1, lambda: "fresh") == "fresh"
+
+
+class TestJsonlTail:
+    def test_append_reads_only_new_bytes(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text(_line("user", "one") + _line("assistant", "two"))
+        tail = JsonlTail()
+        assert [m["content"] for m in tail.read(path)] == ["one", "two"]
+        first = tail.bytes_read
+
+        with open(path, "a") as f:
+            f.write(_line("user", "three"))
+        assert [m["content"] for m in tail.read(path)] == ["one", "two", "three"]
+        assert tail.bytes_read - first == len(_line("user", "three"))
+
+    def test_unchanged_file_not_reread(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text(_line("user", "one"))
+        tail = JsonlTail()
+        tail.read(path)
+        before = tail.bytes_read
+        assert tail.read(path) == [{"role": "user", "content": "one"}]
+        assert tail.bytes_read == before
+
+    def test_rewrite_and_truncate_reread_from_start(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text(_line("user", "aaaa") + _line("user", "bbbb"))
+        tail = JsonlTail()
+        tail.read(path)
+
+        path.write_text(_line("user", "cccc") + _line("user", "dddd") + _line("user", "e"))
+        assert [m["content"] for m in tail.read(path)] == ["cccc", "dddd", "e"]
+        path.write_text(_line("user", "f"))
+        assert [m["content"] for m in tail.read(path)] == ["f"]
+
+    def test_partial_and_malformed_lines(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text(_line("user", "one") + "not json\n" + '{"role": "user", "con')
+        tail = JsonlTail()
+        assert [m["content"] for m in tail.read(path)] == ["one"]
+
+        with open(path, "a") as f:
+            f.write('tent": "two"}\n')
+        assert [m["content"] for m in tail.read(path)] == ["one", "two"]
+
+    def test_missing_file(self, tmp_path):
+        assert JsonlTail().read(tmp_path / "nope.jsonl") == []
+
+    def test_returns_copies(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text(_line("user", "one"))
+        tail = JsonlTail()
+        tail.read(path)[0]["content"] = "mutated"
+        assert tail.read(path)[0]["content"] == "one"
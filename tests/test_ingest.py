@@ -28,6 +28,7 @@ from oi.ingest import (
     ingest_pipeline,
 )
 from oi.parser import DocumentChunk, DocumentMetadata, ParsedDocument
+from oi import metrics
 
 
 # Disable embeddings globally for this module
@@ -709,6 +710,20 @@ class TestIngestPipeline:
         assert result.errors == []
         mock_embed.assert_not_called()
 
+    @patch("oi.ingest.chat")
+    def test_embeds_before_linking(self, mock_chat, session_dir, sample_md):
+        """New nodes are embedded before linking, so embedding triage sees them."""
+        mock_chat.return_value = _llm_response([{"node_type": "fact", "summary": "A fact"}])
+        calls = []
+        with patch("oi.linker.link_new_nodes") as mock_link, \
+             patch("oi.embed.ensure_embeddings", side_effect=lambda *a, **k: calls.append("embed")):
+            from oi.linker import LinkingResult
+            mock_link.side_effect = lambda *a, **k: calls.append("link") or LinkingResult(classifications_avoided=3)
+            result = ingest_pipeline(sample_md, session_dir)
+
+        assert calls == ["embed", "link"]
+        assert result.classifications_avoided == 3
+
     @patch("oi.ingest.chat")
     def test_skip_linking_skips_edges(self, mock_chat, session_dir, sample_md):
         """skip_linking=True skips linking pass and conflict report."""
@@ -723,6 +738,19 @@ class TestIngestPipeline:
         assert result.conflicts == {}
         mock_link.assert_not_called()
 
+    @patch("oi.ingest.chat")
+    def test_reports_stage_timings(self, mock_chat, session_dir, sample_md):
+        """PipelineResult carries per-stage wall time."""
+        mock_chat.return_value = _llm_response([{"node_type": "fact", "summary": "A fact"}])
+        stages = []
+        result = ingest_pipeline(
+            sample_md, session_dir, skip_linking=True, skip_embedding=True,
+            progress_fn=lambda stage, detail: stages.append(stage),
+        )
+        assert {"parse", "extract", "write"} <= set(result.timings)
+        assert "done" not in result.timings
+        assert stages[-1] == "done"  # Caller's callback still sees every stage
+
     def test_unsupported_format_returns_error(self, session_dir, tmp_path):
         """Unsupported file extension returns graceful error."""
         bad = tmp_path / "data.xyz"
@@ -1514,6 +1542,318 @@ class TestIngestChatGPTExportResume:
         assert len(result.nodes_created) == 2
 
 
+class TestIncrementalReingest:
+    """Manifest-driven re-ingest: only changed chunks/conversations re-extracted."""
+
+    @pytest.fixture
+    def session_dir(self, tmp_path):
+        d = tmp_path / "session"
+        d.mkdir()
+        return d
+
+    @staticmethod
+    def _echo_chat(messages, **kwargs):
+        """One claim per chunk, naming the chunk's marker word."""
+        text = messages[-1]["content"]
+        marker = next(w for w in ("alpha", "beta", "gamma", "delta") if w in text)
+        return _llm_response([{"node_type": "fact", "summary": f"Claim about {marker}"}])
+
+    @patch("oi.ingest.chat")
+    def test_unchanged_file_skipped_by_hash(self, mock_chat, session_dir, tmp_path):
+        f = tmp_path / "notes.md"
+        f.write_text("# One\n\nalpha text.\n\n# Two\n\nbeta text.\n")
+        mock_chat.side_effect = self._echo_chat
+
+        first = ingest_pipeline(f, session_dir, skip_linking=True, skip_embedding=True)
+        assert len(first.nodes_created) == 2
+        mock_chat.reset_mock()
+
+        second = ingest_pipeline(f, session_dir, skip_linking=True, skip_embedding=True)
+        assert second.documents_skipped == 1
+        mock_chat.assert_not_called()
+
+    @patch("oi.ingest.chat")
+    def test_edited_chunk_reextracted_and_superseded(self, mock_chat, session_dir, tmp_path):
+        from oi.state import _load_knowledge
+
+        f = tmp_path / "notes.md"
+        f.write_text("# One\n\nalpha text.\n\n# Two\n\nbeta text.\n")
+        mock_chat.side_effect = self._echo_chat
+        first = ingest_pipeline(f, session_dir, skip_linking=True, skip_embedding=True)
+        nodes = {n["summary"]: n["id"] for n in _load_knowledge(session_dir)["nodes"]}
+        alpha_id, beta_id = nodes["Claim about alpha"], nodes["Claim about beta"]
+
+        # Edit only section Two
+        f.write_text("# One\n\nalpha text.\n\n# Two\n\ngamma text.\n")
+        mock_chat.reset_mock()
+        second = ingest_pipeline(f, session_dir, skip_linking=True, skip_embedding=True)
+
+        assert second.chunks_unchanged == 1
+        assert second.nodes_superseded == [beta_id]
+        assert len(second.nodes_created) == 1
+        for call in mock_chat.call_args_list:
+            assert "alpha" not in call.args[0][-1]["content"]
+
+        kg = _load_knowledge(session_dir)
+        by_id = {n["id"]: n for n in kg["nodes"]}
+        assert by_id[alpha_id]["status"] == "active"
+        assert by_id[beta_id]["status"] == "superseded"
+        # The gamma claim doesn't restate the beta one: no replacement recorded
+        assert "superseded_by" not in by_id[beta_id]
+        assert not any(e["type"] == "supersedes" for e in kg["edges"])
+
+    @patch("oi.ingest.chat")
+    def test_edited_chunk_matches_replacements_by_content(self, mock_chat, session_dir, tmp_path):
+        from oi.state import _load_knowledge
+
+        def chat(messages, **kwargs):
+            text = messages[-1]["content"]
+            if "revised" in text:
+                claims = ["Gamma rollout planned for March", "Beta cache holds entries for ten minutes"]
+            else:
+                claims = ["Beta cache holds entries for five minutes", "Delta service owns billing"]
+            return _llm_response([{"node_type": "fact", "summary": c} for c in claims])
+
+        f = tmp_path / "notes.md"
+        f.write_text("# One\n\nOriginal text.\n")
+        mock_chat.side_effect = chat
+        ingest_pipeline(f, session_dir, skip_linking=True, skip_embedding=True)
+        old = {n["summary"]: n["id"] for n in _load_knowledge(session_dir)["nodes"]}
+
+        f.write_text("# One\n\nrevised text.\n")
+        second = ingest_pipeline(f, session_dir, skip_linking=True, skip_embedding=True)
+
+        kg = _load_knowledge(session_dir)
+        by_id = {n["id"]: n for n in kg["nodes"]}
+        new = {by_id[nid]["summary"]: nid for nid in second.nodes_created}
+        beta_old = by_id[old["Beta cache holds entries for five minutes"]]
+        delta_old = by_id[old["Delta service owns billing"]]
+        assert beta_old["superseded_by"] == new["Beta cache holds entries for ten minutes"]
+        assert delta_old["status"] == "superseded"
+        assert "superseded_by" not in delta_old
+        assert [e["target"] for e in kg["edges"] if e["type"] == "supersedes"] == [beta_old["id"]]
+
+    @patch("oi.ingest.chat")
+    def test_removed_chunk_nodes_superseded(self, mock_chat, session_dir, tmp_path):
+        from oi.state import _load_knowledge
+
+        f = tmp_path / "notes.md"
+        f.write_text("# One\n\nalpha text.\n\n# Two\n\nbeta text.\n")
+        mock_chat.side_effect = self._echo_chat
+        ingest_pipeline(f, session_dir, skip_linking=True, skip_embedding=True)
+
+        f.write_text("# One\n\nalpha text.\n")
+        mock_chat.reset_mock()
+        result = ingest_pipeline(f, session_dir, skip_linking=True, skip_embedding=True)
+
+        assert result.nodes_created == []
+        assert len(result.nodes_superseded) == 1
+        mock_chat.assert_not_called()
+        beta = next(n for n in _load_knowledge(session_dir)["nodes"]
+                    if n["summary"] == "Claim about beta")
+        assert beta["status"] == "superseded"
+        assert "superseded_by" not in beta
+
+    @patch("oi.ingest.get_max_input_tokens", return_value=100000)
+    @patch("oi.ingest._estimate_tokens", return_value=100)
+    @patch("oi.ingest.chat")
+    @patch("oi.chatgpt_parser.parse_chatgpt_export")
+    def test_changed_conversation_reingested(self, mock_parse, mock_chat, mock_tokens, mock_max, session_dir):
+        from oi.ingest import ingest_chatgpt_export
+        from oi.sources import register_source
+        from oi.state import _load_knowledge
+
+        register_source(session_dir, id="test-src", type="chatgpt_export", path="/fake/conversations")
+
+        def _conv(conv_id, content, update_time):
+            doc = _make_doc(chunks=[_make_chunk(content=content)], source_path=conv_id)
+            doc.metadata.provenance_uri = f"chatgpt://test-src/{conv_id}"
+            doc.metadata.update_time = update_time
+            return doc
+
+        mock_chat.return_value = _llm_response([{"node_type": "fact", "summary": "A fact"}])
+        mock_parse.return_value = [_conv("conv-1", "C1", 100.0), _conv("conv-2", "C2", 100.0)]
+        first = ingest_chatgpt_export(
+            source_id="test-src", session_dir=session_dir,
+            skip_linking=True, skip_embedding=True,
+        )
+        old_conv2 = first.nodes_created[1]
+
+        # conv-2 continued in ChatGPT: new update_time and content
+        mock_parse.return_value = [_conv("conv-1", "C1", 100.0), _conv("conv-2", "C2 more", 200.0)]
+        second = ingest_chatgpt_export(
+            source_id="test-src", session_dir=session_dir,
+            skip_linking=True, skip_embedding=True,
+        )
+
+        assert second.conversations_skipped == 1
+        assert len(second.nodes_created) == 1
+        assert second.nodes_superseded == [old_conv2]
+        by_id = {n["id"]: n for n in _load_knowledge(session_dir)["nodes"]}
+        assert by_id[old_conv2]["status"] == "superseded"
+        assert by_id[first.nodes_created[0]]["status"] == "active"
+
+
+class TestResumableIngestJobs:
+    """Ingest runs are checkpointed jobs; resume finishes outstanding stages."""
+
+    @pytest.fixture
+    def session_dir(self, tmp_path):
+        d = tmp_path / "session"
+        d.mkdir()
+        return d
+
+    @staticmethod
+    def _conv(conv_id, content):
+        doc = _make_doc(chunks=[_make_chunk(content=content)], source_path=conv_id)
+        doc.metadata.provenance_uri = f"chatgpt://test-src/{conv_id}"
+        return doc
+
+    @patch("oi.ingest.get_max_input_tokens", return_value=100000)
+    @patch("oi.ingest._estimate_tokens", return_value=100)
+    @patch("oi.ingest.chat")
+    @patch("oi.chatgpt_parser.parse_chatgpt_export")
+    def test_resume_after_crash_mid_extraction(self, mock_parse, mock_chat, mock_tokens, mock_max, session_dir):
+        from oi.ingest import ingest_chatgpt_export, resume_ingest_job
+        from oi.ingest_jobs import incomplete_jobs
+        from oi.linker import LinkingResult
+        from oi.sources import register_source
+        import oi.ingest
+
+        register_source(session_dir, id="test-src", type="chatgpt_export", path="/fake/conversations")
+        mock_parse.return_value = [self._conv("conv-1", "C1"), self._conv("conv-2", "C2")]
+        mock_chat.return_value = _llm_response([{"node_type": "fact", "summary": "A fact"}])
+
+        real = oi.ingest.ingest_conversation
+        calls = []
+
+        def _crash_on_second(doc, *args, **kwargs):
+            calls.append(doc.metadata.source_path)
+            if len(calls) == 2:
+                raise RuntimeError("laptop went to sleep")
+            return real(doc, *args, **kwargs)
+
+        with patch("oi.ingest.ingest_conversation", side_effect=_crash_on_second):
+            with pytest.raises(RuntimeError):
+                ingest_chatgpt_export(source_id="test-src", session_dir=session_dir,
+                                      skip_embedding=True)
+
+        [job] = incomplete_jobs(session_dir)
+        assert job["node_ids"] == ["fact-001"]
+        assert job["stages"]["written"] is None
+
+        with patch("oi.linker.link_new_nodes", return_value=LinkingResult()) as mock_link, \
+             patch("oi.linker.auto_link_same_group", return_value=LinkingResult()):
+            result = resume_ingest_job(session_dir)
+
+        assert result.conversations_skipped == 1  # conv-1 not re-extracted
+        assert result.nodes_created == ["fact-002"]
+        assert mock_link.call_args.args[0] == ["fact-001", "fact-002"]
+        assert incomplete_jobs(session_dir) == []
+
+    @patch("oi.ingest.get_max_input_tokens", return_value=100000)
+    @patch("oi.ingest._estimate_tokens", return_value=100)
+    @patch("oi.ingest.chat")
+    @patch("oi.chatgpt_parser.parse_chatgpt_export")
+    def test_resume_runs_only_failed_stage(self, mock_parse, mock_chat, mock_tokens, mock_max, session_dir):
+        from oi.ingest import ingest_chatgpt_export, resume_ingest_job
+        from oi.ingest_jobs import incomplete_jobs
+        from oi.linker import LinkingResult
+        from oi.sources import register_source
+
+        register_source(session_dir, id="test-src", type="chatgpt_export", path="/fake/conversations")
+        mock_parse.return_value = [self._conv("conv-1", "C1")]
+        mock_chat.return_value = _llm_response([{"node_type": "fact", "summary": "A fact"}])
+
+        with patch("oi.linker.link_new_nodes", side_effect=RuntimeError("rate limited")), \
+             patch("oi.linker.auto_link_same_group", return_value=LinkingResult()) as mock_auto:
+            first = ingest_chatgpt_export(source_id="test-src", session_dir=session_dir,
+                                          skip_embedding=True)
+        assert any("Linking failed" in e for e in first.errors)
+        [job] = incomplete_jobs(session_dir)
+        assert job["done"]["auto_linked"] == ["fact-001"]
+        assert job["done"]["linked"] == []
+
+        mock_chat.reset_mock()
+        with patch("oi.linker.link_new_nodes", return_value=LinkingResult(edges_created=2)) as mock_link, \
+             patch("oi.linker.auto_link_same_group", return_value=LinkingResult()) as mock_auto:
+            result = resume_ingest_job(session_dir, job_id=job["id"])
+
+        mock_chat.assert_not_called()
+        mock_auto.assert_not_called()
+        mock_link.assert_called_once()
+        assert result.edges_created == 2
+        assert incomplete_jobs(session_dir) == []
+
+    @patch("oi.ingest.chat")
+    def test_document_nodes_recorded_with_graph_write(self, mock_chat, session_dir, tmp_path):
+        """A crash right after the write still leaves the nodes on the job."""
+        from oi.ingest import ingest_pipeline
+        from oi.ingest_jobs import incomplete_jobs
+
+        sample = tmp_path / "sample.md"
+        sample.write_text("# Title\n\nSome content.\n")
+        mock_chat.return_value = _llm_response([{"node_type": "fact", "summary": "A fact"}])
+
+        with patch("oi.manifest.update_manifest", side_effect=RuntimeError("crash")):
+            with pytest.raises(RuntimeError):
+                ingest_pipeline(sample, session_dir, skip_embedding=True)
+
+        [job] = incomplete_jobs(session_dir)
+        assert job["node_ids"] == ["fact-001"]
+
+    def test_job_ids_stay_unique_after_pruning(self, session_dir):
+        from oi.ingest_jobs import KEEP_FINISHED, checkpoint, create_job, finish_job, load_jobs
+
+        ids = []
+        for _ in range(KEEP_FINISHED + 2):
+            job = create_job(session_dir, "document", {"skip_linking": True, "skip_embedding": True})
+            checkpoint(session_dir, job, "written")
+            finish_job(session_dir, job)
+            ids.append(job["id"])
+
+        jobs = load_jobs(session_dir)
+        assert len(jobs) == KEEP_FINISHED
+        assert ids[0] not in jobs
+        assert create_job(session_dir, "document", {})["id"] == f"ingest-{KEEP_FINISHED + 3:03d}"
+
+    def test_finished_job_keeps_only_node_count(self, session_dir):
+        from oi.ingest_jobs import add_job_nodes, checkpoint, create_job, finish_job, get_job
+
+        job = create_job(session_dir, "document", {"skip_embedding": True})
+        add_job_nodes(session_dir, job, ["fact-001", "fact-002"])
+        checkpoint(session_dir, job, "written")
+        for stage in ("auto_linked", "linked"):
+            checkpoint(session_dir, job, stage, ["fact-001", "fact-002"])
+        finish_job(session_dir, job)
+
+        stored = get_job(session_dir, job["id"])
+        assert stored["status"] == "complete"
+        assert stored["node_count"] == 2
+        assert stored["node_ids"] == [] and stored["done"] == {}
+
+    def test_empty_updates_do_not_write(self, session_dir):
+        from oi.ingest_jobs import add_job_nodes, checkpoint, create_job
+
+        job = create_job(session_dir, "document", {})
+        add_job_nodes(session_dir, job, ["fact-001"])
+        checkpoint(session_dir, job, "written")
+        checkpoint(session_dir, job, "linked", ["fact-001"])
+        with patch("oi.ingest_jobs.save_job") as mock_save:
+            add_job_nodes(session_dir, job, [])
+            add_job_nodes(session_dir, job, ["fact-001"])
+            checkpoint(session_dir, job, "written")
+            checkpoint(session_dir, job, "linked", ["fact-001"])
+            checkpoint(session_dir, job, "embedded", [])
+        mock_save.assert_not_called()
+
+    def test_resume_with_no_jobs(self, session_dir):
+        from oi.ingest import resume_ingest_job
+
+        result = resume_ingest_job(session_dir)
+        assert result.errors == ["No incomplete ingest jobs."]
+
+
 # === Phase 5: LLM integration tests ===
 
 import os
@@ -1946,13 +2286,15 @@ class TestExtractFromConversation:
             valid_json,
         ]
         doc = _make_doc(chunks=[_make_chunk()])
-        result = extract_from_conversation(doc)
+        with metrics.collect() as run:
+            result = extract_from_conversation(doc)
         assert mock_chat.call_count == 2
         assert len(result.claims) == 1
         assert result.claims[0].summary == "Recovered claim"
         assert result.chunks_failed == 0
         # Should have logged the retry
         assert any("retrying" in e for e in result.errors)
+        assert run.summary()["phases"]["extract_conversation"]["retries"] == 1
 
     @patch("oi.ingest.get_max_input_tokens", return_value=100000)
     @patch("oi.ingest.chat")
@@ -4,7 +4,7 @@ import json
 import pytest
 from unittest.mock import patch
 
-from oi.knowledge import add_knowledge, correct_terminology, query_knowledge
+from oi.knowledge import add_knowledge, add_knowledge_bulk, correct_terminology, query_knowledge
 from oi.state import _load_knowledge, _save_knowledge
 
 # Block all external service calls (Ollama embeddings, LLM linking)
@@ -620,6 +620,137 @@ class TestSkipLinkingAndEmbed:
             mock_embed.assert_not_called()
 
 
+# === Linking prefetch ===
+
+def _embed_by_topic(text, model=None):
+    """Stub embedding: one axis per topic word."""
+    text = text.lower()
+    return [1.0 if "postgres" in text or "database" in text else 0.0,
+            1.0 if "deploy" in text else 0.0,
+            0.1]
+
+
+class TestLinkPrefetch:
+    def test_links_against_keyword_and_semantic_candidates(self, session_dir):
+        """A neighbour sharing no keywords still reaches the LLM."""
+        session_dir.mkdir(parents=True, exist_ok=True)
+        with patch("oi.embed.get_embedding", side_effect=_embed_by_topic):
+            _add_node(session_dir, "fact", "Postgres stores the orders")
+            _add_node(session_dir, "fact", "Deploys run every Friday")
+
+            with patch("oi.linker.run_linking", return_value=[]) as mock_linker:
+                add_knowledge(session_dir, "fact", "The database keeps orders durable")
+
+        candidates = mock_linker.call_args.kwargs["candidates"]
+        # "orders" matches fact-001 by keyword; fact-002 is neither
+        assert [c["node"]["id"] for c in candidates] == ["fact-001"]
+
+        with patch("oi.embed.get_embedding", side_effect=_embed_by_topic), \
+             patch("oi.linker.run_linking", return_value=[]) as mock_linker:
+            add_knowledge(session_dir, "fact", "Our database is replicated")
+
+        candidates = mock_linker.call_args.kwargs["candidates"]
+        ids = [c["node"]["id"] for c in candidates]
+        assert "fact-001" in ids and "fact-003" in ids  # No shared keywords: semantic only
+        assert "fact-002" not in ids
+
+    def test_prefetched_vector_is_stored_without_re_embedding(self, session_dir):
+        from oi.embed import load_embeddings
+
+        session_dir.mkdir(parents=True, exist_ok=True)
+        with patch("oi.embed.get_embedding", side_effect=_embed_by_topic) as mock_embed:
+            result = _add_node(session_dir, "fact", "Postgres stores the orders")
+
+        assert mock_embed.call_count == 1
+        assert load_embeddings(session_dir)["vectors"][result["node_id"]] == [1.0, 0.0, 0.1]
+
+    def test_restatement_linked_without_llm(self, session_dir):
+        """Embedding triage settles a near-identical same-type pair."""
+        session_dir.mkdir(parents=True, exist_ok=True)
+        with patch("oi.embed.get_embedding", side_effect=_embed_by_topic):
+            _add_node(session_dir, "fact", "Postgres stores the orders")
+            with patch("oi.linker.chat") as mock_chat:
+                result = _add_node(session_dir, "fact", "The orders live in Postgres")
+
+        mock_chat.assert_not_called()
+        assert [(e["target_id"], e["edge_type"]) for e in result["edges_created"]] == [("fact-001", "related_to")]
+
+    def test_embedding_failure_falls_back_to_keyword_candidates(self, session_dir):
+        session_dir.mkdir(parents=True, exist_ok=True)
+        _add_node(session_dir, "fact", "Postgres stores the orders")
+
+        with patch("oi.embed.get_embedding", side_effect=RuntimeError("down")), \
+             patch("oi.linker.run_linking", return_value=[]) as mock_linker:
+            result = _add_node(session_dir, "fact", "Postgres replicates the orders")
+
+        assert result["status"] == "added"
+        assert [c["node"]["id"] for c in mock_linker.call_args.kwargs["candidates"]] == ["fact-001"]
+
+
+# === add_knowledge_bulk ===
+
+class TestAddKnowledgeBulk:
+    def test_ids_continue_per_type_counter(self, session_dir):
+        """IDs match what sequential add_knowledge calls would assign."""
+        session_dir.mkdir(parents=True, exist_ok=True)
+        _add_node(session_dir, "fact", "Existing fact")
+
+        results = add_knowledge_bulk(session_dir, [
+            {"node_type": "fact", "summary": "A"},
+            {"node_type": "preference", "summary": "B"},
+            {"node_type": "fact", "summary": "C", "provenance_uri": "doc://x.md#s"},
+        ])
+
+        assert [r["node_id"] for r in results] == ["fact-002", "preference-001", "fact-003"]
+        assert results[2]["provenance_uri"] == "doc://x.md#s"
+        ids = [n["id"] for n in _load_knowledge(session_dir)["nodes"]]
+        assert ids == ["fact-001", "fact-002", "preference-001", "fact-003"]
+
+    def test_single_save_and_no_confidence_by_default(self, session_dir):
+        """One graph write for the batch; confidence skipped unless requested."""
+        session_dir.mkdir(parents=True, exist_ok=True)
+        items = [{"node_type": "fact", "summary": f"Fact {i}"} for i in range(50)]
+
+        with patch("oi.state._save_knowledge", wraps=_save_knowledge) as mock_save, \
+             patch("oi.confidence.compute_all_confidences") as mock_conf:
+            results = add_knowledge_bulk(session_dir, items)
+
+        assert mock_save.call_count == 1
+        mock_conf.assert_not_called()
+        assert all("confidence" not in r for r in results)
+
+    def test_with_confidence(self, session_dir):
+        session_dir.mkdir(parents=True, exist_ok=True)
+        results = add_knowledge_bulk(
+            session_dir, [{"node_type": "fact", "summary": "A"}], with_confidence=True)
+        assert results[0]["confidence"]["level"] in ("low", "medium", "high")
+
+    def test_invalid_items_reported_in_place(self, session_dir):
+        """Invalid items get an error result; valid ones are still written."""
+        session_dir.mkdir(parents=True, exist_ok=True)
+        results = add_knowledge_bulk(session_dir, [
+            {"node_type": "bogus", "summary": "A"},
+            {"node_type": "fact", "summary": "  "},
+            {"node_type": "fact", "summary": "Valid", "source": "doc", "voice": "reported"},
+        ])
+
+        assert "error" in results[0]
+        assert "error" in results[1]
+        assert results[2]["node_id"] == "fact-001"
+        [node] = _load_knowledge(session_dir)["nodes"]
+        assert node["source"] == "doc"
+        assert node["voice"] == "reported"
+
+    def test_related_to_edges(self, session_dir):
+        session_dir.mkdir(parents=True, exist_ok=True)
+        _add_node(session_dir, "fact", "Base")
+        add_knowledge_bulk(session_dir, [
+            {"node_type": "fact", "summary": "Child", "related_to": ["fact-001"]},
+        ])
+        edges = _load_knowledge(session_dir)["edges"]
+        assert {"source": "fact-002", "target": "fact-001", "type": "supports"}.items() <= edges[-1].items()
+
+
 # === authored_at on nodes ===
 
 class TestAuthoredAt:
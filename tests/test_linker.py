@@ -10,6 +10,8 @@ from oi.linker import (
     link_nodes,
     batch_link_nodes,
     run_linking,
+    semantic_candidates,
+    triage_candidates,
     link_new_nodes,
     auto_link_same_group,
     LinkingResult,
@@ -371,6 +373,51 @@ class TestRunLinking:
         assert edges == []
         mock_chat.assert_not_called()
 
+    def test_given_candidates_replace_keyword_retrieval(self):
+        """Precomputed candidates are classified without a keyword search."""
+        existing = _node("fact-001", "Deploys happen on Fridays")
+        new = _node("fact-002", "JWT tokens expire after one hour")
+        graph = _graph(existing, new)
+
+        mock_response = '{"edge_type": "related_to", "reasoning": "Semantic neighbour"}'
+        with patch("oi.linker.find_candidates") as mock_find, \
+             patch("oi.linker.chat", return_value=mock_response):
+            edges = run_linking(new, graph, "test-model", candidates=[{"node": existing, "score": 0.8}])
+
+        mock_find.assert_not_called()
+        assert [(e["target_id"], e["edge_type"]) for e in edges] == [("fact-001", "related_to")]
+
+
+class TestSemanticCandidates:
+    def test_keeps_active_linkable_nodes_in_hit_order(self):
+        new = _node("fact-004", "Sessions time out after an hour")
+        graph = _graph(
+            _node("fact-001", "JWT tokens expire hourly"),
+            _node("fact-002", "Old token policy", status="superseded"),
+            _node("fact-003", "Refresh tokens last a week"),
+            new,
+        )
+        hits = [
+            {"node_id": "fact-004", "score": 1.0},
+            {"node_id": "fact-002", "score": 0.9},
+            {"node_id": "fact-003", "score": 0.8},
+            {"node_id": "missing", "score": 0.7},
+            {"node_id": "fact-001", "score": 0.6},
+        ]
+
+        candidates = semantic_candidates(new, graph, hits)
+
+        assert [(c["node"]["id"], c["score"]) for c in candidates] == [("fact-003", 0.8), ("fact-001", 0.6)]
+
+    def test_excludes_ids_and_caps_count(self):
+        new = _node("fact-009", "New")
+        nodes = [_node(f"fact-00{i}", f"Fact {i}") for i in range(1, 7)]
+        hits = [{"node_id": n["id"], "score": 0.9 - i / 10} for i, n in enumerate(nodes)]
+
+        candidates = semantic_candidates(new, _graph(*nodes, new), hits, exclude_ids={"fact-001"}, max_candidates=2)
+
+        assert [c["node"]["id"] for c in candidates] == ["fact-002", "fact-003"]
+
 
 # === TestLinkNewNodes (Slice 13c) ===
 
@@ -390,6 +437,66 @@ def _read_graph(session_dir):
     return yaml.safe_load(path.read_text())
 
 
+class TestTriageCandidates:
+    VECTORS = {
+        "fact-new": [1.0, 0.0, 0.0],
+        "fact-dup": [0.99, 0.05, 0.0],      # ~1.0: paraphrase
+        "decision-dup": [0.99, 0.05, 0.0],  # ~1.0, but a different type
+        "fact-far": [0.0, 1.0, 0.0],        # 0.0: unrelated
+        "fact-mid": [0.7, 0.7, 0.0],        # ~0.71: ambiguous
+    }
+
+    def _candidates(self, *ids):
+        return [{"node": _node(nid, nid, node_type=nid.split("-")[0]), "score": 0.5} for nid in ids]
+
+    def test_settles_clear_cut_pairs(self):
+        new = _node("fact-new", "New")
+        ambiguous, decided = triage_candidates(
+            new, self._candidates("fact-dup", "decision-dup", "fact-far", "fact-mid", "fact-unembedded"),
+            self.VECTORS)
+
+        assert [c["node"]["id"] for c in ambiguous] == ["decision-dup", "fact-mid", "fact-unembedded"]
+        assert [(d["target_id"], d["edge_type"]) for d in decided] == [
+            ("fact-dup", "related_to"), ("fact-far", "none")]
+
+    def test_without_new_vector_everything_is_ambiguous(self):
+        candidates = self._candidates("fact-dup", "fact-far")
+        for vectors in (None, {k: v for k, v in self.VECTORS.items() if k != "fact-new"}):
+            ambiguous, decided = triage_candidates(_node("fact-new", "New"), candidates, vectors)
+            assert (ambiguous, decided) == (candidates, [])
+
+    def test_run_linking_sends_only_ambiguous_pairs_to_llm(self):
+        new = _node("fact-new", "New")
+        candidates = self._candidates("fact-dup", "fact-far", "fact-mid")
+        mock_response = '{"edge_type": "supports", "reasoning": "LLM"}'
+        with patch("oi.linker.chat", return_value=mock_response) as mock_chat:
+            edges = run_linking(new, _graph(), "test-model", candidates=candidates, vectors=self.VECTORS)
+
+        assert mock_chat.call_count == 1
+        assert "fact-mid" in mock_chat.call_args.args[0][1]["content"]
+        assert [(e["target_id"], e["edge_type"]) for e in edges] == [
+            ("fact-dup", "related_to"), ("fact-mid", "supports")]
+
+    def test_link_new_nodes_reports_avoided_classifications(self, tmp_path):
+        from oi.embed import DEFAULT_EMBED_MODEL, save_embeddings
+
+        n1 = _node("fact-001", "API uses JWT tokens for authentication")
+        n2 = _node("fact-002", "API uses JWT tokens for auth")
+        n3 = _node("fact-003", "JWT tokens expire after one hour")
+        _write_graph(tmp_path, [n1, n2, n3])
+        save_embeddings(tmp_path, {"model": DEFAULT_EMBED_MODEL, "vectors": {
+            "fact-001": [1.0, 0.0], "fact-002": [1.0, 0.01], "fact-003": [0.0, 1.0]}})
+
+        with patch("oi.linker.chat") as mock_chat:
+            result = link_new_nodes(["fact-002"], tmp_path, model="test-model")
+
+        mock_chat.assert_not_called()
+        assert result.classifications_avoided == 2
+        assert result.edges_created == 1
+        edges = _read_graph(tmp_path)["edges"]
+        assert [(e["source"], e["target"], e["type"]) for e in edges] == [("fact-002", "fact-001", "related_to")]
+
+
 class TestLinkNewNodes:
     def test_links_two_related_nodes(self, tmp_path):
         """Two related nodes get an edge created."""
@@ -502,6 +609,26 @@ class TestLinkNewNodes:
         # fact-003 should still have been processed
         assert result.nodes_processed == 2
 
+    def test_keeps_writes_made_during_classification(self, tmp_path):
+        """A node added while the LLM classifies survives the edge write."""
+        from oi.knowledge import add_knowledge
+
+        n1 = _node("fact-001", "API uses JWT tokens for authentication")
+        n2 = _node("fact-002", "JWT tokens expire after one hour")
+        _write_graph(tmp_path, [n1, n2])
+
+        def concurrent_chat(*args, **kwargs):
+            add_knowledge(tmp_path, "fact", "Unrelated note", skip_linking=True, skip_embed=True)
+            return '{"edge_type": "supports", "reasoning": "Related JWT facts"}'
+
+        with patch("oi.linker.chat", side_effect=concurrent_chat):
+            result = link_new_nodes(["fact-002"], tmp_path, model="test-model")
+
+        assert result.edges_created == 1
+        graph = _read_graph(tmp_path)
+        assert len(graph["edges"]) == 1
+        assert {n["id"] for n in graph["nodes"]} == {"fact-001", "fact-002", "fact-003"}
+
     def test_empty_node_ids_is_noop(self, tmp_path):
         """Empty node list returns zero-value result, no file I/O."""
         result = link_new_nodes([], tmp_path, model="test-model")
@@ -7,7 +7,8 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
-from oi.llm import _log_llm_call, chat
+from oi.llm import _log_llm_call, chat, chat_with_tools_stream
+from oi.llm_log import read_llm_log
 
 
 @pytest.fixture(autouse=True)
@@ -26,11 +27,11 @@ class TestLogLlmCall:
             messages = [{"role": "user", "content": "hello"}]
             _log_llm_call("extract", "test-model", messages, "response text", {"key": "val"})
 
+            entry = next(read_llm_log(tmp_path))  # Flushes the buffered writer
             log_path = tmp_path / "llm_log.jsonl"
             assert log_path.exists()
+            assert json.loads(log_path.read_text().strip())["prompt_refs"]
 
-            line = log_path.read_text().strip()
-            entry = json.loads(line)
             assert entry["phase"] == "extract"
             assert entry["model"] == "test-model"
             assert entry["prompt"] == messages
@@ -46,14 +47,25 @@ class TestLogLlmCall:
         # Redirect home to tmp_path so we don't pollute real ~/.oi
         monkeypatch.setattr(Path, "home", staticmethod(lambda: tmp_path))
         _log_llm_call("extract", "m", [], "r")
+        assert list(read_llm_log(tmp_path / ".oi"))
         assert (tmp_path / ".oi" / "llm_log.jsonl").exists()
 
+    def test_using_log_dir_overrides_env(self, tmp_path, monkeypatch):
+        """A tenant's calls log to its own session dir, not OI_SESSION_DIR."""
+        from oi.llm_log import using_log_dir
+
+        monkeypatch.setenv("OI_SESSION_DIR", str(tmp_path / "shared"))
+        with using_log_dir(tmp_path / "alice"):
+            _log_llm_call("extract", "m", [], "r")
+        assert list(read_llm_log(tmp_path / "alice"))
+        assert not (tmp_path / "shared" / "llm_log.jsonl").exists()
+
     def test_meta_omitted_when_none(self, tmp_path):
         """meta key absent from entry when log_meta is None."""
         os.environ["OI_SESSION_DIR"] = str(tmp_path)
         try:
             _log_llm_call("link", "m", [], "r", meta=None)
-            entry = json.loads((tmp_path / "llm_log.jsonl").read_text().strip())
+            entry = next(read_llm_log(tmp_path))
             assert "meta" not in entry
         finally:
             os.environ.pop("OI_SESSION_DIR", None)
@@ -64,10 +76,10 @@ class TestLogLlmCall:
         try:
             _log_llm_call("a", "m", [], "r1")
             _log_llm_call("b", "m", [], "r2")
-            lines = (tmp_path / "llm_log.jsonl").read_text().strip().split("\n")
-            assert len(lines) == 2
-            assert json.loads(lines[0])["phase"] == "a"
-            assert json.loads(lines[1])["phase"] == "b"
+            entries = list(read_llm_log(tmp_path))
+            assert len(entries) == 2
+            assert entries[0]["phase"] == "a"
+            assert entries[1]["phase"] == "b"
         finally:
             os.environ.pop("OI_SESSION_DIR", None)
 
@@ -86,6 +98,7 @@ class TestLogLlmCall:
         os.environ["OI_SESSION_DIR"] = str(nested)
         try:
             _log_llm_call("extract", "m", [], "r")
+            assert list(read_llm_log(nested))
             assert (nested / "llm_log.jsonl").exists()
         finally:
             os.environ.pop("OI_SESSION_DIR", None)
@@ -110,9 +123,7 @@ class TestChatLogging:
             result = chat(messages, model="test-model", phase="extract", log_meta={"k": 1})
 
             assert result == "the answer"
-            log_path = tmp_path / "llm_log.jsonl"
-            assert log_path.exists()
-            entry = json.loads(log_path.read_text().strip())
+            entry = next(read_llm_log(tmp_path))
             assert entry["phase"] == "extract"
             assert entry["response"] == "the answer"
             assert entry["meta"] == {"k": 1}
@@ -126,6 +137,7 @@ class TestChatLogging:
         os.environ["OI_SESSION_DIR"] = str(tmp_path)
         try:
             chat([{"role": "user", "content": "test"}], model="test-model")
+            assert list(read_llm_log(tmp_path)) == []
             assert not (tmp_path / "llm_log.jsonl").exists()
         finally:
             os.environ.pop("OI_SESSION_DIR", None)
@@ -144,3 +156,226 @@ class TestChatLogging:
             assert result == "works"
         finally:
             os.environ.pop("OI_SESSION_DIR", None)
+
+
+def _chunk(content=None, tool_calls=None):
+    delta = MagicMock(content=content, tool_calls=tool_calls)
+    return MagicMock(choices=[MagicMock(delta=delta)])
+
+
+def _tool_delta(index, id=None, name=None, arguments=None):
+    tc = MagicMock(index=index, id=id)
+    tc.function.name = name
+    tc.function.arguments = arguments
+    return tc
+
+
+class TestChatWithToolsStream:
+    """chat_with_tools_stream yields deltas and assembles the final message."""
+
+    def _drain(self, gen):
+        deltas = []
+        while True:
+            try:
+                deltas.append(next(gen))
+            except StopIteration as done:
+                return deltas, done.value
+
+    @patch("oi.llm.completion")
+    def test_yields_content_deltas(self, mock_completion, tmp_path):
+        mock_completion.return_value = iter([_chunk("Hel"), _chunk("lo"), _chunk(None)])
+        os.environ["OI_SESSION_DIR"] = str(tmp_path)
+        try:
+            deltas, msg = self._drain(chat_with_tools_stream(
+                [{"role": "user", "content": "hi"}], [], model="test-model", phase="turn"))
+        finally:
+            os.environ.pop("OI_SESSION_DIR", None)
+        assert deltas == ["Hel", "lo"]
+        assert msg.content == "Hello"
+        assert not msg.tool_calls
+        assert mock_completion.call_args.kwargs["stream"] is True
+        entry = next(read_llm_log(tmp_path))
+        assert entry["response"] == "Hello"
+
+    @patch("oi.llm.completion")
+    def test_requests_usage_and_uses_it(self, mock_completion, tmp_path, monkeypatch):
+        last = _chunk(None)
+        last.usage = MagicMock(prompt_tokens=120, completion_tokens=7)
+        mock_completion.return_value = iter([_chunk("Hello"), last])
+        monkeypatch.setenv("OI_SESSION_DIR", str(tmp_path))
+        self._drain(chat_with_tools_stream([{"role": "user", "content": "hi"}], [], model="test-model", phase="turn"))
+        assert mock_completion.call_args.kwargs["stream_options"] == {"include_usage": True}
+        entry = next(read_llm_log(tmp_path))
+        assert (entry["prompt_tokens"], entry["completion_tokens"]) == (120, 7)
+
+    @patch("oi.llm.completion")
+    def test_estimates_usage_when_stream_sends_none(self, mock_completion, tmp_path, monkeypatch):
+        chunks = [_chunk("x" * 40)]
+        for c in chunks:
+            c.usage = None
+        mock_completion.return_value = iter(chunks)
+        monkeypatch.setenv("OI_SESSION_DIR", str(tmp_path))
+        self._drain(chat_with_tools_stream(
+            [{"role": "user", "content": "y" * 80}], [], model="test-model", phase="turn"))
+        entry = next(read_llm_log(tmp_path))
+        assert (entry["prompt_tokens"], entry["completion_tokens"]) == (20, 10)
+
+    @patch("oi.llm.completion")
+    def test_buffers_tool_call_deltas(self, mock_completion):
+        mock_completion.return_value = iter([
+            _chunk(tool_calls=[_tool_delta(0, id="call_1", name="open_effort", arguments='{"na')]),
+            _chunk(tool_calls=[_tool_delta(0, arguments='me": "x"}')]),
+            _chunk(tool_calls=[_tool_delta(1, id="call_2", name="effort_status", arguments="{}")]),
+        ])
+        deltas, msg = self._drain(chat_with_tools_stream([], [], model="test-model"))
+        assert deltas == []
+        assert msg.content is None
+        assert [tc.id for tc in msg.tool_calls] == ["call_1", "call_2"]
+        assert msg.tool_calls[0].function.name == "open_effort"
+        assert json.loads(msg.tool_calls[0].function.arguments) == {"name": "x"}
+
+
+class TestChatMetrics:
+    """chat() records latency, tokens and cost in the log and in metrics."""
+
+    def _mock_completion(self, content="ok", prompt_tokens=12, completion_tokens=3):
+        mock_resp = MagicMock()
+        mock_resp.choices = [MagicMock()]
+        mock_resp.choices[0].message.content = content
+        mock_resp.usage.prompt_tokens = prompt_tokens
+        mock_resp.usage.completion_tokens = completion_tokens
+        return mock_resp
+
+    @patch("oi.llm.cost_per_token", return_value=(0.001, 0.002))
+    @patch("oi.llm.completion")
+    def test_log_entry_has_stats(self, mock_completion, _cost, tmp_path, monkeypatch):
+        monkeypatch.setenv("OI_SESSION_DIR", str(tmp_path))
+        mock_completion.return_value = self._mock_completion()
+        chat([{"role": "user", "content": "hi"}], model="test-model", phase="extract")
+
+        entry = next(read_llm_log(tmp_path))
+        assert entry["prompt_tokens"] == 12
+        assert entry["completion_tokens"] == 3
+        assert entry["cost_usd"] == 0.003
+        assert entry["latency_ms"] >= 0
+
+    @patch("oi.llm.cost_per_token", side_effect=Exception("unknown model"))
+    @patch("oi.llm.completion")
+    def test_collected_per_phase(self, mock_completion, _cost, tmp_path, monkeypatch):
+        from oi import metrics
+
+        monkeypatch.setenv("OI_SESSION_DIR", str(tmp_path))
+        mock_completion.return_value = self._mock_completion()
+        with metrics.collect() as run:
+            chat([{"role": "user", "content": "hi"}], model="m", phase="synthesize")
+            chat([{"role": "user", "content": "hi"}], model="m")
+
+        phases = run.summary()["phases"]
+        assert phases["synthesize"]["calls"] == 1
+        assert phases["synthesize"]["prompt_tokens"] == 12
+        assert phases["synthesize"]["unpriced_calls"] == 1
+        assert phases[metrics.UNPHASED]["calls"] == 1
+
+    @patch("oi.llm.completion", side_effect=RuntimeError("timeout"))
+    def test_failed_call_counts_as_error(self, _completion):
+        from oi import metrics
+
+        with metrics.collect() as run:
+            with pytest.raises(RuntimeError):
+                chat([{"role": "user", "content": "hi"}], model="m", phase="extract")
+        assert run.summary()["phases"]["extract"]["errors"] == 1
+
+
+class TestLogWriter:
+    """Buffered writer: prompt dedup, rotation, reading back."""
+
+    def test_repeated_prompt_blocks_stored_once(self, tmp_path):
+        from oi.llm_log import LogWriter, serialize_message
+
+        system = {"role": "system", "content": "You extract claims. " * 200}
+        w = LogWriter(tmp_path, rotate_bytes=0)
+        for i in range(50):
+            messages = [system, {"role": "user", "content": f"chunk {i}"}]
+            w.write({"phase": "extract", "prompt_refs": [], "response": str(i)},
+                    [serialize_message(m) for m in messages])
+        w.flush()
+
+        blocks = (tmp_path / "llm_prompts.jsonl").read_text().strip().split("\n")
+        assert len(blocks) == 51  # One system prompt + 50 distinct user messages
+        assert (tmp_path / "llm_log.jsonl").stat().st_size < len(system["content"]) * 2
+
+        entries = list(read_llm_log(tmp_path))
+        assert [e["response"] for e in entries] == [str(i) for i in range(50)]
+        assert entries[7]["prompt"] == [system, {"role": "user", "content": "chunk 7"}]
+
+    def test_new_writer_reuses_existing_blocks(self, tmp_path):
+        from oi.llm_log import LogWriter, serialize_message
+
+        block = serialize_message({"role": "system", "content": "same"})
+        for _ in range(2):  # e.g. two processes, one after the other
+            w = LogWriter(tmp_path, rotate_bytes=0)
+            w.write({"prompt_refs": []}, [block])
+            w.flush()
+        assert len((tmp_path / "llm_prompts.jsonl").read_text().strip().split("\n")) == 1
+
+    def test_concurrent_writers_lose_nothing(self, tmp_path, monkeypatch):
+        import threading
+
+        monkeypatch.setenv("OI_SESSION_DIR", str(tmp_path))
+
+        def log_many(n):
+            for i in range(100):
+                _log_llm_call("link", "m", [{"role": "user", "content": f"{n}-{i}"}], "r")
+
+        threads = [threading.Thread(target=log_many, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        entries = list(read_llm_log(tmp_path))
+        assert len(entries) == 800
+        assert {e["prompt"][0]["content"] for e in entries} == {f"{n}-{i}" for n in range(8) for i in range(100)}
+
+    def test_rotation_compresses_and_reader_spans_archives(self, tmp_path):
+        from oi.llm_log import LogWriter, log_files, serialize_message
+
+        w = LogWriter(tmp_path, rotate_bytes=2000, compression="gzip")
+        for i in range(40):
+            w.write({"phase": "p", "prompt_refs": [], "response": "x" * 100 + str(i)},
+                    [serialize_message({"role": "user", "content": "q"})])
+            w.flush()  # One batch per entry, so rotation triggers mid-run
+
+        files = log_files(tmp_path)
+        assert any(p.name.endswith(".jsonl.gz") for p in files)
+        assert not [p for p in tmp_path.glob("llm_log.*.jsonl")]  # Uncompressed archives removed
+        entries = list(read_llm_log(tmp_path))
+        assert [e["response"][100:] for e in entries] == [str(i) for i in range(40)]
+        assert all(e["prompt"] == [{"role": "user", "content": "q"}] for e in entries)
+        assert len(list(read_llm_log(tmp_path, include_rotated=False))) < 40
+
+    def test_reads_legacy_inline_prompts(self, tmp_path):
+        legacy = {"ts": "t", "phase": "extract", "model": "m", "prompt": [{"role": "user", "content": "old"}],
+                  "response": "r"}
+        (tmp_path / "llm_log.jsonl").write_text(json.dumps(legacy) + "\n")
+        assert list(read_llm_log(tmp_path)) == [legacy]
+
+
+class TestChatScheduling:
+    """chat() goes through the scheduler: rate limits are retried."""
+
+    @patch("oi.scheduler.time.sleep")
+    @patch("oi.llm.completion")
+    def test_rate_limited_call_retried(self, mock_completion, _sleep):
+        import litellm
+        from oi import metrics
+
+        ok = MagicMock()
+        ok.choices = [MagicMock()]
+        ok.choices[0].message.content = "fine"
+        mock_completion.side_effect = [litellm.RateLimitError("429", llm_provider="openai", model="m"), ok]
+        with metrics.collect() as run:
+            assert chat([{"role": "user", "content": "hi"}], model="m", phase="extract") == "fine"
+        phase = run.summary()["phases"]["extract"]
+        assert phase["retries"] == 1
+        assert phase["calls"] == 1
+        assert phase["errors"] == 0
@@ -0,0 +1,131 @@
+"""Tests for session-dir locking and knowledge graph version stamps."""
+
+import threading
+import time
+
+import pytest
+
+from oi.locking import GraphConflict, atomic_write_text, session_lock
+from oi.state import _knowledge_version, _load_knowledge, _save_knowledge, update_knowledge
+
+
+def _node(nid, summary="s"):
+    return {"id": nid, "type": "fact", "summary": summary, "status": "active"}
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    _save_knowledge(tmp_path, {"nodes": [_node("fact-001")], "edges": []})
+    return tmp_path
+
+
+class TestVersionStamps:
+    def test_save_bumps_version(self, session_dir):
+        assert _knowledge_version(session_dir) == 1
+        knowledge = _load_knowledge(session_dir)
+        assert knowledge["version"] == 1
+        _save_knowledge(session_dir, knowledge)
+        assert _knowledge_version(session_dir) == 2
+        assert knowledge["version"] == 2
+
+    def test_header_and_no_version_key_in_body(self, session_dir):
+        text = (session_dir / "knowledge.yaml").read_text()
+        assert text.startswith("# oi-graph-version: 1\n")
+        assert "\nversion:" not in text
+
+    def test_legacy_file_without_header(self, tmp_path):
+        (tmp_path / "knowledge.yaml").write_text("nodes: []\nedges: []\n")
+        knowledge = _load_knowledge(tmp_path)
+        assert knowledge["version"] == 0
+        _save_knowledge(tmp_path, knowledge)
+        assert _knowledge_version(tmp_path) == 1
+
+    def test_stale_writer_raises_conflict(self, session_dir):
+        a = _load_knowledge(session_dir)
+        b = _load_knowledge(session_dir)
+        a["nodes"].append(_node("fact-002"))
+        _save_knowledge(session_dir, a)
+
+        b["nodes"].append(_node("fact-003"))
+        with pytest.raises(GraphConflict):
+            _save_knowledge(session_dir, b)
+        ids = [n["id"] for n in _load_knowledge(session_dir)["nodes"]]
+        assert ids == ["fact-001", "fact-002"]
+
+
+class TestUpdateKnowledge:
+    def test_reapplies_after_concurrent_write(self, session_dir):
+        calls = []
+
+        def mutate(knowledge):
+            calls.append(1)
+            if len(calls) == 1:
+                # Another writer lands between our load and save
+                other = _load_knowledge(session_dir)
+                other["nodes"].append(_node("fact-002"))
+                _save_knowledge(session_dir, other)
+            nid = f"fact-{len(knowledge['nodes']) + 1:03d}"
+            knowledge["nodes"].append(_node(nid))
+            return nid, True
+
+        nid = update_knowledge(session_dir, mutate)
+        assert len(calls) == 2
+        assert nid == "fact-003"
+        ids = [n["id"] for n in _load_knowledge(session_dir)["nodes"]]
+        assert ids == ["fact-001", "fact-002", "fact-003"]
+
+    def test_unchanged_skips_save(self, session_dir):
+        result = update_knowledge(session_dir, lambda k: ("noop", False))
+        assert result == "noop"
+        assert _knowledge_version(session_dir) == 1
+
+    def test_concurrent_threads_lose_no_writes(self, session_dir):
+        def add(i):
+            def mutate(knowledge):
+                knowledge["nodes"].append(_node(f"fact-t{i:03d}"))
+                return None, True
+            update_knowledge(session_dir, mutate)
+
+        threads = [threading.Thread(target=add, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        knowledge = _load_knowledge(session_dir)
+        assert len(knowledge["nodes"]) == 9
+        assert knowledge["version"] == 9
+
+
+class TestSessionLock:
+    def test_reentrant(self, tmp_path):
+        with session_lock(tmp_path):
+            with session_lock(tmp_path):
+                pass
+        assert (tmp_path / ".lock").exists()
+
+    def test_excludes_other_threads(self, tmp_path):
+        order = []
+        held = threading.Event()
+
+        def other():
+            held.wait()
+            with session_lock(tmp_path):
+                order.append("other")
+
+        t = threading.Thread(target=other)
+        t.start()
+        with session_lock(tmp_path):
+            held.set()
+            time.sleep(0.05)
+            order.append("main")
+        t.join()
+        assert order == ["main", "other"]
+
+
+def test_atomic_write_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "sub" / "data.json"
+    atomic_write_text(path, "one")
+    atomic_write_text(path, "two")
+    assert path.read_text() == "two"
+    assert [p.name for p in path.parent.iterdir()] == ["data.json"]
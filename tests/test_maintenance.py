@@ -0,0 +1,44 @@
+"""Tests for deferred post-turn maintenance."""
+
+import threading
+
+from oi.maintenance import MaintenanceWorker, submit, wait
+
+
+class TestMaintenanceWorker:
+    def test_runs_jobs_in_order_and_collects_notices(self):
+        w = MaintenanceWorker()
+        ran = []
+        w.submit([lambda: ran.append(1), lambda: ["note a"]])
+        w.submit([lambda: ran.append(2) or ["note b"]])
+        assert w.wait() == ["note a", "note b"]
+        assert ran == [1, 2]
+        assert w.wait() == []  # notices are handed out once
+
+    def test_failing_task_does_not_stop_job(self, capsys):
+        w = MaintenanceWorker()
+        ran = []
+
+        def boom():
+            raise RuntimeError("boom")
+
+        w.submit([boom, lambda: ran.append("after")])
+        w.wait()
+        assert ran == ["after"]
+        assert "boom" in capsys.readouterr().err
+
+    def test_wait_blocks_until_running_job_finishes(self):
+        w = MaintenanceWorker()
+        release = threading.Event()
+        w.submit([lambda: release.wait(5) and ["done"]])
+        assert w.pending == 1
+
+        threading.Timer(0.05, release.set).start()
+        assert w.wait() == ["done"]
+        assert w.pending == 0
+
+
+def test_module_helpers_per_session_dir(tmp_path):
+    submit(tmp_path / "a", [lambda: ["from a"]])
+    assert wait(tmp_path / "b") == []
+    assert wait(tmp_path / "a") == ["from a"]
@@ -167,12 +167,18 @@ class TestToolDelegation:
              patch("oi.mcp_server._get_model", return_value="test-model"), \
              patch("oi.mcp_server._get_session_id", return_value="test-session"), \
              patch("oi.mcp_server.discover_claude_code_chatlog", return_value=None), \
+             patch("oi.mcp_server.prepare_knowledge", return_value={"link_results": [], "vector": None}) as prep, \
              patch("oi.mcp_server.add_knowledge", return_value=fake_json) as mock:
             result = mcp_add_knowledge(
                 node_type="fact",
                 summary="Python is great",
                 source="test",
             )
+            prep.assert_called_once_with(
+                tmp_path, "fact", "Python is great",
+                model="test-model", supersedes=None, source="test",
+                session_id="test-session", reasoning=None, provenance_uri=None,
+            )
             mock.assert_called_once_with(
                 session_dir=tmp_path,
                 node_type="fact",
@@ -185,9 +191,39 @@ class TestToolDelegation:
                 session_id="test-session",
                 reasoning=None,
                 provenance_uri=None,
+                graph=ANY,
+                prepared=prep.return_value,
             )
             assert "fact-001" in result
 
+    def test_add_knowledge_prepares_outside_graph_lock(self, tmp_path):
+        import threading
+        from oi.mcp_server import _graphs, mcp_add_knowledge
+
+        fake_json = '{"status":"added","node_id":"fact-001","node_type":"fact","summary":"test","confidence":{"level":"low"}}'
+        graph = _graphs.get(tmp_path)
+        acquired = []
+
+        def try_lock():
+            if graph.lock.acquire(timeout=1):
+                acquired.append(True)
+                graph.lock.release()
+
+        def prepare(*args, **kwargs):
+            # Another session thread can take the graph lock while linking runs
+            t = threading.Thread(target=try_lock)
+            t.start()
+            t.join()
+            return {"link_results": [], "vector": None}
+
+        with patch("oi.mcp_server._get_session_dir", return_value=tmp_path), \
+             patch("oi.mcp_server._get_model", return_value="test-model"), \
+             patch("oi.mcp_server.discover_claude_code_chatlog", return_value=None), \
+             patch("oi.mcp_server.prepare_knowledge", side_effect=prepare), \
+             patch("oi.mcp_server.add_knowledge", return_value=fake_json):
+            mcp_add_knowledge(node_type="fact", summary="test")
+        assert acquired == [True]
+
     def test_add_knowledge_with_related_to(self, tmp_path):
         from oi.mcp_server import mcp_add_knowledge
 
@@ -196,6 +232,7 @@ class TestToolDelegation:
              patch("oi.mcp_server._get_model", return_value="test-model"), \
              patch("oi.mcp_server._get_session_id", return_value="test-session"), \
              patch("oi.mcp_server.discover_claude_code_chatlog", return_value=None), \
+             patch("oi.mcp_server.prepare_knowledge", return_value=None), \
              patch("oi.mcp_server.add_knowledge", return_value=fake_json) as mock:
             mcp_add_knowledge(
                 node_type="fact",
@@ -215,6 +252,7 @@ class TestToolDelegation:
              patch("oi.mcp_server._get_model", return_value="test-model"), \
              patch("oi.mcp_server._get_session_id", return_value="test-session"), \
              patch("oi.mcp_server.discover_claude_code_chatlog", return_value=None), \
+             patch("oi.mcp_server.prepare_knowledge", return_value=None), \
              patch("oi.mcp_server.add_knowledge", return_value=fake_json) as mock:
             mcp_add_knowledge(node_type="fact", summary="test")
             call_kwargs = mock.call_args[1]
@@ -235,6 +273,7 @@ class TestToolDelegation:
                 node_type=None,
                 min_confidence=None,
                 sort_by=None,
+                graph=ANY,
             )
             assert "No matches" in result
 
@@ -635,7 +674,7 @@ class TestIngestDocument:
         with patch("oi.mcp_server._get_session_dir", return_value=tmp_path), \
              patch("oi.mcp_server._get_model", return_value="test-model"), \
              patch("oi.ingest.ingest_pipeline", return_value=fake_result) as mock_pipeline:
-            result = mcp_ingest_document(file_path="/path/to/docs/test.md")
+            result = mcp_ingest_document(file_path="/path/to/docs/test.md", wait=True)
             call_kwargs = mock_pipeline.call_args[1]
             assert call_kwargs["file_path"] == "/path/to/docs/test.md"
             assert call_kwargs["session_dir"] == tmp_path
@@ -663,7 +702,7 @@ class TestIngestDocument:
         with patch("oi.mcp_server._get_session_dir", return_value=tmp_path), \
              patch("oi.mcp_server._get_model", return_value="test-model"), \
              patch("oi.ingest.ingest_pipeline", return_value=fake_result):
-            result = mcp_ingest_document(file_path="/path/to/paper.md", dry_run=True)
+            result = mcp_ingest_document(file_path="/path/to/paper.md", dry_run=True, wait=True)
             assert "DRY RUN" in result
             assert "10 would be extracted" in result
 
@@ -690,7 +729,7 @@ class TestIngestDocument:
         with patch("oi.mcp_server._get_session_dir", return_value=tmp_path), \
              patch("oi.mcp_server._get_model", return_value="test-model"), \
              patch("oi.ingest.ingest_pipeline", return_value=fake_result) as mock_pipeline:
-            mcp_ingest_document(file_path="/path/to/test.md", source_id="my-source")
+            mcp_ingest_document(file_path="/path/to/test.md", source_id="my-source", wait=True)
             assert mock_pipeline.call_args[1]["source_id"] == "my-source"
 
 
@@ -768,6 +807,7 @@ class TestIngestChatGPTExport:
                 source_id="physics-chatgpt",
                 title_filter="quantum",
                 dry_run=True,
+                wait=True,
             )
             call_kwargs = mock_fn.call_args[1]
             assert call_kwargs["source_id"] == "physics-chatgpt"
@@ -776,3 +816,78 @@ class TestIngestChatGPTExport:
             assert "DRY RUN" in result
             assert "20 would be extracted" in result
             assert "physics-chatgpt" in result
+
+
+class TestBackgroundIngest:
+    """Ingestion tools return a job ID and run on a worker thread."""
+
+    def test_ingest_document_returns_job_id(self, tmp_path):
+        import oi.mcp_server as mod
+        from oi.ingest import PipelineResult
+
+        def fake_pipeline(**kwargs):
+            kwargs["progress_fn"]("extract", "2 chunks")
+            return PipelineResult(source_path="docs/test.md", nodes_created=["fact-001"])
+
+        with patch("oi.mcp_server._get_session_dir", return_value=tmp_path), \
+             patch("oi.mcp_server._get_model", return_value="test-model"), \
+             patch("oi.ingest.ingest_pipeline", side_effect=fake_pipeline):
+            msg = mod.mcp_ingest_document(file_path="/path/to/docs/test.md")
+            job_id = msg.split()[1]
+            assert msg.startswith(f"Started {job_id}")
+            assert mod._jobs.wait(job_id, timeout=5)["status"] == "done"
+
+        status = mod.mcp_job_status(job_id)
+        assert "[done]" in status
+        assert "extract: 2 chunks" in status
+        assert "Nodes created: 1" in status
+        assert job_id in mod.mcp_job_status()
+
+    def test_background_job_logs_to_tenant_dir(self, tmp_path):
+        """The worker thread's completion log lands in the caller's tenant dir."""
+        import oi.mcp_server as mod
+        from oi.ingest import PipelineResult
+
+        tenant, default = tmp_path / "tenant", tmp_path / "default"
+        result = PipelineResult(source_path="docs/test.md", nodes_created=["fact-001"])
+        with patch.dict(os.environ, {"OI_SESSION_DIR": str(default)}), \
+             patch("oi.mcp_server._get_model", return_value="test-model"), \
+             patch("oi.ingest.ingest_pipeline", return_value=result), \
+             mod.using_session_dir(tenant):
+            job_id = mod.mcp_ingest_document(file_path="/path/to/docs/test.md").split()[1]
+            assert mod._jobs.wait(job_id, timeout=5)["status"] == "done"
+
+        entries = [
+            json.loads(line)
+            for f in (tenant / "mcp_sessions").glob("*.jsonl")
+            for line in f.read_text().splitlines()
+        ]
+        assert any(e["tool"] == "mcp_ingest_document" and e.get("result") == "1 nodes" for e in entries)
+        assert not (default / "mcp_sessions").exists()
+
+    def test_background_job_llm_calls_log_to_tenant_dir(self, tmp_path):
+        import oi.mcp_server as mod
+        from oi.ingest import PipelineResult
+        from oi.llm import _log_llm_call
+        from oi.llm_log import read_llm_log
+
+        def pipeline(**kwargs):
+            _log_llm_call("extract", "test-model", [], "r")
+            return PipelineResult(source_path="docs/test.md")
+
+        tenant, default = tmp_path / "tenant", tmp_path / "default"
+        with patch.dict(os.environ, {"OI_SESSION_DIR": str(default)}), \
+             patch("oi.mcp_server._get_model", return_value="test-model"), \
+             patch("oi.ingest.ingest_pipeline", side_effect=pipeline), \
+             mod.using_session_dir(tenant):
+            job_id = mod.mcp_ingest_document(file_path="/path/to/docs/test.md").split()[1]
+            assert mod._jobs.wait(job_id, timeout=5)["status"] == "done"
+
+        assert [e["phase"] for e in read_llm_log(tenant)] == ["extract"]
+        assert not (default / "llm_log.jsonl").exists()
+
+    def test_job_cancel_unknown(self):
+        from oi.mcp_server import mcp_job_cancel, mcp_job_status
+
+        assert mcp_job_cancel("job-999").startswith("Error:")
+        assert mcp_job_status("job-999").startswith("Error:")
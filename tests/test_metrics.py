@@ -0,0 +1,108 @@
+"""Tests for per-phase LLM metrics and pipeline stage timings."""
+
+import threading
+import time
+
+from oi import metrics
+from oi.metrics import Metrics, StageTimer
+
+
+class TestMetrics:
+    def test_aggregates_per_phase(self):
+        m = Metrics()
+        m.record_call("extract", 0.5, prompt_tokens=100, completion_tokens=20, cost_usd=0.01)
+        m.record_call("extract", 1.5, prompt_tokens=50, completion_tokens=10, cost_usd=0.02)
+        m.record_call("link_batch", 0.25, cost_usd=None, error=True)
+        m.record_retry("extract")
+
+        summary = m.summary()
+        extract = summary["phases"]["extract"]
+        assert extract["calls"] == 2
+        assert extract["retries"] == 1
+        assert extract["seconds"] == 2.0
+        assert extract["max_seconds"] == 1.5
+        assert extract["mean_seconds"] == 1.0
+        assert extract["prompt_tokens"] == 150
+        assert extract["completion_tokens"] == 30
+        assert extract["cost_usd"] == 0.03
+        assert summary["phases"]["link_batch"]["errors"] == 1
+        assert summary["phases"]["link_batch"]["unpriced_calls"] == 1
+        assert summary["totals"]["calls"] == 3
+        assert summary["totals"]["max_seconds"] == 1.5
+
+    def test_no_phase_is_unphased(self):
+        m = Metrics()
+        m.record_call(None, 0.1)
+        assert list(m.summary()["phases"]) == [metrics.UNPHASED]
+
+    def test_thread_safe_counts(self):
+        m = Metrics()
+
+        def record():
+            for _ in range(500):
+                m.record_call("p", 0.001, prompt_tokens=1)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert m.summary()["phases"]["p"]["calls"] == 4000
+        assert m.summary()["phases"]["p"]["prompt_tokens"] == 4000
+
+    def test_prometheus_format(self):
+        m = Metrics()
+        m.record_call("extract", 0.5, prompt_tokens=10, cost_usd=0.001)
+        m.record_stage("parse", 0.2)
+        text = m.to_prometheus()
+
+        assert "# TYPE oi_llm_calls_total counter" in text
+        assert 'oi_llm_calls_total{phase="extract"} 1' in text
+        assert 'oi_llm_prompt_tokens_total{phase="extract"} 10' in text
+        assert 'oi_stage_seconds_total{stage="parse"} 0.2' in text
+        assert text.endswith("\n")
+
+    def test_prometheus_escapes_labels(self):
+        m = Metrics()
+        m.record_call('we"ird', 0.1)
+        assert 'phase="we\\"ird"' in m.to_prometheus()
+
+
+class TestCollect:
+    def test_collector_sees_only_its_context(self):
+        metrics.record_call("before", 0.1)
+        with metrics.collect() as run:
+            metrics.record_call("during", 0.1)
+            with metrics.collect() as inner:
+                metrics.record_retry("during")
+        metrics.record_call("after", 0.1)
+
+        assert list(run.summary()["phases"]) == ["during"]
+        assert run.summary()["phases"]["during"]["retries"] == 1
+        assert inner.summary()["phases"]["during"]["calls"] == 0
+        assert "during" in metrics.registry().summary()["phases"]
+
+    def test_other_threads_not_collected(self):
+        with metrics.collect() as run:
+            t = threading.Thread(target=metrics.record_call, args=("elsewhere", 0.1))
+            t.start()
+            t.join()
+        assert run.summary()["phases"] == {}
+
+
+class TestStageTimer:
+    def test_times_consecutive_stages(self):
+        timer = StageTimer()
+        with metrics.collect() as run:
+            timer.mark("parse")
+            time.sleep(0.01)
+            timer.mark("extract")
+            timer.mark(None)  # Gap: not timed
+            time.sleep(0.01)
+            timer.mark("extract")
+            timings = timer.finish()
+
+        assert set(timings) == {"parse", "extract"}
+        assert timings["parse"] >= 0.01
+        assert timings["extract"] < 0.01
+        assert run.summary()["stages"]["extract"]["runs"] == 2
@@ -7,7 +7,7 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 from helpers import setup_concluded_effort
-from oi.orchestrator import _build_messages, _log_message, process_turn
+from oi.orchestrator import _build_messages, _log_message, process_turn, process_turn_stream
 from oi.tools import open_effort, expand_effort, expand_knowledge, get_active_effort
 from oi.decay import AMBIENT_WINDOW, SUMMARY_EVICTION_THRESHOLD, KNOWLEDGE_EVICTION_THRESHOLD, update_summary_references
 from oi.state import _save_summary_references, _save_knowledge_references, _load_expanded_knowledge
@@ -333,6 +333,236 @@ class TestProcessTurn:
 
 # === Slice 8e: Knowledge eviction tests ===
 
+class TestProcessTurnStream:
+    """process_turn_stream yields deltas and matches process_turn's output and logs."""
+
+    @staticmethod
+    def _stream(*rounds):
+        """Fake chat_with_tools_stream: each round is (deltas, tool_calls)."""
+        rounds = list(rounds)
+
+        def fake(messages, tools, model):
+            deltas, tool_calls = rounds.pop(0)
+            yield from deltas
+            msg = MagicMock()
+            msg.content = "".join(deltas) or None
+            msg.tool_calls = tool_calls
+            return msg
+        return fake
+
+    def test_yields_text_then_done(self, session_dir):
+        with patch("oi.orchestrator.chat_with_tools_stream", self._stream((["Hi", " there!"], None))):
+            events = list(process_turn_stream(session_dir, "Hello"))
+        assert events == [("text", "Hi"), ("text", " there!"), ("done", "Hi there!")]
+        lines = (session_dir / "raw.jsonl").read_text().strip().split("\n")
+        assert json.loads(lines[1])["content"] == "Hi there!"
+
+    def test_tool_round_banner_before_answer(self, session_dir):
+        tool_call = MagicMock()
+        tool_call.function.name = "open_effort"
+        tool_call.function.arguments = json.dumps({"name": "auth-bug"})
+        tool_call.id = "call_1"
+        fake = self._stream((["Opening..."], [tool_call]), (["Tracking ", "it."], None))
+        with patch("oi.orchestrator.chat_with_tools_stream", fake):
+            events = list(process_turn_stream(session_dir, "Let's debug auth"))
+
+        kinds = [k for k, _ in events]
+        assert kinds == ["text", "reset", "banner", "text", "text", "done"]
+        assert events[2] == ("banner", "--- Started effort: auth-bug ---")
+        final = events[-1][1]
+        assert final == "--- Started effort: auth-bug ---\n\nTracking it."
+        lines = (session_dir / "efforts" / "auth-bug.jsonl").read_text().strip().split("\n")
+        assert json.loads(lines[1])["content"] == final
+
+
+class TestDeferredMaintenance:
+    """process_turn(defer_maintenance=True) returns before post-turn work runs."""
+
+    def _reply(self, text):
+        msg = MagicMock()
+        msg.content = text
+        msg.tool_calls = None
+        return msg
+
+    @patch("oi.orchestrator.chat_with_tools")
+    def test_returns_before_maintenance_and_next_turn_waits(self, mock_chat, session_dir):
+        import threading
+        release = threading.Event()
+        started = threading.Event()
+        seen_turns = []
+
+        def slow_references(sd, turn, user, response):
+            started.set()
+            release.wait(5)
+            seen_turns.append(turn)
+
+        mock_chat.side_effect = [self._reply("First."), self._reply("Second.")]
+        with patch("oi.orchestrator.update_knowledge_references", side_effect=slow_references):
+            assert process_turn(session_dir, "one", defer_maintenance=True) == "First."
+            assert started.wait(5)
+            assert seen_turns == []  # still running in the background
+
+            threading.Timer(0.05, release.set).start()
+            process_turn(session_dir, "two")  # waits for turn 1's maintenance first
+            assert seen_turns == [1, 2]
+
+    @patch("oi.orchestrator.chat_with_tools")
+    def test_decay_banners_shown_on_next_turn(self, mock_chat, session_dir):
+        mock_chat.side_effect = [self._reply("First."), self._reply("Second.")]
+        with patch("oi.orchestrator.check_decay", side_effect=[["auth-bug"], []]):
+            first = process_turn(session_dir, "one", defer_maintenance=True)
+            second = process_turn(session_dir, "two")
+        assert "Auto-collapsed" not in first
+        assert second.startswith("--- Auto-collapsed effort: auth-bug")
+        assert second.endswith("Second.")
+        # Notices are shown, not logged into the conversation
+        assert all("Auto-collapsed" not in m["content"]
+                   for m in _build_messages(session_dir) if m["role"] == "assistant")
+
+    @patch("oi.orchestrator.chat_with_tools")
+    def test_embedding_deferred(self, mock_chat, session_dir):
+        from oi import maintenance
+        tool_call = MagicMock()
+        tool_call.function.name = "add_knowledge"
+        tool_call.function.arguments = json.dumps({"node_type": "fact", "summary": "Redis caches sessions"})
+        tool_call.id = "call_1"
+        tool_msg = self._reply(None)
+        tool_msg.tool_calls = [tool_call]
+        mock_chat.side_effect = [tool_msg, self._reply("Noted.")]
+
+        with patch("oi.embed.get_embedding", return_value=[1.0, 0.0]) as embed:
+            process_turn(session_dir, "Remember: Redis caches sessions", defer_maintenance=True)
+            maintenance.wait(session_dir)
+        assert embed.call_args_list[0].args[0] == "Redis caches sessions"
+        emb = json.loads((session_dir / "embeddings.json").read_text())
+        assert emb["vectors"]["fact-001"] == [1.0, 0.0]
+
+
+class TestTracing:
+    @patch("oi.orchestrator.chat_with_tools")
+    def test_turn_spans_written(self, mock_chat, session_dir):
+        from oi import tracing
+        tool_call = MagicMock()
+        tool_call.function.name = "add_knowledge"
+        tool_call.function.arguments = json.dumps({"node_type": "fact", "summary": "Redis caches sessions"})
+        tool_call.id = "call_1"
+        tool_msg = MagicMock(content=None, tool_calls=[tool_call])
+        mock_chat.side_effect = [tool_msg, MagicMock(content="Noted.", tool_calls=None)]
+
+        tracing.enable()
+        try:
+            process_turn(session_dir, "Remember: Redis caches sessions")
+        finally:
+            tracing.enable(False)
+
+        names = {e["name"] for e in tracing.read_trace(session_dir / tracing.TRACE_FILE) if e["ph"] == "X"}
+        assert {"turn", "turn.build_messages", "turn.llm_round", "turn.tools", "tool.add_knowledge",
+                "state.load_knowledge", "state.save_knowledge", "turn.post_maintenance"} <= names
+
+
+class TestCacheAwareLayout:
+    """Stable content leads the prompt; the knowledge tier trails it."""
+
+    def test_knowledge_changes_leave_prefix_untouched(self, session_dir):
+        setup_concluded_effort(session_dir, "auth-bug", "Fixed the auth bug")
+        _log_message(session_dir, None, "user", "hello")
+        before = _build_messages(session_dir)
+        add_knowledge(session_dir, "fact", "API uses JWT authentication", skip_embed=True, skip_linking=True)
+        after = _build_messages(session_dir)
+
+        assert after[:-1] == before
+        assert after[-1]["role"] == "system"
+        assert after[-1]["content"].startswith("Knowledge graph:")
+        assert "Knowledge graph" not in after[0]["content"]
+
+    def test_concluded_summaries_in_creation_order(self, session_dir):
+        setup_concluded_effort(session_dir, "zeta", "Z summary")
+        setup_concluded_effort(session_dir, "alpha", "A summary")
+        path = session_dir / "knowledge.yaml"
+        knowledge = yaml.safe_load(path.read_text())
+        knowledge["nodes"][0]["created"] = "2026-01-02T00:00:00"
+        knowledge["nodes"][1]["created"] = "2026-01-01T00:00:00"
+        path.write_text(yaml.dump(knowledge))
+
+        system = _build_messages(session_dir)[0]["content"]
+        assert system.index("alpha") < system.index("zeta")
+
+    @patch("oi.orchestrator.count_tokens", side_effect=lambda text: len(text.split()))
+    @patch("oi.orchestrator.chat_with_tools")
+    def test_prefix_reuse_reported_per_turn(self, mock_chat, _tokens, session_dir):
+        session_dir.mkdir(parents=True, exist_ok=True)
+        sid = create_session_log(session_dir)
+        reply = MagicMock()
+        reply.content = "Hi."
+        reply.tool_calls = None
+        mock_chat.return_value = reply
+
+        process_turn(session_dir, "one", session_id=sid)
+        process_turn(session_dir, "two", session_id=sid)
+
+        reports = [e["data"] for e in read_session_log(session_dir, sid) if e["type"] == "context-prefix"]
+        assert len(reports) == 2
+        first, second = reports
+        assert first["reused_chars"] == 0
+        # Turn 2 only appended turn 1's exchange: all of turn 1's context is reused
+        assert second["reused_chars"] == first["turn_chars"]
+        assert second["reused_tokens"] >= second["prefix_tokens"] > 0
+        saved = json.loads((session_dir / "context_prefix.json").read_text())
+        assert saved["reused_chars"] == second["reused_chars"]
+        assert "prompt" not in saved
+        assert all(len(row) == 3 for row in saved["messages"])  # [hash, chars, tokens]
+
+    @patch("oi.orchestrator.count_tokens", side_effect=lambda text: len(text.split()))
+    def test_prefix_reuse_tokenizes_only_new_messages(self, mock_count, session_dir):
+        from oi.orchestrator import _record_prefix_reuse
+
+        session_dir.mkdir(parents=True, exist_ok=True)
+        context = [{"role": "system", "content": "stable rules"}, {"role": "user", "content": "one"}]
+        _record_prefix_reuse(session_dir, None, context)
+        mock_count.reset_mock()
+
+        context += [{"role": "assistant", "content": "reply"}]
+        report = _record_prefix_reuse(session_dir, None, context)
+
+        mock_count.assert_called_once()
+        assert report["reused_chars"] == report["turn_chars"] - len("<|assistant|>\nreply\n")
+        assert report["reused_tokens"] == report["turn_tokens"] - 2
+
+
+class TestContextMemoization:
+    """Unchanged context tiers are reused across turns, not recomputed."""
+
+    def test_unchanged_tiers_not_rerendered(self, session_dir):
+        from oi import orchestrator
+        setup_concluded_effort(session_dir, "auth-bug", "Fixed the auth bug")
+        add_knowledge(session_dir, "fact", "API uses JWT authentication", skip_embed=True, skip_linking=True)
+        first = _build_messages(session_dir, current_turn=2)
+
+        with patch("oi.confidence.compute_all_confidences") as pagerank, \
+             patch("oi.orchestrator._load_efforts") as load_efforts:
+            second = _build_messages(session_dir, current_turn=3)
+        assert second == first
+        pagerank.assert_not_called()
+        load_efforts.assert_not_called()
+        assert orchestrator._fragments.stats()["hits"] >= 3
+
+    def test_graph_change_rerenders(self, session_dir):
+        add_knowledge(session_dir, "fact", "API uses JWT authentication", skip_embed=True, skip_linking=True)
+        _build_messages(session_dir)
+        add_knowledge(session_dir, "fact", "Sessions live in Redis", skip_embed=True, skip_linking=True)
+        setup_concluded_effort(session_dir, "auth-bug", "Fixed the auth bug")
+
+        messages = _build_messages(session_dir)
+        assert "Sessions live in Redis" in messages[-1]["content"]
+        assert "Fixed the auth bug" in messages[0]["content"]
+
+    def test_appended_log_lines_picked_up(self, session_dir):
+        _log_message(session_dir, None, "user", "hello")
+        assert len(_build_messages(session_dir)) == 2
+        _log_message(session_dir, None, "assistant", "hi")
+        assert _build_messages(session_dir)[-1]["content"] == "hi"
+
+
 class TestKnowledgeEviction:
     def test_evicted_knowledge_excluded_from_system_prompt(self, session_dir):
         """Evicted knowledge nodes don't appear in system prompt."""
@@ -343,7 +573,7 @@ class TestKnowledgeEviction:
 
         # At turn 1 + KNOWLEDGE_EVICTION_THRESHOLD, it should be evicted
         messages = _build_messages(session_dir, current_turn=1 + KNOWLEDGE_EVICTION_THRESHOLD)
-        system_content = messages[0]["content"]
+        system_content = messages[-1]["content"]  # Knowledge tier is last
         assert "JWT" not in system_content
         assert "older knowledge node(s) not shown" in system_content
 
@@ -354,7 +584,7 @@ class TestKnowledgeEviction:
         _save_knowledge_references(session_dir, {"fact-001": 25})
 
         messages = _build_messages(session_dir, current_turn=30)
-        system_content = messages[0]["content"]
+        system_content = messages[-1]["content"]  # Knowledge tier is last
         assert "JWT" in system_content
         assert "older knowledge node(s) not shown" not in system_content
 
@@ -546,7 +776,7 @@ class TestPatternBanners:
         })
 
         messages = _build_messages(session_dir)
-        system_content = messages[0]["content"]
+        system_content = messages[-1]["content"]  # Knowledge tier is last
         assert "[principle, 3 instances]" in system_content
         assert "Always test incrementally" in system_content
 
@@ -564,6 +794,6 @@ class TestPatternBanners:
         })
 
         messages = _build_messages(session_dir)
-        system_content = messages[0]["content"]
+        system_content = messages[-1]["content"]  # Knowledge tier is last
         assert "[principle]" in system_content
         assert "[principle," not in system_content
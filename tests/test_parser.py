@@ -22,6 +22,7 @@ from oi.parser import (
     parse_directory,
     parse_file,
 )
+from pdf_fixtures import write_text_pdf
 
 
 # === Utility Tests ===
@@ -463,6 +464,37 @@ class TestPdfParser:
         assert result.metadata.date == date(2024, 5, 20)
 
 
+class TestParallelPdfParser:
+    @pytest.fixture
+    def multipage_pdf(self, tmp_path):
+        pytest.importorskip("pypdf")
+        texts = [f"Page {i} says hello" if i % 3 else "" for i in range(1, 10)]
+        return write_text_pdf(tmp_path / "paper.pdf", texts)
+
+    def test_parallel_matches_serial(self, multipage_pdf):
+        from oi.parser import _parse_pdf
+
+        serial = _parse_pdf(multipage_pdf, "paper.pdf", 2000)
+        parallel = _parse_pdf(multipage_pdf, "paper.pdf", 2000, workers=2)
+        assert serial.chunks  # sanity: text was extracted
+        assert [c.model_dump() for c in parallel.chunks] == [c.model_dump() for c in serial.chunks]
+        assert parallel.parse_errors == serial.parse_errors
+
+    def test_parallel_preserves_page_order(self, multipage_pdf):
+        from oi.parser import _parse_pdf
+
+        result = _parse_pdf(multipage_pdf, "paper.pdf", 2000, workers=3)
+        ids = [c.chunk_id for c in result.chunks]
+        # Every third page is blank and produces no chunk
+        assert ids == [f"paper.pdf#page-{i}" for i in range(1, 10) if i % 3]
+        assert result.chunks[0].provenance_uri == "doc://paper.pdf#page-1"
+
+    def test_parse_file_passes_pdf_workers(self, multipage_pdf):
+        serial = parse_file(multipage_pdf)
+        parallel = parse_file(multipage_pdf, pdf_workers=2)
+        assert [c.chunk_id for c in parallel.chunks] == [c.chunk_id for c in serial.chunks]
+
+
 # === Top-Level API Tests ===
 
 
@@ -283,3 +283,61 @@ class TestDetectPatterns:
         with patch("oi.patterns._load_knowledge", side_effect=Exception("boom")):
             results = detect_patterns(session_dir, ["fact-001"], "test-model")
         assert results == []
+
+    def test_loads_and_saves_once_across_clusters(self, session_dir):
+        """Two clusters (one new principle, one update) → one load, one save."""
+        _setup_graph(session_dir, [
+            _node("principle-001", source="system", ntype="principle", instance_count=2),
+            _node("fact-001", source="effort-a"),
+            _node("fact-002", source="effort-b"),
+            _node("fact-003", source="effort-b"),
+            _node("fact-010", source="effort-c"),
+            _node("fact-011", source="effort-d"),
+            _node("fact-012", source="effort-d"),
+        ], [
+            _edge("fact-002", "fact-001"),
+            _edge("fact-003", "fact-001"),
+            _edge("fact-011", "fact-010"),
+            _edge("fact-012", "fact-010"),
+            _edge("fact-011", "principle-001", "exemplifies"),
+        ])
+
+        import oi.patterns as patterns
+        mock_result = {"summary": "Always validate inputs", "abstraction_level": 2}
+        with patch("oi.patterns.detect_principle", return_value=mock_result), \
+             patch("oi.patterns._load_knowledge", wraps=patterns._load_knowledge) as load, \
+             patch("oi.state._save_knowledge", wraps=_save_knowledge) as save:
+            results = detect_patterns(session_dir, ["fact-001", "fact-010"], "test-model")
+
+        assert load.call_count == 1
+        assert save.call_count == 1
+        actions = sorted(r["action"] for r in results)
+        assert actions == ["created", "updated"]
+
+        knowledge = _load_knowledge(session_dir)
+        principle = next(n for n in knowledge["nodes"] if n["id"] == "principle-002")
+        assert principle["source"] == "pattern-detection"
+        assert principle["instance_count"] == 3
+        into_new = {e["source"] for e in knowledge["edges"]
+                    if e["type"] == "exemplifies" and e["target"] == "principle-002"}
+        assert into_new == {"fact-001", "fact-002", "fact-003"}
+        existing = next(n for n in knowledge["nodes"] if n["id"] == "principle-001")
+        assert existing["instance_count"] == 3  # 2 + fact-010
+
+    def test_no_save_when_nothing_changes(self, session_dir):
+        """Skipped clusters do not rewrite the graph."""
+        _setup_graph(session_dir, [
+            _node("fact-001", source="effort-a"),
+            _node("fact-002", source="effort-b"),
+            _node("fact-003", source="effort-b"),
+        ], [
+            _edge("fact-002", "fact-001"),
+            _edge("fact-003", "fact-001"),
+        ])
+
+        with patch("oi.patterns.detect_principle", return_value=None), \
+             patch("oi.state._save_knowledge") as save:
+            results = detect_patterns(session_dir, ["fact-001"], "test-model")
+
+        assert results[0]["action"] == "skipped"
+        save.assert_not_called()
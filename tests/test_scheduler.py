@@ -0,0 +1,156 @@
+"""Tests for the LLM call scheduler: limits, AIMD, budgets, retries, priorities."""
+
+import threading
+import time
+
+import litellm
+import pytest
+
+from oi import scheduler
+from oi.scheduler import BULK, INTERACTIVE, NORMAL, ModelLimiter, Scheduler
+
+
+def _rate_limit():
+    return litellm.RateLimitError("slow down", llm_provider="openai", model="m")
+
+
+class TestModelLimiter:
+    def test_aimd(self):
+        limiter = ModelLimiter("m", max_concurrency=8)
+        for _ in range(2):
+            limiter.acquire()
+            limiter.release(throttled=True)
+        assert limiter.limit == 2.0
+        limiter.acquire()
+        limiter.release()
+        assert limiter.limit == 2.5  # +1/limit per success
+        for _ in range(50):
+            limiter.acquire()
+            limiter.release()
+        assert limiter.limit == 8.0  # Capped at max_concurrency
+
+    def test_concurrency_limit_blocks(self):
+        limiter = ModelLimiter("m", max_concurrency=1, reserve=0)
+        limiter.acquire()
+        started = threading.Event()
+
+        def second():
+            limiter.acquire()
+            started.set()
+
+        t = threading.Thread(target=second)
+        t.start()
+        assert not started.wait(0.1)
+        limiter.release()
+        assert started.wait(2)
+        t.join()
+
+    def test_interactive_jumps_the_queue(self):
+        limiter = ModelLimiter("m", max_concurrency=1, reserve=0)
+        limiter.acquire()
+        order = []
+
+        def call(level, name):
+            limiter.acquire(level)
+            order.append(name)
+            limiter.release()
+
+        threads = [threading.Thread(target=call, args=(BULK, f"bulk-{i}")) for i in range(3)]
+        for t in threads:
+            t.start()
+            time.sleep(0.02)  # Queue them in order
+        turn = threading.Thread(target=call, args=(INTERACTIVE, "turn"))
+        turn.start()
+        time.sleep(0.05)
+        limiter.release()
+        for t in threads + [turn]:
+            t.join(2)
+        assert order == ["turn", "bulk-0", "bulk-1", "bulk-2"]
+
+    def test_reserved_slot_only_for_interactive(self):
+        limiter = ModelLimiter("m", max_concurrency=2, reserve=1)
+        limiter.acquire(BULK)
+        admitted = threading.Event()
+        t = threading.Thread(target=lambda: (limiter.acquire(BULK), admitted.set()))
+        t.start()
+        assert not admitted.wait(0.1)  # Second bulk call waits...
+        limiter.acquire(INTERACTIVE)  # ...while a turn still gets in
+        assert limiter.in_flight == 2
+        limiter.release()
+        limiter.release()
+        assert admitted.wait(2)
+        t.join()
+
+    def test_token_budget_waits_for_refill(self):
+        limiter = ModelLimiter("m", tokens_per_minute=6000)  # 100 tokens/s
+        limiter.acquire(tokens=6000)
+        limiter.release(reserved=6000, used=6000)
+        start = time.monotonic()
+        limiter.acquire(tokens=20)
+        assert time.monotonic() - start >= 0.15
+        limiter.release()
+
+    def test_actual_usage_charged(self):
+        limiter = ModelLimiter("m", tokens_per_minute=1000)
+        limiter.acquire(tokens=100)
+        limiter.release(reserved=100, used=400)
+        assert limiter.stats()["tokens_available"] == pytest.approx(600, abs=5)
+
+
+class TestSchedulerCall:
+    def test_retries_rate_limits_with_backoff(self):
+        sleeps = []
+        sched = Scheduler(max_retries=3, sleep=sleeps.append)
+        outcomes = [_rate_limit(), _rate_limit(), "ok"]
+
+        def fn():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        retried = []
+        result, ticket = sched.call("m", fn, on_retry=retried.append)
+        ticket.release()
+        assert result == "ok"
+        assert len(sleeps) == 2 and len(retried) == 2
+        assert all(0 <= s <= sched.max_delay for s in sleeps)
+        stats = sched.stats()["m"]
+        assert stats["throttled"] == 2
+        assert stats["in_flight"] == 0
+
+    def test_gives_up_after_max_retries(self):
+        sched = Scheduler(max_retries=1, sleep=lambda s: None)
+        calls = []
+
+        def fn():
+            calls.append(1)
+            raise _rate_limit()
+
+        with pytest.raises(litellm.RateLimitError):
+            sched.call("m", fn)
+        assert len(calls) == 2
+
+    def test_other_errors_not_retried(self):
+        sched = Scheduler(sleep=lambda s: pytest.fail("should not back off"))
+        with pytest.raises(ValueError):
+            sched.call("m", lambda: (_ for _ in ()).throw(ValueError("bad request")))
+        assert sched.stats()["m"]["in_flight"] == 0
+
+    def test_backoff_honors_retry_after(self):
+        sched = Scheduler()
+        exc = litellm.RateLimitError("slow", llm_provider="openai", model="m", headers={"retry-after": "3"})
+        assert sched.backoff(0, exc) == 3.0
+        assert 0 <= sched.backoff(2) <= sched.base_delay * 4
+
+    def test_priority_from_context(self):
+        assert scheduler.current_priority() == NORMAL
+        with scheduler.priority(BULK):
+            assert scheduler.current_priority() == BULK
+        assert scheduler.current_priority() == NORMAL
+
+    def test_configure_per_model(self):
+        sched = Scheduler(max_concurrency=8)
+        sched.configure("local/llama", max_concurrency=1)
+        assert sched.limiter("local/llama").max_concurrency == 1
+        assert sched.limiter("gpt-4o").max_concurrency == 8
@@ -0,0 +1,141 @@
+"""Tests for the multi-tenant session server."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+import oi.linker  # noqa: F401 — patched below; import at collection, not mid-test
+from oi import mcp_server
+from oi.server import ServerError, SessionClient, SessionServer, make_server
+from oi.state import _load_knowledge
+from oi.warm import GraphPool, LatencyStats
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    monkeypatch.setattr(mcp_server, "_graphs", GraphPool())
+    monkeypatch.setattr(mcp_server, "_latency", LatencyStats())
+    with patch("oi.embed.get_embedding", return_value=None), \
+         patch("oi.linker.chat", return_value='{"edge_type": "none", "reasoning": "mocked"}'), \
+         patch("oi.mcp_server.discover_claude_code_chatlog", return_value=None), \
+         patch("oi.mcp_server._get_model", return_value="test-model"):
+        yield
+
+
+def _running(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def client(tmp_path):
+    server = _running(make_server(tmp_path / "tenants", port=0, max_tenants=2))
+    yield SessionClient(port=server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+class TestSessionServer:
+    def test_tenants_are_isolated(self, tmp_path):
+        app = SessionServer(tmp_path)
+        app.call("alice", "mcp_add_knowledge", {"node_type": "fact", "summary": "Alice uses Postgres"})
+        app.call("bob", "mcp_add_knowledge", {"node_type": "fact", "summary": "Bob uses Redis"})
+
+        assert [n["summary"] for n in _load_knowledge(tmp_path / "alice")["nodes"]] == ["Alice uses Postgres"]
+        assert [n["summary"] for n in _load_knowledge(tmp_path / "bob")["nodes"]] == ["Bob uses Redis"]
+        assert "No matches" in app.call("bob", "mcp_query_knowledge", {"query": "postgres"})
+
+    def test_lru_bounds_warm_tenants(self, tmp_path):
+        app = SessionServer(tmp_path, max_tenants=2)
+        for tenant in ("a", "b", "c"):
+            app.call(tenant, "mcp_query_knowledge", {"query": "x"})
+        warm = [t["tenant"] for t in app.tenants()["tenants"]]
+        assert warm == ["b", "c"]
+        assert app.tenants()["evictions"] == 1
+
+    @pytest.mark.parametrize("tenant", ["..", "a/b", "", ".hidden"])
+    def test_rejects_unsafe_tenant_names(self, tmp_path, tenant):
+        with pytest.raises(ValueError):
+            SessionServer(tmp_path).tenant_dir(tenant)
+
+    def test_bad_arguments_raise_type_error(self, tmp_path):
+        with pytest.raises(TypeError):
+            SessionServer(tmp_path).call("alice", "mcp_query_knowledge", {"nope": 1})
+
+
+    def test_servers_keep_their_own_pool_size(self, tmp_path):
+        first = SessionServer(tmp_path / "one", max_tenants=1)
+        SessionServer(tmp_path / "two", max_tenants=5)
+        for tenant in ("a", "b"):
+            first.call(tenant, "mcp_query_knowledge", {"query": "x"})
+        assert [t["tenant"] for t in first.tenants()["tenants"]] == ["b"]
+        assert len(mcp_server._graphs) == 0
+
+    def test_tool_type_error_is_not_bad_arguments(self, tmp_path):
+        from oi.server import BadArguments
+
+        app = SessionServer(tmp_path)
+        with patch("oi.mcp_server.query_knowledge", side_effect=TypeError("bug in tool")):
+            with pytest.raises(TypeError) as exc:
+                app.call("alice", "mcp_query_knowledge", {"query": "x"})
+        assert not isinstance(exc.value, BadArguments)
+
+
+class TestHTTP:
+    def test_call_over_http(self, client, tmp_path):
+        result = client.call("alice", "mcp_add_knowledge", node_type="fact", summary="Alice uses Postgres")
+        assert "fact-001" in result
+        assert "fact-001" in client.call("alice", "mcp_query_knowledge", query="postgres")
+        assert (tmp_path / "tenants" / "alice" / "knowledge.yaml").exists()
+
+    def test_lists_tools_with_schemas(self, client):
+        tools = {t["name"]: t for t in client.tools()}
+        assert "mcp_add_knowledge" in tools
+        assert "summary" in tools["mcp_add_knowledge"]["input_schema"]["properties"]
+
+    def test_errors(self, client):
+        with pytest.raises(ServerError) as exc:
+            client.call("alice", "mcp_no_such_tool")
+        assert exc.value.status == 404
+        with pytest.raises(ServerError) as exc:
+            client.call("..", "mcp_query_knowledge", query="x")
+        assert exc.value.status in (400, 404)
+        with pytest.raises(ServerError) as exc:
+            client.call("alice", "mcp_query_knowledge", bogus="x")
+        assert exc.value.status == 400
+
+    def test_tool_errors_are_500(self, client):
+        with patch("oi.mcp_server.query_knowledge", side_effect=TypeError("bug in tool")):
+            with pytest.raises(ServerError) as exc:
+                client.call("alice", "mcp_query_knowledge", query="x")
+        assert exc.value.status == 500
+
+    def test_concurrent_tenants(self, client, tmp_path):
+        def work(tenant):
+            for i in range(3):
+                client.call(tenant, "mcp_add_knowledge", node_type="fact", summary=f"{tenant} fact {i}")
+
+        threads = [threading.Thread(target=work, args=(t,)) for t in ("a", "b", "c")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for tenant in ("a", "b", "c"):
+            nodes = _load_knowledge(tmp_path / "tenants" / tenant)["nodes"]
+            assert sorted(n["id"] for n in nodes) == ["fact-001", "fact-002", "fact-003"]
+        assert len(client.tenants()["tenants"]) == 2  # max_tenants
+        assert client.stats()["mcp_add_knowledge"]["calls"] == 9
+
+
+def test_unix_socket(tmp_path):
+    sock = tmp_path / "oi.sock"
+    server = _running(make_server(tmp_path / "tenants", socket_path=sock))
+    try:
+        client = SessionClient(socket_path=sock)
+        assert client.health() == {"status": "ok"}
+        assert "fact-001" in client.call("alice", "mcp_add_knowledge", node_type="fact", summary="Over a socket")
+    finally:
+        server.shutdown()
+        server.server_close()
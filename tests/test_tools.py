@@ -11,7 +11,7 @@ from oi.tools import (
     expand_effort, collapse_effort, switch_effort, search_efforts,
     reopen_effort, read_file, run_command, write_file, append_file,
     expand_knowledge, collapse_knowledge,
-    execute_tool,
+    execute_tool, execute_tools, TOOL_DEFINITIONS, TOOL_REGISTRY,
     READ_FILE_MAX_CHARS, RUN_COMMAND_MAX_CHARS,
 )
 from oi.knowledge import add_knowledge
@@ -912,14 +912,14 @@ class TestKnowledgeStore:
         assert result["node_id"] == "preference-001"
 
     def test_knowledge_in_context(self, session_dir):
-        """_build_messages includes knowledge section in system prompt."""
+        """_build_messages includes the knowledge section as the trailing system message."""
         from oi.orchestrator import _build_messages
         session_dir.mkdir(parents=True, exist_ok=True)
         add_knowledge(session_dir, "fact", "API uses JWT with RS256")
         add_knowledge(session_dir, "preference", "Tabs over spaces")
 
         messages = _build_messages(session_dir)
-        system_content = messages[0]["content"]
+        system_content = messages[-1]["content"]  # Knowledge tier is last
         assert "Knowledge graph:" in system_content
         assert "[fact] API uses JWT with RS256" in system_content
         assert "[preference] Tabs over spaces" in system_content
@@ -1589,3 +1589,88 @@ class TestBecauseOfToolDefinition:
         assert add_knowledge_def is not None
         edge_type_enum = add_knowledge_def["function"]["parameters"]["properties"]["edge_type"]["enum"]
         assert "because_of" in edge_type_enum
+
+
+class TestExecuteTools:
+    """Scheduler for one response's tool calls."""
+
+    def test_registry_covers_every_tool(self):
+        names = {t["function"]["name"] for t in TOOL_DEFINITIONS}
+        assert set(TOOL_REGISTRY) == names
+
+    def test_schedule_class_comes_from_registry(self):
+        from oi.tools import _schedule_class
+
+        assert _schedule_class("add_knowledge") == "add"
+        assert _schedule_class("query_knowledge") == "read"
+        assert _schedule_class("write_file") == "serial"
+        with patch.dict(TOOL_REGISTRY, {"query_knowledge": {
+            "requires_confirmation": False, "mutates": False, "schedule": "serial",
+        }}):
+            assert _schedule_class("query_knowledge") == "serial"
+
+    def test_read_only_calls_run_concurrently(self, session_dir, tmp_path):
+        import threading
+        barrier = threading.Barrier(2, timeout=5)
+        (tmp_path / "a.txt").write_text("A")
+        (tmp_path / "b.txt").write_text("B")
+
+        def meeting_read_file(path):
+            barrier.wait()  # Deadlocks (BrokenBarrierError) if run one at a time
+            return read_file(path)
+
+        with patch("oi.tools.read_file", side_effect=meeting_read_file):
+            results = execute_tools(session_dir, [
+                ("read_file", {"path": str(tmp_path / "a.txt")}),
+                ("read_file", {"path": str(tmp_path / "b.txt")}),
+            ])
+        assert [json.loads(r)["content"] for r in results] == ["A", "B"]
+
+    def test_add_knowledge_prepares_concurrently_commits_in_order(self, session_dir):
+        import threading
+        barrier = threading.Barrier(3, timeout=5)
+
+        def meeting_link(node, knowledge, model, prefetch=None):
+            barrier.wait()
+            return []
+
+        with patch("oi.knowledge._link_node", side_effect=meeting_link):
+            results = execute_tools(session_dir, [
+                ("add_knowledge", {"node_type": "fact", "summary": f"Fact number {i}"})
+                for i in range(3)
+            ])
+        assert [json.loads(r)["node_id"] for r in results] == ["fact-001", "fact-002", "fact-003"]
+        nodes = _load_knowledge(session_dir)["nodes"]
+        assert [n["summary"] for n in nodes] == ["Fact number 0", "Fact number 1", "Fact number 2"]
+
+    def test_prepared_links_are_applied(self, session_dir):
+        add_knowledge(session_dir, "fact", "Postgres handles writes")
+        links = [{"target_id": "fact-001", "edge_type": "supports", "reasoning": "same topic"}]
+        with patch("oi.knowledge._link_node", return_value=links):
+            results = execute_tools(session_dir, [
+                ("add_knowledge", {"node_type": "fact", "summary": "Postgres is ACID"}),
+                ("add_knowledge", {"node_type": "fact", "summary": "Postgres scales reads"}),
+            ])
+        assert all(json.loads(r)["edges_created"][0]["target_id"] == "fact-001" for r in results)
+        edges = _load_knowledge(session_dir)["edges"]
+        assert {(e["source"], e["target"]) for e in edges} == {("fact-002", "fact-001"), ("fact-003", "fact-001")}
+
+    def test_invalid_node_type_is_not_prepared(self, session_dir):
+        from oi.knowledge import prepare_knowledge
+
+        with patch("oi.knowledge.prepare_knowledge", wraps=prepare_knowledge) as prep:
+            results = execute_tools(session_dir, [
+                ("add_knowledge", {"node_type": "fact", "summary": "Valid fact", "source": "x"}),
+                ("add_knowledge", {"node_type": "bogus", "summary": "Invalid type", "source": "x"}),
+            ])
+        assert json.loads(results[0])["node_id"] == "fact-001"
+        assert "Invalid node_type" in json.loads(results[1])["error"]
+        assert [c.kwargs["node_type"] for c in prep.call_args_list] == ["fact"]
+
+    def test_reads_after_writes_see_them(self, session_dir):
+        results = execute_tools(session_dir, [
+            ("add_knowledge", {"node_type": "fact", "summary": "Redis caches sessions"}),
+            ("query_knowledge", {"query": "redis sessions"}),
+        ])
+        assert [r["node_id"] for r in json.loads(results[1])["results"]] == ["fact-001"]
+
@@ -0,0 +1,99 @@
+"""Tests for hot-path tracing spans and the Chrome trace file."""
+
+import json
+import threading
+
+import pytest
+
+from oi import tracing
+
+
+@pytest.fixture
+def tracing_on():
+    tracing.enable()
+    yield
+    tracing.enable(False)
+
+
+class TestSpans:
+    def test_disabled_is_a_no_op(self, tmp_path):
+        tracing.enable(False)
+        with tracing.session(tmp_path) as tracer:
+            assert tracer is None
+            with tracing.span("x"):
+                pass
+        assert not (tmp_path / tracing.TRACE_FILE).exists()
+
+    def test_spans_outside_a_session_are_dropped(self, tracing_on, tmp_path):
+        with tracing.span("orphan"):
+            pass
+        assert tracing.traced("f")(lambda: 42)() == 42
+
+    def test_nested_spans_written_on_exit(self, tracing_on, tmp_path):
+        @tracing.traced("inner", cat="compute")
+        def inner():
+            return "ok"
+
+        with tracing.session(tmp_path):
+            with tracing.span("outer", cat="turn", turn=3):
+                assert inner() == "ok"
+            assert not (tmp_path / tracing.TRACE_FILE).exists()  # Buffered until the session ends
+
+        events = tracing.read_trace(tmp_path / tracing.TRACE_FILE)
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        assert set(spans) == {"outer", "inner"}
+        assert spans["outer"]["args"] == {"turn": 3}
+        assert spans["inner"]["cat"] == "compute"
+        assert spans["outer"]["ts"] <= spans["inner"]["ts"]
+        assert spans["inner"]["ts"] + spans["inner"]["dur"] <= spans["outer"]["ts"] + spans["outer"]["dur"]
+        assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in events)
+
+    def test_file_is_an_appendable_json_array(self, tracing_on, tmp_path):
+        for _ in range(2):
+            with tracing.session(tmp_path):
+                with tracing.span("turn"):
+                    pass
+        text = (tmp_path / tracing.TRACE_FILE).read_text()
+        assert text.startswith("[\n")
+        events = json.loads(text.rstrip().rstrip(",") + "]")  # What trace viewers do
+        assert [e["name"] for e in events if e["ph"] == "X"] == ["turn", "turn"]
+
+    def test_nested_session_shares_tracer(self, tracing_on, tmp_path):
+        with tracing.session(tmp_path) as outer:
+            with tracing.session(tmp_path) as inner:
+                assert inner is outer
+
+    def test_late_spans_from_copied_context_still_written(self, tracing_on, tmp_path):
+        import contextvars
+
+        with tracing.session(tmp_path):
+            context = contextvars.copy_context()
+        worker = threading.Thread(target=context.run, args=(lambda: tracing.complete("late", 0.002),))
+        worker.start()
+        worker.join()
+        names = [e["name"] for e in tracing.read_trace(tmp_path / tracing.TRACE_FILE) if e["ph"] == "X"]
+        assert names == ["late"]
+
+    def test_read_tolerates_torn_line(self, tmp_path):
+        path = tmp_path / tracing.TRACE_FILE
+        path.write_text('[\n{"name":"a","ph":"X","ts":0,"dur":5},\n{"name":"b","ph')
+        assert [e["name"] for e in tracing.read_trace(path)] == ["a"]
+        assert tracing.read_trace(tmp_path / "missing.json") == []
+
+
+class TestSummarize:
+    def test_self_time_subtracts_children(self):
+        events = [
+            {"name": "turn", "ph": "X", "ts": 0, "dur": 10_000, "pid": 1, "tid": 1},
+            {"name": "llm", "ph": "X", "ts": 1_000, "dur": 6_000, "pid": 1, "tid": 1},
+            {"name": "load", "ph": "X", "ts": 7_000, "dur": 1_000, "pid": 1, "tid": 1},
+            {"name": "load", "ph": "X", "ts": 2_000, "dur": 3_000, "pid": 1, "tid": 2},  # Other thread
+        ]
+        rows = {r["name"]: r for r in tracing.summarize(events)}
+        assert rows["turn"]["total_ms"] == 10.0
+        assert rows["turn"]["self_ms"] == 3.0
+        assert rows["llm"]["self_ms"] == 6.0
+        assert rows["load"]["count"] == 2
+        assert rows["load"]["total_ms"] == 4.0
+        assert rows["load"]["max_ms"] == 3.0
+        assert [r["name"] for r in tracing.summarize(events)][0] == "turn"
@@ -0,0 +1,105 @@
+"""Tests for warm in-memory graph state (MCP server)."""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+import oi.linker  # noqa: F401 — patched below; import at collection, not mid-test
+from oi.knowledge import add_knowledge, query_knowledge
+from oi.state import _load_knowledge, _save_knowledge
+from oi.warm import LatencyStats, WarmGraph
+
+
+@pytest.fixture(autouse=True)
+def _no_external_calls():
+    with patch("oi.embed.get_embedding", return_value=None), \
+         patch("oi.linker.chat", return_value='{"edge_type": "none", "reasoning": "mocked"}'):
+        yield
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    d = tmp_path / "session"
+    _save_knowledge(d, {
+        "nodes": [
+            {"id": "fact-001", "type": "fact", "summary": "Postgres handles concurrent writes",
+             "status": "active", "source": "a"},
+            {"id": "fact-002", "type": "fact", "summary": "Postgres replication is asynchronous",
+             "status": "active", "source": "b"},
+        ],
+        "edges": [{"source": "fact-002", "target": "fact-001", "type": "supports", "created": "t"}],
+    })
+    return d
+
+
+def _bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestWarmGraph:
+    def test_loads_once_across_queries(self, session_dir):
+        graph = WarmGraph(session_dir)
+        for _ in range(5):
+            query_knowledge(session_dir, "postgres", graph=graph)
+        assert graph.loads == 1
+
+    def test_same_results_as_cold_query(self, session_dir):
+        graph = WarmGraph(session_dir)
+        warm = json.loads(query_knowledge(session_dir, "postgres writes", graph=graph))
+        cold = json.loads(query_knowledge(session_dir, "postgres writes"))
+        for r in warm["results"] + cold["results"]:
+            r["confidence"].pop("runtime_ms")  # wall-clock, differs per run
+        assert warm == cold
+        assert warm["results"]
+
+    def test_external_write_invalidates(self, session_dir):
+        graph = WarmGraph(session_dir)
+        assert len(graph.knowledge["nodes"]) == 2
+
+        knowledge = _load_knowledge(session_dir)
+        knowledge["nodes"].append({"id": "fact-003", "type": "fact", "summary": "Redis caches sessions",
+                                   "status": "active", "source": "c"})
+        _save_knowledge(session_dir, knowledge)
+        _bump_mtime(session_dir / "knowledge.yaml")
+
+        result = json.loads(query_knowledge(session_dir, "redis sessions", graph=graph))
+        assert [r["node_id"] for r in result["results"]] == ["fact-003"]
+        assert graph.loads == 2
+
+    def test_add_knowledge_writes_through(self, session_dir):
+        graph = WarmGraph(session_dir)
+        graph.warm()
+
+        raw = json.loads(add_knowledge(session_dir, "fact", "Postgres supports JSONB columns",
+                                       source="c", graph=graph))
+        assert raw["node_id"] == "fact-003"
+        assert graph.loads == 1  # own write does not trigger a reload
+
+        # On disk and in memory
+        assert "fact-003" in {n["id"] for n in _load_knowledge(session_dir)["nodes"]}
+        result = json.loads(query_knowledge(session_dir, "jsonb columns", graph=graph))
+        assert "fact-003" in [r["node_id"] for r in result["results"]]
+        assert graph.loads == 1
+
+
+class TestLatencyStats:
+    def test_first_call_separate_from_percentiles(self):
+        stats = LatencyStats()
+        stats.record("q", 2.0)
+        for ms in range(1, 101):
+            stats.record("q", ms / 1000)
+
+        snap = stats.snapshot()["q"]
+        assert snap["calls"] == 101
+        assert snap["first_ms"] == 2000.0
+        assert snap["p50_ms"] == 50.0
+        assert snap["p99_ms"] == 99.0
+
+    def test_timed_context_manager(self):
+        stats = LatencyStats()
+        with stats.timed("tool"):
+            pass
+        assert stats.snapshot()["tool"]["calls"] == 1